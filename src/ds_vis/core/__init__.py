@@ -7,6 +7,7 @@ from .exceptions import (
     DsVisError,
     LayoutError,
     ModelError,
+    RenderError,
     SceneError,
 )
 
@@ -16,4 +17,5 @@ __all__ = [
     "ModelError",
     "LayoutError",
     "CommandError",
+    "RenderError",
 ]
\ No newline at end of file
@@ -20,3 +20,7 @@ class LayoutError(DsVisError):
 class CommandError(DsVisError):
     """Raised when a command payload is invalid or malformed."""
     pass
+
+class RenderError(DsVisError):
+    """Raised when a renderer or exporter cannot produce its output."""
+    pass
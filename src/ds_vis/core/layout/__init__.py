@@ -15,7 +15,7 @@ currently, only roles and protocols are defined.)"
 from __future__ import annotations
 
 from enum import Enum
-from typing import Protocol
+from typing import Any, Dict, Mapping, Protocol, Tuple
 
 from ds_vis.core.ops import Timeline
 
@@ -28,6 +28,9 @@ class LayoutEngine(Protocol):
       - read the structural Timeline,
       - compute positions for each step,
       - return a new Timeline that includes SET_POS ops.
+
+    Engines subclass this protocol; the hooks below default to no-ops, so an
+    engine only overrides what it uses and SceneGraph calls them directly.
     """
 
     def apply_layout(self, timeline: Timeline) -> Timeline:
@@ -35,19 +38,31 @@ class LayoutEngine(Protocol):
         ...
 
     def reset(self) -> None:
-        """
-        Optional: clear internal state when switching scenes or seeking.
-        Implementations may be stateless; default no-op.
-        """
-        # pragma: no cover - protocol
-        ...
+        """Clear internal state when switching scenes or seeking."""
+        return None
 
     def set_filter(self, sids: set[str]) -> None:
         """
-        Optional: restrict the engine to only process specific structure IDs.
+        Restrict the engine to the given structure IDs. The set is live:
+        SceneGraph adds/removes IDs as structures are bound.
         """
-        # pragma: no cover - protocol
-        ...
+        return None
+
+    def set_offsets(self, offsets: Dict[str, Tuple[float, float]]) -> None:
+        """Share the scene's per-structure offset map (kept by reference)."""
+        return None
+
+    def set_structure_config(self, config: Dict[str, Mapping[str, object]]) -> None:
+        """Share the scene's per-structure layout config (kept by reference)."""
+        return None
+
+    def save_rows(self) -> Any:
+        """Opaque layout placement for undo (None: nothing to restore)."""
+        return None
+
+    def restore_rows(self, rows: Any) -> None:
+        """Restore a `save_rows()` result."""
+        return None
 
 
 class LayoutStrategy(Enum):
@@ -64,6 +79,8 @@ DEFAULT_LAYOUT_MAP = {
     "seqlist": LayoutStrategy.LINEAR,
     "stack": LayoutStrategy.LINEAR,
     "bst": LayoutStrategy.TREE,
+    "avl": LayoutStrategy.TREE,
+    "rbtree": LayoutStrategy.TREE,
     "huffman": LayoutStrategy.TREE,
     "git": LayoutStrategy.DAG,
 }
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Mapping, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from ds_vis.core.layout import LayoutEngine, LayoutStrategy
 from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
@@ -13,9 +13,12 @@ class GitLayoutEngine(LayoutEngine):
     Simplified Git DAG layout.
 
     目标：
-    - 按 commit 创建顺序纵向排布（单列 lane 占位）。
+    - 按 commit 创建顺序纵向排布；commit 的 data.branch 决定 lane（按首次出现
+      顺序分配，lane 0 通常为 main），merge commit 的多父边由 Renderer 直接连线。
     - 处理 label 的 attach_to：HEAD/branch label 总是锚定到目标 commit 之上并保持堆叠。
     - 仅注入 SET_POS，不修改结构 Ops。
+    - 增量：只追加 commit 时仅计算新 commit 与 label 的位置（流式导入大历史
+      时每批 O(batch)）；删除 commit 或参数变化才整体重排。
     """
 
     spacing_y: float = 140.0
@@ -23,13 +26,20 @@ class GitLayoutEngine(LayoutEngine):
     start_y: float = 50.0
     label_offset: float = 40.0
     label_stack_gap: float = 26.0
+    lane_spacing: float = 120.0
     strategy: LayoutStrategy = LayoutStrategy.DAG
 
     _offsets: Dict[str, Tuple[float, float]] = field(default_factory=dict)
     _structure_config: Dict[str, Mapping[str, object]] = field(default_factory=dict)
-    _commits: Dict[str, List[str]] = field(default_factory=dict)
+    # commit order per structure (dict as ordered set: O(1) delete)
+    _commits: Dict[str, Dict[str, None]] = field(default_factory=dict)
+    _pending_commits: Dict[str, List[str]] = field(default_factory=dict)
+    _relayout: set[str] = field(default_factory=set)
+    _params: Dict[str, Tuple[float, ...]] = field(default_factory=dict)
     _labels: Dict[str, List[str]] = field(default_factory=dict)
     _attachments: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    _lanes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    _commit_lane: Dict[str, Dict[str, int]] = field(default_factory=dict)
     _positions: Dict[str, Dict[str, Tuple[float, float]]] = field(default_factory=dict)
     _dirty_structures: set[str] = field(default_factory=set)
     _filter: Optional[set[str]] = field(default=None, init=False)
@@ -59,8 +69,13 @@ class GitLayoutEngine(LayoutEngine):
         self._offsets.clear()
         self._structure_config.clear()
         self._commits.clear()
+        self._pending_commits.clear()
+        self._relayout.clear()
+        self._params.clear()
         self._labels.clear()
         self._attachments.clear()
+        self._lanes.clear()
+        self._commit_lane.clear()
         self._positions.clear()
         self._dirty_structures.clear()
 
@@ -76,9 +91,15 @@ class GitLayoutEngine(LayoutEngine):
                 target = op.target or ""
                 kind = str(op.data.get("kind", ""))
                 if kind == "commit":
-                    commits = self._commits.setdefault(sid, [])
+                    commits = self._commits.setdefault(sid, {})
                     if target not in commits:
-                        commits.append(target)
+                        commits[target] = None
+                        self._pending_commits.setdefault(sid, []).append(target)
+                    branch = op.data.get("branch")
+                    if isinstance(branch, str):
+                        lanes = self._lanes.setdefault(sid, {})
+                        lane = lanes.setdefault(branch, len(lanes))
+                        self._commit_lane.setdefault(sid, {})[target] = lane
                 else:
                     labels = self._labels.setdefault(sid, [])
                     if target not in labels:
@@ -86,9 +107,11 @@ class GitLayoutEngine(LayoutEngine):
                 self._dirty_structures.add(sid)
             elif op.op is OpCode.DELETE_NODE:
                 target = op.target or ""
-                commits = self._commits.get(sid, [])
+                commits = self._commits.get(sid, {})
                 if target in commits:
-                    commits.remove(target)
+                    del commits[target]
+                    self._relayout.add(sid)
+                self._commit_lane.get(sid, {}).pop(target, None)
                 labels = self._labels.get(sid, [])
                 if target in labels:
                     labels.remove(target)
@@ -111,40 +134,47 @@ class GitLayoutEngine(LayoutEngine):
             offset_x, offset_y = self._offsets.get(sid, (0.0, 0.0))
             cfg = self._structure_config.get(sid, {})
             spacing_y = _as_float(cfg.get("spacing"), self.spacing_y)
-            start_x = _as_float(cfg.get("start_x"), self.start_x)
-            start_y = _as_float(cfg.get("start_y"), self.start_y)
-            orientation = str(cfg.get("orientation", "vertical")).lower()
-
-            commits = self._commits.get(sid, [])
-            labels = self._labels.get(sid, [])
-            attachments = self._attachments.get(sid, {})
-            new_positions: Dict[str, Tuple[float, float]] = {}
-
-            for idx, commit_id in enumerate(commits):
-                if orientation == "horizontal":
-                    pos = (
-                        start_x + offset_x + spacing_y * idx,
-                        start_y + offset_y,
-                    )
+            start_x = _as_float(cfg.get("start_x"), self.start_x) + offset_x
+            start_y = _as_float(cfg.get("start_y"), self.start_y) + offset_y
+            horizontal = str(cfg.get("orientation", "vertical")).lower() == (
+                "horizontal"
+            )
+            lane_spacing = _as_float(cfg.get("lane_spacing"), self.lane_spacing)
+            commit_lane = self._commit_lane.get(sid, {})
+
+            commits = self._commits.get(sid, {})
+            pending = self._pending_commits.pop(sid, [])
+            params = (spacing_y, start_x, start_y, float(horizontal), lane_spacing)
+            previous = self._positions.get(sid, {})
+            if sid in self._relayout or self._params.get(sid) != params:
+                positions: Dict[str, Tuple[float, float]] = {}
+                todo: Iterable[Tuple[int, str]] = enumerate(commits)
+            else:
+                positions = previous
+                todo = enumerate(pending, start=len(commits) - len(pending))
+            self._relayout.discard(sid)
+            self._params[sid] = params
+
+            for idx, commit_id in todo:
+                lane_offset = commit_lane.get(commit_id, 0) * lane_spacing
+                if horizontal:
+                    pos = (start_x + spacing_y * idx, start_y + lane_offset)
                 else:
-                    pos = (
-                        start_x + offset_x,
-                        start_y + offset_y + spacing_y * idx,
-                    )
-                new_positions[commit_id] = pos
+                    pos = (start_x + lane_offset, start_y + spacing_y * idx)
+                if previous.get(commit_id) != pos:
+                    ops.append(_set_pos(commit_id, pos))
+                positions[commit_id] = pos
 
             labels_by_target: Dict[str, List[str]] = {}
-            for label_id in labels:
+            attachments = self._attachments.get(sid, {})
+            for label_id in self._labels.get(sid, []):
                 target = attachments.get(label_id)
                 labels_by_target.setdefault(target or "", []).append(label_id)
 
             for target, label_ids in labels_by_target.items():
-                base_pos = new_positions.get(target)
+                base_pos = positions.get(target) if target else None
                 if base_pos is None:
-                    base_pos = (
-                        start_x + offset_x,
-                        start_y + offset_y - self.label_offset,
-                    )
+                    base_pos = (start_x, start_y - self.label_offset)
                 for stack_idx, label_id in enumerate(label_ids):
                     pos = (
                         base_pos[0],
@@ -152,23 +182,20 @@ class GitLayoutEngine(LayoutEngine):
                         - self.label_offset
                         - stack_idx * self.label_stack_gap,
                     )
-                    new_positions[label_id] = pos
-
-            prev = self._positions.setdefault(sid, {})
-            for node_id, pos in new_positions.items():
-                if prev.get(node_id) != pos:
-                    ops.append(
-                        AnimationOp(
-                            op=OpCode.SET_POS,
-                            target=node_id,
-                            data={"x": pos[0], "y": pos[1]},
-                        )
-                    )
-            self._positions[sid] = new_positions
+                    if previous.get(label_id) != pos:
+                        ops.append(_set_pos(label_id, pos))
+                    positions[label_id] = pos
+            self._positions[sid] = positions
         self._dirty_structures.clear()
         return ops
 
 
+def _set_pos(node_id: str, pos: Tuple[float, float]) -> AnimationOp:
+    return AnimationOp(
+        op=OpCode.SET_POS, target=node_id, data={"x": pos[0], "y": pos[1]}
+    )
+
+
 def _as_float(value: object | None, default: float) -> float:
     if isinstance(value, (int, float)):
         return float(value)
@@ -42,6 +42,9 @@ class SimpleLayoutEngine(LayoutEngine):
     _row_order: List[str] = field(default_factory=list)
     _dirty_structures: set[str] = field(default_factory=set)
     _filter: Optional[set[str]] = field(default=None, init=False)
+    # Next SET_POS pass visits every structure (first step of a call, or rows
+    # re-packed); otherwise only dirty ones, whose positions alone can change.
+    _full_pass: bool = field(default=True, init=False)
     strategy: LayoutStrategy = LayoutStrategy.LINEAR
 
     def set_filter(self, sids: set[str]) -> None:
@@ -60,6 +63,8 @@ class SimpleLayoutEngine(LayoutEngine):
         row stacking and dirty check to avoid redundant SET_POS.
         """
         new_timeline = Timeline()
+        # Offsets/config/rows may have changed since the last call.
+        self._full_pass = True
 
         for step in timeline.steps:
             new_step = AnimationStep(
@@ -87,11 +92,28 @@ class SimpleLayoutEngine(LayoutEngine):
         self._dirty_structures.clear()
         self._structure_offsets.clear()
         self._structure_config.clear()
+        self._full_pass = True
+
+    def save_rows(self) -> Tuple[str, ...]:
+        """Row assignment (structure order), for undo to restore."""
+        return tuple(self._row_order)
+
+    def restore_rows(self, rows: Tuple[str, ...]) -> None:
+        """
+        Put structures back on the rows of `save_rows()`: undoing a command
+        that emptied (and re-packed away) a structure returns it to its row.
+        """
+        self._row_order = list(rows)
+        self._structure_rows = {sid: idx for idx, sid in enumerate(self._row_order)}
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
     def _apply_structural_ops(self, step: AnimationStep) -> None:
+        # Structures emptied by this step; cleared (rows re-packed) only if
+        # still empty at its end, so a step that deletes and re-creates a
+        # structure's nodes (an undo inverse) keeps its row.
+        emptied: set[str] = set()
         for op in step.ops:
             structure_id = op.data.get("structure_id")
             if self._filter is not None and structure_id not in self._filter:
@@ -115,6 +137,12 @@ class SimpleLayoutEngine(LayoutEngine):
                 else:
                     nodes.insert(insert_idx, node_id)
                 self._dirty_structures.add(structure_id)
+            elif op.op is OpCode.SET_SIZE and structure_id and node_id:
+                if self._structure_containers.get(structure_id) == node_id:
+                    width = float(op.data.get("width", 0.0) or 0.0)
+                    height = float(op.data.get("height", 0.0) or 0.0)
+                    self._container_size[structure_id] = (width, height)
+                    self._dirty_structures.add(structure_id)
             elif op.op is OpCode.DELETE_NODE and structure_id and node_id:
                 nodes = self._structure_nodes.get(structure_id, [])
                 if node_id in nodes:
@@ -124,11 +152,16 @@ class SimpleLayoutEngine(LayoutEngine):
                     self._container_size.pop(structure_id, None)
                 self._dirty_structures.add(structure_id)
                 if not nodes:
-                    self._clear_structure(structure_id)
+                    emptied.add(structure_id)
+        for structure_id in emptied:
+            if not self._structure_nodes.get(structure_id):
+                self._clear_structure(structure_id)
 
     def _inject_positions(self) -> List[AnimationOp]:
         ops: List[AnimationOp] = []
         for structure_id, nodes in self._structure_nodes.items():
+            if not self._full_pass and structure_id not in self._dirty_structures:
+                continue
             row_index = self._structure_rows[structure_id]
             offset_x, offset_y = self._structure_offsets.get(structure_id, (0.0, 0.0))
             cfg = self._structure_config.get(structure_id, {})
@@ -198,6 +231,7 @@ class SimpleLayoutEngine(LayoutEngine):
                 container_cache[container_id] = container_pos
 
         self._dirty_structures.clear()
+        self._full_pass = False
         return ops
 
     def _assign_row_if_absent(self, structure_id: str) -> None:
@@ -209,13 +243,13 @@ class SimpleLayoutEngine(LayoutEngine):
     def _clear_structure(self, structure_id: str) -> None:
         self._structure_nodes.pop(structure_id, None)
         self._structure_positions.pop(structure_id, None)
-        self._structure_config.pop(structure_id, None)
         if structure_id in self._structure_rows:
             self._row_order = [sid for sid in self._row_order if sid != structure_id]
             # Re-pack rows to avoid unbounded vertical drift.
             self._structure_rows = {
                 sid: idx for idx, sid in enumerate(self._row_order)
             }
+            self._full_pass = True
 
     @staticmethod
     def _extract_index(data: Mapping[str, object]) -> Optional[int]:
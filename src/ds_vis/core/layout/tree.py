@@ -132,6 +132,7 @@ class TreeLayoutEngine(LayoutEngine):
             else:
                 sorted_roots = list(roots)
 
+            children = self._children_index(parent_map)
             placed: set[str] = set()
             for idx, root in enumerate(sorted_roots):
                 base_x = (
@@ -144,7 +145,7 @@ class TreeLayoutEngine(LayoutEngine):
                     base_y,
                     tree_span,
                     positions,
-                    parent_map,
+                    children,
                     placed,
                     tree_offset_y,
                 )
@@ -164,13 +165,16 @@ class TreeLayoutEngine(LayoutEngine):
         return ops
 
     @staticmethod
-    def _child(
-        parent_map: Mapping[str, Tuple[str, str]], parent_id: str, direction: str
-    ) -> Optional[str]:
+    def _children_index(
+        parent_map: Mapping[str, Tuple[str, str]],
+    ) -> Dict[str, Dict[str, str]]:
+        """parent -> {"L"/"R": child}; first edge per direction wins."""
+        children: Dict[str, Dict[str, str]] = {}
         for child_id, (parent, dir_label) in parent_map.items():
-            if parent == parent_id and dir_label.upper().startswith(direction):
-                return child_id
-        return None
+            side = dir_label.upper()[:1]
+            if side in ("L", "R"):
+                children.setdefault(parent, {}).setdefault(side, child_id)
+        return children
 
     def _layout_subtree(
         self,
@@ -179,38 +183,28 @@ class TreeLayoutEngine(LayoutEngine):
         y: float,
         span: float,
         positions: Dict[str, Tuple[float, float]],
-        parent_map: Mapping[str, Tuple[str, str]],
+        children: Mapping[str, Mapping[str, str]],
         placed: set[str],
         tree_offset_y: float,
     ) -> None:
-        if not node_id or node_id in placed:
-            return
-        positions[node_id] = (x, y)
-        placed.add(node_id)
-        left = self._child(parent_map, node_id, "L")
-        right = self._child(parent_map, node_id, "R")
-        next_span = max(span / 2.0, self.spacing)
-        if left:
-            self._layout_subtree(
-                left,
-                x - next_span,
-                y + tree_offset_y,
-                next_span,
-                positions,
-                parent_map,
-                placed,
-                tree_offset_y,
+        # Explicit stack (pre-order, left first): deep trees must not hit the
+        # recursion limit, and child lookup is O(1) via the children index.
+        pending: List[Tuple[Optional[str], float, float, float]] = [
+            (node_id, x, y, span)
+        ]
+        while pending:
+            current, cx, cy, cspan = pending.pop()
+            if not current or current in placed:
+                continue
+            positions[current] = (cx, cy)
+            placed.add(current)
+            links = children.get(current, {})
+            next_span = max(cspan / 2.0, self.spacing)
+            pending.append(
+                (links.get("R"), cx + next_span, cy + tree_offset_y, next_span)
             )
-        if right:
-            self._layout_subtree(
-                right,
-                x + next_span,
-                y + tree_offset_y,
-                next_span,
-                positions,
-                parent_map,
-                placed,
-                tree_offset_y,
+            pending.append(
+                (links.get("L"), cx - next_span, cy + tree_offset_y, next_span)
             )
 
 
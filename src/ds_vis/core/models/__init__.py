@@ -13,11 +13,13 @@ Contract:
 
 from __future__ import annotations
 
+from ds_vis.core.models.avl import AvlModel
 from ds_vis.core.models.base import BaseModel
 from ds_vis.core.models.bst import BstModel
 from ds_vis.core.models.gitgraph import GitGraphModel
 from ds_vis.core.models.huffman import HuffmanModel
 from ds_vis.core.models.list_model import ListModel
+from ds_vis.core.models.rbtree import RedBlackModel
 from ds_vis.core.models.seqlist import SeqlistModel
 from ds_vis.core.models.stack import StackModel
 
@@ -25,6 +27,8 @@ __all__ = [
     "BaseModel",
     "ListModel",
     "BstModel",
+    "AvlModel",
+    "RedBlackModel",
     "SeqlistModel",
     "StackModel",
     "HuffmanModel",
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, ClassVar, Mapping, Optional, cast
+
+from ds_vis.core.models.bst import BstModel, _BstNode
+from ds_vis.core.ops import AnimationStep, Timeline
+
+
+@dataclass
+class _AvlNode(_BstNode):
+    height: int = 1
+
+
+@dataclass
+class AvlModel(BstModel):
+    """
+    AVL 树：在 BstModel 的插入/删除微步骤之后，沿插入点（或被摘除节点的父
+    节点）向上更新高度，失衡时输出旋转微步骤。
+
+    - 旋转步：SET_STATE(error) 标记失衡节点 → 每次单旋一个步骤（删旧边、
+      建新边），TreeLayout 随边关系重新定位子树。
+    - 树高始终 O(log n)，search/insert/delete 的步骤数随之为 O(log n)。
+    - 不接受重复键（insert 已存在的键只做查找并提示）。
+    - 节点 label 仍为 key；批量建树 bulk=True 即按中位数建平衡树。
+    """
+
+    _unique_keys: ClassVar[bool] = True
+
+    @property
+    def kind(self) -> str:
+        return "avl"
+
+    def create(
+        self,
+        values: Optional[Mapping[str, Any]] = None,
+        bulk: bool = False,
+        balanced: bool = False,
+        preorder: bool = False,
+    ) -> Timeline:
+        # 顺序插入的 Cartesian 树形不是 AVL：批量建树一律取中位数。
+        timeline = super().create(
+            values, bulk=bulk, balanced=balanced or bulk, preorder=preorder
+        )
+        if (bulk or balanced or preorder) and self._root_id:
+            for node_id in self._postorder_ids(self._root_id):
+                self._update_height(node_id)
+        return timeline
+
+    def insert(self, value: Any) -> Timeline:
+        if value is not None and self._lookup(value) is not None:
+            return self._duplicate_timeline(value)
+        timeline = super().insert(value)
+        if self._last_inserted is not None:
+            parent = self._nodes[self._last_inserted].parent
+            timeline.steps.extend(self._rebalance_from(parent))
+        return timeline
+
+    def delete_value(self, value: Any) -> Timeline:
+        self._last_removed_parent = None
+        before = len(self._nodes)
+        timeline = super().delete_value(value)
+        if len(self._nodes) < before:
+            timeline.steps.extend(self._rebalance_from(self._last_removed_parent))
+        return timeline
+
+    def export_state(self) -> Mapping[str, object]:
+        """Pre-order keys; `preorder` restores the exact shape (no rotations)."""
+        return {
+            "values": list(self._iter_preorder(self._root_id)),
+            "preorder": True,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Balancing helpers
+    # ------------------------------------------------------------------ #
+    def _make_node(self, key: Any, parent: Optional[str] = None) -> _BstNode:
+        return _AvlNode(key=key, parent=parent)
+
+    def _height(self, node_id: Optional[str]) -> int:
+        if node_id is None:
+            return 0
+        return cast(_AvlNode, self._nodes[node_id]).height
+
+    def _update_height(self, node_id: str) -> None:
+        node = cast(_AvlNode, self._nodes[node_id])
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _balance(self, node_id: str) -> int:
+        node = self._nodes[node_id]
+        return self._height(node.left) - self._height(node.right)
+
+    def _rebalance_from(self, node_id: Optional[str]) -> list[AnimationStep]:
+        """Walk to the root updating heights; rotate where |balance| > 1."""
+        steps: list[AnimationStep] = []
+        current = node_id
+        while current:
+            self._update_height(current)
+            balance = self._balance(current)
+            if balance > 1 or balance < -1:
+                current = self._fix_imbalance(current, balance, steps)
+            current = self._nodes[current].parent
+        if steps:
+            steps.append(
+                AnimationStep(
+                    ops=[self._clear_msg()]
+                    + self.restore_touched_ops(alive=self._nodes),
+                    label="Restore",
+                )
+            )
+        return steps
+
+    def _fix_imbalance(
+        self, node_id: str, balance: int, steps: list[AnimationStep]
+    ) -> str:
+        node = self._nodes[node_id]
+        key = node.key
+        if balance > 1:
+            child_id = node.left or ""
+            case = "LR" if self._balance(child_id) < 0 else "LL"
+        else:
+            child_id = node.right or ""
+            case = "RL" if self._balance(child_id) > 0 else "RR"
+        steps.append(
+            AnimationStep(
+                ops=[
+                    self._msg(f"Node {key} unbalanced (balance {balance}): {case}"),
+                    self._set_state(node_id, "error"),
+                ],
+                label="Unbalanced",
+            )
+        )
+        if case == "LR":
+            steps.append(self._rotation_step(child_id, "left"))
+        elif case == "RL":
+            steps.append(self._rotation_step(child_id, "right"))
+        steps.append(self._rotation_step(node_id, "right" if balance > 1 else "left"))
+        return self._nodes[node_id].parent or node_id
+
+    def _rotation_step(self, pivot_id: str, direction: str) -> AnimationStep:
+        key = self._nodes[pivot_id].key
+        ops = [self._msg(f"Rotate {direction} at {key}")]
+        ops.extend(self._rotate(pivot_id, direction))
+        riser_id = self._nodes[pivot_id].parent or pivot_id
+        self._update_height(pivot_id)
+        self._update_height(riser_id)
+        ops.append(self._set_state(riser_id, "active"))
+        return AnimationStep(ops=ops, label=f"Rotate {direction}")
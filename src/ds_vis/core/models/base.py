@@ -1,13 +1,156 @@
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Mapping, Optional
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Container,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
 
-from ds_vis.core.ops import Timeline
+from ds_vis.core.ops import AnimationOp, OpCode, Timeline
 
 IdAllocator = Callable[[str, str, int], str]
 
+NORMAL_STATE = "normal"
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class StateTracker:
+    """
+    Ids (nodes/edges) whose visual state is not "normal".
+
+    Fed by every SET_STATE a model emits, so a restore step only needs to
+    reset what an operation actually touched instead of the whole structure
+    (O(touched) rather than O(n) ops per operation).
+    """
+
+    # dict as an insertion-ordered set: restore ops come out deterministic.
+    _dirty: Dict[str, None] = field(default_factory=dict)
+
+    def mark(self, target: str, state: str) -> None:
+        if state == NORMAL_STATE:
+            self._dirty.pop(target, None)
+        else:
+            self._dirty[target] = None
+
+    def discard(self, target: str) -> None:
+        self._dirty.pop(target, None)
+
+    def drain(self) -> List[str]:
+        """Return dirty ids (oldest first) and forget them."""
+        dirty = list(self._dirty)
+        self._dirty.clear()
+        return dirty
+
+    def clear(self) -> None:
+        self._dirty.clear()
+
+    def __contains__(self, target: object) -> bool:
+        return target in self._dirty
+
+    def __len__(self) -> int:
+        return len(self._dirty)
+
+
+class JournaledDict(Dict[K, V]):
+    """
+    dict that can record the pre-image of every entry it hands out.
+
+    While a journal is open, the first access to a key (read, write or
+    delete) stores a shallow copy of its value (None when the key is new), so
+    in-place mutations of node objects are captured without instrumenting
+    every mutation site. Cost is O(entries touched) per operation; iteration
+    (`values()`/`items()`) is not journaled and must not be used to mutate.
+    """
+
+    _journal: Optional[Dict[K, Optional[V]]] = None
+
+    def open_journal(self) -> None:
+        self._journal = {}
+
+    def close_journal(self) -> Dict[K, Optional[V]]:
+        journal, self._journal = self._journal or {}, None
+        return journal
+
+    def rollback(self, journal: Mapping[K, Optional[V]]) -> None:
+        """Put back the pre-images of a closed journal."""
+        for key, value in journal.items():
+            if value is None:
+                dict.pop(self, key, None)
+            else:
+                dict.__setitem__(self, key, value)
+
+    def _remember(self, key: K) -> None:
+        journal = self._journal
+        if journal is not None and key not in journal:
+            value = dict.get(self, key)
+            journal[key] = copy.copy(value) if value is not None else None
+
+    def __getitem__(self, key: K) -> V:
+        if self._journal is not None:
+            self._remember(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key: K, default: Any = None) -> Any:
+        if self._journal is not None and key in self:
+            self._remember(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if self._journal is not None:
+            self._remember(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: K) -> None:
+        if self._journal is not None:
+            self._remember(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key: K, *default: Any) -> Any:
+        if self._journal is not None and key in self:
+            self._remember(key)
+        return dict.pop(self, key, *default)
+
+    def clear(self) -> None:
+        if self._journal is not None:
+            for key in self:
+                self._remember(key)
+        dict.clear(self)
+
+
+class _JournalMark(NamedTuple):
+    container: JournaledDict[Any, Any]
+    journal: Mapping[Any, Any]
+
+
+class _LengthMark(NamedTuple):
+    container: Any
+    length: int
+
+
+def _truncate(container: Any, length: int) -> None:
+    if isinstance(container, list):
+        del container[length:]
+    elif isinstance(container, dict):
+        while len(container) > length:
+            container.popitem()
+    else:
+        container.truncate(length)
+
 
 @dataclass
 class BaseModel(ABC):
@@ -25,6 +168,15 @@ class BaseModel(ABC):
     structure_id: str
     id_allocator: Optional[IdAllocator] = None
     _next_obj_id: int = field(default=0, init=False, repr=False)
+    _state_tracker: StateTracker = field(
+        default_factory=StateTracker, init=False, repr=False
+    )
+    _change: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+
+    # Containers that only grow between resets (list / insertion-ordered dict /
+    # object with `truncate`); resets must rebind them instead of clearing.
+    # Undo records their length and truncates instead of copying them.
+    _append_only_fields: ClassVar[FrozenSet[str]] = frozenset()
 
     @property
     @abstractmethod
@@ -77,3 +229,90 @@ class BaseModel(ABC):
         Subclasses can override to adapt to specific edge naming strategies.
         """
         return f"{self.structure_id}|{edge_kind}|{src}->{dst}"
+
+    # ------------------------------------------------------------------ #
+    # State helpers (touched-set restoration)
+    # ------------------------------------------------------------------ #
+    @property
+    def state_tracker(self) -> StateTracker:
+        return self._state_tracker
+
+    def state_op(self, target: str, state: str) -> AnimationOp:
+        """Build a SET_STATE op and record the target as touched/restored."""
+        self._state_tracker.mark(target, state)
+        return AnimationOp(
+            op=OpCode.SET_STATE,
+            target=target,
+            data={"structure_id": self.structure_id, "state": state},
+        )
+
+    def restore_touched_ops(
+        self, alive: Optional[Container[str]] = None
+    ) -> List[AnimationOp]:
+        """
+        SET_STATE normal for every id touched since the last restore.
+
+        `alive` filters out ids that no longer exist (deleted nodes/edges);
+        when omitted every touched id is reset.
+        """
+        return [
+            self.state_op(target, NORMAL_STATE)
+            for target in self._state_tracker.drain()
+            if alive is None or target in alive
+        ]
+
+    # ------------------------------------------------------------------ #
+    # Change recording (undo support)
+    # ------------------------------------------------------------------ #
+    def node_index(self, node_id: str) -> Optional[int]:
+        """Layout order of a node for linear kinds (None when order is implicit)."""
+        return None
+
+    def begin_change(self) -> None:
+        """
+        Start recording the state the next operation modifies.
+
+        Per attribute: JournaledDict opens a journal, append-only containers
+        keep (object, length), StateTracker and other containers are shallow
+        copied, scalars are kept as is. Copies cost O(container) only for
+        list-like models whose operations are O(n) anyway.
+        """
+        change: Dict[str, Any] = {}
+        for name, value in vars(self).items():
+            if name == "_change":
+                continue
+            if isinstance(value, JournaledDict):
+                value.open_journal()
+                change[name] = value
+            elif name in self._append_only_fields:
+                change[name] = _LengthMark(value, len(value))
+            elif isinstance(value, StateTracker):
+                change[name] = StateTracker(dict(value._dirty))
+            elif isinstance(value, (list, dict, set, deque)):
+                change[name] = copy.copy(value)
+            else:
+                change[name] = value
+        self._change = change
+
+    def end_change(self) -> Dict[str, Any]:
+        """Stop recording; the returned delta is consumed by `revert_change`."""
+        change, self._change = self._change or {}, None
+        delta: Dict[str, Any] = {}
+        for name, value in change.items():
+            if isinstance(value, JournaledDict):
+                delta[name] = _JournalMark(value, value.close_journal())
+            else:
+                delta[name] = value
+        return delta
+
+    def revert_change(self, delta: Mapping[str, Any]) -> None:
+        """Restore the state captured by `begin_change` (O(recorded delta))."""
+        for name, value in delta.items():
+            if isinstance(value, _LengthMark):
+                _truncate(value.container, value.length)
+                setattr(self, name, value.container)
+            elif isinstance(value, _JournalMark):
+                value.container.rollback(value.journal)
+                setattr(self, name, value.container)
+            else:
+                setattr(self, name, value)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, Mapping, Optional
+from typing import Any, ClassVar, Dict, Iterable, Iterator, Mapping, Optional
 
 from ds_vis.core.exceptions import ModelError
-from ds_vis.core.models.base import BaseModel
+from ds_vis.core.models.base import BaseModel, JournaledDict
 from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
 
 
@@ -28,7 +28,13 @@ class BstModel(BaseModel):
     """
 
     _root_id: Optional[str] = None
-    _nodes: Dict[str, _BstNode] = field(default_factory=dict)
+    _nodes: JournaledDict[str, _BstNode] = field(default_factory=JournaledDict)
+    # Bookkeeping for self-balancing subclasses (AVL / red-black).
+    _last_inserted: Optional[str] = field(default=None, init=False, repr=False)
+    _last_removed_parent: Optional[str] = field(default=None, init=False, repr=False)
+    # Kinds whose insert rejects an existing key (AVL / red-black): bulk
+    # loads keep the first occurrence of each key, as sequential inserts do.
+    _unique_keys: ClassVar[bool] = False
 
     @property
     def kind(self) -> str:
@@ -40,7 +46,12 @@ class BstModel(BaseModel):
 
     def apply_operation(self, op: str, payload: Mapping[str, Any]) -> Timeline:
         if op == "create":
-            return self.create(payload.get("values"))
+            return self.create(
+                payload.get("values"),
+                bulk=bool(payload.get("bulk")),
+                balanced=bool(payload.get("balanced")),
+                preorder=bool(payload.get("preorder")),
+            )
         if op == "insert":
             return self.insert(value=payload.get("value"))
         if op == "search":
@@ -54,9 +65,20 @@ class BstModel(BaseModel):
     # ------------------------------------------------------------------ #
     # Public ops
     # ------------------------------------------------------------------ #
-    def create(self, values: Optional[Mapping[str, Any]] = None) -> Timeline:
+    def create(
+        self,
+        values: Optional[Mapping[str, Any]] = None,
+        bulk: bool = False,
+        balanced: bool = False,
+        preorder: bool = False,
+    ) -> Timeline:
         """
         初始化或重建树结构；values（可选）按插入顺序逐个 insert。
+
+        bulk=True 时一次性建树（与逐个 insert 的树形、节点 ID 完全一致），
+        只输出一个 CREATE_NODE/CREATE_EDGE 结构步；balanced=True 按排序后
+        取中位数建平衡树（隐含 bulk）；preorder=True 表示 values 是某棵树的
+        先序序列（export_state 的输出），按原树形还原（隐含 bulk）。
         """
         timeline = Timeline()
         # 重建前先清空
@@ -65,6 +87,16 @@ class BstModel(BaseModel):
             timeline.add_step(step)
 
         values_iter: list[Any] = list(values or [])
+        if any(value is None for value in values_iter):
+            raise ModelError("insert requires value")
+        if bulk or balanced or preorder:
+            if self._unique_keys:
+                values_iter = self._first_occurrences(values_iter, preorder)
+            if values_iter:
+                timeline.add_step(
+                    self._bulk_load(values_iter, balanced, preorder=preorder)
+                )
+            return timeline
         for value in values_iter:
             ins_tl = self.insert(value)
             for step in ins_tl.steps:
@@ -79,6 +111,7 @@ class BstModel(BaseModel):
         timeline = Timeline()
         if self._root_id is None:
             node_id = self._create_node(value, parent=None)
+            self._last_inserted = node_id
             timeline.add_step(
                 AnimationStep(
                     ops=[
@@ -154,6 +187,7 @@ class BstModel(BaseModel):
             timeline.add_step(step)
 
         new_id = self._create_node(value, parent=parent_id, direction=direction)
+        self._last_inserted = new_id
         connect_ops = [
             self._msg(f"Insert {value} to {direction} of {parent_id}"),
             self._set_state(parent_id, "highlight"),
@@ -284,11 +318,10 @@ class BstModel(BaseModel):
                 ops.extend(self._delete_single_child_ops(succ_id))
         ops.append(self._clear_msg())
         timeline.add_step(AnimationStep(ops=ops, label="Delete"))
-        # restore states
+        # restore states (only nodes/edges touched by this operation)
         timeline.add_step(
             AnimationStep(
-                ops=[self._set_state(nid, "normal") for nid in self._nodes.keys()],
-                label="Restore",
+                ops=self.restore_touched_ops(alive=self._nodes), label="Restore"
             )
         )
         return timeline
@@ -320,7 +353,8 @@ class BstModel(BaseModel):
 
     def export_state(self) -> Mapping[str, object]:
         """Export current BST keys in pre-order for persistence replay."""
-        return {"values": list(self._iter_preorder(self._root_id))}
+        # Re-inserting pre-order keys rebuilds the same shape; bulk skips micro-steps.
+        return {"values": list(self._iter_preorder(self._root_id)), "bulk": True}
 
     # ------------------------------------------------------------------ #
     # Internal helpers
@@ -329,7 +363,7 @@ class BstModel(BaseModel):
         self, value: Any, parent: Optional[str], direction: str | None = None
     ) -> str:
         node_id = self.allocate_node_id("node")
-        self._nodes[node_id] = _BstNode(key=value, parent=parent)
+        self._nodes[node_id] = self._make_node(value, parent)
         if parent and direction:
             parent_node = self._nodes[parent]
             if direction == "left":
@@ -340,6 +374,140 @@ class BstModel(BaseModel):
             self._root_id = node_id
         return node_id
 
+    @staticmethod
+    def _first_occurrences(values: list[Any], preorder: bool) -> list[Any]:
+        """Drop repeated keys in order; a preorder (tree shape) must not repeat."""
+        seen: set[Any] = set()
+        unique: list[Any] = []
+        for value in values:
+            if value in seen:
+                if preorder:
+                    raise ModelError(f"Duplicate key in preorder: {value!r}")
+                continue
+            seen.add(value)
+            unique.append(value)
+        return unique
+
+    def _make_node(self, key: Any, parent: Optional[str] = None) -> _BstNode:
+        """Node factory; balanced subclasses attach height/color here."""
+        return _BstNode(key=key, parent=parent)
+
+    def _bulk_load(
+        self, values: list[Any], balanced: bool, preorder: bool = False
+    ) -> AnimationStep:
+        """
+        Build the tree in one pass and return a single structural step.
+
+        Unbalanced: the tree of sequential inserts is the Cartesian tree of
+        the keys sorted stably (ties keep insertion order, i.e. go right)
+        with insertion index as heap priority, so it is built with one sort
+        plus a monotonic stack instead of n root-to-leaf descents.
+        """
+        parent_of: Dict[int, Optional[int]] = {}
+        side_of: Dict[int, str] = {}
+        if preorder:
+            alloc_order = list(range(len(values)))
+            self._preorder_links(values, parent_of, side_of)
+        elif balanced:
+            order = sorted(range(len(values)), key=lambda idx: values[idx])
+            alloc_order = self._balanced_links(values, order, parent_of, side_of)
+        else:
+            order = sorted(range(len(values)), key=lambda idx: values[idx])
+            alloc_order = list(range(len(values)))
+            self._cartesian_links(order, parent_of, side_of)
+
+        ids: Dict[int, str] = {}
+        for idx in alloc_order:
+            ids[idx] = self.allocate_node_id("node")
+            self._nodes[ids[idx]] = self._make_node(values[idx])
+
+        node_ops: list[AnimationOp] = []
+        edge_ops: list[AnimationOp] = []
+        for idx in alloc_order:
+            node_id = ids[idx]
+            node_ops.append(self._op_create_node(node_id, values[idx]))
+            parent_idx = parent_of.get(idx)
+            if parent_idx is None:
+                self._root_id = node_id
+                continue
+            parent_id = ids[parent_idx]
+            direction = side_of[idx]
+            self._nodes[node_id].parent = parent_id
+            if direction == "left":
+                self._nodes[parent_id].left = node_id
+            else:
+                self._nodes[parent_id].right = node_id
+            edge_ops.append(self._op_create_edge(parent_id, node_id, direction))
+        return AnimationStep(ops=node_ops + edge_ops, label="Bulk build")
+
+    @staticmethod
+    def _cartesian_links(
+        order: list[int], parent_of: Dict[int, Optional[int]], side_of: Dict[int, str]
+    ) -> None:
+        stack: list[int] = []
+        for idx in order:
+            last: Optional[int] = None
+            while stack and stack[-1] > idx:
+                last = stack.pop()
+            if last is not None:
+                parent_of[last] = idx
+                side_of[last] = "left"
+            if stack:
+                parent_of[idx] = stack[-1]
+                side_of[idx] = "right"
+            else:
+                parent_of[idx] = None
+            stack.append(idx)
+
+    @staticmethod
+    def _preorder_links(
+        values: list[Any], parent_of: Dict[int, Optional[int]], side_of: Dict[int, str]
+    ) -> None:
+        """Rebuild the shape whose pre-order is `values` (ties go right)."""
+        stack: list[int] = []
+        for idx, value in enumerate(values):
+            if stack and value < values[stack[-1]]:
+                parent_of[idx] = stack[-1]
+                side_of[idx] = "left"
+            else:
+                last: Optional[int] = None
+                while stack and not value < values[stack[-1]]:
+                    last = stack.pop()
+                parent_of[idx] = last
+                if last is not None:
+                    side_of[idx] = "right"
+            stack.append(idx)
+
+    @staticmethod
+    def _balanced_links(
+        values: list[Any],
+        order: list[int],
+        parent_of: Dict[int, Optional[int]],
+        side_of: Dict[int, str],
+    ) -> list[int]:
+        """Median split over sorted keys; returns nodes in pre-order."""
+        preorder: list[int] = []
+        # (lo, hi, parent index, side) over positions in `order`
+        pending: list[tuple[int, int, Optional[int], str]] = [
+            (0, len(order), None, "")
+        ]
+        while pending:
+            lo, hi, parent, side = pending.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # Equal keys belong to the right subtree (insert sends ties right).
+            while mid > lo and values[order[mid - 1]] == values[order[mid]]:
+                mid -= 1
+            idx = order[mid]
+            preorder.append(idx)
+            parent_of[idx] = parent
+            if parent is not None:
+                side_of[idx] = side
+            pending.append((mid + 1, hi, idx, "right"))
+            pending.append((lo, mid, idx, "left"))
+        return preorder
+
     def _op_create_node(self, node_id: str, value: Any) -> AnimationOp:
         return AnimationOp(
             op=OpCode.CREATE_NODE,
@@ -370,15 +538,11 @@ class BstModel(BaseModel):
         return AnimationOp(
             op=OpCode.DELETE_EDGE,
             target=self.edge_id(direction, parent_id, child_id),
-            data={"structure_id": self.structure_id},
+            data={"structure_id": self.structure_id, "from": parent_id, "to": child_id},
         )
 
     def _set_state(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"state": state, "structure_id": self.structure_id},
-        )
+        return self.state_op(target, state)
 
     def _set_label(self, target: str, value: Any) -> AnimationOp:
         return AnimationOp(
@@ -397,15 +561,58 @@ class BstModel(BaseModel):
     def _clear_msg(self) -> AnimationOp:
         return AnimationOp(op=OpCode.CLEAR_MESSAGE, target=None, data={})
 
+    # Traversals use explicit stacks: sorted inserts build a degenerate chain
+    # whose depth equals the node count, far beyond the recursion limit.
     def _iter_preorder(self, node_id: Optional[str]) -> Iterable[Any]:
-        if node_id is None:
-            return
-        node = self._nodes[node_id]
-        yield node.key
-        if node.left:
-            yield from self._iter_preorder(node.left)
-        if node.right:
-            yield from self._iter_preorder(node.right)
+        for current in self._preorder_ids(node_id):
+            yield self._nodes[current].key
+
+    def _preorder_ids(self, node_id: Optional[str]) -> Iterator[str]:
+        stack = [node_id] if node_id else []
+        while stack:
+            current = stack.pop()
+            yield current
+            node = self._nodes[current]
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def _postorder_ids(self, node_id: Optional[str]) -> Iterator[str]:
+        # (node, children_pushed) pairs: a node is emitted on its second visit.
+        stack: list[tuple[str, bool]] = [(node_id, False)] if node_id else []
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                yield current
+                continue
+            stack.append((current, True))
+            node = self._nodes[current]
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+
+    def _lookup(self, value: Any) -> Optional[str]:
+        """Node id holding `value` (no animation), or None."""
+        current = self._root_id
+        while current:
+            node = self._nodes[current]
+            if value == node.key:
+                return current
+            current = node.left if value < node.key else node.right
+        return None
+
+    def _duplicate_timeline(self, value: Any) -> Timeline:
+        """Search animation plus a notice; for kinds that reject duplicates."""
+        timeline = self.search(value)
+        timeline.add_step(
+            AnimationStep(
+                ops=[self._msg(f"{value} already in tree"), self._clear_msg()],
+                label="Duplicate",
+            )
+        )
+        return timeline
 
     def _find_node(self, value: Any) -> tuple[Optional[str], list[AnimationStep]]:
         steps: list[AnimationStep] = []
@@ -462,13 +669,10 @@ class BstModel(BaseModel):
 
         if child_id:
             ops.append(self._op_delete_edge(node_id, child_id))
-            if parent_id:
-                ops.append(
-                    self._op_create_edge(
-                        parent_id, child_id, self._dir(parent_id, node_id)
-                    )
-                )
-            self._reparent(child_id, parent_id)
+            side = self._dir(parent_id, node_id) if parent_id else None
+            if parent_id and side:
+                ops.append(self._op_create_edge(parent_id, child_id, side))
+            self._reparent(child_id, parent_id, side)
             if parent_id is None:
                 self._root_id = child_id
                 self._nodes[child_id].parent = None
@@ -503,6 +707,7 @@ class BstModel(BaseModel):
         node = self._nodes.pop(node_id, None)
         if not node:
             return
+        self._last_removed_parent = node.parent
         if node.parent:
             parent = self._nodes[node.parent]
             if parent.left == node_id:
@@ -512,16 +717,68 @@ class BstModel(BaseModel):
         if self._root_id == node_id:
             self._root_id = new_root
 
-    def _reparent(self, node_id: str, new_parent: Optional[str]) -> None:
+    def _reparent(
+        self, node_id: str, new_parent: Optional[str], side: Optional[str] = None
+    ) -> None:
+        """Hang `node_id` under `new_parent` (on `side`, else by key order)."""
         node = self._nodes[node_id]
         node.parent = new_parent
         if new_parent:
             parent = self._nodes[new_parent]
-            if node.key < parent.key:
+            if side is None:
+                side = "left" if node.key < parent.key else "right"
+            if side == "left":
                 parent.left = node_id
             else:
                 parent.right = node_id
 
+    def _rotate(self, pivot_id: str, direction: str) -> list[AnimationOp]:
+        """
+        Rotate the subtree rooted at `pivot_id` (direction "left": its right
+        child rises; "right": its left child rises). Updates the links and
+        returns the edge ops (old edges deleted, new edges created) that let
+        TreeLayout re-place the subtree. The risen child becomes subtree root.
+        """
+        pivot = self._nodes[pivot_id]
+        riser_id = pivot.right if direction == "left" else pivot.left
+        if riser_id is None:
+            raise ModelError(f"Cannot rotate {direction} at {pivot_id}")
+        riser = self._nodes[riser_id]
+        inner_id = riser.left if direction == "left" else riser.right
+        parent_id = pivot.parent
+        parent_side = self._dir(parent_id, pivot_id) if parent_id else None
+        inner_side = "right" if direction == "left" else "left"
+
+        ops: list[AnimationOp] = []
+        if parent_id:
+            ops.append(self._op_delete_edge(parent_id, pivot_id))
+        ops.append(self._op_delete_edge(pivot_id, riser_id))
+        if inner_id:
+            ops.append(self._op_delete_edge(riser_id, inner_id))
+
+        # relink: inner subtree moves across, pivot hangs under the riser
+        if direction == "left":
+            pivot.right = inner_id
+            riser.left = pivot_id
+        else:
+            pivot.left = inner_id
+            riser.right = pivot_id
+        if inner_id:
+            self._nodes[inner_id].parent = pivot_id
+        pivot.parent = riser_id
+        riser.parent = parent_id
+        if parent_id and parent_side:
+            self._reparent(riser_id, parent_id, parent_side)
+        else:
+            self._root_id = riser_id
+
+        if inner_id:
+            ops.append(self._op_create_edge(pivot_id, inner_id, inner_side))
+        ops.append(self._op_create_edge(riser_id, pivot_id, direction))
+        if parent_id and parent_side:
+            ops.append(self._op_create_edge(parent_id, riser_id, parent_side))
+        return ops
+
     def _dir(self, parent_id: str, child_id: str) -> str:
         parent = self._nodes[parent_id]
         if parent.left == child_id:
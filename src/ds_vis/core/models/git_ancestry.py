@@ -0,0 +1,203 @@
+"""
+Ancestry index for GitGraphModel (generation numbers + first-parent lifting).
+
+Commits are appended in topological order (parents first). For each commit
+the index keeps:
+
+- its generation number (1 for roots, 1 + max(parent generations) otherwise);
+- binary-lifting jumps along the first-parent chain (2^k-th first parent);
+- the nearest merge commit on that chain (itself if it is a merge).
+
+Between a commit and its nearest merge the history is a plain chain whose
+generation drops by exactly one per step, so a whole chain segment can be
+skipped with O(log n) jumps. `is_ancestor` and `merge_bases` therefore cost
+O(m log n) for m merge commits explored instead of walking every commit.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Optional, Sequence
+
+from ds_vis.core.exceptions import ModelError
+
+
+class AncestryIndex:
+    """Append-only reachability index over a commit DAG."""
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._parents: List[List[int]] = []
+        self._generation: List[int] = []
+        self._jumps: List[List[int]] = []  # _jumps[i][k] = 2^k-th first parent
+        self._merge_below: List[int] = []  # nearest merge on first-parent chain, -1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, commit_id: object) -> bool:
+        return commit_id in self._index
+
+    def clear(self) -> None:
+        self._index.clear()
+        self._ids.clear()
+        self._parents.clear()
+        self._generation.clear()
+        self._jumps.clear()
+        self._merge_below.clear()
+
+    def truncate(self, length: int) -> None:
+        """Drop the most recently added commits, keeping the first `length`."""
+        for commit_id in self._ids[length:]:
+            del self._index[commit_id]
+        for column in (
+            self._ids,
+            self._parents,
+            self._generation,
+            self._jumps,
+            self._merge_below,
+        ):
+            del column[length:]
+
+    def add(self, commit_id: str, parents: Sequence[str]) -> None:
+        """Register a commit; every parent must already be indexed."""
+        if commit_id in self._index:
+            raise ModelError(f"Commit already indexed: {commit_id}")
+        try:
+            parent_idx = [self._index[parent] for parent in parents]
+        except KeyError as exc:
+            raise ModelError(f"Unknown parent commit: {exc.args[0]}") from exc
+        idx = len(self._ids)
+        self._index[commit_id] = idx
+        self._ids.append(commit_id)
+        self._parents.append(parent_idx)
+        self._generation.append(
+            1 + max((self._generation[p] for p in parent_idx), default=0)
+        )
+
+        jumps: List[int] = []
+        if parent_idx:
+            node = parent_idx[0]
+            jumps.append(node)
+            level = 0
+            while level < len(self._jumps[node]):
+                node = self._jumps[node][level]
+                jumps.append(node)
+                level += 1
+        self._jumps.append(jumps)
+
+        if len(parent_idx) > 1:
+            self._merge_below.append(idx)
+        elif parent_idx:
+            self._merge_below.append(self._merge_below[parent_idx[0]])
+        else:
+            self._merge_below.append(-1)
+
+    def generation(self, commit_id: str) -> int:
+        return self._generation[self._require(commit_id)]
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """True when `ancestor` is reachable from `descendant` (or equal)."""
+        return self._is_ancestor(self._require(ancestor), self._require(descendant))
+
+    def merge_bases(self, a: str, b: str) -> List[str]:
+        """
+        Best common ancestors of `a` and `b` (none is an ancestor of another),
+        highest generation first. Empty when the histories are unrelated.
+        """
+        ia, ib = self._require(a), self._require(b)
+        if self._is_ancestor(ia, ib):
+            return [a]
+        if self._is_ancestor(ib, ia):
+            return [b]
+
+        candidates: List[int] = []
+        seen: set[int] = set()
+        # Explore b's history one first-parent segment at a time.
+        heap: List[tuple[int, int]] = [(-self._generation[ib], ib)]
+        while heap:
+            _, top = heapq.heappop(heap)
+            if top in seen:
+                continue
+            seen.add(top)
+            bottom = self._segment_bottom(top)
+            if not self._is_ancestor(bottom, ia):
+                if self._merge_below[top] == bottom:
+                    for parent in self._parents[bottom]:
+                        if parent not in seen:
+                            heapq.heappush(heap, (-self._generation[parent], parent))
+                continue
+            # Ancestry of `a` is closed downwards along the chain: binary
+            # search the highest segment node that is still an ancestor of a.
+            lo, hi = 0, self._generation[top] - self._generation[bottom]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._is_ancestor(self._first_parent_at(top, mid), ia):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            candidates.append(self._first_parent_at(top, lo))
+
+        best = [
+            c
+            for c in candidates
+            if not any(o != c and self._is_ancestor(c, o) for o in candidates)
+        ]
+        best = sorted(set(best), key=lambda c: -self._generation[c])
+        return [self._ids[c] for c in best]
+
+    def merge_base(self, a: str, b: str) -> Optional[str]:
+        bases = self.merge_bases(a, b)
+        return bases[0] if bases else None
+
+    # ------------------------------------------------------------------ #
+    # internals
+    # ------------------------------------------------------------------ #
+    def _require(self, commit_id: str) -> int:
+        idx = self._index.get(commit_id)
+        if idx is None:
+            raise ModelError(f"Unknown commit: {commit_id}")
+        return idx
+
+    def _first_parent_at(self, node: int, steps: int) -> int:
+        level = 0
+        while steps and node >= 0:
+            if steps & 1:
+                jumps = self._jumps[node]
+                node = jumps[level] if level < len(jumps) else -1
+            steps >>= 1
+            level += 1
+        return node
+
+    def _segment_bottom(self, node: int) -> int:
+        """Nearest merge below `node`, or the root of its first-parent chain."""
+        merge = self._merge_below[node]
+        if merge >= 0:
+            return merge
+        return self._first_parent_at(node, self._generation[node] - 1)
+
+    def _is_ancestor(self, ancestor: int, descendant: int) -> bool:
+        target_gen = self._generation[ancestor]
+        seen: set[int] = set()
+        heap: List[tuple[int, int]] = [(-self._generation[descendant], descendant)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == ancestor:
+                return True
+            if node in seen or self._generation[node] <= target_gen:
+                continue
+            seen.add(node)
+            merge = self._merge_below[node]
+            if merge < 0 or self._generation[merge] < target_gen:
+                # Plain chain down to target's generation: one lifted jump.
+                steps = self._generation[node] - target_gen
+                if self._first_parent_at(node, steps) == ancestor:
+                    return True
+                continue
+            if merge == ancestor:
+                return True
+            for parent in self._parents[merge]:
+                if parent not in seen:
+                    heapq.heappush(heap, (-self._generation[parent], parent))
+        return False
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Mapping, Optional, Set
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+)
 
 from ds_vis.core.exceptions import ModelError
 from ds_vis.core.models.base import BaseModel, IdAllocator
+from ds_vis.core.models.git_ancestry import AncestryIndex
 from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
 
 
@@ -18,13 +29,21 @@ class GitCommit:
 
 class GitGraphModel(BaseModel):
     """
-    简化 Git DAG 教学模型，支持 init/commit/checkout。
+    简化 Git DAG 教学模型，支持 init/commit/checkout/branch/merge。
 
-    - commit 节点：circle，label=commit_id 短名或 message。
+    - commit 节点：circle，label=commit_id 短名或 message；data.branch 供布局分 lane。
     - branch/HEAD label：rect 形状，使用 SET_POS/SET_LABEL 移动。
-    - 不处理 merge/branch 删除，commit id 为递增编号。
+    - merge：快进或生成双亲 merge commit；merge-base / is_ancestor 由
+      AncestryIndex（世代号 + 首父链倍增）支撑，大历史上为亚线性查询。
+    - 不处理 branch 删除，commit id 为递增编号。
+    - commit 表/顺序/祖先索引只追加，重置时换新容器（撤销按长度截断）。
+    - export_state 增量导出：已导出的 commit dict 缓存为同样只追加的前缀。
     """
 
+    _append_only_fields: ClassVar[FrozenSet[str]] = frozenset(
+        {"commits", "_commit_order", "ancestry", "_lane_taken", "_exported_commits"}
+    )
+
     def __init__(
         self, structure_id: str, id_allocator: IdAllocator | None = None
     ) -> None:
@@ -34,6 +53,13 @@ class GitGraphModel(BaseModel):
         self.head: Optional[str] = None  # branch name or detached commit id
         self._commit_order: List[str] = []
         self._branch_set: Set[str] = set()
+        self.ancestry = AncestryIndex()
+        # import_commits lane assignment: commits whose lane a child continued
+        # (dict as an insertion-ordered set, so undo can truncate it)
+        self._lane_taken: Dict[str, None] = {}
+        self._lane_count = 0
+        # export_state() entries for the first len(...) commits of _commit_order
+        self._exported_commits: List[Dict[str, object]] = []
 
     @property
     def kind(self) -> str:
@@ -55,6 +81,29 @@ class GitGraphModel(BaseModel):
             if not isinstance(target, str):
                 raise ModelError("checkout requires target branch or commit id")
             return self.checkout(target)
+        if op == "branch":
+            name = payload.get("name")
+            if not isinstance(name, str) or not name:
+                raise ModelError("branch requires name")
+            start = payload.get("start")
+            return self.branch(name, start if isinstance(start, str) else None)
+        if op == "merge":
+            source = payload.get("source")
+            if not isinstance(source, str):
+                raise ModelError("merge requires source branch or commit id")
+            return self.merge(source)
+        if op == "import_commits":
+            commits = payload.get("commits")
+            if not isinstance(commits, (list, tuple)):
+                raise ModelError("import_commits requires a list of commits")
+            branches = payload.get("branches")
+            head = payload.get("head")
+            return self.import_commits(
+                commits,
+                reset=bool(payload.get("reset", False)),
+                branches=branches if isinstance(branches, Mapping) else None,
+                head=head if isinstance(head, str) else None,
+            )
         if op == "delete_all":
             return self.delete_all()
         raise ModelError(f"Unsupported git operation: {op}")
@@ -72,11 +121,9 @@ class GitGraphModel(BaseModel):
 
     def git_init(self) -> Timeline:
         timeline = Timeline()
-        self.commits.clear()
-        self.branches.clear()
+        self._reset_history()
         self.head = "main"
         self._branch_set = {"main"}
-        self._commit_order = []
 
         ops = [
             self._msg("git init"),
@@ -92,24 +139,25 @@ class GitGraphModel(BaseModel):
             raise ModelError("HEAD is not set; run git init first")
         current_commit = self._current_commit_id()
         commit_id = self._next_commit_id()
-        commit = GitCommit(commit_id=commit_id, message=message, parents=[])
+        branch = self._current_branch()
+        commit = GitCommit(
+            commit_id=commit_id, message=message, parents=[], branch=branch
+        )
         if current_commit:
             commit.parents.append(current_commit)
-        self.commits[commit_id] = commit
-        self._commit_order.append(commit_id)
-        self.branches[self._current_branch()] = commit_id
+        self._add_commit(commit)
+        self.branches[branch] = commit_id
 
         ops: List[AnimationOp] = [
             self._msg(f"commit: {message}"),
         ]
         if current_commit:
             ops.append(self._set_state(current_commit, "highlight"))
-        ops.append(self._create_node_op(commit_id, message))
+        ops.append(self._create_node_op(commit_id, message, branch))
         if current_commit:
             ops.append(self._create_edge_op(current_commit, commit_id))
 
         # Move branch and HEAD labels to new commit
-        branch = self._current_branch()
         branch_label_id = f"branch_{branch}"
         ops.append(self._move_label(branch_label_id, commit_id, branch))
         ops.append(self._move_label("HEAD", commit_id, "HEAD"))
@@ -141,29 +189,218 @@ class GitGraphModel(BaseModel):
         timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
         return timeline
 
+    def branch(self, name: str, start: Optional[str] = None) -> Timeline:
+        """Create branch `name` at `start` (branch or commit) or at HEAD."""
+        if name in self.branches or name in self.commits or name == "HEAD":
+            raise ModelError(f"Branch already exists: {name}")
+        target = self._resolve_commit(start) if start else self._current_commit_id()
+        if target is None:
+            raise ModelError("branch requires at least one commit")
+        self.branches[name] = target
+        self._branch_set.add(name)
+        label_id = f"branch_{name}"
+        timeline = Timeline()
+        timeline.add_step(
+            AnimationStep(
+                ops=[
+                    self._msg(f"branch {name} at {target}"),
+                    self._create_label_op(label_id, name),
+                    self._move_label(label_id, target, name),
+                    self._set_state(target, "highlight"),
+                ],
+                label="Branch",
+            )
+        )
+        timeline.add_step(
+            AnimationStep(
+                ops=[self._clear_msg()] + self._restore_states(), label="Restore"
+            )
+        )
+        return timeline
+
+    def merge(self, source: str) -> Timeline:
+        """
+        Merge `source` (branch or commit) into the current HEAD.
+
+        Up-to-date and fast-forward cases only move labels; otherwise a merge
+        commit with parents [HEAD, source] is created and the merge base is
+        highlighted.
+        """
+        ours = self._current_commit_id()
+        if ours is None:
+            raise ModelError("merge requires at least one commit on HEAD")
+        theirs = self._resolve_commit(source)
+        timeline = Timeline()
+        if self.ancestry.is_ancestor(theirs, ours):
+            timeline.add_step(
+                AnimationStep(
+                    ops=[self._msg(f"merge {source}: already up to date")],
+                    label="Up to date",
+                )
+            )
+            timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
+            return timeline
+
+        branch = self._current_branch()
+        attached = self.head in self.branches
+        if self.ancestry.is_ancestor(ours, theirs):
+            ops = [self._msg(f"merge {source}: fast-forward to {theirs}")]
+            if attached:
+                self.branches[branch] = theirs
+                ops.append(self._move_label(f"branch_{branch}", theirs, branch))
+            else:
+                self.head = theirs
+            ops.append(self._move_label("HEAD", theirs, "HEAD"))
+            ops.append(self._set_state(theirs, "highlight"))
+            timeline.add_step(AnimationStep(ops=ops, label="Fast-forward"))
+            timeline.add_step(
+                AnimationStep(
+                    ops=[self._clear_msg()] + self._restore_states(), label="Restore"
+                )
+            )
+            return timeline
+
+        base = self.ancestry.merge_base(ours, theirs)
+        base_ops = [self._msg(f"merge-base of {ours} and {theirs}: {base}")]
+        base_ops.append(self._set_state(ours, "highlight"))
+        base_ops.append(self._set_state(theirs, "highlight"))
+        if base is not None:
+            base_ops.append(self._set_state(base, "secondary"))
+        timeline.add_step(AnimationStep(ops=base_ops, label="Merge base"))
+
+        message = f"Merge {source} into {branch}"
+        commit_id = self._next_commit_id()
+        self._add_commit(
+            GitCommit(
+                commit_id=commit_id,
+                message=message,
+                parents=[ours, theirs],
+                branch=branch,
+            )
+        )
+        ops = [
+            self._msg(message),
+            self._create_node_op(commit_id, message, branch),
+            self._create_edge_op(ours, commit_id),
+            self._create_edge_op(theirs, commit_id),
+        ]
+        if attached:
+            self.branches[branch] = commit_id
+            ops.append(self._move_label(f"branch_{branch}", commit_id, branch))
+        else:
+            self.head = commit_id
+        ops.append(self._move_label("HEAD", commit_id, "HEAD"))
+        timeline.add_step(AnimationStep(ops=ops, label="Merge commit"))
+        timeline.add_step(
+            AnimationStep(
+                ops=[self._clear_msg()] + self._restore_states(), label="Restore"
+            )
+        )
+        return timeline
+
+    def import_commits(
+        self,
+        commits: Sequence[Mapping[str, Any]],
+        reset: bool = False,
+        branches: Optional[Mapping[str, Any]] = None,
+        head: Optional[str] = None,
+    ) -> Timeline:
+        """
+        Append a batch of real commits (`{"id", "message", "parents"}`, parents
+        first) as one structural step.
+
+        Used by the streaming repository importer: `reset` clears the model
+        with the first batch, `branches`/`head` place the labels with the
+        last one. Parents outside the imported window are dropped, so the
+        oldest windowed commits become roots. Commits get a lane tag in
+        `branch`: a commit continues its first parent's lane unless another
+        child already did.
+        """
+        ops: List[AnimationOp] = []
+        if reset:
+            ops.extend(self._clear_all_ops())
+            self._lane_taken = {}
+            self._lane_count = 0
+        ops.append(self._msg(f"import {len(commits)} commits"))
+        for item in commits:
+            cid = item.get("id")
+            if not isinstance(cid, str) or not cid:
+                raise ModelError("imported commit requires an id")
+            if cid in self.commits:
+                raise ModelError(f"Commit already exists: {cid}")
+            parents = [p for p in item.get("parents", ()) if p in self.commits]
+            message = str(item.get("message", cid))
+            lane = self._import_lane(parents)
+            self._add_commit(
+                GitCommit(commit_id=cid, message=message, parents=parents, branch=lane)
+            )
+            ops.append(self._create_node_op(cid, message, lane))
+            ops.extend(self._create_edge_op(p, cid) for p in parents)
+
+        for name, target in (branches or {}).items():
+            if not isinstance(target, str) or target not in self.commits:
+                continue
+            label_id = f"branch_{name}"
+            if name not in self._branch_set:
+                self._branch_set.add(name)
+                ops.append(self._create_label_op(label_id, name))
+            self.branches[name] = target
+            ops.append(self._move_label(label_id, target, name))
+        if head is not None:
+            if self.head is None:
+                ops.append(self._create_label_op("HEAD", "HEAD"))
+            self.head = head
+            target_cid = self._current_commit_id()
+            if target_cid is not None:
+                ops.append(self._move_label("HEAD", target_cid, "HEAD"))
+
+        timeline = Timeline()
+        timeline.add_step(AnimationStep(ops=ops, label="Import"))
+        timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
+        return timeline
+
     def delete_all(self) -> Timeline:
         """Delete all commits and labels."""
         timeline = Timeline()
         ops: List[AnimationOp] = [self._msg("Deleting all git structures")]
+        ops.extend(self._clear_all_ops())
+        timeline.add_step(AnimationStep(ops=ops, label="Delete all"))
+        timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
+        return timeline
 
-        # Delete labels (HEAD and branches)
-        ops.append(self._delete_node_op("HEAD"))
-        for bname in self.branches:
+    def _clear_all_ops(self) -> List[AnimationOp]:
+        """Reset the state; return deletes for labels (HEAD, branches) and commits."""
+        ops: List[AnimationOp] = []
+        if self.head is not None:
+            ops.append(self._delete_node_op("HEAD"))
+        for bname in self._branch_set:
             ops.append(self._delete_node_op(f"branch_{bname}"))
-
-        # Delete commits
         for cid in self.commits:
             ops.append(self._delete_node_op(cid))
 
-        self.commits.clear()
-        self.branches.clear()
+        self._reset_history()
         self.head = None
-        self._branch_set.clear()
-        self._commit_order.clear()
-
-        timeline.add_step(AnimationStep(ops=ops, label="Delete all"))
-        timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
-        return timeline
+        return ops
+
+    def _reset_history(self) -> None:
+        # Rebind rather than clear: an open undo record still holds the old
+        # append-only containers.
+        self.commits = {}
+        self.branches = {}
+        self._branch_set = set()
+        self._commit_order = []
+        self.ancestry = AncestryIndex()
+        self._exported_commits = []
+
+    def _import_lane(self, parents: List[str]) -> str:
+        if parents and parents[0] not in self._lane_taken:
+            self._lane_taken[parents[0]] = None
+            lane = self.commits[parents[0]].branch
+            if lane:
+                return lane
+        lane = f"lane{self._lane_count}"
+        self._lane_count += 1
+        return lane
 
     def _current_commit_id(self) -> Optional[str]:
         if self.head is None:
@@ -185,20 +422,33 @@ class GitGraphModel(BaseModel):
     def _next_commit_id(self) -> str:
         return f"c{len(self.commits)}"
 
+    def _resolve_commit(self, ref: str) -> str:
+        if ref in self.branches:
+            return self.branches[ref]
+        if ref in self.commits:
+            return ref
+        raise ModelError(f"Unknown branch or commit: {ref}")
+
+    def _add_commit(self, commit: GitCommit) -> None:
+        self.ancestry.add(commit.commit_id, commit.parents)
+        self.commits[commit.commit_id] = commit
+        self._commit_order.append(commit.commit_id)
+
     # ------------------------------------------------------------------ #
     # Op builders
     # ------------------------------------------------------------------ #
-    def _create_node_op(self, node_id: str, message: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.CREATE_NODE,
-            target=node_id,
-            data={
-                "structure_id": self.structure_id,
-                "label": message,
-                "shape": "circle",
-                "kind": "commit",
-            },
-        )
+    def _create_node_op(
+        self, node_id: str, message: str, branch: Optional[str] = None
+    ) -> AnimationOp:
+        data: Dict[str, object] = {
+            "structure_id": self.structure_id,
+            "label": message,
+            "shape": "circle",
+            "kind": "commit",
+        }
+        if branch:
+            data["branch"] = branch
+        return AnimationOp(op=OpCode.CREATE_NODE, target=node_id, data=data)
 
     def _delete_node_op(self, node_id: str) -> AnimationOp:
         return AnimationOp(
@@ -242,14 +492,11 @@ class GitGraphModel(BaseModel):
         )
 
     def _set_state(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"structure_id": self.structure_id, "state": state},
-        )
+        return self.state_op(target, state)
 
     def _restore_states(self) -> List[AnimationOp]:
-        return [self._set_state(cid, "normal") for cid in self.commits]
+        # Only commits touched since the last restore (O(1) per commit, not O(n)).
+        return self.restore_touched_ops(alive=self.commits)
 
     def _msg(self, text: str) -> AnimationOp:
         return AnimationOp(op=OpCode.SET_MESSAGE, target=None, data={"text": text})
@@ -262,10 +509,7 @@ class GitGraphModel(BaseModel):
         Restore git state from a snapshot.
         """
         timeline = Timeline()
-        self.commits.clear()
-        self.branches.clear()
-        self._commit_order.clear()
-        self._branch_set.clear()
+        self._reset_history()
 
         commits_data = state.get("commits", [])
         branches_data = state.get("branches", {})
@@ -280,11 +524,10 @@ class GitGraphModel(BaseModel):
             parents = c_data["parents"]
             branch = c_data.get("branch")
             commit = GitCommit(
-                commit_id=cid, message=msg, parents=parents, branch=branch
+                commit_id=cid, message=msg, parents=list(parents), branch=branch
             )
-            self.commits[cid] = commit
-            self._commit_order.append(cid)
-            ops.append(self._create_node_op(cid, msg))
+            self._add_commit(commit)
+            ops.append(self._create_node_op(cid, msg, branch))
             for p in parents:
                 ops.append(self._create_edge_op(p, cid))
 
@@ -313,16 +556,20 @@ class GitGraphModel(BaseModel):
     # Persistence
     # ------------------------------------------------------------------ #
     def export_state(self) -> Mapping[str, object]:
-        return {
-            "commits": [
+        # commits are immutable once added: only export the new suffix
+        exported = self._exported_commits
+        for commit_id in self._commit_order[len(exported) :]:
+            commit = self.commits[commit_id]
+            exported.append(
                 {
                     "id": commit_id,
                     "message": commit.message,
                     "parents": list(commit.parents),
                     "branch": commit.branch,
                 }
-                for commit_id, commit in self.commits.items()
-            ],
+            )
+        return {
+            "commits": list(exported),
             "branches": dict(self.branches),
             "head": self.head,
         }
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import heapq
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Mapping, Optional
+from typing import Deque, Dict, List, Mapping, Optional
 
 from ds_vis.core.exceptions import ModelError
 from ds_vis.core.models.base import BaseModel, IdAllocator
@@ -20,12 +21,59 @@ class _QueueNode:
     right: Optional[str] = field(default=None, compare=False)
 
 
+class _HuffmanQueue:
+    """
+    Huffman 候选队列：有序叶子 + FIFO 内部节点（经典双队列法）。
+
+    权值非负时新父节点的权值单调不减，FIFO 即按 (weight, order) 有序，
+    pop/push 均为 O(1)（push 另需一次 O(log n) 二分），无需每轮 sorted()。
+
+    queue_index 采用稀疏排序键而非连续名次：叶子键为 rank * stride，
+    父节点落在其前驱叶子与后继叶子之间的空隙里。已入队节点的键永不改变，
+    因此每轮只需为新父节点发出一次 queue_index 更新；TreeLayout 只按键排序。
+    """
+
+    def __init__(self, sorted_leaves: List[_QueueNode]) -> None:
+        self._leaves: Deque[_QueueNode] = deque(sorted_leaves)
+        self._internal: Deque[_QueueNode] = deque()
+        self._leaf_bounds = [(node.weight, node.order) for node in sorted_leaves]
+        self._stride = max(1, len(sorted_leaves))
+        self._keys = {
+            node.node_id: rank * self._stride
+            for rank, node in enumerate(sorted_leaves)
+        }
+        self._gap_fill: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._leaves) + len(self._internal)
+
+    def key(self, node: _QueueNode) -> int:
+        return self._keys[node.node_id]
+
+    def pop(self) -> _QueueNode:
+        internal, leaves = self._internal, self._leaves
+        if internal and (not leaves or internal[0] < leaves[0]):
+            return self._internal.popleft()
+        return self._leaves.popleft()
+
+    def push(self, node: _QueueNode) -> int:
+        """Append a merged node and return its (stable) queue key."""
+        gap = bisect_right(self._leaf_bounds, (node.weight, node.order)) - 1
+        filled = self._gap_fill.get(gap, 0) + 1
+        self._gap_fill[gap] = filled
+        key = gap * self._stride + filled
+        self._keys[node.node_id] = key
+        self._internal.append(node)
+        return key
+
+
 class HuffmanModel(BaseModel):
     """
     Huffman 构建模型：输入权值列表，逐步合并生成 Huffman 树。
 
     - 仅支持 build/delete_all。
-    - 使用 heapq 维护候选队列，生成 L2 微步骤（高亮两最小、生成父节点、重新入队）。
+    - 使用双队列（有序叶子 + FIFO 父节点）维护候选队列，生成 L2 微步骤（高亮两最小、
+      生成父节点、重新入队）；重新入队只更新新父节点的 queue_index。
     - 输出结构 Ops（CREATE_NODE/CREATE_EDGE 等），不包含坐标，位置由 Layout 注入。
     """
 
@@ -36,6 +84,9 @@ class HuffmanModel(BaseModel):
         self._nodes: dict[str, _QueueNode] = {}
         self._root: Optional[str] = None
         self._last_values: list[float] = []
+        # leaf node_id -> symbol (only for frequency-table builds)
+        self._leaf_symbols: dict[str, object] = {}
+        self._symbols: list[object] = []
 
     @property
     def kind(self) -> str:
@@ -52,6 +103,11 @@ class HuffmanModel(BaseModel):
                 raise ModelError("create requires values")
             if not isinstance(values, (list, tuple)):
                 raise ModelError("values must be list/tuple")
+            symbols = payload.get("symbols")
+            if symbols is not None:
+                if not isinstance(symbols, (list, tuple)):
+                    raise ModelError("symbols must be list/tuple")
+                return self.create(list(values), symbols=list(symbols))
             return self.create(list(values))
         if op == "delete_all":
             return self.delete_all()
@@ -60,11 +116,20 @@ class HuffmanModel(BaseModel):
     # ------------------------------------------------------------------ #
     # Public ops
     # ------------------------------------------------------------------ #
-    def create(self, values: List[object]) -> Timeline:
+    def create(
+        self, values: List[object], symbols: Optional[List[object]] = None
+    ) -> Timeline:
+        """
+        按权值构建 Huffman 树；symbols（可选）与 values 一一对应，用于 code_table。
+        """
+        if symbols is not None and len(symbols) != len(values):
+            raise ModelError("symbols must match values in length")
         timeline = Timeline()
         self._nodes.clear()
         self._root = None
         self._last_values = []
+        self._leaf_symbols = {}
+        self._symbols = list(symbols) if symbols is not None else []
         if not values:
             timeline.add_step(
                 AnimationStep(ops=[self._msg("Empty weights for Huffman build")])
@@ -72,32 +137,38 @@ class HuffmanModel(BaseModel):
             timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
             return timeline
 
-        heap: list[_QueueNode] = []
+        leaves: list[_QueueNode] = []
         normalized_values: list[float] = []
         for i, val in enumerate(values):
             if not isinstance(val, (int, float)):
                 raise ModelError("Huffman weights must be numbers")
             weight = float(val)
+            if weight < 0:
+                raise ModelError("Huffman weights must be non-negative")
             normalized_values.append(weight)
             node_id = self.allocate_node_id("node")
             node = _QueueNode(weight=weight, order=i, node_id=node_id)
-            heapq.heappush(heap, node)
+            self._leaf_symbols[node_id] = self._symbols[i] if self._symbols else i
+            leaves.append(node)
             self._nodes[node_id] = node
         self._last_values = normalized_values
 
         # 初始创建节点（按权值排序后分配 queue_index）
-        initial_queue = sorted(heap)
+        leaves.sort()
+        queue = _HuffmanQueue(leaves)
         create_ops: list[AnimationOp] = [self._msg("Init Huffman queue")]
-        for idx, node in enumerate(initial_queue):
-            create_ops.append(self._create_node_op(node.node_id, node.weight, idx))
+        for node in leaves:
+            create_ops.append(
+                self._create_node_op(node.node_id, node.weight, queue.key(node))
+            )
         timeline.add_step(AnimationStep(ops=create_ops, label="Init"))
 
-        merge_order = len(initial_queue)
+        merge_order = len(leaves)
         step_idx = 0
-        while len(heap) > 1:
+        while len(queue) > 1:
             step_idx += 1
-            n1 = heapq.heappop(heap)
-            n2 = heapq.heappop(heap)
+            n1 = queue.pop()
+            n2 = queue.pop()
             highlight_ops = [
                 self._msg(f"Merge step {step_idx}: pick {n1.weight} & {n2.weight}"),
                 self._set_state(n1.node_id, "highlight"),
@@ -117,7 +188,6 @@ class HuffmanModel(BaseModel):
             merge_order += 1
             self._nodes[parent_id] = parent_node
             self._root = parent_id
-            heapq.heappush(heap, parent_node)
 
             create_parent_ops = [
                 self._create_node_op(parent_id, parent_weight, None),
@@ -128,19 +198,15 @@ class HuffmanModel(BaseModel):
                 AnimationStep(ops=create_parent_ops, label="Create parent")
             )
 
-            # 更新队列顺序（按权值排序后赋予 queue_index）
-            sorted_queue = sorted(heap)
-            reorder_ops = []
-            for idx, node in enumerate(sorted_queue):
-                reorder_ops.append(
-                    self._set_label(node.node_id, node.weight, queue_index=idx)
-                )
-                reorder_ops.append(self._set_state(node.node_id, "normal"))
+            # 入队：只有新父节点获得排序键，其余队列节点的键不变
+            queue_key = queue.push(parent_node)
+            reorder_ops = [self._set_label(parent_id, parent_weight, queue_key)]
+            reorder_ops.extend(self.restore_touched_ops())
             reorder_ops.append(self._clear_msg())
             timeline.add_step(AnimationStep(ops=reorder_ops, label="Requeue"))
 
-        if heap:
-            root_node = heap[0]
+        if len(queue):
+            root_node = queue.pop()
             self._root = root_node.node_id
             timeline.add_step(
                 AnimationStep(
@@ -154,6 +220,52 @@ class HuffmanModel(BaseModel):
         timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
         return timeline
 
+    def create_from_frequencies(self, frequencies: Mapping[object, int]) -> Timeline:
+        """
+        Build from a symbol -> count table (e.g. from streaming a file with
+        `persistence.frequency.count_file_frequencies`).
+        """
+        symbols = list(frequencies.keys())
+        return self.create([frequencies[sym] for sym in symbols], symbols=symbols)
+
+    def code_table(self) -> Dict[object, str]:
+        """
+        Symbol -> prefix code ("0" for left, "1" for right).
+
+        Leaves are keyed by their symbol, or by input position when the tree
+        was built from a bare weight list. A single-leaf tree gets code "0".
+        """
+        if self._root is None:
+            return {}
+        table: Dict[object, str] = {}
+        pending: list[tuple[str, str]] = [(self._root, "")]
+        while pending:
+            node_id, code = pending.pop()
+            node = self._nodes[node_id]
+            if node.left is None and node.right is None:
+                table[self._leaf_symbols[node_id]] = code or "0"
+                continue
+            if node.right is not None:
+                pending.append((node.right, code + "1"))
+            if node.left is not None:
+                pending.append((node.left, code + "0"))
+        return table
+
+    def encoded_bits(self) -> int:
+        """Size of the encoded input in bits: sum(weight * code length)."""
+        table = self.code_table()
+        total = 0.0
+        for node_id, symbol in self._leaf_symbols.items():
+            total += self._nodes[node_id].weight * len(table[symbol])
+        return int(round(total))
+
+    def average_code_length(self) -> float:
+        """Weighted mean code length in bits per symbol (0.0 when empty)."""
+        weight_sum = sum(self._last_values)
+        if weight_sum <= 0:
+            return 0.0
+        return self.encoded_bits() / weight_sum
+
     def delete_all(self) -> Timeline:
         timeline = Timeline()
         if not self._nodes:
@@ -170,12 +282,16 @@ class HuffmanModel(BaseModel):
         self._nodes.clear()
         self._root = None
         self._last_values = []
+        self._leaf_symbols = {}
+        self._symbols = []
         timeline.add_step(AnimationStep(ops=ops, label="Delete all"))
         timeline.add_step(AnimationStep(ops=[self._clear_msg()], label="Restore"))
         return timeline
 
     def export_state(self) -> Mapping[str, object]:
         """Export last build weights for persistence replay."""
+        if self._symbols:
+            return {"values": list(self._last_values), "symbols": list(self._symbols)}
         return {"values": list(self._last_values)}
 
     # ------------------------------------------------------------------ #
@@ -208,11 +324,7 @@ class HuffmanModel(BaseModel):
         )
 
     def _set_state(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"structure_id": self.structure_id, "state": state},
-        )
+        return self.state_op(target, state)
 
     def _set_label(
         self, target: str, weight: float, queue_index: Optional[int]
@@ -66,8 +66,19 @@ class ListModel(BaseModel):
         """
         # NOTE: sentinel exists only for visualization of empty list (display-only).
         self.values = list(values or [])
+        ops: List[AnimationOp] = []
+        if self._sentinel_id:
+            # re-create of an empty list: its sentinel is not a node, so
+            # delete_all was skipped
+            ops.append(
+                AnimationOp(
+                    op=OpCode.DELETE_NODE,
+                    target=self._sentinel_id,
+                    data={"structure_id": self.structure_id},
+                )
+            )
         self._sentinel_id = None
-        ops = self._emit_create_ops()
+        ops.extend(self._emit_create_ops())
 
         timeline = Timeline()
         timeline.add_step(AnimationStep(ops=ops))
@@ -325,11 +336,7 @@ class ListModel(BaseModel):
                 target=target_id,
                 data={"structure_id": self.structure_id, "text": str(new_value)},
             ),
-            AnimationOp(
-                op=OpCode.SET_STATE,
-                target=target_id,
-                data={"structure_id": self.structure_id, "state": "highlight"},
-            ),
+            self._build_set_state_op(target_id, "highlight"),
         ]
         self._add_ops_step(timeline, ops, "Update value")
         self._add_message_step(
@@ -359,6 +366,13 @@ class ListModel(BaseModel):
         """Export logical values for persistence replay."""
         return {"values": list(self.values)}
 
+    def node_index(self, node_id: str) -> Optional[int]:
+        """Position in the chain (SimpleLayout order)."""
+        try:
+            return self._node_ids.index(node_id)
+        except ValueError:
+            return None
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
@@ -411,11 +425,7 @@ class ListModel(BaseModel):
         )
 
     def _build_set_state_op(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"structure_id": self.structure_id, "state": state},
-        )
+        return self.state_op(target, state)
 
     def _emit_edge_state_ops(
         self, edge_ids: List[str], state: str
@@ -475,11 +485,7 @@ class ListModel(BaseModel):
                 label=str(value),
                 index=index,
             ),
-            AnimationOp(
-                op=OpCode.SET_STATE,
-                target=node_id,
-                data={"structure_id": self.structure_id, "state": "highlight"},
-            ),
+            self._build_set_state_op(node_id, "highlight"),
         ]
 
     def _emit_rewire_edges(
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, cast
+
+from ds_vis.core.exceptions import ModelError
+from ds_vis.core.models.bst import BstModel, _BstNode
+from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
+
+RED = "red"
+BLACK = "black"
+
+
+@dataclass
+class _RbNode(_BstNode):
+    color: str = RED
+
+
+@dataclass
+class RedBlackModel(BstModel):
+    """
+    红黑树：插入/删除复用 BstModel 的查找与摘除微步骤，随后输出修复微步骤
+    （变色 / 旋转），树高保持 ≤ 2·log2(n+1)。
+
+    - 颜色随 label 显示（`key R` / `key B`），CREATE_NODE/SET_LABEL 同时带
+      data.color，便于 Renderer 后续按颜色着色。
+    - 每个修复 case 一个步骤；旋转只删旧边、建新边，TreeLayout 重新定位。
+    - 不接受重复键；批量建树（bulk）按中位数建树，最深一层（不满时）为红色。
+    """
+
+    # colors for the bulk load in progress (create(preorder=True, colors=...))
+    _pending_colors: Optional[str] = field(default=None, init=False, repr=False)
+    _unique_keys: ClassVar[bool] = True
+
+    @property
+    def kind(self) -> str:
+        return "rbtree"
+
+    def apply_operation(self, op: str, payload: Mapping[str, Any]) -> Timeline:
+        if op == "create":
+            colors = payload.get("colors")
+            return self.create(
+                payload.get("values"),
+                bulk=bool(payload.get("bulk")),
+                balanced=bool(payload.get("balanced")),
+                preorder=bool(payload.get("preorder")),
+                colors=colors if isinstance(colors, str) else None,
+            )
+        return super().apply_operation(op, payload)
+
+    def create(
+        self,
+        values: Optional[Mapping[str, Any]] = None,
+        bulk: bool = False,
+        balanced: bool = False,
+        preorder: bool = False,
+        colors: Optional[str] = None,
+    ) -> Timeline:
+        """
+        colors：与 preorder 先序序列对齐的 "R"/"B" 串（export_state 输出）。
+        """
+        self._pending_colors = colors if preorder else None
+        try:
+            return super().create(
+                values, bulk=bulk, balanced=balanced or bulk, preorder=preorder
+            )
+        finally:
+            self._pending_colors = None
+
+    def insert(self, value: Any) -> Timeline:
+        if value is not None and self._lookup(value) is not None:
+            return self._duplicate_timeline(value)
+        timeline = super().insert(value)
+        if self._last_inserted is not None:
+            timeline.steps.extend(self._insert_fixup(self._last_inserted))
+        return timeline
+
+    def delete_value(self, value: Any) -> Timeline:
+        if value is None:
+            raise ModelError("delete_value requires value")
+        target_id = self._lookup(value)
+        if target_id is None:
+            return super().delete_value(value)  # animated miss
+
+        node = self._nodes[target_id]
+        # Node physically removed: the target itself or its in-order successor.
+        removed_id = target_id
+        if node.left and node.right:
+            removed_id = node.right
+            while self._nodes[removed_id].left:
+                removed_id = self._nodes[removed_id].left or removed_id
+        removed = self._nodes[removed_id]
+        removed_color = self._color(removed_id)
+        child_id = removed.left or removed.right
+
+        timeline = super().delete_value(value)
+        if removed_color == BLACK:
+            timeline.steps.extend(
+                self._delete_fixup(child_id, self._last_removed_parent)
+            )
+        return timeline
+
+    def export_state(self) -> Mapping[str, object]:
+        """Pre-order keys plus their colors; restores shape and colors."""
+        ids = list(self._preorder_ids(self._root_id))
+        return {
+            "values": [self._nodes[node_id].key for node_id in ids],
+            "colors": "".join(
+                "R" if self._color(node_id) == RED else "B" for node_id in ids
+            ),
+            "preorder": True,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Node colors
+    # ------------------------------------------------------------------ #
+    def _make_node(self, key: Any, parent: Optional[str] = None) -> _BstNode:
+        return _RbNode(key=key, parent=parent)
+
+    def _color(self, node_id: Optional[str]) -> str:
+        if node_id is None:
+            return BLACK  # nil leaves are black
+        return cast(_RbNode, self._nodes[node_id]).color
+
+    def _label_text(self, node_id: str, key: Any) -> str:
+        return f"{key} {'R' if self._color(node_id) == RED else 'B'}"
+
+    def _op_create_node(self, node_id: str, value: Any) -> AnimationOp:
+        op = super()._op_create_node(node_id, value)
+        return AnimationOp(
+            op=op.op,
+            target=op.target,
+            data={
+                **op.data,
+                "label": self._label_text(node_id, value),
+                "color": self._color(node_id),
+            },
+        )
+
+    def _set_label(self, target: str, value: Any) -> AnimationOp:
+        op = super()._set_label(target, value)
+        text = self._label_text(target, value)
+        return AnimationOp(
+            op=op.op,
+            target=op.target,
+            data={**op.data, "label": text, "text": text, "color": self._color(target)},
+        )
+
+    def _recolor(self, node_id: str, color: str) -> AnimationOp:
+        node = cast(_RbNode, self._nodes[node_id])
+        node.color = color
+        return self._set_label(node_id, node.key)
+
+    def _bulk_load(
+        self, values: list[Any], balanced: bool, preorder: bool = False
+    ) -> AnimationStep:
+        step = super()._bulk_load(values, balanced, preorder=preorder)
+        if self._pending_colors is not None:
+            ids = list(self._preorder_ids(self._root_id))
+            if len(self._pending_colors) != len(ids):
+                raise ModelError("colors must match values in length")
+            for node_id, flag in zip(ids, self._pending_colors):
+                cast(_RbNode, self._nodes[node_id]).color = (
+                    RED if flag.upper() == "R" else BLACK
+                )
+        else:
+            self._color_by_depth()
+        step.ops = [
+            self._op_create_node(op.target, self._nodes[op.target].key)
+            if op.op is OpCode.CREATE_NODE and op.target
+            else op
+            for op in step.ops
+        ]
+        return step
+
+    def _color_by_depth(self) -> None:
+        """Median-split trees: black everywhere, red on an incomplete last level."""
+        depth: Dict[str, int] = {}
+        for node_id in self._preorder_ids(self._root_id):
+            parent = self._nodes[node_id].parent
+            depth[node_id] = depth[parent] + 1 if parent else 0
+        max_depth = max(depth.values(), default=0)
+        perfect = len(depth) == (1 << (max_depth + 1)) - 1
+        for node_id, level in depth.items():
+            red = level == max_depth and not perfect and level > 0
+            cast(_RbNode, self._nodes[node_id]).color = RED if red else BLACK
+
+    # ------------------------------------------------------------------ #
+    # Fix-up (CLRS), one AnimationStep per case
+    # ------------------------------------------------------------------ #
+    def _insert_fixup(self, node_id: str) -> List[AnimationStep]:
+        steps: List[AnimationStep] = []
+        current = node_id
+        while self._color(self._nodes[current].parent) == RED:
+            parent_id = self._nodes[current].parent or ""
+            grand_id = self._nodes[parent_id].parent or ""
+            parent_is_left = self._nodes[grand_id].left == parent_id
+            grand = self._nodes[grand_id]
+            uncle_id = grand.right if parent_is_left else grand.left
+            if uncle_id and self._color(uncle_id) == RED:
+                steps.append(
+                    self._case_step(
+                        "Recolor",
+                        "Parent and uncle red: recolor, move up",
+                        [
+                            self._recolor(parent_id, BLACK),
+                            self._recolor(uncle_id, BLACK),
+                            self._recolor(grand_id, RED),
+                            self._set_state(grand_id, "highlight"),
+                        ],
+                    )
+                )
+                current = grand_id
+                continue
+            inner = (self._nodes[parent_id].right == current) == parent_is_left
+            if inner:
+                direction = "left" if parent_is_left else "right"
+                steps.append(
+                    self._case_step(
+                        f"Rotate {direction}",
+                        "Uncle black, inner child: rotate parent",
+                        self._rotate(parent_id, direction),
+                    )
+                )
+                current, parent_id = parent_id, current
+            direction = "right" if parent_is_left else "left"
+            ops = [self._recolor(parent_id, BLACK), self._recolor(grand_id, RED)]
+            ops.extend(self._rotate(grand_id, direction))
+            ops.append(self._set_state(parent_id, "active"))
+            steps.append(
+                self._case_step(
+                    f"Rotate {direction}",
+                    "Uncle black, outer child: recolor and rotate grandparent",
+                    ops,
+                )
+            )
+            break
+        root_id = self._root_id
+        if root_id and self._color(root_id) == RED:
+            steps.append(
+                self._case_step(
+                    "Recolor root",
+                    "Root must be black",
+                    [self._recolor(root_id, BLACK)],
+                )
+            )
+        return self._with_restore(steps)
+
+    def _delete_fixup(
+        self, node_id: Optional[str], parent_id: Optional[str]
+    ) -> List[AnimationStep]:
+        """
+        Resolve the "double black" left at `node_id` (may be a nil leaf) under
+        `parent_id` after a black node was removed.
+        """
+        steps: List[AnimationStep] = []
+        current, parent = node_id, parent_id
+        while current != self._root_id and self._color(current) == BLACK and parent:
+            parent_node = self._nodes[parent]
+            is_left = parent_node.left == current
+            sibling = parent_node.right if is_left else parent_node.left
+            if sibling is None:  # pragma: no cover - violates black height
+                break
+            toward = "left" if is_left else "right"
+            away = "right" if is_left else "left"
+            if self._color(sibling) == RED:
+                ops = [self._recolor(sibling, BLACK), self._recolor(parent, RED)]
+                ops.extend(self._rotate(parent, toward))
+                steps.append(
+                    self._case_step(
+                        f"Rotate {toward}", "Sibling red: rotate parent", ops
+                    )
+                )
+                parent_node = self._nodes[parent]
+                sibling = (parent_node.right if is_left else parent_node.left) or ""
+            sib_node = self._nodes[sibling]
+            near = sib_node.left if is_left else sib_node.right
+            far = sib_node.right if is_left else sib_node.left
+            if self._color(near) == BLACK and self._color(far) == BLACK:
+                steps.append(
+                    self._case_step(
+                        "Recolor",
+                        "Sibling's children black: recolor sibling, move up",
+                        [
+                            self._recolor(sibling, RED),
+                            self._set_state(parent, "highlight"),
+                        ],
+                    )
+                )
+                current, parent = parent, self._nodes[parent].parent
+                continue
+            if self._color(far) == BLACK and near:
+                ops = [self._recolor(near, BLACK), self._recolor(sibling, RED)]
+                ops.extend(self._rotate(sibling, away))
+                steps.append(
+                    self._case_step(
+                        f"Rotate {away}", "Near nephew red: rotate sibling", ops
+                    )
+                )
+                sibling = near
+                sib_node = self._nodes[sibling]
+                far = sib_node.right if is_left else sib_node.left
+            ops = [self._recolor(sibling, self._color(parent))]
+            ops.append(self._recolor(parent, BLACK))
+            if far:
+                ops.append(self._recolor(far, BLACK))
+            ops.extend(self._rotate(parent, toward))
+            steps.append(
+                self._case_step(
+                    f"Rotate {toward}", "Far nephew red: recolor and rotate parent", ops
+                )
+            )
+            current = self._root_id
+            break
+        if current and self._color(current) == RED:
+            steps.append(
+                self._case_step(
+                    "Recolor", "Absorb extra black", [self._recolor(current, BLACK)]
+                )
+            )
+        return self._with_restore(steps)
+
+    def _case_step(
+        self, label: str, text: str, ops: List[AnimationOp]
+    ) -> AnimationStep:
+        return AnimationStep(ops=[self._msg(text)] + ops, label=label)
+
+    def _with_restore(self, steps: List[AnimationStep]) -> List[AnimationStep]:
+        if steps:
+            steps.append(
+                AnimationStep(
+                    ops=[self._clear_msg()]
+                    + self.restore_touched_ops(alive=self._nodes),
+                    label="Restore",
+                )
+            )
+        return steps
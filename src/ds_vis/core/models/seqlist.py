@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, List, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 from ds_vis.core.exceptions import ModelError
 from ds_vis.core.models.base import BaseModel
@@ -129,7 +129,8 @@ class SeqlistModel(BaseModel):
         self._node_ids.insert(index, new_id)
         timeline.add_step(
             AnimationStep(
-                ops=[self._op_create_node(new_id, value)], label="Create node"
+                ops=[self._op_create_node(new_id, value, index=index)],
+                label="Create node",
             )
         )
 
@@ -290,29 +291,33 @@ class SeqlistModel(BaseModel):
         """Export current values for persistence replay."""
         return {"values": list(self.values)}
 
+    def node_index(self, node_id: str) -> Optional[int]:
+        """Slot index (SimpleLayout order)."""
+        try:
+            return self._node_ids.index(node_id)
+        except ValueError:
+            return None
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
     def _create_node_id(self) -> str:
         return self.allocate_node_id("node")
 
-    def _op_create_node(self, node_id: str, value: Any) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.CREATE_NODE,
-            target=node_id,
-            data={
-                "structure_id": self.structure_id,
-                "label": str(value),
-                "shape": "rect",
-            },
-        )
+    def _op_create_node(
+        self, node_id: str, value: Any, index: Optional[int] = None
+    ) -> AnimationOp:
+        data: Dict[str, Any] = {
+            "structure_id": self.structure_id,
+            "label": str(value),
+            "shape": "rect",
+        }
+        if index is not None:
+            data["index"] = index
+        return AnimationOp(op=OpCode.CREATE_NODE, target=node_id, data=data)
 
     def _set_state(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"structure_id": self.structure_id, "state": state},
-        )
+        return self.state_op(target, state)
 
     def _set_label(self, target: str, value: Any) -> AnimationOp:
         return AnimationOp(
@@ -332,16 +337,20 @@ class SeqlistModel(BaseModel):
         return AnimationOp(op=OpCode.CLEAR_MESSAGE, target=None, data={})
 
     def _restore_all_states(self) -> list[AnimationOp]:
-        return [
-            self._set_state(nid, "normal")
-            for nid in list(self._node_ids)
-        ]
+        # Reset only what this model highlighted since the last restore and
+        # still exists (a deleted/popped node gets no SET_STATE).
+        alive = set(self._node_ids)
+        if self._container_id:
+            alive.add(self._container_id)
+        return self.restore_touched_ops(alive=alive)
+
+    @staticmethod
+    def _container_size(count: int) -> tuple[float, float]:
+        # approximate spacing; layout controls positions
+        return max(1, count) * 80.0 + 40.0, 40.0
 
     def _create_container_ops(self, count: int) -> list[AnimationOp]:
-        width = (
-            max(1, count) * 80.0 + 40.0
-        )  # approximate spacing; layout controls positions
-        height = 40.0
+        width, height = self._container_size(count)
         container_id = self.allocate_node_id("bucket")
         self._container_id = container_id
         return [
@@ -360,14 +369,16 @@ class SeqlistModel(BaseModel):
     def _resize_container_ops(self) -> list[AnimationOp]:
         if self._container_id is None:
             return self._create_container_ops(count=len(self._node_ids))
-        ops: list[AnimationOp] = []
-        # delete old
-        ops.append(
+        # resize in place: layout/renderer keep the existing container item
+        width, height = self._container_size(len(self._node_ids))
+        return [
             AnimationOp(
-                op=OpCode.DELETE_NODE,
+                op=OpCode.SET_SIZE,
                 target=self._container_id,
-                data={"structure_id": self.structure_id},
+                data={
+                    "structure_id": self.structure_id,
+                    "width": width,
+                    "height": height,
+                },
             )
-        )
-        ops.extend(self._create_container_ops(count=len(self._node_ids)))
-        return ops
+        ]
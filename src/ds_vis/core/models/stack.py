@@ -203,6 +203,13 @@ class StackModel(BaseModel):
         """Export current stack as a push-sequence (bottom -> top)."""
         return {"values": list(reversed(self.values))}
 
+    def node_index(self, node_id: str) -> Optional[int]:
+        """Depth from the top (SimpleLayout order)."""
+        try:
+            return self._node_ids.index(node_id)
+        except ValueError:
+            return None
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
@@ -231,11 +238,7 @@ class StackModel(BaseModel):
         )
 
     def _set_state(self, target: str, state: str) -> AnimationOp:
-        return AnimationOp(
-            op=OpCode.SET_STATE,
-            target=target,
-            data={"structure_id": self.structure_id, "state": state},
-        )
+        return self.state_op(target, state)
 
     def _msg(self, text: str) -> AnimationOp:
         return AnimationOp(op=OpCode.SET_MESSAGE, target=None, data={"text": text})
@@ -244,21 +247,23 @@ class StackModel(BaseModel):
         return AnimationOp(op=OpCode.CLEAR_MESSAGE, target=None, data={})
 
     def _restore_all_states(self) -> list[AnimationOp]:
-        ops: list[AnimationOp] = []
+        # Reset only what this model highlighted since the last restore and
+        # still exists (a deleted/popped node gets no SET_STATE).
+        alive = set(self._node_ids)
         if self._container_id:
-            ops.append(self._set_state(self._container_id, "normal"))
-        for nid in list(self._node_ids):
-            ops.append(self._set_state(nid, "normal"))
-        return ops
+            alive.add(self._container_id)
+        return self.restore_touched_ops(alive=alive)
 
     def _highlight_bucket(self) -> AnimationOp:
         if self._container_id:
             return self._set_state(self._container_id, "active")
         return self._msg("Push")  # fallback, should not happen
 
+    def _container_size(self) -> tuple[float, float]:
+        return 80.0, max(1, len(self.values)) * self._cell_spacing + 40.0
+
     def _create_container_ops(self) -> list[AnimationOp]:
-        width = 80.0
-        height = max(1, len(self.values)) * self._cell_spacing + 40.0
+        width, height = self._container_size()
         container_id = self.allocate_node_id("bucket")
         self._container_id = container_id
         return [
@@ -282,6 +287,15 @@ class StackModel(BaseModel):
     def _resize_container_ops(self) -> list[AnimationOp]:
         if self._container_id is None:
             return self._create_container_ops()
-        ops: list[AnimationOp] = [self._delete_node_op(self._container_id)]
-        ops.extend(self._create_container_ops())
-        return ops
+        width, height = self._container_size()
+        return [
+            AnimationOp(
+                op=OpCode.SET_SIZE,
+                target=self._container_id,
+                data={
+                    "structure_id": self.structure_id,
+                    "width": width,
+                    "height": height,
+                },
+            )
+        ]
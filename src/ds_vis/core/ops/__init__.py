@@ -5,10 +5,12 @@ This package implements the data structures specified in OPS_SPEC v1.0:
 - AnimationOp: a single semantic operation (no time attached)
 - AnimationStep: a teaching micro-step with duration and ops
 - Timeline: an ordered sequence of steps
+- DetailLevel / condense_timeline: L0/L1/L2 animation detail reduction
 """
 
 from __future__ import annotations
 
+from .detail import DetailLevel, condense_timeline, fold_steps, parse_detail_level
 from .ops import AnimationOp, OpCode
 from .timeline import AnimationStep, Timeline
 
@@ -17,4 +19,8 @@ __all__ = [
     "AnimationOp",
     "AnimationStep",
     "Timeline",
+    "DetailLevel",
+    "condense_timeline",
+    "fold_steps",
+    "parse_detail_level",
 ]
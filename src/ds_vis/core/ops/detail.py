@@ -0,0 +1,203 @@
+"""
+Animation detail levels (L0/L1/L2) and timeline condensation.
+
+Models always describe an operation as full teaching micro-steps (L2). For
+bulk builds or replays that detail is wasted work for layout and renderer, so
+a structural Timeline can be condensed to:
+
+- L0 (result): one step holding only the net effect of the whole operation;
+- L1 (phases): state/message-only steps are folded into the structural step
+  that ends them, so only steps that change structure remain (the trailing
+  restore step is kept);
+- L2 (full): unchanged.
+
+Condensation works on ops alone (no model knowledge), so every model honours
+the levels uniformly. Folding keeps the *net* effect: a node created and
+deleted inside the window disappears entirely, and only the last
+SET_STATE/SET_LABEL/SET_POS/SET_SIZE per target survives.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ds_vis.core.exceptions import CommandError
+
+from .ops import AnimationOp, OpCode
+from .timeline import AnimationStep, Timeline
+
+
+class DetailLevel(Enum):
+    """How much of an operation's micro-step sequence reaches layout/renderer."""
+
+    L0 = 0  # result only
+    L1 = 1  # coarse phases
+    L2 = 2  # full micro-steps
+
+
+_DETAIL_ALIASES: Dict[str, DetailLevel] = {
+    "l0": DetailLevel.L0,
+    "0": DetailLevel.L0,
+    "result": DetailLevel.L0,
+    "l1": DetailLevel.L1,
+    "1": DetailLevel.L1,
+    "phase": DetailLevel.L1,
+    "phases": DetailLevel.L1,
+    "l2": DetailLevel.L2,
+    "2": DetailLevel.L2,
+    "full": DetailLevel.L2,
+}
+
+_CREATE_OPS = frozenset({OpCode.CREATE_NODE, OpCode.CREATE_EDGE})
+_STRUCTURAL_OPS = frozenset(
+    {OpCode.CREATE_NODE, OpCode.DELETE_NODE, OpCode.CREATE_EDGE, OpCode.DELETE_EDGE}
+)
+_ATTRIBUTE_OPS = (
+    OpCode.SET_LABEL,
+    OpCode.SET_STATE,
+    OpCode.SET_POS,
+    OpCode.SET_SIZE,
+)
+_MESSAGE_OPS = frozenset({OpCode.SET_MESSAGE, OpCode.CLEAR_MESSAGE})
+
+
+def parse_detail_level(value: Union[DetailLevel, str, int]) -> DetailLevel:
+    """Accept a DetailLevel, "L0"/"l1"/"full"… or 0/1/2; else raise CommandError."""
+    if isinstance(value, DetailLevel):
+        return value
+    if isinstance(value, bool):
+        raise CommandError(f"Invalid detail level: {value!r}")
+    key = str(value).strip().lower()
+    level = _DETAIL_ALIASES.get(key)
+    if level is None:
+        raise CommandError(
+            f"Invalid detail level: {value!r} (expected L0, L1 or L2)"
+        )
+    return level
+
+
+def condense_timeline(timeline: Timeline, level: DetailLevel) -> Timeline:
+    """Return `timeline` reduced to `level` (L2 returns it unchanged)."""
+    if level is DetailLevel.L2 or len(timeline.steps) <= 1:
+        return timeline
+    if level is DetailLevel.L0:
+        return Timeline(steps=fold_steps(timeline.steps))
+
+    steps = timeline.steps
+    condensed = Timeline()
+    phase: List[AnimationStep] = []
+    for step in steps[:-1]:
+        phase.append(step)
+        if _is_structural(step):
+            condensed.steps.extend(_fold_phase(phase))
+            phase = []
+    if phase:
+        condensed.steps.extend(_fold_phase(phase))
+    condensed.add_step(steps[-1])
+    return condensed
+
+
+def fold_steps(
+    steps: Sequence[AnimationStep], label: Optional[str] = None
+) -> List[AnimationStep]:
+    """
+    Fold consecutive steps into their net effect.
+
+    Usually returns one step. When a target is deleted and re-created inside
+    the window, the deletes are emitted as a separate leading step: the
+    animated renderer path applies creates before deletes within a step.
+    """
+    if not steps:
+        return []
+
+    # (is_edge, target) -> (first structural op, last structural op)
+    structure: Dict[Tuple[bool, str], Tuple[AnimationOp, AnimationOp]] = {}
+    # (target, op) -> last attribute op; re-inserted on write to keep last-write order
+    attributes: Dict[Tuple[str, OpCode], AnimationOp] = {}
+    message: Optional[AnimationOp] = None
+    passthrough: List[AnimationOp] = []
+
+    for step in steps:
+        for op in step.ops:
+            if op.op in _STRUCTURAL_OPS and op.target is not None:
+                key = (op.op in (OpCode.CREATE_EDGE, OpCode.DELETE_EDGE), op.target)
+                first = structure.get(key, (op, op))[0]
+                structure[key] = (first, op)
+                for code in _ATTRIBUTE_OPS:
+                    attributes.pop((op.target, code), None)
+            elif op.op in _ATTRIBUTE_OPS and op.target is not None:
+                attr_key = (op.target, op.op)
+                attributes.pop(attr_key, None)
+                attributes[attr_key] = op
+            elif op.op in _MESSAGE_OPS:
+                message = op
+            else:
+                passthrough.append(op)
+
+    delete_edges: List[AnimationOp] = []
+    delete_nodes: List[AnimationOp] = []
+    create_nodes: List[AnimationOp] = []
+    create_edges: List[AnimationOp] = []
+    created: set[str] = set()
+    recreated = False
+    for (is_edge, target), (first, last) in structure.items():
+        born_here = first.op in _CREATE_OPS
+        alive = last.op in _CREATE_OPS
+        if not born_here:
+            (delete_edges if is_edge else delete_nodes).append(first)
+        if alive:
+            (create_edges if is_edge else create_nodes).append(last)
+            created.add(target)
+            recreated = recreated or not born_here
+
+    attribute_ops = [
+        op
+        for (target, code), op in attributes.items()
+        if not (
+            code is OpCode.SET_STATE
+            and target in created
+            and op.data.get("state") == "normal"
+        )
+    ]
+    trailing = [message] if message is not None else []
+
+    duration = max(step.duration_ms for step in steps)
+    label = label if label is not None else _last_label(steps)
+    deletes = delete_edges + delete_nodes
+    creates = create_nodes + create_edges
+    if recreated:
+        folded = [
+            AnimationStep(duration_ms=0, label=label, ops=deletes),
+            AnimationStep(
+                duration_ms=duration,
+                label=label,
+                ops=creates + attribute_ops + passthrough + trailing,
+            ),
+        ]
+    else:
+        folded = [
+            AnimationStep(
+                duration_ms=duration,
+                label=label,
+                ops=deletes + creates + attribute_ops + passthrough + trailing,
+            )
+        ]
+    return [step for step in folded if step.ops]
+
+
+def _fold_phase(phase: List[AnimationStep]) -> List[AnimationStep]:
+    if len(phase) == 1:
+        return phase
+    return fold_steps(phase)
+
+
+def _is_structural(step: AnimationStep) -> bool:
+    return any(op.op in _STRUCTURAL_OPS for op in step.ops)
+
+
+def _last_label(steps: Sequence[AnimationStep]) -> Optional[str]:
+    for step in reversed(steps):
+        if step.label:
+            return step.label
+    return None
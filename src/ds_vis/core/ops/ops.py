@@ -20,6 +20,7 @@ class OpCode(Enum):
 
     # Layout / position
     SET_POS = auto()
+    SET_SIZE = auto()  # resize an existing node in place (width/height)
 
     # Visual / state
     SET_STATE = auto()
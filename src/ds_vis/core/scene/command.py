@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any, Mapping
 
@@ -26,6 +26,7 @@ class CommandType(Enum):
     GIT_BRANCH = auto()
     GIT_CHECKOUT = auto()
     GIT_MERGE = auto()
+    GIT_IMPORT = auto()  # batch of real commits from a repository importer
 
 
 @dataclass(frozen=True)
@@ -37,9 +38,14 @@ class Command:
     - `type` describes the kind of operation.
     - `payload` contains operation-specific parameters (values, keys, options).
 
+    - `validated` marks a payload already checked against SCHEMA_REGISTRY
+      (e.g. by persistence.json_io on load); SceneGraph then skips its own
+      schema check. Trusted input: do not mutate such a payload afterwards.
+
     Concrete shape of `payload` will be documented in DSL/OPS specs.
     """
 
     structure_id: str
     type: CommandType
     payload: Mapping[str, Any]
+    validated: bool = field(default=False, compare=False)
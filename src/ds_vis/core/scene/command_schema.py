@@ -1,80 +1,83 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Tuple, Type
 
 from ds_vis.core.exceptions import CommandError
 from ds_vis.core.scene.command import CommandType
 
 Validator = Callable[[Mapping[str, Any]], None]
+
+# Fields accepted by every command schema (consumed by SceneGraph, not models).
+# - detail: animation detail level for this command ("L0"/"L1"/"L2" or 0/1/2)
+ENVELOPE_FIELDS: Dict[str, Tuple[Type[Any], ...]] = {"detail": (str, int)}
+# Search-tree kinds addressed by key (value) rather than by index.
+VALUE_KEYED_KINDS = frozenset({"bst", "avl", "rbtree"})
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from ds_vis.core.models import BaseModel
 
 
 @dataclass(frozen=True)
 class CommandSchema:
+    """
+    Payload schema of one (CommandType, kind).
+
+    The checks are compiled once (at `register_command` time) into a
+    specialized function; `validate` runs it.
+    """
+
     required: Dict[str, Type[Any]] = field(default_factory=dict)
     optional: Dict[str, Tuple[Type[Any], ...]] = field(default_factory=dict)
     allow_extra: bool = False
     validators: Tuple[Validator, ...] = ()
 
-    def validate(self, payload: Mapping[str, Any]) -> None:
-        _ensure_mapping(payload)
-
-        _validate_required_fields(payload, self.required)
-        _validate_optional_fields(payload, self.optional)
-        _validate_no_extra_fields(
-            payload,
-            allowed=set(self.required) | set(self.optional),
-            allow_extra=self.allow_extra,
-        )
-        _run_validators(payload, self.validators)
-
-
-def _ensure_mapping(payload: Mapping[str, Any]) -> None:
-    if not isinstance(payload, Mapping):
-        raise CommandError("Command payload must be a mapping")
+    @cached_property
+    def compiled(self) -> Validator:
+        return _compile_schema(self)
 
-
-def _validate_required_fields(
-    payload: Mapping[str, Any], required: Dict[str, Type[Any]]
-) -> None:
-    for key, expected_type in required.items():
-        if key not in payload:
-            raise CommandError(f"Missing required field: {key}")
-        if not isinstance(payload.get(key), expected_type):
-            raise CommandError(
-                f"Field {key!r} must be {_type_names((expected_type,))}"
-            )
+    def validate(self, payload: Mapping[str, Any]) -> None:
+        self.compiled(payload)
 
 
-def _validate_optional_fields(
-    payload: Mapping[str, Any], optional: Dict[str, Tuple[Type[Any], ...]]
-) -> None:
-    for key, expected_types in optional.items():
-        if key in payload and payload.get(key) is not None:
+def _compile_schema(schema: CommandSchema) -> Validator:
+    """
+    Specialize the generic checks (required -> optional/envelope types ->
+    extra fields -> custom validators) for one schema: error messages and the
+    allowed key set are precomputed, empty checks are dropped.
+    """
+    required = tuple(
+        (key, expected, f"Field {key!r} must be {_type_names((expected,))}")
+        for key, expected in schema.required.items()
+    )
+    optional = tuple(
+        (key, types, f"Field {key!r} must be a {_type_names(types)} when present")
+        for key, types in (*schema.optional.items(), *ENVELOPE_FIELDS.items())
+    )
+    allowed = frozenset(schema.required) | frozenset(schema.optional)
+    allowed |= frozenset(ENVELOPE_FIELDS)
+    check_extra = not schema.allow_extra
+    validators = schema.validators
+
+    def validate(payload: Mapping[str, Any]) -> None:
+        if not isinstance(payload, Mapping):
+            raise CommandError("Command payload must be a mapping")
+        for key, expected, message in required:
+            if key not in payload:
+                raise CommandError(f"Missing required field: {key}")
+            if not isinstance(payload[key], expected):
+                raise CommandError(message)
+        for key, types, message in optional:
             value = payload.get(key)
-            if not isinstance(value, expected_types):
-                msg = _type_names(expected_types)
-                raise CommandError(f"Field {key!r} must be a {msg} when present")
-
-
-def _validate_no_extra_fields(
-    payload: Mapping[str, Any], allowed: set[str], allow_extra: bool
-) -> None:
-    if allow_extra:
-        return
-    unknown = set(payload.keys()) - allowed
-    if unknown:
-        unknown_list = ", ".join(sorted(unknown))
-        raise CommandError(f"Unexpected payload fields: {unknown_list}")
-
+            if value is not None and not isinstance(value, types):
+                raise CommandError(message)
+        if check_extra and not allowed.issuperset(payload.keys()):
+            unknown_list = ", ".join(sorted(set(payload.keys()) - allowed))
+            raise CommandError(f"Unexpected payload fields: {unknown_list}")
+        for validator in validators:
+            validator(payload)
 
-def _run_validators(
-    payload: Mapping[str, Any], validators: Tuple[Validator, ...]
-) -> None:
-    for validator in validators:
-        validator(payload)
+    return validate
 
 
 def _type_names(types: Tuple[Type[Any], ...]) -> str:
@@ -109,6 +112,7 @@ def register_command(
     Usage for new structures:
         register_command(CommandType.CREATE_STRUCTURE, "tree", tree_schema, "create")
     """
+    schema.compiled  # compile once here, not on the first command
     SCHEMA_REGISTRY[(cmd_type, kind)] = schema
     MODEL_OP_REGISTRY[(cmd_type, kind)] = model_op
 
@@ -124,7 +128,14 @@ def register_model_factory(kind: str, factory: Callable[[str], "BaseModel"]) ->
 
 
 def _register_defaults() -> None:
-    from ds_vis.core.models import BstModel, GitGraphModel, HuffmanModel, ListModel
+    from ds_vis.core.models import (
+        AvlModel,
+        BstModel,
+        GitGraphModel,
+        HuffmanModel,
+        ListModel,
+        RedBlackModel,
+    )
     from ds_vis.core.models.seqlist import SeqlistModel
     from ds_vis.core.models.stack import StackModel
 
@@ -217,7 +228,10 @@ def _register_defaults() -> None:
     register_command(
         CommandType.CREATE_STRUCTURE,
         "huffman",
-        CommandSchema(required={"kind": str}, optional={"values": (list, tuple)}),
+        CommandSchema(
+            required={"kind": str},
+            optional={"values": (list, tuple), "symbols": (list, tuple)},
+        ),
         "create",
     )
     register_command(
@@ -250,6 +264,27 @@ def _register_defaults() -> None:
         CommandSchema(required={"kind": str, "target": str}),
         "checkout",
     )
+    register_command(
+        CommandType.GIT_BRANCH,
+        "git",
+        CommandSchema(required={"kind": str, "name": str}, optional={"start": (str,)}),
+        "branch",
+    )
+    register_command(
+        CommandType.GIT_MERGE,
+        "git",
+        CommandSchema(required={"kind": str, "source": str}),
+        "merge",
+    )
+    register_command(
+        CommandType.GIT_IMPORT,
+        "git",
+        CommandSchema(
+            required={"kind": str, "commits": list},
+            optional={"reset": (bool,), "branches": (dict,), "head": (str,)},
+        ),
+        "import_commits",
+    )
     register_model_factory(
         "git", lambda structure_id: GitGraphModel(structure_id=structure_id)
     )
@@ -303,7 +338,10 @@ def _register_defaults() -> None:
     register_command(
         CommandType.CREATE_STRUCTURE,
         "bst",
-        CommandSchema(required={"kind": str}, optional={"values": (list, tuple)}),
+        CommandSchema(
+            required={"kind": str},
+            optional={"values": (list, tuple), "bulk": (bool,), "balanced": (bool,)},
+        ),
         "create",
     )
     register_command(
@@ -333,6 +371,46 @@ def _register_defaults() -> None:
     register_model_factory(
         "bst", lambda structure_id: BstModel(structure_id=structure_id)
     )
+    # Self-balancing trees share the BST command surface.
+    balanced_create = {
+        "values": (list, tuple),
+        "bulk": (bool,),
+        "balanced": (bool,),
+        "preorder": (bool,),
+    }
+    for tree_kind, create_optional in (
+        ("avl", balanced_create),
+        ("rbtree", {**balanced_create, "colors": (str,)}),
+    ):
+        register_command(
+            CommandType.CREATE_STRUCTURE,
+            tree_kind,
+            CommandSchema(required={"kind": str}, optional=create_optional),
+            "create",
+        )
+        for cmd_type, op_name in (
+            (CommandType.INSERT, "insert"),
+            (CommandType.SEARCH, "search"),
+            (CommandType.DELETE_NODE, "delete_value"),
+        ):
+            register_command(
+                cmd_type,
+                tree_kind,
+                CommandSchema(required={"kind": str, "value": object}),
+                op_name,
+            )
+        register_command(
+            CommandType.DELETE_STRUCTURE,
+            tree_kind,
+            CommandSchema(required={"kind": str}),
+            "delete_all",
+        )
+    register_model_factory(
+        "avl", lambda structure_id: AvlModel(structure_id=structure_id)
+    )
+    register_model_factory(
+        "rbtree", lambda structure_id: RedBlackModel(structure_id=structure_id)
+    )
 
 
 _register_defaults()
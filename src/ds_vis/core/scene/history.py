@@ -0,0 +1,224 @@
+"""
+Undo/redo support for SceneGraph.
+
+Every applied command (or `apply_commands` batch) leaves a `HistoryEntry`
+holding two deltas:
+
+- per command, a `CommandChange` with the model delta from
+  `BaseModel.begin_change/end_change` (journaled node pre-images,
+  append-only lengths or shallow container copies); a batch keeps one per
+  structure, spanning all of its commands on that structure;
+- the visual pre-images of every target the laid-out timeline touched,
+  collected by `VisualIndex.record` in O(ops).
+
+Undo reverts the model and turns the visual delta into one inverse step
+(DELETE for CREATE, re-CREATE for DELETE, previous SET_STATE/SET_LABEL/
+SET_POS/SET_SIZE), so undoing costs as much as the command did, independent
+of how many commands came before. Redo re-applies the command.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from ds_vis.core.ops import AnimationOp, OpCode, Timeline
+
+from .command import Command
+
+_CREATE_OPS = frozenset({OpCode.CREATE_NODE, OpCode.CREATE_EDGE})
+_DELETE_OPS = frozenset({OpCode.DELETE_NODE, OpCode.DELETE_EDGE})
+_ATTRIBUTE_OPS = (OpCode.SET_LABEL, OpCode.SET_STATE, OpCode.SET_SIZE, OpCode.SET_POS)
+_DELETE_FOR = {
+    OpCode.CREATE_NODE: OpCode.DELETE_NODE,
+    OpCode.CREATE_EDGE: OpCode.DELETE_EDGE,
+}
+
+# target -> (creating op, last attribute op per OpCode); None = did not exist
+Visual = Tuple[AnimationOp, Dict[OpCode, AnimationOp]]
+VisualDelta = Dict[str, Optional[Visual]]
+
+
+@dataclass
+class CommandChange:
+    command: Command
+    kind: str = ""
+    model_delta: Optional[Mapping[str, Any]] = None
+    # scene bookkeeping when the command created the structure
+    created_structure: bool = False
+    had_offset: bool = True
+    had_config: bool = True
+    row_index: Optional[Dict[Any, int]] = None
+    # layout engine row assignments before the command (engines with
+    # save_rows/restore_rows), restored on undo
+    layout_rows: Optional[Dict[Any, Any]] = None
+
+
+@dataclass
+class HistoryEntry:
+    """One undo step: a single command or a whole batch."""
+
+    changes: List[CommandChange]
+    visual_delta: VisualDelta = field(default_factory=dict)
+    # every command of a batch; its `changes` keep one per structure
+    batch: Optional[List[Command]] = None
+
+    @property
+    def commands(self) -> List[Command]:
+        if self.batch is not None:
+            return self.batch
+        return [change.command for change in self.changes]
+
+
+class VisualIndex:
+    """
+    Last known visual attributes of every live node/edge in the scene.
+
+    Like the renderer, DELETE_NODE also drops the edges attached to the node.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[str, Visual] = {}
+        self._edges_of: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._edges_of.clear()
+
+    def record(self, timeline: Timeline) -> VisualDelta:
+        """Apply `timeline`; return the pre-image of every target it touched."""
+        items = self._items
+        before: VisualDelta = {}
+        for step in timeline.steps:
+            for op in step.ops:
+                target = op.target
+                if target is None:
+                    continue
+                code = op.op
+                if code in _CREATE_OPS:
+                    self._remember(before, target)
+                    items[target] = (op, {})
+                    if code is OpCode.CREATE_EDGE:
+                        self._link(target, op)
+                elif code in _DELETE_OPS:
+                    self._remember(before, target)
+                    removed = items.pop(target, None)
+                    if code is OpCode.DELETE_NODE:
+                        for edge_id in self._edges_of.pop(target, ()):
+                            if edge_id in items:
+                                self._remember(before, edge_id)
+                                self._unlink(edge_id, items.pop(edge_id)[0])
+                    elif removed is not None:
+                        self._unlink(target, removed[0])
+                elif code in _ATTRIBUTE_OPS:
+                    item = items.get(target)
+                    if item is not None:
+                        self._remember(before, target)
+                        item[1][code] = op
+        return before
+
+    def _link(self, edge_id: str, create: AnimationOp) -> None:
+        for end in (create.data.get("from"), create.data.get("to")):
+            if isinstance(end, str):
+                self._edges_of.setdefault(end, set()).add(edge_id)
+
+    def _unlink(self, edge_id: str, create: AnimationOp) -> None:
+        for end in (create.data.get("from"), create.data.get("to")):
+            if not isinstance(end, str):
+                continue
+            edges = self._edges_of.get(end)
+            if edges is not None:
+                edges.discard(edge_id)
+                if not edges:
+                    del self._edges_of[end]
+
+    def _remember(self, before: VisualDelta, target: str) -> None:
+        if target not in before:
+            item = self._items.get(target)
+            before[target] = (item[0], dict(item[1])) if item is not None else None
+
+    def inverse_ops(
+        self,
+        before: VisualDelta,
+        node_index: Optional[Callable[[str], Optional[int]]] = None,
+    ) -> List[AnimationOp]:
+        """
+        Ops that take the touched targets back to `before`: removals first,
+        then re-creations (nodes before edges, linear nodes in index order),
+        then attribute restores. `node_index` supplies the current layout
+        index of re-created nodes of linear kinds.
+        """
+        removed_edges: List[AnimationOp] = []
+        removed_nodes: List[AnimationOp] = []
+        created_nodes: List[Tuple[int, AnimationOp]] = []
+        created_edges: List[AnimationOp] = []
+        attributes: List[AnimationOp] = []
+        for target, old in before.items():
+            new = self._items.get(target)
+            if old is None:
+                if new is not None:
+                    create = new[0]
+                    removal = AnimationOp(
+                        op=_DELETE_FOR[create.op], target=target, data=create.data
+                    )
+                    if create.op is OpCode.CREATE_EDGE:
+                        removed_edges.append(removal)
+                    else:
+                        removed_nodes.append(removal)
+                continue
+            create, old_attrs = old
+            if new is None:
+                if create.op is OpCode.CREATE_EDGE:
+                    created_edges.append(create)
+                else:
+                    index = node_index(target) if node_index else None
+                    if index is not None:
+                        create = AnimationOp(
+                            op=create.op,
+                            target=target,
+                            data={**create.data, "index": index},
+                        )
+                    created_nodes.append(
+                        (index if index is not None else len(created_nodes), create)
+                    )
+                attributes.extend(old_attrs.values())
+                continue
+            new_attrs = new[1]
+            for code in _ATTRIBUTE_OPS:
+                previous, current = old_attrs.get(code), new_attrs.get(code)
+                if previous is current:
+                    continue
+                restore = previous or _initial_attribute(create, code)
+                if restore is not None:
+                    attributes.append(restore)
+
+        created_nodes.sort(key=lambda item: item[0])
+        return (
+            removed_edges
+            + removed_nodes
+            + [op for _, op in created_nodes]
+            + created_edges
+            + attributes
+        )
+
+
+def _initial_attribute(create: AnimationOp, code: OpCode) -> Optional[AnimationOp]:
+    """Attribute value implied by the creating op (None: leave it to layout)."""
+    structure_id = create.data.get("structure_id")
+    if code is OpCode.SET_STATE:
+        data: Dict[str, Any] = {"structure_id": structure_id, "state": "normal"}
+    elif code is OpCode.SET_LABEL and "label" in create.data:
+        label = create.data["label"]
+        data = {"structure_id": structure_id, "label": label, "text": label}
+    elif code is OpCode.SET_SIZE and "width" in create.data:
+        data = {
+            "structure_id": structure_id,
+            "width": create.data.get("width"),
+            "height": create.data.get("height"),
+        }
+    else:
+        return None
+    return AnimationOp(op=code, target=create.target, data=data)
@@ -1,7 +1,22 @@
 from __future__ import annotations
 
+import itertools
+import threading
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from ds_vis.core.exceptions import CommandError
 from ds_vis.core.layout import DEFAULT_LAYOUT_MAP, LayoutEngine, LayoutStrategy
@@ -9,14 +24,43 @@ from ds_vis.core.layout.git import GitLayoutEngine
 from ds_vis.core.layout.simple import SimpleLayoutEngine
 from ds_vis.core.layout.tree import TreeLayoutEngine
 from ds_vis.core.models import BaseModel
-from ds_vis.core.ops import AnimationOp, AnimationStep, Timeline
+from ds_vis.core.ops import (
+    AnimationOp,
+    AnimationStep,
+    DetailLevel,
+    Timeline,
+    condense_timeline,
+    parse_detail_level,
+)
 
 from .command import Command, CommandType
 from .command_schema import (
     MODEL_FACTORY_REGISTRY,
     MODEL_OP_REGISTRY,
     SCHEMA_REGISTRY,
+    VALUE_KEYED_KINDS,
 )
+from .history import CommandChange, HistoryEntry, VisualIndex
+from .snapshot import SCENE_VERSION, SceneSnapshot
+
+# Revisions are unique across all scenes/imports, so a (structure, revision)
+# pair never names two different states.
+_REVISIONS = itertools.count(1)
+
+# structure id -> (its first change in a batch, model whose delta is open)
+_HeldChanges = Dict[str, Tuple[CommandChange, Optional[BaseModel]]]
+
+
+@dataclass
+class LayoutBinding:
+    """
+    Layout route of one structure: its strategy and engine. Per-structure
+    config is not copied here; engines read the scene's shared
+    `_structure_layout_config` map (see `_attach_engine`).
+    """
+
+    strategy: LayoutStrategy
+    engine: Optional[LayoutEngine]
 
 
 @dataclass
@@ -34,6 +78,16 @@ class SceneGraph:
     P0.3: commands are routed via a handler registry; surface-only support for list
     CREATE_STRUCTURE / DELETE_STRUCTURE / DELETE_NODE. Unknown commands raise
     CommandError (no silent no-op).
+
+    Undo/redo: each command keeps its inverse (model delta + visual
+    pre-images, see core.scene.history) for the last `history_limit`
+    commands; 0 (the default) disables history tracking, since recording
+    visual pre-images costs about as much as the layout itself. Interactive
+    front ends opt in (MainWindow keeps 1000).
+
+    Snapshots: every structure carries a revision bumped on each write;
+    exported states are cached per revision and `snapshot()` is
+    copy-on-write (see core.scene.snapshot).
     """
 
     _structures: Dict[str, BaseModel] = field(default_factory=dict)
@@ -49,6 +103,40 @@ class SceneGraph:
     _handlers: Dict[CommandType, Callable[[Command], Tuple[Timeline, str]]] = field(
         default_factory=dict
     )
+    default_detail: DetailLevel = DetailLevel.L2
+    _structure_detail: Dict[str, DetailLevel] = field(default_factory=dict)
+    history_limit: int = 0
+    _undo_stack: Deque[HistoryEntry] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _redo_stack: List[List[Command]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _visuals: VisualIndex = field(
+        default_factory=VisualIndex, init=False, repr=False
+    )
+    _revisions: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _revision: int = field(default=0, init=False, repr=False)
+    _export_cache: Dict[str, Tuple[int, Mapping[str, object]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _open_snapshots: "weakref.WeakSet[SceneSnapshot]" = field(
+        default_factory=weakref.WeakSet, init=False, repr=False
+    )
+    _snapshot_lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
+    # layout routing table: structure -> engine binding, engine structure sets
+    _layout_bindings: Dict[str, "LayoutBinding"] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _strategy_sids: Dict[LayoutStrategy, Set[str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _attached_engines: Set[LayoutStrategy] = field(
+        default_factory=set, init=False, repr=False
+    )
+
     def __post_init__(self) -> None:
         # Default to a simple linear layout to keep the pipeline connected.
         if self._layout_engine is None:
@@ -60,10 +148,9 @@ class SceneGraph:
         if not self._layout_map:
             self._layout_map = dict(DEFAULT_LAYOUT_MAP)
         self._register_handlers()
+        self._undo_stack = deque(maxlen=max(self.history_limit, 1))
         # TODO(P0.8): allow injecting/swapping layout engines/strategies and invoking
         # layout_engine.reset() on scene reset/seek to support non-linear layouts.
-        # TODO(P0.8): consider layout routing (e.g., per-structure strategy selection)
-        # rather than a single engine instance, once tree/DAG layouts are available.
         # Layout defaults per kind (orientation/spacing等)
         self._kind_layout_config: Dict[str, Mapping[str, object]] = {
             "seqlist": {"orientation": "horizontal", "spacing": 80.0},
@@ -75,6 +162,8 @@ class SceneGraph:
             },
             "git": {"orientation": "vertical", "spacing": 140.0},
             "bst": {"spacing": 120.0, "level_spacing": 100.0},
+            "avl": {"spacing": 120.0, "level_spacing": 100.0},
+            "rbtree": {"spacing": 120.0, "level_spacing": 100.0},
             "huffman": {
                 "queue_spacing": 80.0,
                 "queue_start_y": 0.0,
@@ -91,6 +180,9 @@ class SceneGraph:
             CommandType.INSERT: self._handle_insert,
             CommandType.SEARCH: self._handle_search,
             CommandType.UPDATE: self._handle_update,
+            CommandType.GIT_BRANCH: self._handle_model_op,
+            CommandType.GIT_MERGE: self._handle_model_op,
+            CommandType.GIT_IMPORT: self._handle_import,
         }
 
     def apply_command(self, command: Command) -> Timeline:
@@ -102,23 +194,424 @@ class SceneGraph:
           - DELETE_STRUCTURE / DELETE_NODE for list (no legacy DELETE overload).
           - Unsupported commands raise CommandError (no silent no-op).
         """
+        timeline = self._execute(command)
+        self._redo_stack.clear()
+        return timeline
+
+    def apply_commands(
+        self,
+        commands: Iterable[Command],
+        detail: DetailLevel | str | int | None = None,
+    ) -> Timeline:
+        """
+        Apply a batch of commands atomically and return one Timeline.
+
+        Commands are validated and dispatched in order; their structural
+        timelines are concatenated per layout strategy (steps are shared, not
+        copied) and each affected layout engine runs once. Steps keep the
+        command order. `detail` additionally condenses each strategy's part
+        of the batch (e.g. L0: one laid-out step per strategy).
+
+        If any command fails, the commands already applied are reverted and
+        the error is re-raised; layout engines and history are untouched.
+        The batch is a single undo step.
+        """
+        timeline = self._execute_batch(list(commands), detail)
+        self._redo_stack.clear()
+        return timeline
+
+    def replay(
+        self,
+        commands: Iterable[Command],
+        *,
+        chunk_size: int = 512,
+        detail: DetailLevel | str | int | None = None,
+        on_timeline: Optional[Callable[[Timeline], None]] = None,
+    ) -> int:
+        """
+        Apply a (possibly huge, lazily produced) command stream in constant
+        memory: commands are pulled `chunk_size` at a time and each chunk is
+        applied as one `apply_commands` batch. Timelines are dropped unless
+        `on_timeline` consumes them (without a consumer and without history,
+        commands are laid out one by one and nothing is kept). Returns the
+        number of commands applied.
+
+        A failing command rolls back its own chunk only; earlier chunks stay
+        applied and the error is re-raised. Each chunk is one undo step: use
+        `history_limit=0` for unbounded streams.
+        """
+        chunk_size = max(1, chunk_size)
+        iterator = iter(commands)
+        applied = 0
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return applied
+            timeline = self._execute_batch(
+                chunk, detail, keep_timeline=on_timeline is not None
+            )
+            self._redo_stack.clear()
+            applied += len(chunk)
+            if on_timeline is not None:
+                on_timeline(timeline)
+
+    def _execute(self, command: Command) -> Timeline:
+        record = self.history_limit > 0
+        structural_timeline, change = self._dispatch(command, record, [])
+        timeline = self._apply_layout(
+            command.structure_id, change.kind, structural_timeline
+        )
+        if record:
+            self._undo_stack.append(
+                HistoryEntry(
+                    changes=[change], visual_delta=self._visuals.record(timeline)
+                )
+            )
+        return timeline
+
+    def _execute_batch(
+        self,
+        commands: List[Command],
+        detail: DetailLevel | str | int | None = None,
+        *,
+        keep_timeline: bool = True,
+    ) -> Timeline:
+        changes: List[CommandChange] = []
+        parts: List[Tuple[Timeline, CommandChange]] = []
+        # Rollback and undo both go back to the state before the whole batch:
+        # one pre-image per structure, held open from its first command to
+        # the end of the batch, is all either needs.
+        held: _HeldChanges = {}
+        record = self.history_limit > 0
+        layout_rows = self._save_layout_rows() if record else None
+        try:
+            for command in commands:
+                parts.append(self._dispatch(command, True, changes, held))
+        except Exception:
+            self._end_held(held)
+            for change in reversed(changes):
+                self._revert_change(change)
+            self._prune_bindings()
+            raise
+        self._end_held(held)
+        if not parts:
+            return Timeline()
+
+        level = parse_detail_level(detail) if detail is not None else None
+        if not record and not keep_timeline:
+            # Nobody reads the laid-out timeline: lay out command by command
+            # so the batch never holds all of its SET_POS ops at once.
+            for tl, change in parts:
+                if level is not None:
+                    tl = condense_timeline(tl, level)
+                self._apply_layout(change.command.structure_id, change.kind, tl)
+            return Timeline()
+
+        timeline = self._layout_batch(
+            [
+                (change.command.structure_id, change.kind, tl)
+                for tl, change in parts
+            ],
+            level,
+        )
+        if record:
+            changes[0].layout_rows = layout_rows
+            self._undo_stack.append(
+                HistoryEntry(
+                    changes=changes,
+                    visual_delta=self._visuals.record(timeline),
+                    batch=commands,
+                )
+            )
+        return timeline
+
+    def _dispatch(
+        self,
+        command: Command,
+        record: bool,
+        changes: List[CommandChange],
+        held: Optional[_HeldChanges] = None,
+    ) -> Tuple[Timeline, CommandChange]:
+        """
+        Run the handler of one command; returns its structural Timeline
+        (condensed to the command's detail level) and its CommandChange.
+        With `record`, the model delta is kept so the command can be reverted;
+        the change is appended to `changes` before the handler runs, so a
+        failing command can be reverted too.
+
+        With `held` (a batch), only the first command of each structure
+        records, and its model delta stays open until `_end_held`: it then
+        reverts every command of the batch on that structure.
+        """
         handler = self._handlers.get(command.type)
         if handler is None:
             raise CommandError(f"Unsupported command type: {command.type!s}")
-        structural_timeline, kind = handler(command)
+        detail = self._resolve_detail(command)
+        sid = command.structure_id
+        if held is not None and sid in held:
+            record = False
+        model = self._structures.get(sid) if record else None
+        change = CommandChange(command=command)
+        if record:
+            change.row_index = None if model else dict(self._row_index)
+            change.had_offset = sid in self._structure_offsets
+            change.had_config = sid in self._structure_layout_config
+            if held is None:
+                change.layout_rows = self._save_layout_rows()
+            else:
+                held[sid] = (change, model)
+            changes.append(change)
+        self._before_write((sid,))
+        if model:
+            model.begin_change()
+        try:
+            structural_timeline, change.kind = handler(command)
+        finally:
+            if model and held is None:
+                change.model_delta = model.end_change()
+            if record:
+                change.created_structure = model is None and sid in self._structures
+            self._after_write((sid,))
+        if detail is not DetailLevel.L2:
+            structural_timeline = condense_timeline(structural_timeline, detail)
+        return structural_timeline, change
+
+    @staticmethod
+    def _end_held(held: _HeldChanges) -> None:
+        """Close the model deltas `_dispatch` held open for a batch."""
+        for change, model in held.values():
+            if model is not None:
+                change.model_delta = model.end_change()
+
+    def _revert_change(self, change: CommandChange) -> None:
+        """Revert the model side of one recorded command (undo/batch rollback)."""
+        sid = change.command.structure_id
+        model = self._structures.get(sid)
+        self._before_write((sid,))
+        if model is not None and change.model_delta is not None:
+            model.revert_change(change.model_delta)
+        if change.created_structure:
+            self._structures.pop(sid, None)
+            if not change.had_offset:
+                self._structure_offsets.pop(sid, None)
+            if not change.had_config:
+                self._structure_layout_config.pop(sid, None)
+            if change.row_index is not None:
+                self._row_index = change.row_index
+        self._after_write((sid,))
+
+    # ------------------------------------------------------------------ #
+    # Undo / redo
+    # ------------------------------------------------------------------ #
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo_stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
+
+    def undo(self) -> Timeline:
+        """
+        Revert the last command (or batch) and return the inverse Timeline
+        (one step). Raises CommandError when there is nothing to undo.
+        """
+        if not self._undo_stack:
+            raise CommandError("Nothing to undo")
+        entry = self._undo_stack.pop()
+        models = [
+            self._structures[change.command.structure_id]
+            for change in entry.changes
+            if change.command.structure_id in self._structures
+        ]
+        for change in reversed(entry.changes):
+            self._revert_change(change)
+        self._restore_layout_rows(entry.changes[0].layout_rows)
+
+        def node_index(target: str) -> Optional[int]:
+            for model in models:
+                index = model.node_index(target)
+                if index is not None:
+                    return index
+            return None
+
+        step = AnimationStep(
+            ops=self._visuals.inverse_ops(entry.visual_delta, node_index),
+            label="Undo",
+        )
+        kinds = {
+            change.command.structure_id: change.kind for change in entry.changes
+        }
+        if len(set(kinds.values())) == 1:
+            inverse = Timeline()
+            inverse.add_step(step)
+            first = entry.changes[0]
+            timeline = self._apply_layout(
+                first.command.structure_id, first.kind, inverse
+            )
+        else:
+            timeline = Timeline()
+            timeline.add_step(self._layout_mixed_step(step, kinds))
+        self._prune_bindings()
+        self._visuals.record(timeline)
+        self._redo_stack.append(entry.commands)
+        return timeline
+
+    def redo(self) -> Timeline:
+        """Re-apply the last undone command or batch. Raises CommandError when none."""
+        if not self._redo_stack:
+            raise CommandError("Nothing to redo")
+        commands = self._redo_stack.pop()
+        if len(commands) == 1:
+            return self._execute(commands[0])
+        return self._execute_batch(commands)
+
+    def clear_history(self) -> None:
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+
+    # ------------------------------------------------------------------ #
+    # Revisions / snapshots
+    # ------------------------------------------------------------------ #
+    @property
+    def revision(self) -> int:
+        """Changes whenever any structure (or the structure set) changes."""
+        return self._revision
+
+    def structure_revision(self, structure_id: str) -> Optional[int]:
+        return self._revisions.get(structure_id)
+
+    def snapshot(self) -> SceneSnapshot:
+        """
+        Copy-on-write snapshot of the scene: O(#structures), no model data is
+        copied. Materialize it with `to_dict()` (export_scene format), from
+        any thread; structures modified meanwhile are captured just before
+        their first write.
+        """
+        with self._snapshot_lock:
+            snap = SceneSnapshot(
+                self,
+                self._revision,
+                [
+                    (sid, model.kind, self._revisions[sid])
+                    for sid, model in self._structures.items()
+                ],
+                self._structure_offsets,
+                self._structure_layout_config,
+            )
+            self._open_snapshots.add(snap)
+        return snap
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickle support (models, layout engine state, history). Open
+        snapshots, the lock and the bound handlers stay with this instance.
+        """
+        state = dict(self.__dict__)
+        for name in ("_open_snapshots", "_snapshot_lock", "_handlers"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._open_snapshots = weakref.WeakSet()
+        self._snapshot_lock = threading.RLock()
+        self._register_handlers()
+        # revisions are only unique within one process: renumber them
+        self._revisions = {sid: next(_REVISIONS) for sid in self._structures}
+        self._revision = next(_REVISIONS)
+        self._export_cache = {}
+
+    def _structure_state(self, structure_id: str) -> Mapping[str, object]:
+        # Caller holds _snapshot_lock.
+        revision = self._revisions[structure_id]
+        cached = self._export_cache.get(structure_id)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        state = self._structures[structure_id].export_state()
+        self._export_cache[structure_id] = (revision, state)
+        return state
 
-        return self._apply_layout(kind, structural_timeline)
+    def _capture_for_snapshot(
+        self, snap: SceneSnapshot, structure_id: str
+    ) -> Mapping[str, object]:
+        with self._snapshot_lock:
+            if snap.needs(structure_id, self._revisions.get(structure_id, -1)):
+                snap.capture(structure_id, self._structure_state(structure_id))
+            state = snap._states.get(structure_id)
+        if state is None:  # pragma: no cover - capture always precedes writes
+            raise CommandError(f"Snapshot lost structure {structure_id!r}")
+        return state
+
+    def _release_snapshot(self, snap: SceneSnapshot) -> None:
+        with self._snapshot_lock:
+            self._open_snapshots.discard(snap)
+
+    def _before_write(self, structure_ids: Iterable[str]) -> None:
+        """Copy-on-write: hand the current state to snapshots that need it."""
+        with self._snapshot_lock:
+            if not self._open_snapshots:
+                return
+            for sid in structure_ids:
+                revision = self._revisions.get(sid)
+                if revision is None:
+                    continue
+                for snap in list(self._open_snapshots):
+                    if snap.needs(sid, revision):
+                        snap.capture(sid, self._structure_state(sid))
+
+    def _after_write(self, structure_ids: Iterable[str]) -> None:
+        with self._snapshot_lock:
+            for sid in structure_ids:
+                if sid in self._structures:
+                    self._revisions[sid] = next(_REVISIONS)
+                else:
+                    self._revisions.pop(sid, None)
+                    self._export_cache.pop(sid, None)
+            self._revision = next(_REVISIONS)
+
+    def set_detail_level(
+        self,
+        level: DetailLevel | str | int,
+        structure_id: Optional[str] = None,
+    ) -> None:
+        """
+        Set the animation detail level for one structure, or the scene default
+        when `structure_id` is None. A per-command `payload["detail"]` wins
+        over both.
+        """
+        resolved = parse_detail_level(level)
+        if structure_id is None:
+            self.default_detail = resolved
+        else:
+            self._structure_detail[structure_id] = resolved
+
+    def detail_level(self, structure_id: str) -> DetailLevel:
+        return self._structure_detail.get(structure_id, self.default_detail)
+
+    def _resolve_detail(self, command: Command) -> DetailLevel:
+        requested = (
+            command.payload.get("detail")
+            if isinstance(command.payload, Mapping)
+            else None
+        )
+        if requested is not None:
+            return parse_detail_level(requested)
+        return self.detail_level(command.structure_id)
 
     def _handle_create_structure(self, command: Command) -> Tuple[Timeline, str]:
         kind, op_name, payload = self._resolve_schema_and_op(command)
         model = self._get_or_create_model(kind, command.structure_id)
-        values = payload.get("values")
+        create_payload: Dict[str, Any] = {"values": payload.get("values")}
+        for option in ("bulk", "balanced", "preorder", "colors", "symbols"):
+            if option in payload:
+                create_payload[option] = payload[option]
         if model.node_count:
             delete_tl = model.apply_operation("delete_all", {})
-            create_tl = model.apply_operation(op_name, {"values": values})
+            create_tl = model.apply_operation(op_name, create_payload)
             merged = self._merge_timelines(delete_tl, create_tl)
             return merged, kind
-        return model.apply_operation(op_name, {"values": values}), kind
+        return model.apply_operation(op_name, create_payload), kind
 
     def _handle_delete_structure(self, command: Command) -> Tuple[Timeline, str]:
         kind, op_name, payload = self._resolve_schema_and_op(command)
@@ -132,6 +625,30 @@ class SceneGraph:
             )
         return model.apply_operation(op_name, payload), kind
 
+    def _handle_model_op(self, command: Command) -> Tuple[Timeline, str]:
+        """Forward the validated payload to the registered model operation."""
+        kind, op_name, payload = self._resolve_schema_and_op(command)
+        model = self._structures.get(command.structure_id)
+        if model is None:
+            raise CommandError(f"Structure not found: {command.structure_id!r}")
+        if model.kind != kind:
+            raise CommandError(
+                f"Kind mismatch for {command.structure_id!r}: "
+                f"expected {kind}, found {model.kind}"
+            )
+        return model.apply_operation(op_name, payload), kind
+
+    def _handle_import(self, command: Command) -> Tuple[Timeline, str]:
+        """Like `_handle_model_op`, but the first batch may create the structure."""
+        kind, op_name, payload = self._resolve_schema_and_op(command)
+        model = self._get_or_create_model(kind, command.structure_id)
+        if model.kind != kind:
+            raise CommandError(
+                f"Kind mismatch for {command.structure_id!r}: "
+                f"expected {kind}, found {model.kind}"
+            )
+        return model.apply_operation(op_name, payload), kind
+
     def _handle_delete_node(self, command: Command) -> Tuple[Timeline, str]:
         kind, op_name, payload = self._resolve_schema_and_op(command)
         model = self._structures.get(command.structure_id)
@@ -142,7 +659,7 @@ class SceneGraph:
                 f"Kind mismatch for {command.structure_id!r}: "
                 f"expected {kind}, found {model.kind}"
             )
-        if kind == "bst":
+        if kind in VALUE_KEYED_KINDS:
             value = payload.get("value")
             return model.apply_operation(op_name, {"value": value}), kind
         index = payload.get("index")
@@ -186,7 +703,7 @@ class SceneGraph:
         if kind == "git":
             target = payload.get("target")
             return model.apply_operation(op_name, {"target": target}), kind
-        if kind == "bst":
+        if kind in VALUE_KEYED_KINDS:
             return model.apply_operation(op_name, {"value": payload.get("value")}), kind
         index = payload.get("index")
         if isinstance(index, int) and (index < 0 or index >= model.node_count):
@@ -226,26 +743,30 @@ class SceneGraph:
     def export_scene(self) -> Mapping[str, object]:
         """
         Export the entire scene state (all structures, offsets, and configs).
+
+        Structure states are cached per revision and shared with snapshots:
+        treat them as read-only.
         """
         structures = []
-        for sid, model in self._structures.items():
-            structures.append(
-                {
-                    "id": sid,
-                    "kind": model.kind,
-                    "state": model.export_state(),
-                    "offset": self._structure_offsets.get(sid),
-                    "config": self._structure_layout_config.get(sid),
-                }
-            )
-        return {"version": "1.0", "structures": structures}
+        with self._snapshot_lock:
+            for sid, model in self._structures.items():
+                structures.append(
+                    {
+                        "id": sid,
+                        "kind": model.kind,
+                        "state": self._structure_state(sid),
+                        "offset": self._structure_offsets.get(sid),
+                        "config": self._structure_layout_config.get(sid),
+                    }
+                )
+        return {"version": SCENE_VERSION, "structures": structures}
 
     def import_scene(self, data: Mapping[str, object]) -> Timeline:
         """
         Clear the current scene and restore from a snapshot.
         Robustness: validates all structures before modifying current state.
         """
-        if not isinstance(data, Mapping) or data.get("version") != "1.0":
+        if not isinstance(data, Mapping) or data.get("version") != SCENE_VERSION:
             raise CommandError("Invalid scene data version")
 
         structures_data = data.get("structures")
@@ -293,6 +814,8 @@ class SceneGraph:
                 new_configs[sid] = config
 
         # 2. Commit: generate delete ops for old state and swap
+        old_sids = list(self._structures)
+        self._before_write(old_sids)
         delete_ops: List[AnimationOp] = []
         for sid, model in self._structures.items():
             tl = model.apply_operation("delete_all", {})
@@ -303,6 +826,7 @@ class SceneGraph:
         self._structure_offsets = new_offsets
         self._structure_layout_config = new_configs
         self._row_index.clear()
+        self._after_write(old_sids + list(new_structures))
 
         # Re-assign offsets for those that didn't have them
         for sid, model in self._structures.items():
@@ -318,61 +842,35 @@ class SceneGraph:
             for step in tl.steps:
                 timeline.add_step(step)
 
-        return self._apply_layout_to_import(timeline)
+        timeline = self._apply_layout_to_import(timeline)
+        self.clear_history()
+        if self.history_limit > 0:
+            self._visuals.clear()
+            self._visuals.record(timeline)
+        return timeline
 
     def _apply_layout_to_import(self, timeline: Timeline) -> Timeline:
         """
         Apply all layout engines to a mixed-structure timeline.
         """
-        tl = timeline
-
-        # Filter SIDs by strategy to avoid interference
-        linear_sids = {
-            sid
-            for sid, m in self._structures.items()
-            if self._layout_map.get(m.kind) == LayoutStrategy.LINEAR
-        }
-        tree_sids = {
-            sid
-            for sid, m in self._structures.items()
-            if self._layout_map.get(m.kind) == LayoutStrategy.TREE
-        }
-        dag_sids = {
-            sid
-            for sid, m in self._structures.items()
-            if self._layout_map.get(m.kind) == LayoutStrategy.DAG
-        }
+        # Engines restart from scratch; the routing table is rebuilt for the
+        # imported structures (and re-attached to the new offset/config maps).
+        for strategy in LayoutStrategy:
+            engine = self._engine_for(strategy)
+            if engine is not None:
+                engine.reset()
+        self._layout_bindings.clear()
+        self._strategy_sids.clear()
+        self._attached_engines.clear()
+        for sid, model in self._structures.items():
+            self._binding(sid, model.kind)
 
-        # Run engines sequentially; later engines (Tree/DAG) override earlier ones
-        if self._layout_engine:
-            self._layout_engine.reset()
-            if hasattr(self._layout_engine, "set_filter"):
-                self._layout_engine.set_filter(linear_sids)
-            if hasattr(self._layout_engine, "set_offsets"):
-                self._layout_engine.set_offsets(self._structure_offsets)
-            if hasattr(self._layout_engine, "set_structure_config"):
-                self._layout_engine.set_structure_config(self._structure_layout_config)
-            tl = self._layout_engine.apply_layout(tl)
-
-        if self._tree_layout_engine:
-            self._tree_layout_engine.reset()
-            if hasattr(self._tree_layout_engine, "set_filter"):
-                self._tree_layout_engine.set_filter(tree_sids)
-            if hasattr(self._tree_layout_engine, "set_offsets"):
-                self._tree_layout_engine.set_offsets(self._structure_offsets)
-            if hasattr(self._tree_layout_engine, "set_structure_config"):
-                self._tree_layout_engine.set_structure_config(
-                    self._structure_layout_config
-                )
-            tl = self._tree_layout_engine.apply_layout(tl)
-
-        if self._dag_layout_engine:
-            self._dag_layout_engine.reset()
-            if hasattr(self._dag_layout_engine, "set_filter"):
-                self._dag_layout_engine.set_filter(dag_sids)
-            if hasattr(self._dag_layout_engine, "set_offsets"):
-                self._dag_layout_engine.set_offsets(self._structure_offsets)
-            tl = self._dag_layout_engine.apply_layout(tl)
+        # Run engines sequentially; each only sees its own structures (filter)
+        tl = timeline
+        for strategy in LayoutStrategy:
+            engine = self._attach_engine(strategy)
+            if engine is not None:
+                tl = engine.apply_layout(tl)
         return tl
 
     def _merge_timelines(self, *timelines: Timeline) -> Timeline:
@@ -382,28 +880,170 @@ class SceneGraph:
                 merged.add_step(step)
         return merged
 
-    def _apply_layout(self, kind: str, timeline: Timeline) -> Timeline:
-        strategy = self._layout_map.get(kind, LayoutStrategy.LINEAR)
-        engine: Optional[LayoutEngine] = None
+    # ------------------------------------------------------------------ #
+    # Layout routing
+    # ------------------------------------------------------------------ #
+    def _engine_for(self, strategy: LayoutStrategy) -> Optional[LayoutEngine]:
         if strategy is LayoutStrategy.TREE:
-            engine = self._tree_layout_engine
-        elif strategy is LayoutStrategy.DAG:
-            engine = self._dag_layout_engine
-        else:
-            engine = self._layout_engine
-
-        if engine:
-            offsets = self._structure_offsets
-            # best-effort: inject offsets if engine exposes offset_* or setter
-            if hasattr(engine, "set_offsets"):
-                engine.set_offsets(offsets)
-            if hasattr(engine, "set_structure_config"):
-                engine.set_structure_config(self._structure_layout_config)
-            else:
-                # try common attribute names
-                setattr(engine, "offset_map", offsets)
-            return engine.apply_layout(timeline)
-        return timeline
+            return self._tree_layout_engine
+        if strategy is LayoutStrategy.DAG:
+            return self._dag_layout_engine
+        return self._layout_engine
+
+    def _binding(self, structure_id: str, kind: str) -> LayoutBinding:
+        """
+        Routing table entry of a structure, built on first use after the
+        structure is created. Structures that are not (or no longer) in the
+        scene get a transient binding.
+        """
+        binding = self._layout_bindings.get(structure_id)
+        if binding is not None:
+            return binding
+        strategy = self._layout_map.get(kind, LayoutStrategy.LINEAR)
+        binding = LayoutBinding(
+            strategy=strategy,
+            engine=self._attach_engine(strategy),
+        )
+        if structure_id in self._structures:
+            self._layout_bindings[structure_id] = binding
+            self._strategy_sids.setdefault(strategy, set()).add(structure_id)
+        return binding
+
+    def _attach_engine(self, strategy: LayoutStrategy) -> Optional[LayoutEngine]:
+        """
+        Hand the engine the scene's offset/config maps and its structure set
+        once; engines keep the references, so later bindings only add
+        entries. Re-attached when those maps are replaced (import_scene).
+        """
+        engine = self._engine_for(strategy)
+        if engine is None or strategy in self._attached_engines:
+            return engine
+        engine.set_filter(self._strategy_sids.setdefault(strategy, set()))
+        engine.set_offsets(self._structure_offsets)
+        engine.set_structure_config(self._structure_layout_config)
+        self._attached_engines.add(strategy)
+        return engine
+
+    def _save_layout_rows(self) -> Dict[LayoutStrategy, Any]:
+        rows: Dict[LayoutStrategy, Any] = {}
+        for strategy in LayoutStrategy:
+            engine = self._engine_for(strategy)
+            if engine is not None:
+                rows[strategy] = engine.save_rows()
+        return rows
+
+    def _restore_layout_rows(self, rows: Optional[Dict[LayoutStrategy, Any]]) -> None:
+        for strategy, saved in (rows or {}).items():
+            engine = self._engine_for(strategy)
+            if engine is not None:
+                engine.restore_rows(saved)
+
+    def _unbind(self, structure_id: str) -> None:
+        binding = self._layout_bindings.pop(structure_id, None)
+        if binding is not None:
+            self._strategy_sids.get(binding.strategy, set()).discard(structure_id)
+
+    def _prune_bindings(self) -> None:
+        """Drop the bindings of structures that left the scene."""
+        for sid in [s for s in self._layout_bindings if s not in self._structures]:
+            self._unbind(sid)
+
+    def set_layout_config(
+        self, structure_id: str, config: Mapping[str, object]
+    ) -> None:
+        """
+        Replace the layout config (orientation/spacing/...) of a structure;
+        takes effect from its next command. Engines share the config map, so
+        the binding stays valid.
+        """
+        if structure_id not in self._structures:
+            raise CommandError(f"Structure not found: {structure_id!r}")
+        self._structure_layout_config[structure_id] = dict(config)
+        self._after_write(())
+
+    def _apply_layout(
+        self, structure_id: str, kind: str, timeline: Timeline
+    ) -> Timeline:
+        engine = self._binding(structure_id, kind).engine
+        if engine is None:
+            return timeline
+        return engine.apply_layout(timeline)
+
+    def _layout_with(self, strategy: LayoutStrategy, timeline: Timeline) -> Timeline:
+        engine = self._attach_engine(strategy)
+        if engine is None:
+            return timeline
+        return engine.apply_layout(timeline)
+
+    def _layout_batch(
+        self,
+        parts: List[Tuple[str, str, Timeline]],
+        detail: Optional[DetailLevel] = None,
+    ) -> Timeline:
+        """
+        Lay out the structural timelines of a batch with one engine pass per
+        strategy. Engines map steps 1:1, so without `detail` the laid-out
+        steps are put back in command order.
+        """
+        groups: Dict[LayoutStrategy, Timeline] = {}
+        spans: List[Tuple[LayoutStrategy, int, int]] = []
+        for structure_id, kind, structural in parts:
+            strategy = self._binding(structure_id, kind).strategy
+            group = groups.setdefault(strategy, Timeline())
+            spans.append((strategy, len(group.steps), len(structural.steps)))
+            group.steps.extend(structural.steps)
+
+        laid_out: Dict[LayoutStrategy, Timeline] = {}
+        for strategy, group in groups.items():
+            if detail is not None:
+                group = condense_timeline(group, detail)
+            laid_out[strategy] = self._layout_with(strategy, group)
+
+        merged = Timeline()
+        one_to_one = all(
+            len(laid_out[strategy].steps) == len(groups[strategy].steps)
+            for strategy in groups
+        )
+        if detail is not None or not one_to_one:
+            for result in laid_out.values():
+                merged.steps.extend(result.steps)
+            return merged
+        for strategy, start, count in spans:
+            merged.steps.extend(laid_out[strategy].steps[start : start + count])
+        return merged
+
+    def _layout_mixed_step(
+        self, step: AnimationStep, kinds: Mapping[str, str]
+    ) -> AnimationStep:
+        """
+        Lay out one step touching structures of several strategies: each
+        engine sees the ops of its structures; ops without structure_id
+        (restored SET_POS) pass through, and engine positions come last.
+        """
+        by_strategy: Dict[LayoutStrategy, List[AnimationOp]] = {}
+        passthrough: List[AnimationOp] = []
+        for op in step.ops:
+            sid = op.data.get("structure_id") or ""
+            kind = kinds.get(sid)
+            if kind is None:
+                passthrough.append(op)
+                continue
+            strategy = self._binding(sid, kind).strategy
+            by_strategy.setdefault(strategy, []).append(op)
+
+        structural: List[AnimationOp] = []
+        positions: List[AnimationOp] = []
+        for strategy, ops in by_strategy.items():
+            single = Timeline()
+            single.add_step(AnimationStep(ops=ops, label=step.label))
+            for laid in self._layout_with(strategy, single).steps:
+                positions.extend(laid.ops[len(ops) :])
+            structural.extend(ops)
+        return AnimationStep(
+            ops=structural + passthrough + positions,
+            duration_ms=step.duration_ms,
+            label=step.label,
+        )
 
     # ------------------------------------------------------------------ #
     # Model registry + schema helpers
@@ -458,11 +1098,13 @@ class SceneGraph:
     ) -> Tuple[str, str, Mapping[str, Any]]:
         if not isinstance(command.payload, Mapping):
             raise CommandError("Command payload must be a mapping")
-        
-        payload = dict(command.payload)
+
+        # Handlers only read the payload: copy it only to fill in the kind.
+        payload = command.payload
         kind = payload.get("kind")
 
         if kind is None:
+            payload = dict(payload)
             # Try to resolve kind from existing structure
             model = self._structures.get(command.structure_id)
             if model:
@@ -483,7 +1125,8 @@ class SceneGraph:
         schema = SCHEMA_REGISTRY.get((command.type, kind))
         if schema is None:
             raise CommandError(f"Unsupported command/kind combination: {kind!r}")
-        schema.validate(payload)
+        if not command.validated:
+            schema.validate(payload)
 
         op_name = MODEL_OP_REGISTRY.get((command.type, kind))
         if op_name is None:
@@ -0,0 +1,109 @@
+"""
+Copy-on-write scene snapshots.
+
+`SceneGraph.snapshot()` records which structures exist and their revision
+numbers (plus the small offset/config maps); no model data is copied. A
+structure's state is exported lazily:
+
+- when it is read (`state()` / `to_dict()`), usually by an autosave writer,
+  possibly on another thread; `release()` ends tracking;
+- or, copy-on-write, just before SceneGraph modifies a structure that an
+  open snapshot still needs at its recorded revision.
+
+Exported states are cached per (structure, revision) by the SceneGraph, so an
+unchanged structure is exported once no matter how many snapshots or
+export_scene calls see it. Exported states are shared: treat them as
+read-only.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .scene_graph import SceneGraph
+
+SCENE_VERSION = "1.0"
+
+
+class SceneSnapshot:
+    """Point-in-time view of a SceneGraph; O(#structures) to take."""
+
+    def __init__(
+        self,
+        scene: "SceneGraph",
+        revision: int,
+        structures: List[Tuple[str, str, int]],
+        offsets: Mapping[str, Tuple[float, float]],
+        configs: Mapping[str, Mapping[str, object]],
+    ) -> None:
+        self.revision = revision
+        self._scene: Optional["SceneGraph"] = scene
+        self._kinds = {sid: kind for sid, kind, _ in structures}
+        self._revisions = {sid: rev for sid, _, rev in structures}
+        self._offsets = dict(offsets)
+        self._configs = dict(configs)
+        self._states: Dict[str, Mapping[str, object]] = {}
+        self._materialized: Optional[Mapping[str, object]] = None
+
+    @property
+    def structure_ids(self) -> List[str]:
+        return list(self._kinds)
+
+    @property
+    def structure_revisions(self) -> Dict[str, int]:
+        return dict(self._revisions)
+
+    def needs(self, structure_id: str, revision: int) -> bool:
+        """True while the state of `structure_id` at `revision` is not captured."""
+        return (
+            self._scene is not None
+            and structure_id not in self._states
+            and self._revisions.get(structure_id) == revision
+        )
+
+    def capture(self, structure_id: str, state: Mapping[str, object]) -> None:
+        self._states.setdefault(structure_id, state)
+
+    def kind(self, structure_id: str) -> str:
+        return self._kinds[structure_id]
+
+    def offset(self, structure_id: str) -> Optional[Tuple[float, float]]:
+        return self._offsets.get(structure_id)
+
+    def config(self, structure_id: str) -> Optional[Mapping[str, object]]:
+        return self._configs.get(structure_id)
+
+    def state(self, structure_id: str) -> Mapping[str, object]:
+        """Exported state at the snapshot's revision (exported on demand)."""
+        state = self._states.get(structure_id)
+        if state is None:
+            scene = self._scene
+            if scene is None:
+                raise RuntimeError("Snapshot already released")
+            state = scene._capture_for_snapshot(self, structure_id)
+        return state
+
+    def structure_entry(self, structure_id: str) -> Mapping[str, object]:
+        """One `structures[]` entry of the export_scene format."""
+        return {
+            "id": structure_id,
+            "kind": self._kinds[structure_id],
+            "state": self.state(structure_id),
+            "offset": self._offsets.get(structure_id),
+            "config": self._configs.get(structure_id),
+        }
+
+    def to_dict(self) -> Mapping[str, object]:
+        """Materialize in the export_scene format (exports what is still missing)."""
+        if self._materialized is None:
+            structures = [self.structure_entry(sid) for sid in self._kinds]
+            self._materialized = {"version": SCENE_VERSION, "structures": structures}
+            self.release()
+        return self._materialized
+
+    def release(self) -> None:
+        """Stop copy-on-write tracking; states not read yet become unavailable."""
+        scene, self._scene = self._scene, None
+        if scene is not None:
+            scene._release_snapshot(self)
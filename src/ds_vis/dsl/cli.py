@@ -2,12 +2,186 @@ from __future__ import annotations
 
 import argparse
 import io
+import os
 import sys
-from typing import Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, TextIO, Tuple
 
 from ds_vis.core.exceptions import CommandError
 from ds_vis.core.scene.scene_graph import SceneGraph
 from ds_vis.dsl.parser import parse_dsl, run_commands
+from ds_vis.persistence.json_io import iter_commands, save_timeline_to_file
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of compiling one script in batch mode."""
+
+    path: str
+    output: Optional[str] = None
+    commands: int = 0
+    steps: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def compile_script(path: str, output: str) -> ScriptResult:
+    """
+    Parse one DSL/JSON script, run it on a fresh SceneGraph and write the
+    laid-out Timeline as JSON to `output`. Errors are returned, not raised,
+    so one bad script never stops a batch.
+    """
+    start = time.perf_counter()
+    result = ScriptResult(path=path)
+    try:
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Failed to read script: {exc}") from exc
+        commands = parse_dsl(text)
+        timeline = SceneGraph().apply_commands(commands)
+        save_timeline_to_file(timeline, output)
+        result.output = output
+        result.commands = len(commands)
+        result.steps = len(timeline.steps)
+    except CommandError as exc:
+        result.error = str(exc)
+    except Exception as exc:  # isolate any per-script failure
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _output_paths(paths: Sequence[str], out_dir: Path) -> List[str]:
+    outputs: List[str] = []
+    used: set[str] = set()
+    for path in paths:
+        stem = Path(path).stem
+        name = f"{stem}.timeline.json"
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{stem}-{n}.timeline.json"
+        used.add(name)
+        outputs.append(str(out_dir / name))
+    return outputs
+
+
+def compile_scripts(
+    paths: Sequence[str], out_dir: str | Path, jobs: Optional[int] = None
+) -> List[ScriptResult]:
+    """
+    Compile many scripts into `out_dir` (one `<stem>.timeline.json` each),
+    fanned out over `jobs` worker processes (default: CPU count; 1 runs
+    inline). Results are in input order. Scripts lost to a crashed worker
+    are rerun one per process, so only the script that crashes fails.
+    """
+    out = Path(out_dir)
+    try:
+        out.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        raise CommandError(f"Failed to create output directory: {exc}") from exc
+    outputs = _output_paths(paths, out)
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [compile_script(p, o) for p, o in zip(paths, outputs)]
+
+    jobs_list = list(zip(paths, outputs))
+    results: List[Optional[ScriptResult]] = [None] * len(jobs_list)
+    crashed = _run_pool(jobs_list, range(len(jobs_list)), results, workers)
+    # A dying worker breaks the whole pool and fails every unfinished
+    # future: rerun those one per process so only the crashing script fails.
+    for start in range(0, len(crashed), workers):
+        _run_isolated(jobs_list, crashed[start : start + workers], results)
+    return [r for r in results if r is not None]
+
+
+def _run_pool(
+    jobs: Sequence[Tuple[str, str]],
+    indices: Iterable[int],
+    results: List[Optional[ScriptResult]],
+    workers: int,
+) -> List[int]:
+    """Run `indices` on one pool; returns those lost to a broken pool."""
+    broken: List[int] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(i, pool.submit(compile_script, *jobs[i])) for i in indices]
+        for i, future in futures:
+            try:
+                results[i] = future.result()
+            except BrokenProcessPool:
+                broken.append(i)
+            except Exception as exc:
+                results[i] = ScriptResult(
+                    path=jobs[i][0], error=f"{type(exc).__name__}: {exc}"
+                )
+    return broken
+
+
+def _run_isolated(
+    jobs: Sequence[Tuple[str, str]],
+    indices: Sequence[int],
+    results: List[Optional[ScriptResult]],
+) -> None:
+    """Run each of `indices` in its own single-worker pool, concurrently."""
+    pools = [ProcessPoolExecutor(max_workers=1) for _ in indices]
+    try:
+        futures = [
+            pool.submit(compile_script, *jobs[i]) for pool, i in zip(pools, indices)
+        ]
+        for i, future in zip(indices, futures):
+            try:
+                results[i] = future.result()
+            except BrokenProcessPool:
+                results[i] = ScriptResult(
+                    path=jobs[i][0], error="Worker process crashed"
+                )
+            except Exception as exc:
+                results[i] = ScriptResult(
+                    path=jobs[i][0], error=f"{type(exc).__name__}: {exc}"
+                )
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    if not args.out_dir:
+        print("Error: --batch requires --out-dir", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        results = compile_scripts(args.batch, args.out_dir, args.jobs)
+    except CommandError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result.ok:
+            print(
+                f"{result.path} -> {result.output} "
+                f"({result.commands} command(s), {result.steps} step(s), "
+                f"{result.seconds:.3f}s)"
+            )
+        else:
+            print(f"Error: {result.path}: {result.error}", file=sys.stderr)
+    done = [r for r in results if r.ok]
+    commands = sum(r.commands for r in done)
+    rate = 1.0 / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Compiled {len(done)}/{len(results)} script(s), {commands} command(s) "
+        f"in {elapsed:.2f}s ({len(results) * rate:.1f} scripts/s, "
+        f"{commands * rate:.0f} commands/s)"
+    )
+    return 0 if len(done) == len(results) else 1
 
 
 def _read_input(args: argparse.Namespace) -> str:
@@ -18,6 +192,23 @@ def _read_input(args: argparse.Namespace) -> str:
     return sys.stdin.read()
 
 
+def _run_stream(args: argparse.Namespace) -> int:
+    if isinstance(args.text, str):
+        stream: TextIO = io.StringIO(args.text)
+    elif args.file is not None:
+        stream = args.file
+    else:
+        stream = sys.stdin
+    try:
+        sg = SceneGraph(history_limit=0)
+        count = sg.replay(iter_commands(stream))
+    except CommandError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Executed {count} command(s)")
+    return 0
+
+
 def run_cli(argv: Optional[list[str]] = None) -> int:
     """
     Minimal CLI hook: parse DSL/JSON text and apply to SceneGraph.
@@ -35,7 +226,33 @@ def run_cli(argv: Optional[list[str]] = None) -> int:
         type=str,
         help="Inline DSL/JSON string (overrides --file/stdin)",
     )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PATH",
+        help="Compile many scripts to laid-out timelines (requires --out-dir)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        help="Output directory for --batch timelines (<stem>.timeline.json)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read a JSON array or JSON Lines command log incrementally "
+        "(constant memory)",
+    )
     args = parser.parse_args(argv)
+    if args.batch:
+        return _run_batch(args)
+    if args.stream:
+        return _run_stream(args)
 
     try:
         text = _read_input(args)
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterable, List, Mapping
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Mapping
 
 from ds_vis.core.exceptions import CommandError
 from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.command_schema import VALUE_KEYED_KINDS
 from ds_vis.persistence.json_io import commands_from_json
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from ds_vis.core.scene.scene_graph import SceneGraph
 
-KEYWORDS = {"list", "seqlist", "stack", "bst", "git", "huffman"}
+KEYWORDS = {"list", "seqlist", "stack", "bst", "avl", "rbtree", "git", "huffman"}
 
 
 def parse_dsl(
@@ -21,72 +22,39 @@ def parse_dsl(
       - Accept simple文本语法，语句以 ';' 分隔，格式：
         <kind> <id> [= [values...]] | <op> <id> [args...]
     """
+    return list(iter_dsl(text, existing_kinds=existing_kinds))
+
+
+def iter_dsl(
+    text: str, existing_kinds: Mapping[str, str] | None = None
+) -> Iterator[Command]:
+    """
+    Lazily parse DSL text, yielding each Command as soon as its statement ends.
+
+    Same grammar as `parse_dsl`; lets callers start applying (and playing)
+    the first commands of a long script before the rest is parsed. Errors
+    surface when the offending statement is reached.
+    """
     text = text.strip()
     if not text:
-        return []
+        return
 
     # JSON branch for compatibility
     if text.lstrip().startswith("["):
         try:
-            return commands_from_json(text)
+            commands = commands_from_json(text)
         except Exception as exc:  # pragma: no cover - defensive
             raise CommandError(f"Failed to parse DSL input: {exc}") from exc
+        yield from commands
+        return
 
-    commands: List[Command] = []
     # Normalize existing_kinds to lowercase keys for robust lookup
     ctx: dict[str, str] = {k.lower(): v for k, v in (existing_kinds or {}).items()}
-    
-    # 1. Strip comments
-    processed_lines = []
-    for line in text.splitlines():
-        comment_idx = -1
-        in_q = False
-        for idx, char in enumerate(line):
-            if char == '"':
-                in_q = not in_q
-            elif char == '#' and not in_q:
-                comment_idx = idx
-                break
-        if comment_idx != -1:
-            line = line[:comment_idx]
-        processed_lines.append(line)
-    text = "\n".join(processed_lines)
-
-    # 2. Split into statements by ';' or newline (respecting brackets)
-    raw_statements: List[str] = []
-    current: List[str] = []
-    in_bracket = False
-    in_quote = False
-    for char in text:
-        if char == '"':
-            in_quote = not in_quote
-            current.append(char)
-        elif in_quote:
-            current.append(char)
-        elif char == '[':
-            in_bracket = True
-            current.append(char)
-        elif char == ']':
-            in_bracket = False
-            current.append(char)
-        elif (char == ';' or char == '\n') and not in_bracket:
-            stmt = "".join(current).strip()
-            if stmt:
-                raw_statements.append(stmt)
-            current = []
-        else:
-            current.append(char)
-    
-    final_stmt = "".join(current).strip()
-    if final_stmt:
-        raw_statements.append(final_stmt)
-
-    for stmt in raw_statements:
+    for stmt in _iter_statements(text):
         cmd, kind = _parse_statement(stmt, ctx)
         if kind:
             ctx[cmd.structure_id.lower()] = kind
-        commands.append(cmd)
-    return commands
+        yield cmd
 
 
 def run_commands(commands: Iterable[Command], scene_graph: "SceneGraph") -> None:
@@ -100,6 +68,50 @@ def run_commands(commands: Iterable[Command], scene_graph: "SceneGraph") -> None
 # --------------------------------------------------------------------------- #
 # Internal parsing helpers
 # --------------------------------------------------------------------------- #
+def _iter_statements(text: str) -> Iterator[str]:
+    """
+    Split DSL text into statements by ';' or newline (respecting brackets
+    and quotes), stripping '#' comments line by line.
+    """
+    current: List[str] = []
+    in_bracket = False
+    in_quote = False
+    for line in text.splitlines():
+        # 1. Strip comments (quote state is per line here)
+        in_q = False
+        for idx, char in enumerate(line):
+            if char == '"':
+                in_q = not in_q
+            elif char == '#' and not in_q:
+                line = line[:idx]
+                break
+
+        # 2. Split into statements (bracket/quote state spans lines)
+        for char in line + "\n":
+            if char == '"':
+                in_quote = not in_quote
+                current.append(char)
+            elif in_quote:
+                current.append(char)
+            elif char == '[':
+                in_bracket = True
+                current.append(char)
+            elif char == ']':
+                in_bracket = False
+                current.append(char)
+            elif (char == ';' or char == '\n') and not in_bracket:
+                stmt = "".join(current).strip()
+                if stmt:
+                    yield stmt
+                current = []
+            else:
+                current.append(char)
+
+    final_stmt = "".join(current).strip()
+    if final_stmt:
+        yield final_stmt
+
+
 def _parse_statement(stmt: str, ctx: Mapping[str, str]) -> tuple[Command, str | None]:
     """
     stmt grammar (minimal, whitespace separated):
@@ -110,6 +122,7 @@ def _parse_statement(stmt: str, ctx: Mapping[str, str]) -> tuple[Command, str |
       update: update <id> <index> <new_value>
       push/pop: push <id> <value> | pop <id>
       git: git <id> init | commit <id> <msg> | checkout <id> <target>
+           git <id> branch <name> [start] | git <id> merge <source>
     """
     tokens = _tokenize(stmt)
     if not tokens:
@@ -117,6 +130,10 @@ def _parse_statement(stmt: str, ctx: Mapping[str, str]) -> tuple[Command, str |
 
     # create with assignment: kind id = [1,2,3]
     first_token_lower = tokens[0].lower()
+    # git <id> <subcommand> ...: init/commit/checkout/branch/merge
+    is_git_sub = len(tokens) >= 3 and not any("=" in tok for tok in tokens[1:3])
+    if first_token_lower == "git" and is_git_sub:
+        return _parse_git(tokens)
     if first_token_lower in KEYWORDS and len(tokens) >= 2:
         cmd = _parse_create(tokens)
         return cmd, first_token_lower
@@ -263,7 +280,7 @@ def _parse_delete(tokens: List[str], ctx: Mapping[str, str]) -> Command:
         if tokens[2].startswith("val="):
             payload["value"] = _coerce_value(tokens[2].split("=", 1)[1])
         else:
-            if kind == "bst":
+            if kind in VALUE_KEYED_KINDS:
                 payload["value"] = _coerce_value(tokens[2])
             else:
                 payload["index"] = _coerce_value(tokens[2])
@@ -282,7 +299,7 @@ def _parse_search(tokens: List[str], ctx: Mapping[str, str]) -> Command:
         if tokens[2].startswith("val="):
             payload["value"] = _coerce_value(tokens[2].split("=", 1)[1])
         else:
-            if kind == "bst":
+            if kind in VALUE_KEYED_KINDS:
                 payload["value"] = _coerce_value(tokens[2])
             else:
                 payload["index"] = _coerce_value(tokens[2])
@@ -380,6 +397,24 @@ def _parse_git(tokens: List[str]) -> tuple[Command, str | None]:
             ),
             None,
         )
+    if sub == "branch":
+        if len(tokens) < 4:
+            raise CommandError("git branch requires name")
+        payload = {"kind": "git", "name": tokens[3]}
+        if len(tokens) >= 5:
+            payload["start"] = tokens[4]
+        return Command(structure_id, CommandType.GIT_BRANCH, payload=payload), None
+    if sub == "merge":
+        if len(tokens) < 4:
+            raise CommandError("git merge requires source")
+        return (
+            Command(
+                structure_id,
+                CommandType.GIT_MERGE,
+                payload={"kind": "git", "source": tokens[3]},
+            ),
+            None,
+        )
     raise CommandError(f"Unsupported git subcommand: {sub}")
 
 
@@ -0,0 +1,159 @@
+"""
+Periodic scene autosave built on copy-on-write snapshots.
+
+`AutosaveScheduler.poll()` is meant to be called from the UI/event loop (a
+timer tick or after each command). When the scene revision changed and the
+interval elapsed, it takes a `SceneGraph.snapshot()` (O(#structures)) and
+writes it, inline or on a background thread.
+
+Only changed structures are re-serialized: the JSON text of every structure
+state is cached per (structure_id, revision), so an autosave of a scene where
+one structure changed exports and encodes that structure only. The file is
+written atomically (temp file + os.replace) in the export_scene format, so
+`load_scene_from_file` / `SceneGraph.import_scene` read it back.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.core.scene.snapshot import SCENE_VERSION, SceneSnapshot
+
+
+class AutosaveScheduler:
+    """
+    Save `scene_graph` to `path` at most every `interval_s` seconds, and only
+    when it changed.
+
+    With `background=True` the snapshot is encoded and written on a worker
+    thread (one at a time); the scene may keep changing meanwhile. Errors of
+    a background save (of any type) are kept in `last_error` and raised by
+    `flush()`; a failed save leaves the scene dirty, so the next poll retries.
+    """
+
+    def __init__(
+        self,
+        scene_graph: SceneGraph,
+        path: str | Path,
+        interval_s: float = 30.0,
+        *,
+        background: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval_s < 0:
+            raise CommandError("Autosave interval must be >= 0")
+        self.scene_graph = scene_graph
+        self.path = Path(path)
+        self.interval_s = interval_s
+        self.background = background
+        self._clock = clock
+        self._saved_revision: Optional[int] = None
+        self._last_save: Optional[float] = None
+        self._fragments: Dict[str, Tuple[int, str]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+        self.saves = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self.scene_graph.revision != self._saved_revision
+
+    def poll(self, force: bool = False) -> bool:
+        """
+        Save if the scene changed and the interval elapsed (`force` skips the
+        interval). Returns True when a save was started.
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return False
+        if not self.dirty:
+            return False
+        now = self._clock()
+        if (
+            not force
+            and self._last_save is not None
+            and now - self._last_save < self.interval_s
+        ):
+            return False
+
+        snap = self.scene_graph.snapshot()
+        self._saved_revision = snap.revision
+        self._last_save = now
+        if self.background:
+            self._worker = threading.Thread(
+                target=self._write_in_background,
+                args=(snap,),
+                name="ds-vis-autosave",
+                daemon=True,
+            )
+            self._worker.start()
+        else:
+            self._write(snap)
+        return True
+
+    def flush(self) -> None:
+        """Wait for a background save; raise its error, if any."""
+        worker = self._worker
+        if worker is not None:
+            worker.join()
+            self._worker = None
+        error, self.last_error = self.last_error, None
+        if error is not None:
+            raise error
+
+    def _write_in_background(self, snap: SceneSnapshot) -> None:
+        try:
+            self._write(snap)
+        except Exception as exc:  # the thread would otherwise swallow it
+            self._saved_revision = None
+            self.last_error = exc
+
+    def _write(self, snap: SceneSnapshot) -> None:
+        try:
+            text = self._encode(snap)
+        except Exception:
+            self._saved_revision = None
+            raise
+        finally:
+            snap.release()
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            # Next poll retries: the scene is still dirty from our point of view.
+            self._saved_revision = None
+            raise CommandError(f"Failed to autosave scene: {exc}") from exc
+        self.saves += 1
+
+    def _encode(self, snap: SceneSnapshot) -> str:
+        revisions = snap.structure_revisions
+        fragments: Dict[str, Tuple[int, str]] = {}
+        entries: List[str] = []
+        for sid in snap.structure_ids:
+            revision = revisions[sid]
+            cached = self._fragments.get(sid)
+            if cached is None or cached[0] != revision:
+                cached = (revision, json.dumps(snap.state(sid)))
+            fragments[sid] = cached
+            entries.append(
+                '{"id": %s, "kind": %s, "state": %s, "offset": %s, "config": %s}'
+                % (
+                    json.dumps(sid),
+                    json.dumps(snap.kind(sid)),
+                    cached[1],
+                    json.dumps(snap.offset(sid)),
+                    json.dumps(snap.config(sid)),
+                )
+            )
+        self._fragments = fragments
+        return '{"version": %s, "structures": [%s]}' % (
+            json.dumps(SCENE_VERSION),
+            ", ".join(entries),
+        )
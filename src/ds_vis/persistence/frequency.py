@@ -0,0 +1,68 @@
+"""
+Streaming symbol-frequency counting for Huffman demos.
+
+Files are read in fixed-size chunks and folded into a Counter, so memory is
+bounded by one chunk plus the alphabet (256 entries in binary mode) no matter
+how large the input is. Feed the result to
+`HuffmanModel.create_from_frequencies`.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+from ds_vis.core.exceptions import CommandError
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+Chunk = Union[bytes, str]
+
+
+def iter_file_chunks(
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    text: bool = False,
+    encoding: str = "utf-8",
+) -> Iterator[Chunk]:
+    """
+    Yield the file's content chunk by chunk (bytes, or str when `text`).
+
+    Raises CommandError on IO or decoding errors.
+    """
+    size = max(1, chunk_size)
+    try:
+        if text:
+            with open(path, "r", encoding=encoding, newline="") as handle:
+                while chunk := handle.read(size):
+                    yield chunk
+        else:
+            with open(path, "rb") as handle:
+                while data := handle.read(size):
+                    yield data
+    except (OSError, UnicodeDecodeError) as exc:
+        raise CommandError(f"Failed to read {path}: {exc}") from exc
+
+
+def count_symbol_frequencies(chunks: Iterable[Chunk]) -> Counter[object]:
+    """
+    Fold chunks into symbol counts (byte values 0-255 for bytes, characters
+    for str). Only the running Counter is kept between chunks.
+    """
+    counts: Counter[object] = Counter()
+    for chunk in chunks:
+        counts.update(chunk)
+    return counts
+
+
+def count_file_frequencies(
+    path: str | Path,
+    text: bool = False,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Counter[object]:
+    """Stream `path` and return its symbol frequencies."""
+    return count_symbol_frequencies(
+        iter_file_chunks(path, chunk_size=chunk_size, text=text, encoding=encoding)
+    )
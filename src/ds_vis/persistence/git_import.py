@@ -0,0 +1,186 @@
+"""
+Streaming import of a local git repository's commit graph.
+
+`git log --topo-order --reverse` is read line by line (parents always come
+before children), commits are grouped into batches and each batch becomes one
+`GIT_IMPORT` command. Replaying the commands through a SceneGraph (or a
+SceneGraphWorker) builds the GitGraphModel and its timeline incrementally;
+the importer itself only keeps the current batch and the set of imported ids.
+`max_count` windows the import to the most recent N commits: parents outside
+the window are dropped by the model, so the oldest windowed commits become
+roots.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.command import Command, CommandType
+
+DEFAULT_BATCH_SIZE = 500
+
+_FIELD_SEP = "\x1f"
+_LOG_FORMAT = "%H%x1f%P%x1f%s"
+
+
+@dataclass(frozen=True)
+class GitLogEntry:
+    commit_id: str
+    parents: Tuple[str, ...]
+    message: str
+
+
+def iter_git_log(
+    repo_path: str | Path,
+    rev: str = "HEAD",
+    max_count: Optional[int] = None,
+    git: str = "git",
+) -> Iterator[GitLogEntry]:
+    """
+    Yield commits reachable from `rev`, parents first.
+
+    With `max_count`, only the most recent N commits are listed (git applies
+    the limit before reversing). Raises CommandError when git fails.
+    """
+    args = [git, "-C", str(repo_path), "log", "--topo-order", "--reverse"]
+    if max_count is not None:
+        if max_count <= 0:
+            return
+        args.append(f"--max-count={max_count}")
+    args += [f"--format={_LOG_FORMAT}", rev, "--"]
+    try:
+        proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+    except OSError as exc:
+        raise CommandError(f"Failed to run git: {exc}") from exc
+
+    stdout, stderr = proc.stdout, proc.stderr
+    if stdout is None or stderr is None:  # pragma: no cover - PIPE requested
+        raise CommandError("Failed to capture git output")
+    completed = False
+    try:
+        for line in stdout:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            commit_id, parents, message = (line.split(_FIELD_SEP, 2) + ["", ""])[:3]
+            yield GitLogEntry(commit_id, tuple(parents.split()), message)
+        completed = True
+    finally:
+        # A consumer that stops early must not leave git blocked on the pipe.
+        stdout.close()
+        if not completed:
+            proc.kill()
+        error = stderr.read()
+        stderr.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise CommandError(f"git log failed in {repo_path}: {error.strip()}")
+
+
+def read_git_refs(
+    repo_path: str | Path, git: str = "git"
+) -> Tuple[Dict[str, str], Optional[str]]:
+    """Return (local branch -> commit id, HEAD branch name or detached id)."""
+    refs = _run_git(
+        repo_path,
+        ["for-each-ref", "--format=%(refname:short) %(objectname)", "refs/heads"],
+        git,
+    )
+    branches: Dict[str, str] = {}
+    for line in refs.splitlines():
+        name, _, commit_id = line.rpartition(" ")
+        if name:
+            branches[name] = commit_id
+    try:
+        head: Optional[str] = _run_git(
+            repo_path, ["symbolic-ref", "--quiet", "--short", "HEAD"], git
+        ).strip()
+    except CommandError:
+        head = None
+    if not head:
+        try:
+            head = _run_git(repo_path, ["rev-parse", "HEAD"], git).strip() or None
+        except CommandError:
+            head = None
+    return branches, head
+
+
+def iter_git_import_commands(
+    repo_path: str | Path,
+    structure_id: str,
+    rev: str = "HEAD",
+    max_count: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    git: str = "git",
+) -> Iterator[Command]:
+    """
+    Stream a repository as GIT_IMPORT commands for `structure_id`.
+
+    The first command resets the structure, the last one places the branch
+    and HEAD labels (only branches whose tip is inside the window).
+    """
+    size = max(1, batch_size)
+    seen: Set[str] = set()
+    batch: List[Dict[str, object]] = []
+    first = True
+    for entry in iter_git_log(repo_path, rev=rev, max_count=max_count, git=git):
+        seen.add(entry.commit_id)
+        batch.append(
+            {
+                "id": entry.commit_id,
+                "message": entry.message,
+                "parents": list(entry.parents),
+            }
+        )
+        if len(batch) >= size:
+            yield _import_command(structure_id, batch, reset=first)
+            batch = []
+            first = False
+
+    branches, head = read_git_refs(repo_path, git=git)
+    refs = {name: cid for name, cid in branches.items() if cid in seen}
+    payload_head = head if head in refs or head in seen else None
+    yield _import_command(
+        structure_id, batch, reset=first, branches=refs, head=payload_head
+    )
+
+
+def _import_command(
+    structure_id: str,
+    commits: List[Dict[str, object]],
+    reset: bool,
+    branches: Optional[Dict[str, str]] = None,
+    head: Optional[str] = None,
+) -> Command:
+    payload: Dict[str, object] = {"kind": "git", "commits": commits, "reset": reset}
+    if branches:
+        payload["branches"] = branches
+    if head is not None:
+        payload["head"] = head
+    return Command(structure_id, CommandType.GIT_IMPORT, payload)
+
+
+def _run_git(repo_path: str | Path, args: List[str], git: str) -> str:
+    try:
+        result = subprocess.run(
+            [git, "-C", str(repo_path), *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise CommandError(f"git {args[0]} failed in {repo_path}: {exc}") from exc
+    return result.stdout
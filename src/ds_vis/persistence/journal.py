@@ -0,0 +1,339 @@
+"""
+Append-only command journal with periodic checkpoints (event sourcing).
+
+A journal directory holds:
+
+- `checkpoint.json`: `{"version", "seq", "scene", "default_detail",
+  "structure_detail"}` where `scene` is `export_scene()` after command `seq`;
+- `journal.jsonl`: one line per applied command, `{"seq", "structure_id",
+  "type", "payload"}`.
+
+`CommandJournal` writes ahead: a command's lines are written (flushed, not
+yet fsynced) before the scene applies it, and cut off again if it fails, so
+the scene never holds a command the journal could not record. Lines are
+fsynced in batches: every `sync_every` commands, or once `sync_interval_s`
+has elapsed. The interval is checked on append and by `poll()`, which the
+owner calls from a timer so that the window stays bounded when commands stop
+arriving; a crash loses at most that window. Every `checkpoint_every`
+commands the scene is checkpointed and the journal compacted (commands up to
+the checkpoint are dropped).
+
+`CommandJournal.open(directory)` recovers: it imports the checkpoint and
+replays only the journal tail after it. A torn last line (crash mid-write) is
+discarded. Recovery restores the scene, not the undo/redo history; undo/redo
+through the journal write a checkpoint, since they are not commands.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import DetailLevel, Timeline
+from ds_vis.core.scene.command import Command
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.core.scene.snapshot import SCENE_VERSION
+
+from .json_io import command_from_dict, command_to_dict
+
+CHECKPOINT_FILE = "checkpoint.json"
+JOURNAL_FILE = "journal.jsonl"
+
+# Commands per replay chunk during recovery (one layout pass per strategy
+# each).
+_REPLAY_CHUNK = 512
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - e.g. platforms without dir fds
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+class CommandJournal:
+    """
+    Durable command log for one SceneGraph.
+
+    `CommandJournal(scene, directory)` starts a new journal: the current
+    scene becomes the first checkpoint and any old journal is discarded.
+    `CommandJournal.open(directory)` resumes an existing one (or starts an
+    empty scene). Apply commands through the journal, not the scene.
+    """
+
+    def __init__(
+        self,
+        scene: SceneGraph,
+        directory: str | Path,
+        *,
+        checkpoint_every: int = 1000,
+        sync_every: int = 64,
+        sync_interval_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        _resume_seq: Optional[int] = None,
+    ) -> None:
+        self.scene = scene
+        self.directory = Path(directory)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.sync_every = max(1, sync_every)
+        self.sync_interval_s = sync_interval_s
+        self._clock = clock
+        self._unsynced = 0
+        self._last_sync = clock()
+        self.replayed = 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file = (self.directory / JOURNAL_FILE).open("a", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Failed to open command journal: {exc}") from exc
+        if _resume_seq is None:
+            self._seq = 0
+            self._checkpoint_seq = -1
+            self.checkpoint()
+        else:
+            self._seq = self._checkpoint_seq = _resume_seq
+
+    @property
+    def seq(self) -> int:
+        """Number of commands journaled since the journal was created."""
+        return self._seq
+
+    @property
+    def pending_sync(self) -> int:
+        """Journaled commands not yet fsynced."""
+        return self._unsynced
+
+    # ------------------------------------------------------------------ #
+    # Write path
+    # ------------------------------------------------------------------ #
+    def apply_command(self, command: Command) -> Timeline:
+        return self._journaled([command], lambda: self.scene.apply_command(command))
+
+    def apply_commands(
+        self,
+        commands: Iterable[Command],
+        detail: DetailLevel | str | int | None = None,
+    ) -> Timeline:
+        """Atomic batch (see SceneGraph.apply_commands), journaled on success."""
+        batch = list(commands)
+        return self._journaled(batch, lambda: self.scene.apply_commands(batch, detail))
+
+    def undo(self) -> Timeline:
+        timeline = self.scene.undo()
+        self.checkpoint()
+        return timeline
+
+    def redo(self) -> Timeline:
+        timeline = self.scene.redo()
+        self.checkpoint()
+        return timeline
+
+    def _journaled(
+        self, commands: List[Command], apply: Callable[[], Timeline]
+    ) -> Timeline:
+        """Write `commands` ahead, run `apply`, and cut them off if it fails."""
+        if not commands:
+            return apply()
+        seq, offset = self._seq, self._write(commands)
+        try:
+            timeline = apply()
+        except Exception:
+            self._rewind(seq, offset)
+            raise
+        self._unsynced += len(commands)
+        if self._seq - self._checkpoint_seq >= self.checkpoint_every:
+            self.checkpoint()
+        elif self._unsynced >= self.sync_every or self._interval_elapsed():
+            self.sync()
+        return timeline
+
+    def _write(self, commands: List[Command]) -> int:
+        """Write and flush the lines of `commands`; returns the prior file size."""
+        seq = self._seq
+        lines = []
+        for command in commands:
+            seq += 1
+            record = {"seq": seq, **command_to_dict(command)}
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        try:
+            # Lines are flushed per append, so the file size is the offset
+            # (tell() is stale after checkpoint() truncates the file).
+            offset = os.fstat(self._file.fileno()).st_size
+        except OSError as exc:
+            raise CommandError(f"Failed to append to command journal: {exc}") from exc
+        try:
+            self._file.write("".join(lines))
+            self._file.flush()
+        except OSError as exc:
+            self._rewind(self._seq, offset)  # drop a partly written line
+            raise CommandError(f"Failed to append to command journal: {exc}") from exc
+        self._seq = seq
+        return offset
+
+    def _rewind(self, seq: int, offset: int) -> None:
+        self._seq = seq
+        try:
+            self._file.truncate(offset)
+        except OSError as exc:
+            raise CommandError(f"Failed to rewind command journal: {exc}") from exc
+
+    def _interval_elapsed(self) -> bool:
+        return self._clock() - self._last_sync >= self.sync_interval_s
+
+    def poll(self) -> bool:
+        """
+        Timer hook: fsync pending lines once `sync_interval_s` has elapsed
+        since the last sync. Returns True when it synced.
+        """
+        if self._unsynced and self._interval_elapsed():
+            self.sync()
+            return True
+        return False
+
+    def sync(self) -> None:
+        """Flush and fsync the journal."""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as exc:
+            raise CommandError(f"Failed to sync command journal: {exc}") from exc
+        self._unsynced = 0
+        self._last_sync = self._clock()
+
+    def checkpoint(self) -> None:
+        """
+        Write the current scene as the checkpoint and compact the journal.
+
+        Order keeps every step crash-safe: the checkpoint is replaced
+        atomically first (recovery skips journal lines up to its `seq`),
+        then the journal is truncated.
+        """
+        self.sync()
+        data = {
+            "version": SCENE_VERSION,
+            "seq": self._seq,
+            "scene": self.scene.export_scene(),
+            "default_detail": self.scene.default_detail.name,
+            "structure_detail": {
+                sid: level.name for sid, level in self.scene._structure_detail.items()
+            },
+        }
+        path = self.directory / CHECKPOINT_FILE
+        tmp = path.with_suffix(".tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+            _fsync_dir(self.directory)
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as exc:
+            raise CommandError(f"Failed to write journal checkpoint: {exc}") from exc
+        self._checkpoint_seq = self._seq
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> CommandJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Recovery
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def open(
+        cls,
+        directory: str | Path,
+        *,
+        scene_factory: Callable[[], SceneGraph] = SceneGraph,
+        **options: Any,
+    ) -> CommandJournal:
+        """
+        Recover the scene of `directory` (latest checkpoint + journal tail)
+        and keep journaling to it. Starts an empty journal if there is none.
+        """
+        directory = Path(directory)
+        scene = scene_factory()
+        checkpoint_path = directory / CHECKPOINT_FILE
+        if not checkpoint_path.exists():
+            return cls(scene, directory, **options)
+        try:
+            data = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise CommandError(f"Failed to read journal checkpoint: {exc}") from exc
+        if not isinstance(data, dict) or not isinstance(data.get("seq"), int):
+            raise CommandError("Invalid journal checkpoint")
+        if data.get("version") != SCENE_VERSION:
+            raise CommandError(
+                f"Unsupported journal checkpoint version: {data.get('version')!r}"
+            )
+        seq: int = data["seq"]
+        scene.import_scene(data["scene"])
+        scene.set_detail_level(data.get("default_detail", "L2"))
+        for sid, level in dict(data.get("structure_detail") or {}).items():
+            scene.set_detail_level(level, sid)
+
+        tail = _read_tail(directory / JOURNAL_FILE, seq)
+        scene.replay(tail, chunk_size=_REPLAY_CHUNK)
+        scene.clear_history()
+
+        journal = cls(scene, directory, _resume_seq=seq + len(tail), **options)
+        journal.replayed = len(tail)
+        return journal
+
+
+def _read_tail(path: Path, after_seq: int) -> List[Command]:
+    """
+    Commands with seq > `after_seq`, in order. A torn last line is cut off
+    the file; any other malformed line or a gap in seq raises CommandError.
+    """
+    commands: List[Command] = []
+    try:
+        fh = path.open("r+b")
+    except FileNotFoundError:
+        return commands
+    except OSError as exc:
+        raise CommandError(f"Failed to read command journal: {exc}") from exc
+    with fh:
+        good_end = 0
+        expected = after_seq + 1
+        for raw in fh:
+            try:
+                record = json.loads(raw)
+                if not raw.endswith(b"\n"):
+                    raise ValueError("unterminated line")
+            except ValueError as exc:
+                if fh.read(1):
+                    raise CommandError(f"Corrupt command journal line: {exc}") from exc
+                fh.truncate(good_end)
+                break
+            good_end += len(raw)
+            seq = record.get("seq") if isinstance(record, dict) else None
+            if not isinstance(seq, int):
+                raise CommandError("Command journal line requires seq")
+            if seq <= after_seq:
+                continue  # checkpointed before the journal was compacted
+            if seq != expected:
+                raise CommandError(f"Command journal gap: expected {expected}")
+            commands.append(command_from_dict(record))
+            expected += 1
+    return commands
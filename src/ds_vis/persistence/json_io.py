@@ -1,28 +1,60 @@
 from __future__ import annotations
 
 import json
+import re
 from pathlib import Path
-from typing import Iterable, List, Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO
 
 from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import Timeline
 from ds_vis.core.scene.command import Command, CommandType
 from ds_vis.core.scene.command_schema import SCHEMA_REGISTRY
 
 
+def command_to_dict(cmd: Command) -> Dict[str, object]:
+    """JSON-ready form of one Command."""
+    return {
+        "structure_id": cmd.structure_id,
+        "type": cmd.type.name,
+        "payload": cmd.payload,
+    }
+
+
+def command_from_dict(item: object) -> Command:
+    """
+    Parse one command mapping and validate it via SCHEMA_REGISTRY; the
+    Command is marked `validated`.
+    """
+    if not isinstance(item, Mapping):
+        raise CommandError("Each command must be a mapping")
+    structure_id = item.get("structure_id")
+    type_name = item.get("type")
+    payload_raw = item.get("payload")
+    if not isinstance(payload_raw, Mapping):
+        raise CommandError("Command payload must be a mapping")
+    payload: Mapping[str, object] = payload_raw
+    if not isinstance(structure_id, str):
+        raise CommandError("Command requires structure_id as string")
+    if not isinstance(type_name, str):
+        raise CommandError("Command requires type as string")
+    try:
+        cmd_type = CommandType[type_name]
+    except KeyError as exc:
+        raise CommandError(f"Unsupported command type: {type_name!r}") from exc
+    _validate_command_payload(cmd_type, payload)
+    return Command(
+        structure_id=structure_id,
+        type=cmd_type,
+        payload=payload,
+        validated=True,
+    )
+
+
 def commands_to_json(commands: Iterable[Command]) -> str:
     """
     Serialize a list of Commands to JSON (list of dict).
     """
-    return json.dumps(
-        [
-            {
-                "structure_id": cmd.structure_id,
-                "type": cmd.type.name,
-                "payload": cmd.payload,
-            }
-            for cmd in commands
-        ]
-    )
+    return json.dumps([command_to_dict(cmd) for cmd in commands])
 
 
 def save_commands_to_file(commands: Sequence[Command], path: str | Path) -> None:
@@ -38,6 +70,9 @@ def save_commands_to_file(commands: Sequence[Command], path: str | Path) -> None
 def commands_from_json(text: str) -> List[Command]:
     """
     Deserialize Commands from JSON and validate via SCHEMA_REGISTRY.
+
+    The returned commands are marked `validated`, so SceneGraph does not
+    check them a second time.
     """
     try:
         data = json.loads(text)
@@ -47,29 +82,7 @@ def commands_from_json(text: str) -> List[Command]:
     if not isinstance(data, list):
         raise CommandError("Command JSON must be a list")
 
-    commands: List[Command] = []
-    for item in data:
-        if not isinstance(item, Mapping):
-            raise CommandError("Each command must be a mapping")
-        structure_id = item.get("structure_id")
-        type_name = item.get("type")
-        payload_raw = item.get("payload")
-        if not isinstance(payload_raw, Mapping):
-            raise CommandError("Command payload must be a mapping")
-        payload: Mapping[str, object] = payload_raw
-        if not isinstance(structure_id, str):
-            raise CommandError("Command requires structure_id as string")
-        if not isinstance(type_name, str):
-            raise CommandError("Command requires type as string")
-        try:
-            cmd_type = CommandType[type_name]
-        except KeyError as exc:
-            raise CommandError(f"Unsupported command type: {type_name!r}") from exc
-        _validate_command_payload(cmd_type, payload)
-        commands.append(
-            Command(structure_id=structure_id, type=cmd_type, payload=payload)
-        )
-    return commands
+    return [command_from_dict(item) for item in data]
 
 
 def load_commands_from_file(path: str | Path) -> List[Command]:
@@ -83,6 +96,175 @@ def load_commands_from_file(path: str | Path) -> List[Command]:
     return commands_from_json(text)
 
 
+# ------------------------------------------------------------------ #
+# Streaming command loading
+# ------------------------------------------------------------------ #
+_STREAM_CHUNK = 1 << 16
+# A single command larger than this is treated as invalid JSON rather than
+# buffered until EOF.
+MAX_STREAM_COMMAND_BYTES = 64 << 20
+_DECODER = json.JSONDecoder()
+# Tokens a chunk boundary can cut so that the decoder reports an error
+# before the end of the buffer (literals, number tails).
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_NUMBER_TAIL = re.compile(r"\.|[eE][+-]?")
+
+
+class _StreamBuffer:
+    """Unconsumed text of a stream, refilled chunk by chunk."""
+
+    def __init__(self, stream: TextIO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """Append at least one chunk (growing with the pending text)."""
+        rest = self.text[self.pos :]
+        if len(rest) > MAX_STREAM_COMMAND_BYTES:
+            raise CommandError("Command too large or invalid JSON in stream")
+        try:
+            chunk = self.stream.read(max(self.chunk_size, len(rest)))
+        except OSError as exc:
+            raise CommandError(f"Failed to read commands stream: {exc}") from exc
+        self.text = rest + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character (not consumed), None at EOF."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return None
+
+
+def iter_commands(stream: TextIO, chunk_size: int = _STREAM_CHUNK) -> Iterator[Command]:
+    """
+    Incrementally read validated Commands from a text stream holding either
+    a JSON array of commands or JSON Lines (one command object per line).
+
+    Memory stays bounded by the largest command, not the stream size; each
+    Command is yielded as soon as it is parsed and validated, so errors
+    surface when the offending command is reached.
+    """
+    buf = _StreamBuffer(stream, max(1, chunk_size))
+    first = buf.peek()
+    if first is None:
+        return
+    if first == "[":
+        yield from _iter_json_array(buf)
+    elif first == "{":
+        yield from _iter_json_lines(buf)
+    else:
+        raise CommandError("Command stream must be a JSON array or JSON Lines")
+
+
+def iter_commands_from_file(path: str | Path) -> Iterator[Command]:
+    """`iter_commands` over a file (JSON array or JSON Lines)."""
+    try:
+        fh = Path(path).open("r", encoding="utf-8")
+    except OSError as exc:
+        raise CommandError(f"Failed to read commands file: {exc}") from exc
+    with fh:
+        yield from iter_commands(fh)
+
+
+def _iter_json_array(buf: _StreamBuffer) -> Iterator[Command]:
+    buf.pos += 1  # "["
+    index = 0
+    while True:
+        ch = buf.peek()
+        if ch is None:
+            raise CommandError("Unterminated command JSON array")
+        if ch == "]" and index == 0:
+            buf.pos += 1
+            break
+        if index > 0:
+            if ch == "]":
+                buf.pos += 1
+                break
+            if ch != ",":
+                raise CommandError(f"Expected ',' after command {index - 1}")
+            buf.pos += 1
+            if buf.peek() is None:
+                raise CommandError("Unterminated command JSON array")
+        item = _decode_value(buf, index)
+        yield _command_at(item, index)
+        index += 1
+    if buf.peek() is not None:
+        raise CommandError("Unexpected data after command JSON array")
+
+
+def _decode_value(buf: _StreamBuffer, index: int) -> object:
+    while True:
+        try:
+            item, end = _DECODER.raw_decode(buf.text, buf.pos)
+        except json.JSONDecodeError as exc:
+            if _truncated(exc, buf.text) and buf.fill():
+                continue
+            raise CommandError(f"Invalid JSON in command {index}: {exc}") from exc
+        if end == len(buf.text) and not isinstance(item, (dict, list, str)):
+            # a number/literal may continue in the next chunk
+            if buf.fill():
+                continue
+        buf.pos = end
+        return item
+
+
+def _truncated(exc: json.JSONDecodeError, text: str) -> bool:
+    """
+    Whether the decode error can be fixed by more input: it is at the end of
+    the buffer, or the buffer ends inside a string, literal, number or
+    escape. Anything else is invalid JSON, however much data follows.
+    """
+    if exc.pos >= len(text) or exc.msg.startswith("Unterminated string"):
+        return True
+    tail = text[exc.pos :]
+    if "escape" in exc.msg:
+        return len(tail) < 6  # \uXXXX cut short
+    return (
+        any(literal.startswith(tail) for literal in _LITERALS)
+        or _NUMBER_TAIL.fullmatch(tail) is not None
+    )
+
+
+def _iter_json_lines(buf: _StreamBuffer) -> Iterator[Command]:
+    index = 0
+    line_no = 0
+    while True:
+        newline = buf.text.find("\n", buf.pos)
+        if newline < 0:
+            if buf.fill():
+                continue
+            line, buf.pos = buf.text[buf.pos :], len(buf.text)
+        else:
+            line, buf.pos = buf.text[buf.pos : newline], newline + 1
+        line_no += 1
+        if line.strip():
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"Invalid JSON on line {line_no}: {exc}") from exc
+            yield _command_at(item, index)
+            index += 1
+        if newline < 0:
+            return
+
+
+def _command_at(item: object, index: int) -> Command:
+    try:
+        return command_from_dict(item)
+    except CommandError as exc:
+        raise CommandError(f"Command {index}: {exc}") from exc
+
+
 def _validate_command_payload(
     cmd_type: CommandType, payload: Mapping[str, object]
 ) -> None:
@@ -97,6 +279,36 @@ def _validate_command_payload(
     schema.validate(payload)
 
 
+def timeline_to_dict(timeline: Timeline) -> Dict[str, object]:
+    """JSON-ready form of a (laid-out) Timeline: steps with their ops."""
+    return {
+        "steps": [
+            {
+                "duration_ms": step.duration_ms,
+                "label": step.label,
+                "ops": [
+                    {"op": op.op.name, "target": op.target, "data": dict(op.data)}
+                    for op in step.ops
+                ],
+            }
+            for step in timeline.steps
+        ]
+    }
+
+
+def save_timeline_to_file(timeline: Timeline, path: str | Path) -> None:
+    """
+    Save a Timeline as JSON. Raises CommandError on IO issues.
+    """
+    try:
+        Path(path).write_text(
+            json.dumps(timeline_to_dict(timeline), separators=(",", ":")),
+            encoding="utf-8",
+        )
+    except OSError as exc:
+        raise CommandError(f"Failed to write timeline to file: {exc}") from exc
+
+
 # ------------------------------------------------------------------ #
 # Scene Persistence (Snapshot-based)
 # ------------------------------------------------------------------ #
@@ -0,0 +1,270 @@
+"""
+Many independent SceneGraphs (e.g. one per student session) in one process.
+
+`SessionManager` keeps the most recently used sessions resident and evicts
+the least recently used ones when a memory budget or a resident-count limit
+is exceeded. An evicted session is kept as its `export_scene()` snapshot,
+serialized to (optionally zlib-compressed) JSON, and rehydrated with
+`import_scene` the next time it is used.
+
+Memory is an estimate: a deep `sys.getsizeof` walk over the models, the
+layout engines' caches, the undo/redo history and the export cache. The walk
+is O(session size), so it is only redone for sessions whose revision
+changed, and while enforcing limits at most every `estimate_every` uses of a
+changed session (in between, its last estimate is used).
+
+Eviction keeps the scene (structures, offsets, configs, detail levels), not
+the undo/redo history nor the engines' incremental state: a rehydrated
+session starts with an empty history and a fresh layout.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import DetailLevel, Timeline
+from ds_vis.core.scene.command import Command
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+# Never walked into by the memory estimate: shared, immutable or not owned
+# by the session.
+_OPAQUE = (type, str, bytes, int, float, bool, complex, Enum, type(None))
+
+
+def estimate_memory(*roots: object) -> int:
+    """
+    Approximate bytes reachable from `roots` (objects shared between roots
+    are counted once). Walks containers, `__dict__` and `__slots__`;
+    functions, classes, strings and numbers count their own size only.
+    """
+    seen: set[int] = set()
+    total = 0
+    pending: List[object] = list(roots)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 64)
+        if isinstance(obj, _OPAQUE) or callable(obj):
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            pending.extend(obj)
+        else:
+            attrs = getattr(obj, "__dict__", None)
+            if isinstance(attrs, dict):
+                pending.append(attrs)
+            for slot in getattr(type(obj), "__slots__", ()):
+                value = getattr(obj, slot, None)
+                if value is not None:
+                    pending.append(value)
+    return total
+
+
+def estimate_scene_memory(scene: SceneGraph) -> int:
+    """Models + layout engine caches + history + export cache of one scene."""
+    return estimate_memory(
+        scene._structures,
+        scene._layout_engine,
+        scene._tree_layout_engine,
+        scene._dag_layout_engine,
+        scene._visuals,
+        scene._undo_stack,
+        scene._redo_stack,
+        scene._export_cache,
+    )
+
+
+@dataclass
+class _Session:
+    scene: Optional[SceneGraph] = None
+    # evicted form: serialized export_scene() + detail settings
+    blob: Optional[bytes] = None
+    default_detail: DetailLevel = DetailLevel.L2
+    structure_detail: Dict[str, DetailLevel] = field(default_factory=dict)
+    memory: int = 0
+    estimated_revision: Optional[int] = None
+    stale_uses: int = 0
+
+
+class SessionManager:
+    """
+    Owns many SceneGraphs addressed by session id, with LRU eviction.
+
+    - `memory_limit`: budget in bytes for resident sessions (estimated).
+    - `max_resident`: at most this many SceneGraphs in memory.
+    The session being used is never evicted, even if it alone exceeds the
+    budget. Evicted sessions (compact blobs) do not count against it.
+    """
+
+    def __init__(
+        self,
+        *,
+        memory_limit: Optional[int] = None,
+        max_resident: Optional[int] = None,
+        scene_factory: Callable[[], SceneGraph] = SceneGraph,
+        compress: bool = True,
+        estimate_every: int = 32,
+    ) -> None:
+        if max_resident is not None and max_resident < 1:
+            raise CommandError("max_resident must be >= 1")
+        self.memory_limit = memory_limit
+        self.max_resident = max_resident
+        self._scene_factory = scene_factory
+        self._compress = compress
+        self.estimate_every = max(1, estimate_every)
+        self._sessions: Dict[str, _Session] = {}
+        # resident session ids, least recently used first
+        self._lru: OrderedDict[str, None] = OrderedDict()
+        self.evictions = 0
+        self.rehydrations = 0
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def session_ids(self) -> List[str]:
+        return list(self._sessions)
+
+    @property
+    def resident_ids(self) -> List[str]:
+        """Resident sessions, least recently used first."""
+        return list(self._lru)
+
+    def is_resident(self, session_id: str) -> bool:
+        return session_id in self._lru
+
+    # ------------------------------------------------------------------ #
+    # Use
+    # ------------------------------------------------------------------ #
+    def scene(self, session_id: str) -> SceneGraph:
+        """
+        The session's SceneGraph (created on first use, rehydrated if it was
+        evicted); marks it most recently used and enforces the limits.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+        if session.scene is None:
+            session.scene = self._rehydrate(session)
+        scene = session.scene
+        self._lru[session_id] = None
+        self._lru.move_to_end(session_id)
+        self._enforce_limits(keep=session_id)
+        return scene
+
+    def apply_command(self, session_id: str, command: Command) -> Timeline:
+        timeline = self.scene(session_id).apply_command(command)
+        self._enforce_limits(keep=session_id)
+        return timeline
+
+    def apply_commands(
+        self,
+        session_id: str,
+        commands: Iterable[Command],
+        detail: DetailLevel | str | int | None = None,
+    ) -> Timeline:
+        timeline = self.scene(session_id).apply_commands(commands, detail)
+        self._enforce_limits(keep=session_id)
+        return timeline
+
+    def close(self, session_id: str) -> None:
+        """Forget a session entirely (resident or evicted)."""
+        self._sessions.pop(session_id, None)
+        self._lru.pop(session_id, None)
+
+    # ------------------------------------------------------------------ #
+    # Memory / eviction
+    # ------------------------------------------------------------------ #
+    def memory_usage(self, session_id: Optional[str] = None) -> int:
+        """
+        Estimated bytes of one session (resident scene or evicted blob), or
+        of all resident sessions when `session_id` is None.
+        """
+        if session_id is None:
+            return self._resident_memory(refresh=True)
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise CommandError(f"Unknown session: {session_id!r}")
+        return self._estimate(session, refresh=True)
+
+    def evict(self, session_id: str) -> None:
+        """Serialize a resident session and drop its SceneGraph."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise CommandError(f"Unknown session: {session_id!r}")
+        scene = session.scene
+        if scene is None:
+            return
+        text = json.dumps(scene.export_scene(), separators=(",", ":"))
+        blob = text.encode("utf-8")
+        session.blob = zlib.compress(blob) if self._compress else blob
+        session.default_detail = scene.default_detail
+        session.structure_detail = dict(scene._structure_detail)
+        session.scene = None
+        session.memory = len(session.blob)
+        session.estimated_revision = None
+        self._lru.pop(session_id, None)
+        self.evictions += 1
+
+    def _rehydrate(self, session: _Session) -> SceneGraph:
+        scene = self._scene_factory()
+        if session.blob is None:
+            return scene
+        blob = zlib.decompress(session.blob) if self._compress else session.blob
+        data: Any = json.loads(blob.decode("utf-8"))
+        scene.import_scene(data)
+        scene.default_detail = session.default_detail
+        scene._structure_detail.update(session.structure_detail)
+        session.blob = None
+        session.estimated_revision = None
+        self.rehydrations += 1
+        return scene
+
+    def _resident_memory(self, refresh: bool) -> int:
+        return sum(self._estimate(self._sessions[sid], refresh) for sid in self._lru)
+
+    def _estimate(self, session: _Session, refresh: bool) -> int:
+        scene = session.scene
+        if scene is None or session.estimated_revision == scene.revision:
+            return session.memory
+        session.stale_uses += 1
+        if (
+            refresh
+            or session.estimated_revision is None
+            or session.stale_uses >= self.estimate_every
+        ):
+            session.memory = estimate_scene_memory(scene)
+            session.estimated_revision = scene.revision
+            session.stale_uses = 0
+        return session.memory
+
+    def _enforce_limits(self, keep: str) -> None:
+        if self.max_resident is not None:
+            while len(self._lru) > self.max_resident:
+                if not self._evict_lru(keep):
+                    break
+        if self.memory_limit is not None:
+            while self._resident_memory(refresh=False) > self.memory_limit:
+                if not self._evict_lru(keep):
+                    break
+
+    def _evict_lru(self, keep: str) -> bool:
+        for session_id in self._lru:
+            if session_id != keep:
+                self.evict(session_id)
+                return True
+        return False
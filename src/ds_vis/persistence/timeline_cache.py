@@ -0,0 +1,301 @@
+"""
+Content-addressed cache of laid-out Timelines for replayed command scripts.
+
+Lesson scripts and demo buttons replay the same commands from the same
+starting scene. A command's Timeline depends on the whole history of the
+scene (node ids, layout engine state), not only on its exported state, so
+entries are keyed by a hash chain:
+
+    key_0     = H(format, SCENE_VERSION, default detail, start scene JSON)
+    key_{n+1} = H(key_n, command JSON)
+
+`CachedSceneRunner` owns a SceneGraph built from a known start (empty or
+`import_scene(data)`). On a cache hit it returns the stored Timeline and
+defers the real work; the SceneGraph catches up only when it is needed
+(`runner.scene`, or the next miss), from the newest stored post-state (a
+pickled SceneGraph, kept every `checkpoint_every` commands and on
+`checkpoint()`) plus the deferred commands after it. Replaying a fully cached
+script therefore does no model or layout work until the scene is inspected.
+
+Tiers: an in-memory LRU (`max_entries`) and an optional directory of pickle
+files named by key. Pickles are only safe to load from a trusted directory.
+Cached Timelines are shared between hits: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Mapping, Optional, Tuple
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import DetailLevel, Timeline, parse_detail_level
+from ds_vis.core.scene.command import Command
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.core.scene.snapshot import SCENE_VERSION
+
+# Bump when the key derivation or the entry layout changes.
+CACHE_FORMAT = 1
+
+
+def _canonical(obj: object) -> bytes:
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr
+    ).encode("utf-8")
+
+
+def _chain(key: str, *parts: object) -> str:
+    digest = hashlib.sha256(key.encode("ascii"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(_canonical(part))
+    return digest.hexdigest()
+
+
+def start_key(
+    scene_data: Optional[Mapping[str, object]] = None,
+    default_detail: DetailLevel = DetailLevel.L2,
+) -> str:
+    """Key of a fresh SceneGraph (optionally after `import_scene(scene_data)`)."""
+    return _chain(
+        "", CACHE_FORMAT, SCENE_VERSION, default_detail.name, scene_data or {}
+    )
+
+
+def command_key(key: str, command: Command) -> str:
+    """Key of the scene reached by applying `command` to the scene `key`."""
+    return _chain(
+        key,
+        {
+            "structure_id": command.structure_id,
+            "type": command.type.name,
+            "payload": command.payload,
+        },
+    )
+
+
+@dataclass
+class CacheEntry:
+    """Laid-out Timeline of one command, and optionally the pickled post-state."""
+
+    timeline: Timeline
+    state: Optional[bytes] = None
+
+
+class TimelineCache:
+    """
+    In-memory LRU of `CacheEntry` by key, backed by an optional directory.
+
+    Memory misses fall back to `directory/<key>.pkl` (promoted on hit);
+    `put` writes through to the directory. Unreadable files count as misses.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, directory: str | Path | None = None
+    ) -> None:
+        if max_entries < 1:
+            raise CommandError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            entry = self._read(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Memory-tier lookup that neither reorders nor counts."""
+        return self._entries.get(key)
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store `entry`; an existing post-state is kept if `entry` has none."""
+        old = self._entries.get(key)
+        if entry.state is None and old is not None and old.state is not None:
+            entry = CacheEntry(entry.timeline, old.state)
+        self._remember(key, entry)
+        self._write(key, entry)
+
+    def clear(self) -> None:
+        """Drop the memory tier and the files of the disk tier."""
+        self._entries.clear()
+        if self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.pkl"
+
+    def _read(self, key: str) -> Optional[CacheEntry]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with path.open("rb") as fh:
+                entry = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            path.unlink(missing_ok=True)
+            return None
+        return entry if isinstance(entry, CacheEntry) else None
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as fh:
+                pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as exc:
+            raise CommandError(f"Failed to write timeline cache: {exc}") from exc
+
+
+# A deferred step: how to apply it, and its entry if it was a cache hit.
+_Pending = Tuple[Callable[[SceneGraph], object], Optional[CacheEntry]]
+
+
+class CachedSceneRunner:
+    """
+    Apply commands to a SceneGraph through a `TimelineCache`.
+
+    The scene starts empty or from `import_scene(scene_data)` (its Timeline is
+    `start_timeline`), so equal starts and equal command sequences give equal
+    keys. Runners sharing a cache must use equivalent `scene_factory`s
+    (engines, history limit). Mutate the scene only through the runner;
+    `scene` catches it up and may be a different object after a resume.
+    """
+
+    def __init__(
+        self,
+        cache: TimelineCache,
+        scene_data: Optional[Mapping[str, object]] = None,
+        *,
+        scene_factory: Callable[[], SceneGraph] = SceneGraph,
+        checkpoint_every: int = 16,
+    ) -> None:
+        self.cache = cache
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._scene = scene_factory()
+        self.start_timeline = (
+            self._scene.import_scene(scene_data) if scene_data else Timeline()
+        )
+        self._key = start_key(scene_data, self._scene.default_detail)
+        self._pending: List[_Pending] = []
+        self._since_checkpoint = 0
+
+    @property
+    def key(self) -> str:
+        """Key of the current (possibly not yet materialized) scene."""
+        return self._key
+
+    @property
+    def pending(self) -> int:
+        """Number of cached steps not yet applied to the SceneGraph."""
+        return len(self._pending)
+
+    @property
+    def scene(self) -> SceneGraph:
+        """The SceneGraph, caught up with every command applied so far."""
+        self._catch_up()
+        return self._scene
+
+    def apply_command(self, command: Command) -> Timeline:
+        key = command_key(self._key, command)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self._pending.append((lambda sg: sg.apply_command(command), entry))
+            self._key = key
+            if entry.state is not None:
+                self._since_checkpoint = 0
+            else:
+                self._since_checkpoint += 1
+            return entry.timeline
+        # a failing command raises here and leaves the key unchanged
+        timeline = self.scene.apply_command(command)
+        self._key = key
+        self._since_checkpoint += 1
+        state = None
+        if self._since_checkpoint >= self.checkpoint_every:
+            state = self._dump()
+        self.cache.put(key, CacheEntry(timeline, state))
+        return timeline
+
+    def apply_commands(self, commands: Iterable[Command]) -> Timeline:
+        """Apply commands one by one and checkpoint the end state."""
+        merged = Timeline()
+        for command in commands:
+            for step in self.apply_command(command).steps:
+                merged.add_step(step)
+        self.checkpoint()
+        return merged
+
+    def set_detail_level(
+        self,
+        level: DetailLevel | str | int,
+        structure_id: Optional[str] = None,
+    ) -> None:
+        """Same as SceneGraph.set_detail_level; part of the cache key."""
+        level = parse_detail_level(level)
+        self._key = _chain(self._key, "detail", level.name, structure_id)
+        self._pending.append(
+            (lambda sg: sg.set_detail_level(level, structure_id), None)
+        )
+
+    def checkpoint(self) -> None:
+        """Store the current post-state so later runs can resume from it."""
+        if self._since_checkpoint == 0:
+            return
+        entry = self.cache.peek(self._key)
+        if entry is not None and entry.state is None:
+            self.cache.put(self._key, CacheEntry(entry.timeline, self._dump()))
+        self._since_checkpoint = 0
+
+    def _dump(self) -> bytes:
+        return pickle.dumps(self.scene, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _catch_up(self) -> None:
+        if not self._pending:
+            return
+        start = 0
+        for index in range(len(self._pending) - 1, -1, -1):
+            entry = self._pending[index][1]
+            if entry is not None and entry.state is not None:
+                self._scene = pickle.loads(entry.state)
+                start = index + 1
+                break
+        pending, self._pending = self._pending, []
+        for apply, _ in pending[start:]:
+            apply(self._scene)
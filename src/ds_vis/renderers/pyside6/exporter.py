@@ -0,0 +1,321 @@
+"""
+Offscreen frame exporter for PySide6Renderer.
+
+Drives a PySide6Renderer through a Timeline under the `offscreen` QPA platform
+and rasterizes every interpolated frame to PNG via QImage. Frame ranges are
+split at step boundaries (keyframes) and fanned out over a process pool. One
+parent pass over the keyframes computes the shared scene rect and captures a
+compact `KeyframeSnapshot` at every chunk boundary; each worker restores its
+snapshot and renders only its own steps, so total work stays linear in the
+timeline length.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+from ds_vis.core.exceptions import RenderError
+from ds_vis.core.ops import AnimationStep, Timeline
+from ds_vis.renderers.pyside6.renderer import (
+    KeyframeSnapshot,
+    PySide6Renderer,
+    RendererConfig,
+)
+
+# (x, y, width, height) of the scene region captured in every frame.
+SceneRect = Tuple[float, float, float, float]
+
+
+@dataclass
+class ExportConfig:
+    """Exporter parameters (frame timing, output geometry, parallelism)."""
+
+    fps: int = 30
+    workers: int = 1  # <= 0 uses os.cpu_count()
+    scale: float = 1.0
+    margin: float = 40.0
+    background: str = "#ffffff"
+    filename_pattern: str = "frame_{:06d}.png"
+    show_messages: bool = True
+
+
+@dataclass
+class ExportResult:
+    """Outcome of an export run."""
+
+    frame_paths: List[Path] = field(default_factory=list)
+    video_path: Optional[Path] = None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frame_paths)
+
+
+@dataclass(frozen=True)
+class _FrameJob:
+    """A contiguous step range rendered by one worker."""
+
+    steps: Tuple[AnimationStep, ...]  # this chunk's steps only
+    seed: Optional[KeyframeSnapshot]  # end state of the previous step
+    first_frame: int
+    frame_counts: Tuple[int, ...]
+    scene_rect: SceneRect
+    out_dir: str
+    config: ExportConfig
+
+
+class FrameExporter:
+    """
+    Pre-render a Timeline to an image sequence (and optionally a video).
+
+    Usage:
+        exporter = FrameExporter(ExportConfig(fps=30, workers=4))
+        result = exporter.export_frames(timeline, "out/frames")
+        exporter.encode_video("out/frames", "out/lesson.mp4")
+    """
+
+    def __init__(self, config: Optional[ExportConfig] = None) -> None:
+        self._config = config or ExportConfig()
+
+    @property
+    def config(self) -> ExportConfig:
+        return self._config
+
+    def plan_frames(self, timeline: Timeline) -> List[int]:
+        """Frame count per step; zero-duration steps still emit one frame."""
+        fps = max(1, self._config.fps)
+        return [
+            max(1, round(max(0, step.duration_ms) * fps / 1000.0))
+            for step in timeline.steps
+        ]
+
+    def export_frames(
+        self, timeline: Timeline, out_dir: str | Path
+    ) -> ExportResult:
+        """Render all frames of `timeline` into `out_dir` as numbered PNGs."""
+        out_path = Path(out_dir)
+        try:
+            out_path.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:  # pragma: no cover - environment specific
+            raise RenderError(f"Failed to create export dir: {exc}") from exc
+
+        steps = tuple(timeline.steps)
+        if not steps:
+            return ExportResult()
+        frame_counts = self.plan_frames(timeline)
+        workers = self._resolve_workers(len(steps))
+        # A few chunks per worker keeps the pool balanced when step sizes vary.
+        chunks = 1 if workers <= 1 else workers * 4
+        bounds = _chunk_bounds(frame_counts, chunks)
+        scene_rect, seeds = _scan_keyframes(
+            steps, self._config, [start for start, _ in bounds]
+        )
+        jobs = [
+            _FrameJob(
+                steps=steps[start:end],
+                seed=seeds.get(start),
+                first_frame=sum(frame_counts[:start]),
+                frame_counts=tuple(frame_counts[start:end]),
+                scene_rect=scene_rect,
+                out_dir=str(out_path),
+                config=self._config,
+            )
+            for start, end in bounds
+        ]
+
+        if workers <= 1:
+            for job in jobs:
+                _render_job(job)
+        else:
+            ctx = get_context("spawn")  # Qt state must not be forked
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                # list() re-raises the first worker failure, if any.
+                list(pool.map(_render_job, jobs))
+
+        total = sum(frame_counts)
+        pattern = self._config.filename_pattern
+        return ExportResult(
+            frame_paths=[out_path / pattern.format(i) for i in range(total)]
+        )
+
+    def export_video(
+        self,
+        timeline: Timeline,
+        video_path: str | Path,
+        frames_dir: str | Path | None = None,
+    ) -> ExportResult:
+        """Export frames (to `frames_dir` or next to the video) and encode them."""
+        target = Path(video_path)
+        frames = (
+            Path(frames_dir)
+            if frames_dir is not None
+            else target.with_name(f"{target.stem}_frames")
+        )
+        result = self.export_frames(timeline, frames)
+        result.video_path = self.encode_video(frames, target)
+        return result
+
+    def encode_video(self, frames_dir: str | Path, video_path: str | Path) -> Path:
+        """Encode a PNG sequence into a video using ffmpeg (must be on PATH)."""
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RenderError("ffmpeg not found on PATH; cannot encode video")
+        pattern = self._config.filename_pattern.replace("{:06d}", "%06d")
+        target = Path(video_path)
+        cmd = [
+            ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-framerate",
+            str(max(1, self._config.fps)),
+            "-i",
+            str(Path(frames_dir) / pattern),
+            "-pix_fmt",
+            "yuv420p",
+            str(target),
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise RenderError(f"ffmpeg failed: {exc}") from exc
+        return target
+
+    def _resolve_workers(self, step_count: int) -> int:
+        workers = self._config.workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, step_count))
+
+
+# ---------------------------------------------------------------------- #
+# Worker side (module-level so it can be pickled by the process pool)
+# ---------------------------------------------------------------------- #
+def _ensure_app() -> QApplication:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance()
+    if isinstance(app, QApplication):
+        return app
+    return QApplication([])
+
+
+def _make_renderer(
+    scene: QGraphicsScene, config: ExportConfig
+) -> PySide6Renderer:
+    renderer_config = RendererConfig(show_messages=config.show_messages)
+    return PySide6Renderer(scene, animations_enabled=False, config=renderer_config)
+
+
+def _seek_keyframe(renderer: PySide6Renderer, step: AnimationStep) -> None:
+    """
+    Jump to a step's end state through the animated path (one frame).
+
+    The instant path applies ops in arrival order, while the animated path
+    finalizes labels/states/messages after structure; seeding through the
+    latter keeps worker output identical to a serial run.
+    """
+    renderer.render_step_frames(step, 1, _ignore_frame)
+
+
+def _ignore_frame(_: int) -> None:
+    return None
+
+
+def _scan_keyframes(
+    steps: Sequence[AnimationStep],
+    config: ExportConfig,
+    chunk_starts: Sequence[int],
+) -> Tuple[SceneRect, Dict[int, KeyframeSnapshot]]:
+    """
+    One pass over the keyframes: union of the scene bounds at every keyframe,
+    plus a snapshot of the end state before each chunk start (> 0).
+
+    Interpolation is linear between keyframes, so intermediate frames stay
+    inside this rect and every frame can share one output size.
+    """
+    _ensure_app()
+    scene = QGraphicsScene()
+    renderer = _make_renderer(scene, config)
+    wanted = set(chunk_starts)
+    seeds: Dict[int, KeyframeSnapshot] = {}
+    bounds = QRectF()
+    for idx, step in enumerate(steps):
+        _seek_keyframe(renderer, step)
+        bounds = bounds.united(scene.itemsBoundingRect())
+        if idx + 1 in wanted:
+            seeds[idx + 1] = renderer.capture_keyframe()
+    if bounds.isNull():
+        bounds = QRectF(0.0, 0.0, 1.0, 1.0)
+    bounds.adjust(-config.margin, -config.margin, config.margin, config.margin)
+    return (bounds.x(), bounds.y(), bounds.width(), bounds.height()), seeds
+
+
+def _chunk_bounds(frame_counts: Sequence[int], chunks: int) -> List[Tuple[int, int]]:
+    """
+    Cut the timeline at keyframes into [start, end) step ranges of roughly
+    equal frame count.
+    """
+    total = sum(frame_counts)
+    chunk_target = max(1, -(-total // max(1, chunks)))
+
+    bounds: List[Tuple[int, int]] = []
+    start = 0
+    acc = 0
+    for idx, count in enumerate(frame_counts):
+        acc += count
+        if acc >= chunk_target or idx == len(frame_counts) - 1:
+            bounds.append((start, idx + 1))
+            start = idx + 1
+            acc = 0
+    return bounds
+
+
+def _render_job(job: _FrameJob) -> int:
+    """Seed a renderer at the job's keyframe and rasterize its frames."""
+    _ensure_app()
+    scene = QGraphicsScene()
+    renderer = _make_renderer(scene, job.config)
+    if job.seed is not None:
+        renderer.restore_keyframe(job.seed)
+
+    x, y, w, h = job.scene_rect
+    source = QRectF(x, y, w, h)
+    scale = max(0.01, job.config.scale)
+    # Even dimensions keep common video encoders (yuv420p) happy.
+    width = max(2, int(w * scale) // 2 * 2)
+    height = max(2, int(h * scale) // 2 * 2)
+    background = QColor(job.config.background)
+    out_dir = Path(job.out_dir)
+    pattern = job.config.filename_pattern
+
+    frame_index = job.first_frame
+    written = 0
+
+    def _save_frame(_: int) -> None:
+        nonlocal frame_index, written
+        image = QImage(width, height, QImage.Format.Format_ARGB32)
+        image.fill(background)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        scene.render(painter, QRectF(0.0, 0.0, width, height), source)
+        painter.end()
+        path = out_dir / pattern.format(frame_index)
+        if not image.save(str(path)):
+            raise RenderError(f"Failed to write frame: {path}")
+        frame_index += 1
+        written += 1
+
+    for step, frames in zip(job.steps, job.frame_counts):
+        renderer.render_step_frames(step, frames, _save_frame)
+    return written
@@ -0,0 +1,85 @@
+"""
+Adaptive frame scheduling for PySide6Renderer.
+
+The fixed policy (`duration // 50` frames, capped at `max_frames`) ignores how
+expensive a frame actually is: on large scenes each frame costs more than its
+slot and the step overshoots its duration, on tiny scenes the cap leaves
+motion choppy. The scheduler below keeps a smoothed estimate of the measured
+frame cost, plans the frame count from it and, while a step is playing,
+drops intermediate frames whose slot has already passed so the step ends on
+time (wall clock) even under load.
+"""
+
+from __future__ import annotations
+
+import math
+
+
+class AdaptiveFrameScheduler:
+    """
+    Frame planner driven by measured frame cost (exponential moving average).
+
+    Frame `i` of `frames` is due at `duration_ms * i / frames` after the step
+    starts; the last frame is never dropped, so the step always lands on its
+    end state.
+    """
+
+    def __init__(
+        self,
+        max_frames: int = 60,
+        min_frame_ms: float = 16.0,
+        smoothing: float = 0.3,
+        initial_cost_ms: float = 0.0,
+    ) -> None:
+        self._max_frames = max(1, max_frames)
+        self._min_frame_ms = max(1.0, min_frame_ms)
+        self._smoothing = min(1.0, max(0.0, smoothing))
+        self._cost_ms = max(0.0, initial_cost_ms)
+
+    @property
+    def cost_ms(self) -> float:
+        """Current smoothed estimate of one frame's cost."""
+        return self._cost_ms
+
+    @property
+    def max_frames(self) -> int:
+        return self._max_frames
+
+    def plan(self, duration_ms: float) -> int:
+        """Frame count that fits `duration_ms` at the measured frame cost."""
+        if duration_ms <= 0:
+            return 1
+        slot = max(self._min_frame_ms, self._cost_ms)
+        return max(1, min(self._max_frames, int(duration_ms // slot)))
+
+    def record(self, cost_ms: float) -> None:
+        """Feed the wall-clock cost of a frame (draw + present)."""
+        cost_ms = max(0.0, cost_ms)
+        if self._cost_ms <= 0.0:
+            self._cost_ms = cost_ms
+            return
+        self._cost_ms += self._smoothing * (cost_ms - self._cost_ms)
+
+    def next_frame(
+        self, current: int, frames: int, elapsed_ms: float, duration_ms: float
+    ) -> int:
+        """
+        Index of the next frame to draw after `current`.
+
+        Frames whose slot ended before `elapsed_ms` are skipped; the result is
+        at most `frames`.
+        """
+        following = current + 1
+        if duration_ms <= 0 or frames <= 0:
+            return min(max(1, frames), following)
+        due = math.floor(elapsed_ms * frames / duration_ms)
+        return min(frames, max(following, due))
+
+    def wait_ms(
+        self, current: int, frames: int, elapsed_ms: float, duration_ms: float
+    ) -> int:
+        """Milliseconds to hold frame `current` on screen before the next one."""
+        if frames <= 0 or duration_ms <= 0:
+            return 0
+        slot_end = duration_ms * current / frames
+        return max(0, int(slot_end - elapsed_ms))
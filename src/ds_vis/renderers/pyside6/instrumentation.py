@@ -0,0 +1,160 @@
+"""
+Opt-in instrumentation for PySide6Renderer.
+
+Records, per AnimationStep, how many ops of each OpCode were applied, the
+time spent applying them, how many edge paths were rebuilt and how long each
+interpolation frame took compared to its budget. Disabled renderers never
+touch this module on the hot path.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from ds_vis.core.ops import OpCode
+
+
+@dataclass
+class FrameSample:
+    """Cost of one interpolation frame."""
+
+    index: int
+    duration_ms: float
+    budget_ms: float
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ms > 0 and self.duration_ms > self.budget_ms
+
+
+@dataclass
+class StepStats:
+    """Aggregated renderer cost for a single AnimationStep."""
+
+    index: int
+    label: Optional[str] = None
+    duration_ms: int = 0
+    animated: bool = False
+    op_counts: Dict[OpCode, int] = field(default_factory=dict)
+    op_time_ms: Dict[OpCode, float] = field(default_factory=dict)
+    edge_rebuilds: int = 0
+    frames: List[FrameSample] = field(default_factory=list)
+    skipped_frames: int = 0
+    wall_ms: float = 0.0
+
+    @property
+    def op_total(self) -> int:
+        return sum(self.op_counts.values())
+
+    @property
+    def dropped_frames(self) -> int:
+        """Frames whose cost exceeded their budget."""
+        return sum(1 for frame in self.frames if frame.over_budget)
+
+    @property
+    def worst_frame_ms(self) -> float:
+        return max((frame.duration_ms for frame in self.frames), default=0.0)
+
+    def summary(self) -> str:
+        """One-line description used by the overlay and logs."""
+        ops = ", ".join(
+            f"{op.name}×{count}"
+            for op, count in sorted(
+                self.op_counts.items(), key=lambda item: item[0].name
+            )
+        )
+        parts = [f"step {self.index}"]
+        if self.label:
+            parts.append(self.label)
+        parts.append(f"{self.wall_ms:.1f}/{self.duration_ms}ms")
+        if self.frames:
+            parts.append(
+                f"frames {len(self.frames)} (dropped {self.dropped_frames}, "
+                f"skipped {self.skipped_frames}, worst {self.worst_frame_ms:.1f}ms)"
+            )
+        parts.append(f"edges {self.edge_rebuilds}")
+        if ops:
+            parts.append(ops)
+        return " | ".join(parts)
+
+
+class RendererInstrumentation:
+    """
+    Collector fed by PySide6Renderer when instrumentation is enabled.
+
+    Keeps the most recent `history` steps; older entries are discarded so
+    long lessons do not grow memory without bound.
+    """
+
+    def __init__(self, history: int = 256) -> None:
+        self._steps: Deque[StepStats] = deque(maxlen=max(1, history))
+        self._current: Optional[StepStats] = None
+        self._next_index = 0
+
+    @property
+    def current(self) -> Optional[StepStats]:
+        return self._current
+
+    @property
+    def steps(self) -> List[StepStats]:
+        """Completed steps, oldest first."""
+        return list(self._steps)
+
+    @property
+    def last_step(self) -> Optional[StepStats]:
+        return self._steps[-1] if self._steps else None
+
+    def reset(self) -> None:
+        self._steps.clear()
+        self._current = None
+        self._next_index = 0
+
+    def begin_step(
+        self, duration_ms: int, label: Optional[str] = None, animated: bool = False
+    ) -> StepStats:
+        stats = StepStats(
+            index=self._next_index,
+            label=label,
+            duration_ms=duration_ms,
+            animated=animated,
+        )
+        self._next_index += 1
+        self._current = stats
+        return stats
+
+    def end_step(self, wall_ms: float) -> Optional[StepStats]:
+        stats = self._current
+        if stats is None:
+            return None
+        stats.wall_ms = wall_ms
+        self._steps.append(stats)
+        self._current = None
+        return stats
+
+    def record_op(self, op: OpCode, elapsed_ms: float) -> None:
+        stats = self._current
+        if stats is None:
+            return
+        stats.op_counts[op] = stats.op_counts.get(op, 0) + 1
+        stats.op_time_ms[op] = stats.op_time_ms.get(op, 0.0) + elapsed_ms
+
+    def record_edge_rebuild(self) -> None:
+        if self._current is not None:
+            self._current.edge_rebuilds += 1
+
+    def record_frame(self, index: int, duration_ms: float, budget_ms: float) -> None:
+        if self._current is not None:
+            self._current.frames.append(
+                FrameSample(index=index, duration_ms=duration_ms, budget_ms=budget_ms)
+            )
+
+    def record_skipped_frames(self, count: int) -> None:
+        """Frames the adaptive scheduler dropped to stay on schedule."""
+        if self._current is not None and count > 0:
+            self._current.skipped_frames += count
+
+    def slow_steps(self) -> List[StepStats]:
+        """Completed steps that dropped at least one frame."""
+        return [stats for stats in self._steps if stats.dropped_frames > 0]
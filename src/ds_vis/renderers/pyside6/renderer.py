@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import math
+import time
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
 from PySide6.QtCore import QPointF, QRectF, Qt
 from PySide6.QtGui import QColor, QPainterPath, QPen
@@ -18,6 +19,11 @@ from PySide6.QtWidgets import (
 
 from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
 from ds_vis.renderers.base import Renderer
+from ds_vis.renderers.pyside6.frame_scheduler import AdaptiveFrameScheduler
+from ds_vis.renderers.pyside6.instrumentation import (
+    RendererInstrumentation,
+    StepStats,
+)
 
 
 @dataclass
@@ -42,6 +48,14 @@ class RendererConfig:
     )
     max_frames: int = 10
     show_messages: bool = True
+    # Adaptive scheduling: plan frames from measured cost and drop late frames
+    # so steps keep their wall-clock duration (see frame_scheduler.py).
+    adaptive_frames: bool = False
+    adaptive_max_frames: int = 60
+    min_frame_ms: float = 16.0
+    # Opt-in cost tracking (see instrumentation.py) and its on-scene overlay.
+    instrument: bool = False
+    show_stats_overlay: bool = False
 
     # Placeholder for future easing/animation parameters.
     easing: str = "linear"
@@ -56,6 +70,7 @@ class NodeVisual:
     shape: str = "circle"
     width: float = 0.0
     height: float = 0.0
+    state: Optional[str] = None  # last SET_STATE, None = creation default
 
 
 @dataclass
@@ -66,6 +81,48 @@ class EdgeVisual:
     label: Optional[QGraphicsSimpleTextItem] = None
     src_id: str = ""
     dst_id: str = ""
+    state: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class NodeKeyframe:
+    """A node's settled visual state (see `KeyframeSnapshot`)."""
+
+    node_id: str
+    shape: str
+    width: float
+    height: float
+    x: float
+    y: float
+    state: Optional[str] = None
+    # Label text and its offset inside the node (kept as created: SET_LABEL
+    # changes the text without re-centering).
+    label: Optional[str] = None
+    label_pos: Tuple[float, float] = (0.0, 0.0)
+
+
+@dataclass(frozen=True)
+class EdgeKeyframe:
+    """An edge's settled visual state (see `KeyframeSnapshot`)."""
+
+    edge_id: str
+    src_id: str
+    dst_id: str
+    state: Optional[str] = None
+    label: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class KeyframeSnapshot:
+    """
+    Compact, picklable end state of a step: node/edge visuals in stacking
+    order plus the message. `restore_keyframe` rebuilds the same scene
+    without replaying the steps that produced it.
+    """
+
+    items: Tuple[Union[NodeKeyframe, EdgeKeyframe], ...] = ()
+    message: str = ""
+    message_pos: Tuple[float, float] = (10.0, 10.0)
 
 
 class PySide6Renderer(Renderer):
@@ -96,6 +153,15 @@ class PySide6Renderer(Renderer):
         self._animations_enabled: bool = animations_enabled
         self._speed_factor: float = 1.0
         self._abort_animations: bool = False
+        self._instrumentation: Optional[RendererInstrumentation] = None
+        self._stats_item: Optional[QGraphicsSimpleTextItem] = None
+        self._frame_scheduler: Optional[AdaptiveFrameScheduler] = None
+        if self._config.adaptive_frames:
+            self.set_adaptive_frames(True)
+        if self._config.instrument or self._config.show_stats_overlay:
+            self.enable_instrumentation()
+        if self._config.show_stats_overlay:
+            self.set_stats_overlay(True)
 
     def render_timeline(self, timeline: Timeline) -> None:
         """Interpret the given Timeline and update the scene accordingly."""
@@ -103,11 +169,28 @@ class PySide6Renderer(Renderer):
             self.apply_step(step)
 
     def apply_step(self, step: AnimationStep) -> None:
-        if self._animations_enabled and step.duration_ms > 0:
+        animated = self._animations_enabled and step.duration_ms > 0
+        started = self._begin_step_stats(step, animated)
+        if animated:
             self._apply_step_animated(step)
         else:
             for op in step.ops:
                 self._apply_op(op)
+        self._end_step_stats(started)
+
+    def render_step_frames(
+        self, step: AnimationStep, frames: int, on_frame: Callable[[int], None]
+    ) -> None:
+        """
+        Interpolate a step over a fixed number of frames without waiting.
+
+        `on_frame(i)` is invoked after frame i (1-based) has been drawn into the
+        scene; the last call happens after the step has been finalized, so the
+        scene then matches the step's end state. Used by offscreen exporters.
+        """
+        started = self._begin_step_stats(step, animated=True)
+        self._apply_step_animated(step, frames=max(1, frames), on_frame=on_frame)
+        self._end_step_stats(started)
 
     def set_speed(self, factor: float) -> None:
         """Adjust animation speed (scales duration)."""
@@ -117,12 +200,141 @@ class PySide6Renderer(Renderer):
         """Enable or disable animations without rebuilding renderer."""
         self._animations_enabled = enabled
 
+    def set_adaptive_frames(self, enabled: bool) -> None:
+        """Switch between the fixed frame policy and measured-cost scheduling."""
+        self._config.adaptive_frames = enabled
+        if not enabled:
+            self._frame_scheduler = None
+        elif self._frame_scheduler is None:
+            self._frame_scheduler = AdaptiveFrameScheduler(
+                max_frames=self._config.adaptive_max_frames,
+                min_frame_ms=self._config.min_frame_ms,
+            )
+
+    @property
+    def frame_scheduler(self) -> Optional[AdaptiveFrameScheduler]:
+        return self._frame_scheduler
+
     def set_show_messages(self, enabled: bool) -> None:
         """Enable or disable message rendering."""
         self._config.show_messages = enabled
         if not enabled:
             self._clear_message()
 
+    # ------------------------------------------------------------------ #
+    # Instrumentation
+    # ------------------------------------------------------------------ #
+    @property
+    def instrumentation(self) -> Optional[RendererInstrumentation]:
+        """Collected per-step stats, or None when instrumentation is off."""
+        return self._instrumentation
+
+    def enable_instrumentation(
+        self, enabled: bool = True, history: int = 256
+    ) -> Optional[RendererInstrumentation]:
+        """
+        Start (or stop) recording op counts/costs, edge rebuilds and frame times.
+
+        Re-enabling keeps the existing collector; disabling drops it together
+        with the overlay.
+        """
+        if not enabled:
+            self.set_stats_overlay(False)
+            self._instrumentation = None
+            return None
+        if self._instrumentation is None:
+            self._instrumentation = RendererInstrumentation(history=history)
+        return self._instrumentation
+
+    def set_stats_overlay(self, enabled: bool) -> None:
+        """Show the last step's stats as a text item in the scene corner."""
+        if enabled:
+            self.enable_instrumentation()
+            if self._stats_item is None:
+                self._stats_item = QGraphicsSimpleTextItem("")
+                self._stats_item.setBrush(QColor("#4b5563"))
+                self._stats_item.setZValue(1000.0)
+                self._scene.addItem(self._stats_item)
+            self._stats_item.setVisible(True)
+            self._refresh_stats_overlay()
+        elif self._stats_item is not None:
+            self._scene.removeItem(self._stats_item)
+            self._stats_item = None
+
+    def capture_keyframe(self) -> KeyframeSnapshot:
+        """Snapshot the settled scene (call between steps, not mid-animation)."""
+        by_item: Dict[QGraphicsItem, Union[NodeKeyframe, EdgeKeyframe]] = {}
+        for node_id, node in self._nodes.items():
+            pos = node.item.pos()
+            label_pos = node.label.pos() if node.label else QPointF()
+            by_item[node.item] = NodeKeyframe(
+                node_id=node_id,
+                shape=node.shape,
+                width=node.width,
+                height=node.height,
+                x=pos.x(),
+                y=pos.y(),
+                state=node.state,
+                label=node.label.text() if node.label else None,
+                label_pos=(label_pos.x(), label_pos.y()),
+            )
+        for edge_id, edge in self._edges.items():
+            by_item[edge.item] = EdgeKeyframe(
+                edge_id=edge_id,
+                src_id=edge.src_id,
+                dst_id=edge.dst_id,
+                state=edge.state,
+                label=edge.label.text() if edge.label else None,
+            )
+        # Same-Z items stack in insertion order; rebuild in that order.
+        ordered = [
+            by_item[item]
+            for item in self._scene.items(Qt.SortOrder.AscendingOrder)
+            if item in by_item
+        ]
+        if not self._message:
+            return KeyframeSnapshot(items=tuple(ordered))
+        message_pos = self._message_item.pos()
+        return KeyframeSnapshot(
+            items=tuple(ordered),
+            message=self._message,
+            message_pos=(message_pos.x(), message_pos.y()),
+        )
+
+    def restore_keyframe(self, snapshot: KeyframeSnapshot) -> None:
+        """Replace the scene with `snapshot` (no animation, no stats)."""
+        self.clear()
+        for entry in snapshot.items:
+            if isinstance(entry, NodeKeyframe):
+                self._restore_node(entry)
+            else:
+                self._create_edge(
+                    AnimationOp(
+                        op=OpCode.CREATE_EDGE,
+                        target=entry.edge_id,
+                        data={"from": entry.src_id, "to": entry.dst_id},
+                    )
+                )
+                if entry.label is not None:
+                    edge = self._edges[entry.edge_id]
+                    edge.label = QGraphicsSimpleTextItem(entry.label)
+                    self._scene.addItem(edge.label)
+                if entry.state is not None:
+                    self._set_state(
+                        AnimationOp(
+                            op=OpCode.SET_STATE,
+                            target=entry.edge_id,
+                            data={"state": entry.state},
+                        )
+                    )
+        for edge_id in self._edges:
+            self._update_edge_position(edge_id)
+        if snapshot.message:
+            self._message = snapshot.message
+            self._message_item.setText(snapshot.message)
+            self._message_item.setPos(*snapshot.message_pos)
+            self._message_item.setVisible(True)
+
     def abort_animations(self) -> None:
         """Signal any in-flight animation loop to stop safely."""
         self._abort_animations = True
@@ -139,26 +351,73 @@ class PySide6Renderer(Renderer):
         self._edges.clear()
         self._clear_message()
 
+    def _restore_node(self, entry: NodeKeyframe) -> None:
+        self._create_node(
+            AnimationOp(
+                op=OpCode.CREATE_NODE,
+                target=entry.node_id,
+                data={
+                    "shape": entry.shape,
+                    "width": entry.width,
+                    "height": entry.height,
+                },
+            )
+        )
+        node = self._nodes[entry.node_id]
+        node.item.setPos(entry.x, entry.y)
+        if entry.label is not None:
+            node.label = QGraphicsSimpleTextItem(entry.label)
+            node.label.setParentItem(node.item)
+            node.label.setPos(*entry.label_pos)
+        if entry.state is not None:
+            self._set_state(
+                AnimationOp(
+                    op=OpCode.SET_STATE,
+                    target=entry.node_id,
+                    data={"state": entry.state},
+                )
+            )
+
     # ------------------------------------------------------------------ #
     # Animation helpers
     # ------------------------------------------------------------------ #
-    def _apply_step_animated(self, step: AnimationStep) -> None:
+    def _apply_step_animated(
+        self,
+        step: AnimationStep,
+        frames: Optional[int] = None,
+        on_frame: Optional[Callable[[int], None]] = None,
+    ) -> None:
         """
         Basic synchronous animation:
           - SET_POS interpolated linearly
           - SET_STATE color interpolation
           - CREATE_* fade-in; DELETE_* fade-out then remove
+
+        When `on_frame` is given, frames are produced back-to-back (no qWait)
+        and the callback observes each one. With adaptive scheduling enabled
+        (and no explicit frame count), the frame count follows measured cost
+        and late frames are dropped to keep the step's wall-clock duration.
         """
         if self._abort_animations:
             return
 
         adjusted_duration = int(step.duration_ms / self._speed_factor)
-        frames = max(1, min(10, adjusted_duration // 50 or 1))
+        scheduler = (
+            self._frame_scheduler if frames is None and on_frame is None else None
+        )
+        if frames is None:
+            if scheduler is not None:
+                frames = scheduler.plan(adjusted_duration)
+            else:
+                frames = max(
+                    1, min(self._config.max_frames, adjusted_duration // 50 or 1)
+                )
         create_nodes: list[AnimationOp] = []
         create_edges: list[AnimationOp] = []
         delete_nodes: list[AnimationOp] = []
         delete_edges: list[AnimationOp] = []
         set_pos_ops: list[AnimationOp] = []
+        set_size_ops: list[AnimationOp] = []
         set_state_ops: list[AnimationOp] = []
         set_label_ops: list[AnimationOp] = []
         other_ops: list[AnimationOp] = []
@@ -174,6 +433,8 @@ class PySide6Renderer(Renderer):
                 delete_edges.append(op)
             elif op.op is OpCode.SET_POS:
                 set_pos_ops.append(op)
+            elif op.op is OpCode.SET_SIZE:
+                set_size_ops.append(op)
             elif op.op is OpCode.SET_STATE:
                 set_state_ops.append(op)
             elif op.op is OpCode.SET_LABEL:
@@ -218,6 +479,18 @@ class PySide6Renderer(Renderer):
                     float(op.data.get("y", 0.0)),
                 )
 
+        size_targets: Dict[str, tuple[float, float]] = {}
+        size_starts: Dict[str, tuple[float, float]] = {}
+        for op in set_size_ops:
+            target = op.target or ""
+            node = self._nodes.get(target)
+            if node and node.shape != "circle":
+                size_starts[target] = (node.width, node.height)
+                size_targets[target] = (
+                    float(op.data.get("width", node.width)),
+                    float(op.data.get("height", node.height)),
+                )
+
         state_targets: Dict[str, QColor] = {}
         state_starts: Dict[str, QColor] = {}
         for op in set_state_ops:
@@ -250,9 +523,24 @@ class PySide6Renderer(Renderer):
         # Run interpolation frames synchronously (with a small wait per frame
         # so the UI can present motion when running in the main loop).
         delay_per_frame = int(adjusted_duration / frames) if frames > 0 else 0
-        for i in range(1, frames + 1):
+        if on_frame is not None:
+            delay_per_frame = 0
+        budget_ms = adjusted_duration / frames if frames > 0 else 0.0
+        instrumentation = self._instrumentation
+        step_started = time.perf_counter()
+        i = 0
+        while i < frames:
             if self._abort_animations:
                 return
+            frame_started = time.perf_counter()
+            if scheduler is not None:
+                elapsed = (frame_started - step_started) * 1000.0
+                following = scheduler.next_frame(i, frames, elapsed, adjusted_duration)
+                if instrumentation is not None and following > i + 1:
+                    instrumentation.record_skipped_frames(following - i - 1)
+                i = following
+            else:
+                i += 1
             t = i / frames
             # positions
             for target, end_pos in pos_targets.items():
@@ -263,6 +551,14 @@ class PySide6Renderer(Renderer):
                 if node:
                     node.item.setPos(new_x, new_y)
                     self._update_edges_for_node(target)
+            # sizes
+            for target, end_size in size_targets.items():
+                start_size = size_starts.get(target, end_size)
+                self._resize_node(
+                    target,
+                    start_size[0] + (end_size[0] - start_size[0]) * t,
+                    start_size[1] + (end_size[1] - start_size[1]) * t,
+                )
             # states
             for target, end_color in state_targets.items():
                 start_color = state_starts.get(target, end_color)
@@ -300,10 +596,25 @@ class PySide6Renderer(Renderer):
                     edge.item.setOpacity(max(0.0, start_opacity * (1 - t)))
                     if edge.label:
                         edge.label.setOpacity(max(0.0, start_opacity * (1 - t)))
-            if delay_per_frame > 0:
-                QTest.qWait(delay_per_frame)
-                if self._abort_animations:
-                    return
+            frame_cost = (time.perf_counter() - frame_started) * 1000.0
+            if on_frame is not None and i < frames:
+                on_frame(i)
+            wait = delay_per_frame
+            if scheduler is not None:
+                elapsed = (time.perf_counter() - step_started) * 1000.0
+                wait = scheduler.wait_ms(i, frames, elapsed, adjusted_duration)
+            if wait > 0:
+                waited_from = time.perf_counter()
+                QTest.qWait(wait)
+                # Repaint happens inside the event loop; count the overrun.
+                overrun = (time.perf_counter() - waited_from) * 1000.0 - wait
+                frame_cost += max(0.0, overrun)
+            if scheduler is not None:
+                scheduler.record(frame_cost)
+            if instrumentation is not None:
+                instrumentation.record_frame(i, frame_cost, budget_ms)
+            if self._abort_animations:
+                return
 
         # Finalize state: apply labels, final set_state/set_label/pos just in case.
         if self._abort_animations:
@@ -314,6 +625,8 @@ class PySide6Renderer(Renderer):
             self._apply_op(op)
         for op in set_pos_ops:
             self._apply_op(op)
+        for op in set_size_ops:
+            self._apply_op(op)
         # Remove deleted objects after fade-out.
         for op in delete_edges:
             self._delete_edge(op)
@@ -322,6 +635,29 @@ class PySide6Renderer(Renderer):
         # Apply any remaining ops (messages, etc.).
         for op in other_ops:
             self._apply_op(op)
+        if on_frame is not None:
+            on_frame(frames)
+
+    def _begin_step_stats(self, step: AnimationStep, animated: bool) -> float:
+        if self._instrumentation is None:
+            return 0.0
+        self._instrumentation.begin_step(
+            int(step.duration_ms / self._speed_factor), step.label, animated
+        )
+        return time.perf_counter()
+
+    def _end_step_stats(self, started: float) -> None:
+        if self._instrumentation is None:
+            return
+        self._instrumentation.end_step((time.perf_counter() - started) * 1000.0)
+        self._refresh_stats_overlay()
+
+    def _refresh_stats_overlay(self) -> None:
+        if self._stats_item is None or self._instrumentation is None:
+            return
+        last: Optional[StepStats] = self._instrumentation.last_step
+        self._stats_item.setText(last.summary() if last else "no steps yet")
+        self._stats_item.setPos(*self._compute_stats_anchor())
 
     @staticmethod
     def _interpolate_color(start: QColor, end: QColor, t: float) -> QColor:
@@ -333,6 +669,16 @@ class PySide6Renderer(Renderer):
         return QColor(r, g, b, a)
 
     def _apply_op(self, op: AnimationOp) -> None:
+        if self._instrumentation is None:
+            self._dispatch_op(op)
+            return
+        started = time.perf_counter()
+        self._dispatch_op(op)
+        self._instrumentation.record_op(
+            op.op, (time.perf_counter() - started) * 1000.0
+        )
+
+    def _dispatch_op(self, op: AnimationOp) -> None:
         if op.op is OpCode.CREATE_NODE:
             self._create_node(op)
             return
@@ -348,6 +694,9 @@ class PySide6Renderer(Renderer):
         if op.op is OpCode.SET_POS:
             self._set_pos(op)
             return
+        if op.op is OpCode.SET_SIZE:
+            self._set_size(op)
+            return
         if op.op is OpCode.SET_STATE:
             self._set_state(op)
             return
@@ -476,10 +825,29 @@ class PySide6Renderer(Renderer):
         # label is parented, so it moves with the node item automatically
         self._update_edges_for_node(op.target or "")
 
+    def _set_size(self, op: AnimationOp) -> None:
+        node = self._nodes.get(op.target or "")
+        if not node:
+            return
+        width = float(op.data.get("width", node.width))
+        height = float(op.data.get("height", node.height))
+        self._resize_node(op.target or "", width, height)
+
+    def _resize_node(self, node_id: str, width: float, height: float) -> None:
+        """Resize a rect-like node in place (circles keep the configured radius)."""
+        node = self._nodes.get(node_id)
+        if not node or not isinstance(node.item, QGraphicsRectItem):
+            return
+        node.item.setRect(-width / 2, -height / 2, width, height)
+        node.width = width
+        node.height = height
+        self._update_edges_for_node(node_id)
+
     def _set_state(self, op: AnimationOp) -> None:
         state = op.data.get("state", "normal")
         node = self._nodes.get(op.target or "")
         if node:
+            node.state = state
             color = self._config.colors.get(state, self._config.colors["normal"])
             if node.shape == "bucket":
                 pen = QPen(color)
@@ -492,6 +860,7 @@ class PySide6Renderer(Renderer):
 
         edge = self._edges.get(op.target or "")
         if edge:
+            edge.state = state
             color = self._config.colors.get(state, self._config.colors["normal"])
             edge.item.setPen(QPen(color, 1.5))
 
@@ -549,6 +918,18 @@ class PySide6Renderer(Renderer):
             y = content_rect.top() + margin
         return x, y
 
+    def _compute_stats_anchor(self) -> tuple[float, float]:
+        """
+        Place the stats overlay below the content's bottom-left corner;
+        messages sit above the content, so the two never overlap. An empty
+        scene puts it under the message's default slot at (12, 12).
+        """
+        margin = 12.0
+        content_rect = self._content_bounding_rect()
+        if content_rect.isNull():
+            return margin, margin + self._message_item.boundingRect().height() + 6.0
+        return content_rect.left(), content_rect.bottom() + margin
+
     def _content_bounding_rect(self) -> QRectF:
         """
         Compute bounding rect excluding the message item itself to avoid
@@ -623,6 +1004,8 @@ class PySide6Renderer(Renderer):
             path.lineTo(x2, y2)
 
         edge.item.setPath(path)
+        if self._instrumentation is not None:
+            self._instrumentation.record_edge_rebuild()
 
         if edge.label:
             mid_x = (p1.x() + p2.x()) / 2
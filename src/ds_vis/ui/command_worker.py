@@ -0,0 +1,167 @@
+"""
+Background execution of SceneGraph work for the desktop UI.
+
+Applying a large DSL script or importing a big scene runs model operations and
+layout for every command; doing that on the GUI thread freezes the window.
+`SceneGraphWorker` runs those jobs on a QThreadPool thread and streams the
+resulting AnimationSteps into a bounded `StepStream` that the player drains
+on the GUI thread, so playback starts after the first command and memory
+stays bounded however long the script is.
+
+Threading contract: while a worker runs, it is the only writer of its
+SceneGraph; the window must not read or mutate that graph until `finished`.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Deque, Iterable, List
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from ds_vis.core.exceptions import DsVisError
+from ds_vis.core.ops import AnimationStep, Timeline
+
+# One unit of work: mutate the SceneGraph and return the resulting timeline.
+SceneGraphJob = Callable[[], Timeline]
+
+
+class StepStream:
+    """
+    Bounded, thread-safe FIFO of AnimationSteps (producer: worker thread,
+    consumer: GUI player).
+
+    `put` blocks while the stream is full (backpressure on the compiler);
+    `close` ends the stream and unblocks the producer. `release` lifts the
+    bound so a cancelled producer can flush the command it is finishing
+    without waiting for playback.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._capacity = max(1, capacity)
+        self._items: Deque[AnimationStep] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._bounded = True
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    @property
+    def exhausted(self) -> bool:
+        """Closed and fully drained: no more steps will ever arrive."""
+        with self._cond:
+            return self._closed and not self._items
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def put(self, step: AnimationStep) -> bool:
+        """
+        Append a step, waiting for room. Returns True when the stream was
+        empty before (the consumer may be idle and needs a wake-up).
+        """
+        with self._cond:
+            while (
+                self._bounded
+                and not self._closed
+                and len(self._items) >= self._capacity
+            ):
+                self._cond.wait()
+            if self._closed:
+                return False
+            was_empty = not self._items
+            self._items.append(step)
+            return was_empty
+
+    def drain(self, limit: int = 0) -> List[AnimationStep]:
+        """Take up to `limit` queued steps (all when `limit` <= 0) without waiting."""
+        with self._cond:
+            count = len(self._items) if limit <= 0 else min(limit, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            if batch:
+                self._cond.notify_all()
+            return batch
+
+    def release(self) -> None:
+        with self._cond:
+            self._bounded = False
+            self._cond.notify_all()
+
+    def close(self, discard: bool = False) -> None:
+        with self._cond:
+            self._closed = True
+            if discard:
+                self._items.clear()
+            self._cond.notify_all()
+
+
+class SceneGraphWorkerSignals(QObject):
+    """Signals emitted by SceneGraphWorker (QRunnable cannot own signals)."""
+
+    progress = Signal(int, int)  # done, total (0 when unknown)
+    steps_available = Signal()  # stream went from empty to non-empty
+    failed = Signal(str)
+    finished = Signal(bool)  # cancelled
+
+
+class SceneGraphWorker(QRunnable):
+    """
+    Run SceneGraph jobs off the GUI thread, streaming their steps.
+
+    `jobs` may be lazy (e.g. a generator over a DSL parser), so parsing,
+    model operations and layout all overlap with playback. Steps of every
+    job that completed are delivered — also after a cancellation or a
+    failure — so the rendered scene stays consistent with the models.
+    """
+
+    def __init__(
+        self, jobs: Iterable[SceneGraphJob], stream: StepStream, total: int = 0
+    ) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # the window keeps a handle for cancel()
+        self.signals = SceneGraphWorkerSignals()
+        self._jobs = jobs
+        self._stream = stream
+        self._total = max(0, total)
+        self._cancel = threading.Event()
+
+    @property
+    def stream(self) -> StepStream:
+        return self._stream
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Request a stop; takes effect before the next job starts."""
+        self._cancel.set()
+        self._stream.release()
+
+    def run(self) -> None:
+        done = 0
+        try:
+            for job in self._jobs:
+                if self._cancel.is_set():
+                    break
+                for step in job().steps:
+                    if self._stream.put(step):
+                        self.signals.steps_available.emit()
+                done += 1
+                self.signals.progress.emit(done, self._total)
+        except DsVisError as exc:
+            self.signals.failed.emit(str(exc))
+        except Exception as exc:  # pragma: no cover - defensive
+            self.signals.failed.emit(f"{type(exc).__name__}: {exc}")
+        finally:
+            self._stream.close()
+        self.signals.finished.emit(self._cancel.is_set())
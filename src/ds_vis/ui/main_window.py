@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import sys
-from typing import Any, Dict, List
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QAction, QScreen
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QAction, QCloseEvent, QScreen
 from PySide6.QtWidgets import (
     QApplication,
     QComboBox,
@@ -19,6 +20,7 @@ from PySide6.QtWidgets import (
     QMenu,
     QMenuBar,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QSplitter,
     QToolBar,
@@ -30,12 +32,13 @@ from ds_vis.core.exceptions import CommandError
 from ds_vis.core.ops import AnimationStep, Timeline
 from ds_vis.core.scene import SceneGraph
 from ds_vis.core.scene.command import Command, CommandType
-from ds_vis.dsl.parser import parse_dsl
+from ds_vis.dsl.parser import iter_dsl, parse_dsl
 from ds_vis.persistence.json_io import (
     load_scene_from_file,
     save_scene_to_file,
 )
 from ds_vis.renderers.pyside6.renderer import PySide6Renderer, RendererConfig
+from ds_vis.ui.command_worker import SceneGraphJob, SceneGraphWorker, StepStream
 
 # Developer examples (structural timelines only)
 try:
@@ -48,6 +51,9 @@ except ImportError:  # pragma: no cover - defensive
     bst_insert_7_into_root_5 = None  # type: ignore[assignment]
     bst_insert_7_with_layout_example = None  # type: ignore[assignment]
 
+# Undo steps kept by the window's SceneGraph (history is off by default).
+UNDO_HISTORY_LIMIT = 1000
+
 class MainWindow(QMainWindow):
     """
     Minimal main window for the visualizer.
@@ -85,8 +91,10 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(splitter)
 
         # Core engine wiring (skeleton)
-        self._scene_graph = SceneGraph()
-        self._renderer = PySide6Renderer(self._scene)
+        self._scene_graph = SceneGraph(history_limit=UNDO_HISTORY_LIMIT)
+        self._renderer = PySide6Renderer(
+            self._scene, config=RendererConfig(adaptive_frames=True)
+        )
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._advance_step)
         self._pending_steps: list[AnimationStep] = []
@@ -94,11 +102,28 @@ class MainWindow(QMainWindow):
         self._speed_factor: float = 1.0
         self._animations_enabled: bool = True
         self._show_messages: bool = True
+        self._show_stats: bool = False
         self._paused: bool = False
 
+        # Background SceneGraph work (one job at a time per window). Batches
+        # shorter than the threshold run inline: the handoff is not worth it.
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._worker: Optional[SceneGraphWorker] = None
+        self._worker_error_title: str = "Command Error"
+        self._background_min_commands: int = 32
+        # Streamed playback: the player drains steps from a bounded stream fed
+        # by the worker; played steps are dropped to keep memory bounded.
+        self._stream: Optional[StepStream] = None
+        self._stream_capacity: int = 256
+        self._stream_batch: int = 64
+        self._awaiting_stream: bool = False
+        self._streamed_playback: bool = False
+
         # Developer playground menu
         self._init_menubar()
         self._init_toolbar()
+        self._init_statusbar()
         self._wire_control_panel()
 
     # --------------------------------------------------------------------- #
@@ -113,7 +138,9 @@ class MainWindow(QMainWindow):
         form_layout = QVBoxLayout()
         self._structure_id_input = QLineEdit("ui_ds", panel)
         self._kind_combo = QComboBox(panel)
-        self._kind_combo.addItems(["list", "seqlist", "stack", "bst", "huffman", "git"])
+        self._kind_combo.addItems(
+            ["list", "seqlist", "stack", "bst", "avl", "rbtree", "huffman", "git"]
+        )
         self._values_input = QLineEdit("", panel)
         self._value_input = QLineEdit("", panel)
         self._index_input = QLineEdit("", panel)
@@ -137,6 +164,8 @@ class MainWindow(QMainWindow):
         btn_search = QPushButton("Search", panel)
         btn_delete = QPushButton("Delete", panel)
         btn_delete_all = QPushButton("Delete All", panel)
+        btn_undo = QPushButton("Undo", panel)
+        btn_redo = QPushButton("Redo", panel)
         btn_dsl = QPushButton("Run DSL/JSON (Reset)", panel)
         btn_interactive_dsl = QPushButton("Interactive DSL", panel)
         btn_import = QPushButton("Import JSON", panel)
@@ -148,6 +177,8 @@ class MainWindow(QMainWindow):
             btn_search,
             btn_delete,
             btn_delete_all,
+            btn_undo,
+            btn_redo,
             btn_dsl,
             btn_interactive_dsl,
             btn_import,
@@ -162,6 +193,8 @@ class MainWindow(QMainWindow):
         self._btn_search = btn_search
         self._btn_delete = btn_delete
         self._btn_delete_all = btn_delete_all
+        self._btn_undo = btn_undo
+        self._btn_redo = btn_redo
         self._btn_dsl = btn_dsl
         self._btn_interactive_dsl = btn_interactive_dsl
         self._btn_import = btn_import
@@ -254,12 +287,31 @@ class MainWindow(QMainWindow):
         self._act_toggle_message.triggered.connect(self._toggle_messages)
         toolbar.addAction(self._act_toggle_message)
 
+        self._act_toggle_stats = QAction("Stats", self, checkable=True)
+        self._act_toggle_stats.setChecked(False)
+        self._act_toggle_stats.triggered.connect(self._toggle_stats)
+        toolbar.addAction(self._act_toggle_stats)
+
+    def _init_statusbar(self) -> None:
+        """Progress + cancel for background command execution."""
+        status = self.statusBar()
+        self._progress_bar = QProgressBar(self)
+        self._progress_bar.setMaximumWidth(200)
+        self._progress_bar.setVisible(False)
+        self._btn_cancel_worker = QPushButton("Cancel", self)
+        self._btn_cancel_worker.setVisible(False)
+        self._btn_cancel_worker.clicked.connect(self._cancel_worker)
+        status.addPermanentWidget(self._progress_bar)
+        status.addPermanentWidget(self._btn_cancel_worker)
+
     def _wire_control_panel(self) -> None:
         self._btn_create.clicked.connect(self._on_create_clicked)
         self._btn_insert.clicked.connect(self._on_insert_clicked)
         self._btn_search.clicked.connect(self._on_search_clicked)
         self._btn_delete.clicked.connect(self._on_delete_clicked)
         self._btn_delete_all.clicked.connect(self._on_delete_all_clicked)
+        self._btn_undo.clicked.connect(self._on_undo_clicked)
+        self._btn_redo.clicked.connect(self._on_redo_clicked)
         self._btn_dsl.clicked.connect(self._run_dsl_input_dev)
         self._btn_interactive_dsl.clicked.connect(self._run_interactive_dsl_input)
         self._btn_import.clicked.connect(self._on_import_clicked)
@@ -415,9 +467,32 @@ class MainWindow(QMainWindow):
         cmd = Command(sid, CommandType.DELETE_STRUCTURE, {"kind": kind})
         self._run_commands([cmd])
 
+    def _on_undo_clicked(self) -> None:
+        self._run_history(self._scene_graph.undo)
+
+    def _on_redo_clicked(self) -> None:
+        self._run_history(self._scene_graph.redo)
+
+    def _run_history(self, action: Callable[[], Timeline]) -> None:
+        """Play the inverse (undo) or re-applied (redo) timeline."""
+        if self._reject_if_busy():
+            return
+        self._timer.stop()
+        try:
+            timeline = action()
+        except CommandError as exc:
+            QMessageBox.information(self, "History", str(exc))
+            return
+        self._play_timeline(timeline)
+
     def _run_commands(self, commands: list[Command]) -> None:
         """Apply a sequence of commands and play their timelines."""
+        if self._reject_if_busy():
+            return
         self._timer.stop()
+        if len(commands) >= self._background_min_commands:
+            self._start_worker(self._command_jobs(commands), len(commands))
+            return
         merged = Timeline()
         try:
             for cmd in commands:
@@ -440,18 +515,20 @@ class MainWindow(QMainWindow):
         )
         if not filename:
             return
-        try:
-            scene_data = load_scene_from_file(filename)
-            timeline = self._scene_graph.import_scene(scene_data)
-            self._play_timeline(timeline)
-        except CommandError as exc:
-            QMessageBox.critical(self, "Import Error", str(exc))
-            return
-        except Exception as exc:
-            QMessageBox.critical(self, "Error", str(exc))
+        if self._reject_if_busy():
             return
+        self._timer.stop()
+        # Reading, validating and laying out a large scene happens off-thread.
+        job = partial(self._import_scene_file, self._scene_graph, filename)
+        self._start_worker([job], 1, error_title="Import Error")
+
+    @staticmethod
+    def _import_scene_file(scene_graph: SceneGraph, filename: str) -> Timeline:
+        return scene_graph.import_scene(load_scene_from_file(filename))
 
     def _on_export_clicked(self) -> None:
+        if self._reject_if_busy():
+            return
         # Check if there are any structures to export
         if not self._scene_graph._structures:
             QMessageBox.information(
@@ -632,13 +709,22 @@ class MainWindow(QMainWindow):
         self._run_dsl_text(text, reset=False)
 
     def _run_dsl_text(self, text: str, reset: bool = True) -> None:
+        # A reset run supersedes (cancels) a running worker; injection waits.
+        if not reset and self._reject_if_busy():
+            return
         if reset:
             self._reset_engine()
         
         existing_kinds = {
             sid: model.kind for sid, model in self._scene_graph._structures.items()
         }
-        
+
+        if _estimate_statements(text) >= self._background_min_commands:
+            # Long scripts: parse, apply and play concurrently.
+            self._timer.stop()
+            self._start_worker(self._dsl_jobs(text, existing_kinds), total=0)
+            return
+
         try:
             commands = parse_dsl(text, existing_kinds=existing_kinds)
         except Exception as exc:  # pragma: no cover - defensive
@@ -719,16 +805,126 @@ class MainWindow(QMainWindow):
 
         self._play_timeline(merged)
 
+    # --------------------------------------------------------------------- #
+    # Background execution
+    # --------------------------------------------------------------------- #
+    def _command_jobs(self, commands: Iterable[Command]) -> List[SceneGraphJob]:
+        return [partial(self._scene_graph.apply_command, cmd) for cmd in commands]
+
+    def _dsl_jobs(
+        self, text: str, existing_kinds: Mapping[str, str]
+    ) -> Iterator[SceneGraphJob]:
+        """Lazily parse `text` on the worker thread, one job per command."""
+        scene_graph = self._scene_graph
+        for cmd in iter_dsl(text, existing_kinds=existing_kinds):
+            yield partial(scene_graph.apply_command, cmd)
+
+    def _start_worker(
+        self,
+        jobs: Iterable[SceneGraphJob],
+        total: int,
+        error_title: str = "Command Error",
+    ) -> None:
+        """Run SceneGraph jobs on the pool and play their steps as they stream in."""
+        stream = StepStream(self._stream_capacity)
+        worker = SceneGraphWorker(jobs, stream, total=total)
+        # Bound methods of this window => queued delivery on the GUI thread.
+        worker.signals.progress.connect(self._on_worker_progress)
+        worker.signals.steps_available.connect(self._on_steps_available)
+        worker.signals.failed.connect(self._on_worker_failed)
+        worker.signals.finished.connect(self._on_worker_finished)
+        self._worker = worker
+        self._worker_error_title = error_title
+        self._control_panel.setEnabled(False)
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(0)
+        self._progress_bar.setVisible(True)
+        self._btn_cancel_worker.setVisible(True)
+        self._begin_stream(stream)
+        self._thread_pool.start(worker)
+
+    def _is_busy(self) -> bool:
+        return self._worker is not None
+
+    def _reject_if_busy(self) -> bool:
+        if not self._is_busy():
+            return False
+        self.statusBar().showMessage("Busy: previous commands still running", 3000)
+        return True
+
+    def _is_current_worker(self) -> bool:
+        worker = self._worker
+        return worker is not None and self.sender() is worker.signals
+
+    def _cancel_worker(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self.statusBar().showMessage("Cancelling...", 2000)
+
+    def _on_worker_progress(self, done: int, total: int) -> None:
+        if not self._is_current_worker():
+            return
+        if total <= 0:
+            self._progress_bar.setRange(0, 0)  # busy indicator
+            self.statusBar().showMessage(f"Applied {done} commands")
+        else:
+            self._progress_bar.setValue(done)
+
+    def _on_steps_available(self) -> None:
+        if not self._is_current_worker():
+            return
+        if self._awaiting_stream and not self._paused:
+            self._awaiting_stream = False
+            self._advance_step()
+
+    def _on_worker_failed(self, message: str) -> None:
+        if self._is_current_worker():
+            QMessageBox.critical(self, self._worker_error_title, message)
+
+    def _on_worker_finished(self, cancelled: bool) -> None:
+        if not self._is_current_worker():
+            return
+        self._release_worker()
+        if cancelled:
+            self.statusBar().showMessage("Cancelled", 3000)
+
+    def _stop_worker(self) -> None:
+        """Cancel any running worker and wait for its current job to end."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        self._worker.stream.close(discard=True)
+        self._thread_pool.waitForDone()
+        # Pending queued signals are ignored once the handle is dropped.
+        self._release_worker()
+
+    def _release_worker(self) -> None:
+        self._worker = None
+        self._control_panel.setEnabled(True)
+        self._progress_bar.setVisible(False)
+        self._btn_cancel_worker.setVisible(False)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self._stop_worker()
+        super().closeEvent(event)
+
     def _reset_engine(self) -> None:
         """Reset scene, renderer, and scene graph for a fresh demo run."""
+        self._stop_worker()
         self._timer.stop()
         self._pending_steps = []
         self._current_step_index = 0
+        self._stream = None
+        self._awaiting_stream = False
         self._paused = False
         self._renderer.abort_animations()
         self._scene.clear()
-        config = RendererConfig(show_messages=self._show_messages)
-        self._scene_graph = SceneGraph()
+        config = RendererConfig(
+            show_messages=self._show_messages,
+            show_stats_overlay=self._show_stats,
+            adaptive_frames=True,
+        )
+        self._scene_graph = SceneGraph(history_limit=UNDO_HISTORY_LIMIT)
         self._renderer = PySide6Renderer(
             self._scene,
             animations_enabled=self._animations_enabled,
@@ -742,36 +938,74 @@ class MainWindow(QMainWindow):
         self._pending_steps = list(timeline.steps)
         self._current_step_index = 0
         self._paused = False
+        self._stream = None
+        self._awaiting_stream = False
+        self._streamed_playback = False
         if not self._pending_steps:
             return
         self._advance_step()
 
+    def _begin_stream(self, stream: StepStream) -> None:
+        """Start streamed playback; the first step plays once it arrives."""
+        self._timer.stop()
+        self._pending_steps = []
+        self._current_step_index = 0
+        self._paused = False
+        self._stream = stream
+        self._awaiting_stream = True
+        self._streamed_playback = True
+
+    def _pull_stream(self) -> bool:
+        """Refill pending steps from the stream; False if none are ready."""
+        stream = self._stream
+        if stream is None:
+            return False
+        # Played steps are dropped so long streams keep memory bounded.
+        del self._pending_steps[: self._current_step_index]
+        self._current_step_index = 0
+        batch = stream.drain(self._stream_batch)
+        if batch:
+            self._pending_steps.extend(batch)
+            return True
+        if stream.exhausted:
+            self._stream = None
+        else:
+            # Producer is behind; steps_available resumes playback.
+            self._awaiting_stream = True
+        return False
+
     def _advance_step(self, schedule_next: bool = True) -> None:
-        if self._current_step_index >= len(self._pending_steps):
+        if (
+            self._current_step_index >= len(self._pending_steps)
+            and not self._pull_stream()
+        ):
             self._timer.stop()
             return
 
         step = self._pending_steps[self._current_step_index]
         self._renderer.apply_step(step)
         self._current_step_index += 1
-        if (
-            schedule_next
-            and not self._paused
-            and self._current_step_index < len(self._pending_steps)
-        ):
+        has_more = (
+            self._current_step_index < len(self._pending_steps)
+            or self._stream is not None
+        )
+        if schedule_next and not self._paused and has_more:
             delay = int(max(0, step.duration_ms) / self._speed_factor)
             self._timer.start(delay)
         else:
             self._timer.stop()
 
     def _play(self) -> None:
-        if not self._pending_steps:
+        if not self._pending_steps and self._stream is None:
             return
         # If paused mid-sequence, resume; otherwise restart from current index.
         self._paused = False
         if not self._timer.isActive():
             current = max(0, min(self._current_step_index, len(self._pending_steps)))
-            if current >= len(self._pending_steps):
+            if current >= len(self._pending_steps) and self._stream is None:
+                if self._streamed_playback:
+                    # Streamed steps were dropped after playing; nothing to replay.
+                    return
                 self._renderer.clear()
                 self._current_step_index = 0
             self._advance_step()
@@ -796,10 +1030,19 @@ class MainWindow(QMainWindow):
         self._show_messages = checked
         self._renderer.set_show_messages(checked)
 
+    def _toggle_stats(self, checked: bool) -> None:
+        self._show_stats = checked
+        self._renderer.set_stats_overlay(checked)
+
     # --------------------------------------------------------------------- #
     # Entry point
     # --------------------------------------------------------------------- #
 
+def _estimate_statements(text: str) -> int:
+    """Cheap upper bound on DSL statements (separators + 1), no parsing."""
+    return text.count(";") + text.count("\n") + 1
+
+
 def main() -> None:
     """
     Entry point for launching the desktop MVP skeleton.
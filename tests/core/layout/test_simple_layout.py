@@ -285,3 +285,89 @@ def test_bucket_center_aligns_vertical_stack():
     # bucket center 在两节点之间
     assert pos_ops["bucket"]["x"] == 0.0
     assert pos_ops["bucket"]["y"] == 25.0
+
+
+def test_set_size_updates_container_without_recreate():
+    layout = SimpleLayoutEngine()
+    bucket = AnimationOp(
+        op=OpCode.CREATE_NODE,
+        target="bucket",
+        data={"structure_id": "s", "shape": "bucket", "width": 120.0, "height": 40.0},
+    )
+    node = AnimationOp(op=OpCode.CREATE_NODE, target="n0", data={"structure_id": "s"})
+    layout.apply_layout(Timeline(steps=[AnimationStep(ops=[bucket, node])]))
+
+    resized = layout.apply_layout(
+        Timeline(
+            steps=[
+                AnimationStep(
+                    ops=[
+                        AnimationOp(
+                            op=OpCode.CREATE_NODE,
+                            target="n1",
+                            data={"structure_id": "s"},
+                        ),
+                        AnimationOp(
+                            op=OpCode.SET_SIZE,
+                            target="bucket",
+                            data={"structure_id": "s", "width": 200.0, "height": 40.0},
+                        ),
+                    ]
+                )
+            ]
+        )
+    )
+    bucket_pos = [
+        op.data
+        for step in resized.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS and op.target == "bucket"
+    ]
+    assert bucket_pos and bucket_pos[-1]["width"] == 200.0
+
+
+def test_later_steps_only_lay_out_dirty_structures(monkeypatch):
+    layout = SimpleLayoutEngine()
+
+    def create(node_id: str, structure_id: str) -> AnimationOp:
+        return AnimationOp(
+            op=OpCode.CREATE_NODE, target=node_id, data={"structure_id": structure_id}
+        )
+
+    layout.apply_layout(
+        Timeline(steps=[AnimationStep(ops=[create(f"{s}1", s) for s in "abc"])])
+    )
+    visited = []
+    original = layout._structure_positions.setdefault
+
+    class Spy(dict):
+        def setdefault(self, key, default=None):
+            visited.append(key)
+            return original(key, default)
+
+    monkeypatch.setattr(
+        layout, "_structure_positions", Spy(layout._structure_positions)
+    )
+    delete_a = AnimationOp(
+        op=OpCode.DELETE_NODE, target="a1", data={"structure_id": "a"}
+    )
+    laid_out = layout.apply_layout(
+        Timeline(
+            steps=[
+                AnimationStep(ops=[create("c2", "c")]),
+                AnimationStep(ops=[create("c3", "c")]),
+                AnimationStep(ops=[delete_a]),  # re-packs rows: b, c move up
+            ]
+        )
+    )
+    # first step of a call and after a re-pack: every structure; else dirty only
+    assert visited == ["a", "b", "c", "c", "b", "c"]
+    assert _set_pos_targets(Timeline(steps=laid_out.steps[2:])) == {
+        "b1": (layout.start_x, layout.start_y),
+        "c1": (layout.start_x, layout.start_y + layout.row_spacing),
+        "c2": (layout.start_x + layout.spacing, layout.start_y + layout.row_spacing),
+        "c3": (
+            layout.start_x + 2 * layout.spacing,
+            layout.start_y + layout.row_spacing,
+        ),
+    }
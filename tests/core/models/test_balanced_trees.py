@@ -0,0 +1,191 @@
+"""
+AVL / red-black kinds: invariants under random workloads, rotation
+micro-steps, O(log n) timelines and SceneGraph/DSL integration.
+"""
+
+import math
+import random
+
+import pytest
+
+from ds_vis.core.exceptions import ModelError
+from ds_vis.core.models import AvlModel, RedBlackModel
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.dsl.parser import parse_dsl
+
+
+def _inorder_keys(model):
+    for node_id in model._preorder_ids(model._root_id):
+        node = model._nodes[node_id]
+        for child in (node.left, node.right):
+            if child:
+                assert model._nodes[child].parent == node_id
+    keys, stack, current = [], [], model._root_id
+    while stack or current:
+        while current:
+            stack.append(current)
+            current = model._nodes[current].left
+        current = stack.pop()
+        keys.append(model._nodes[current].key)
+        current = model._nodes[current].right
+    return keys
+
+
+def _check_avl(model):
+    for node_id in model._postorder_ids(model._root_id):
+        node = model._nodes[node_id]
+        assert node.height == 1 + max(
+            model._height(node.left), model._height(node.right)
+        )
+        assert abs(model._balance(node_id)) <= 1
+
+
+def _check_rb(model):
+    assert model._color(model._root_id) == "black"
+    black_height = {}
+    for node_id in model._postorder_ids(model._root_id):
+        node = model._nodes[node_id]
+        left = black_height.get(node.left, 1)
+        right = black_height.get(node.right, 1)
+        assert left == right
+        if model._color(node_id) == "red":
+            assert model._color(node.left) == model._color(node.right) == "black"
+        black_height[node_id] = left + (model._color(node_id) == "black")
+
+
+CHECKS = [(AvlModel, _check_avl), (RedBlackModel, _check_rb)]
+
+
+@pytest.mark.parametrize("model_cls, check", CHECKS)
+@pytest.mark.parametrize("seed", range(5))
+def test_random_workload_keeps_invariants(model_cls, check, seed):
+    rng = random.Random(seed)
+    model = model_cls(structure_id="t")
+    expected = set()
+    for _ in range(300):
+        value = rng.randrange(80)
+        if rng.random() < 0.6:
+            model.insert(value)
+            expected.add(value)
+        else:
+            model.delete_value(value)
+            expected.discard(value)
+        assert _inorder_keys(model) == sorted(expected)
+        check(model)
+
+    restored = model_cls(structure_id="t")
+    restored.apply_operation("create", model.export_state())
+    assert restored.export_state() == model.export_state()
+
+
+@pytest.mark.parametrize("model_cls, check", CHECKS)
+@pytest.mark.parametrize("size", [1, 2, 7, 8, 100])
+def test_bulk_build_is_balanced(model_cls, check, size):
+    model = model_cls(structure_id="b")
+    model.create(list(range(size)), bulk=True)
+    assert _inorder_keys(model) == list(range(size))
+    check(model)
+
+
+def test_avl_sorted_inserts_emit_rotation_steps():
+    model = AvlModel(structure_id="avl")
+    model.create([1, 2])
+
+    timeline = model.insert(3)
+
+    labels = [step.label for step in timeline.steps]
+    assert "Unbalanced" in labels and "Rotate left" in labels
+    rotate = next(step for step in timeline.steps if step.label == "Rotate left")
+    codes = [op.op for op in rotate.ops]
+    assert OpCode.DELETE_EDGE in codes and OpCode.CREATE_EDGE in codes
+    assert model._nodes[model._root_id].key == 2
+
+
+def test_rbtree_labels_carry_colors():
+    model = RedBlackModel(structure_id="rb")
+    timeline = model.create([10, 20, 30])
+    last_label = {}
+    for step in timeline.steps:
+        for op in step.ops:
+            if op.op is OpCode.CREATE_NODE:
+                last_label[op.target] = op.data["label"]
+            elif op.op is OpCode.SET_LABEL:
+                last_label[op.target] = op.data["text"]
+    root = model._root_id
+    assert last_label[root] == "20 B"
+    assert sorted(last_label[n] for n in model._nodes if n != root) == [
+        "10 R",
+        "30 R",
+    ]
+
+
+def test_duplicate_insert_is_rejected_without_changes():
+    model = AvlModel(structure_id="dup")
+    model.create([1, 2, 3])
+    timeline = model.insert(2)
+    assert model.node_count == 3
+    assert timeline.steps[-1].label == "Duplicate"
+
+
+@pytest.mark.parametrize("model_cls, check", CHECKS)
+def test_bulk_build_drops_duplicate_keys(model_cls, check):
+    model = model_cls(structure_id="dup")
+    model.create([7, 7, 7, 7, 1], bulk=True)
+    assert _inorder_keys(model) == [1, 7]
+    check(model)
+
+    sequential = model_cls(structure_id="dup")
+    sequential.create([7, 7, 7, 7, 1])
+    assert _inorder_keys(sequential) == _inorder_keys(model)
+    with pytest.raises(ModelError, match="Duplicate"):
+        model_cls(structure_id="bad").create([2, 1, 2], preorder=True)
+
+
+@pytest.mark.parametrize("model_cls", [AvlModel, RedBlackModel])
+def test_large_tree_timelines_stay_logarithmic(model_cls):
+    size = 1 << 12
+    model = model_cls(structure_id="big")
+    model.create(list(range(0, 2 * size, 2)), bulk=True)
+    bound = 4 * math.log2(size) + 8
+
+    assert len(model.insert(size + 1).steps) <= bound
+    assert len(model.search(2 * size - 2).steps) <= bound
+    assert len(model.delete_value(size).steps) <= bound
+
+
+@pytest.mark.parametrize("kind", ["avl", "rbtree"])
+def test_scene_graph_layout_follows_rotations(kind):
+    sg = SceneGraph()
+    sg.apply_command(Command("T", CommandType.CREATE_STRUCTURE, {"kind": kind}))
+    positions = {}
+    for value in range(1, 8):
+        timeline = sg.apply_command(
+            Command("T", CommandType.INSERT, {"kind": kind, "value": value})
+        )
+        for step in timeline.steps:
+            for op in step.ops:
+                if op.op is OpCode.SET_POS:
+                    positions[op.target] = (op.data["x"], op.data["y"])
+
+    model = sg._structures["T"]
+    for node_id, node in model._nodes.items():
+        for child in (node.left, node.right):
+            if child:
+                assert positions[child][1] > positions[node_id][1]
+        if node.left:
+            assert positions[node.left][0] < positions[node_id][0]
+        if node.right:
+            assert positions[node.right][0] > positions[node_id][0]
+
+    restored = SceneGraph()
+    restored.import_scene(sg.export_scene())
+    assert restored._structures["T"].export_state() == model.export_state()
+
+
+def test_dsl_balanced_tree_statements():
+    cmds = parse_dsl("avl A = [3, 1, 2]; insert A 4; delete A 1; search A 2")
+    assert cmds[0].payload == {"kind": "avl", "values": [3, 1, 2]}
+    assert cmds[2].payload == {"kind": "avl", "value": 1}
+    assert cmds[3].payload == {"kind": "avl", "value": 2}
@@ -0,0 +1,92 @@
+import random
+
+from ds_vis.core.models.bst import BstModel
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+
+def _shape(model: BstModel):
+    return model._root_id, {
+        node_id: (node.key, node.left, node.right, node.parent)
+        for node_id, node in model._nodes.items()
+    }
+
+
+def _depth(model: BstModel) -> int:
+    depth = 0
+    frontier = [model._root_id] if model._root_id else []
+    while frontier:
+        depth += 1
+        frontier = [
+            child
+            for node_id in frontier
+            for child in (model._nodes[node_id].left, model._nodes[node_id].right)
+            if child
+        ]
+    return depth
+
+
+def _inorder(model: BstModel):
+    keys, stack, node_id = [], [], model._root_id
+    while stack or node_id:
+        while node_id:
+            stack.append(node_id)
+            node_id = model._nodes[node_id].left
+        node_id = stack.pop()
+        keys.append(model._nodes[node_id].key)
+        node_id = model._nodes[node_id].right
+    return keys
+
+
+def test_bulk_matches_sequential_insertion():
+    rng = random.Random(7)
+    values = [rng.randint(0, 40) for _ in range(200)]  # includes duplicates
+
+    sequential = BstModel(structure_id="t")
+    sequential.create(values)
+    bulk = BstModel(structure_id="t")
+    timeline = bulk.create(values, bulk=True)
+
+    assert _shape(bulk) == _shape(sequential)
+    assert len(timeline.steps) == 1
+    ops = timeline.steps[0].ops
+    assert sum(op.op is OpCode.CREATE_NODE for op in ops) == 200
+    assert sum(op.op is OpCode.CREATE_EDGE for op in ops) == 199
+    # Later operations keep working on the bulk-built tree.
+    bulk.insert(41)
+    sequential.insert(41)
+    assert _shape(bulk) == _shape(sequential)
+
+
+def test_balanced_bulk_load_of_sorted_input():
+    model = BstModel(structure_id="t")
+    model.create(list(range(1023)), balanced=True)
+
+    assert model.node_count == 1023
+    assert _depth(model) == 10
+    assert _inorder(model) == list(range(1023))
+
+
+def test_balanced_keeps_equal_keys_on_the_right():
+    model = BstModel(structure_id="t")
+    model.create([2, 2, 2, 1, 3], balanced=True)
+
+    for node in model._nodes.values():
+        if node.left:
+            assert model._nodes[node.left].key < node.key
+        if node.right:
+            assert model._nodes[node.right].key >= node.key
+
+
+def test_scene_graph_routes_bulk_flag():
+    sg = SceneGraph()
+    timeline = sg.apply_command(
+        Command(
+            "b",
+            CommandType.CREATE_STRUCTURE,
+            {"kind": "bst", "values": [5, 3, 8, 1], "bulk": True},
+        )
+    )
+    assert len(timeline.steps) == 1
+    assert any(op.op is OpCode.SET_POS for op in timeline.steps[0].ops)
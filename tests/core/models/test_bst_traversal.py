@@ -0,0 +1,85 @@
+"""
+Recursion-free BST traversals: degenerate (sorted) trees far deeper than the
+recursion limit export, traverse and lay out without RecursionError.
+"""
+
+import sys
+
+import pytest
+
+from ds_vis.core.models.bst import BstModel, _BstNode
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+# only needs to exceed the recursion limit a recursive walk would hit
+DEGENERATE_SIZE = sys.getrecursionlimit() * 5
+
+
+@pytest.fixture(scope="module")
+def degenerate() -> BstModel:
+    """Right-leaning chain of sorted keys, wired directly (no micro-steps)."""
+    model = BstModel(structure_id="deep")
+    nodes = model._nodes
+    prev = None
+    for key in range(DEGENERATE_SIZE):
+        node_id = f"n{key}"
+        nodes[node_id] = _BstNode(key=key, parent=prev)
+        if prev is not None:
+            nodes[prev].right = node_id
+        prev = node_id
+    model._root_id = "n0"
+    return model
+
+
+@pytest.mark.parametrize("traversal", ["_preorder_ids", "_postorder_ids"])
+def test_degenerate_traversal_visits_whole_chain(degenerate, traversal):
+    # a recursive walk would need one frame per level of the chain
+    assert DEGENERATE_SIZE > sys.getrecursionlimit()
+    ids = list(getattr(degenerate, traversal)(degenerate._root_id))
+
+    expected = [f"n{key}" for key in range(DEGENERATE_SIZE)]
+    if traversal == "_postorder_ids":
+        expected.reverse()
+    assert ids == expected
+
+
+def test_degenerate_export_state(degenerate):
+    values = degenerate.export_state()["values"]
+    assert values[:3] == [0, 1, 2]
+    assert len(values) == DEGENERATE_SIZE
+
+
+def test_traversal_orders_on_small_tree():
+    model = BstModel(structure_id="small")
+    model.create([5, 3, 8, 1, 4, 9])
+    keys = model._nodes
+
+    def as_keys(ids):
+        return [keys[node_id].key for node_id in ids]
+
+    assert as_keys(model._preorder_ids(model._root_id)) == [5, 3, 1, 4, 8, 9]
+    assert as_keys(model._postorder_ids(model._root_id)) == [1, 4, 3, 9, 8, 5]
+
+
+def test_degenerate_tree_round_trips_through_scene_graph():
+    size = 20_000
+    sg = SceneGraph()
+    timeline = sg.apply_command(
+        Command(
+            "deep",
+            CommandType.CREATE_STRUCTURE,
+            {"kind": "bst", "values": list(range(size)), "bulk": True},
+        )
+    )
+    positioned = {
+        op.target
+        for step in timeline.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS
+    }
+    assert len(positioned) == size
+
+    restored = SceneGraph()
+    restored.import_scene(sg.export_scene())
+    assert restored._structures["deep"].node_count == size
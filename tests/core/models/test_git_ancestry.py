@@ -0,0 +1,101 @@
+"""
+AncestryIndex: is_ancestor / merge_bases agree with a brute-force DAG walk.
+"""
+
+import random
+from typing import Dict, List, Set
+
+import pytest
+
+from ds_vis.core.exceptions import ModelError
+from ds_vis.core.models.git_ancestry import AncestryIndex
+
+
+def _random_dag(seed: int, size: int) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    dag: Dict[str, List[str]] = {}
+    ids: List[str] = []
+    for i in range(size):
+        parents: List[str] = []
+        if ids and rng.random() > 0.05:
+            parents.append(ids[-1] if rng.random() < 0.6 else rng.choice(ids))
+            if rng.random() < 0.25:
+                other = rng.choice(ids)
+                if other not in parents:
+                    parents.append(other)
+        cid = f"c{i}"
+        dag[cid] = parents
+        ids.append(cid)
+    return dag
+
+
+def _ancestors(dag: Dict[str, List[str]], cid: str) -> Set[str]:
+    seen = {cid}
+    stack = [cid]
+    while stack:
+        for parent in dag[stack.pop()]:
+            if parent not in seen:
+                seen.add(parent)
+                stack.append(parent)
+    return seen
+
+
+def _build(dag: Dict[str, List[str]]) -> AncestryIndex:
+    index = AncestryIndex()
+    for cid, parents in dag.items():
+        index.add(cid, parents)
+    return index
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_queries_match_brute_force(seed):
+    dag = _random_dag(seed, 120)
+    index = _build(dag)
+    closure = {cid: _ancestors(dag, cid) for cid in dag}
+    rng = random.Random(seed)
+    ids = list(dag)
+    for _ in range(300):
+        a, b = rng.choice(ids), rng.choice(ids)
+        assert index.is_ancestor(a, b) == (a in closure[b])
+        common = closure[a] & closure[b]
+        expected = {
+            c for c in common if not any(c in closure[o] - {o} for o in common)
+        }
+        assert set(index.merge_bases(a, b)) == expected
+
+
+def test_generation_and_errors():
+    index = AncestryIndex()
+    index.add("a", [])
+    index.add("b", ["a"])
+    index.add("c", ["a"])
+    index.add("m", ["b", "c"])
+    assert [index.generation(c) for c in "abcm"] == [1, 2, 2, 3]
+    assert index.merge_base("b", "c") == "a"
+    with pytest.raises(ModelError):
+        index.add("m", ["a"])
+    with pytest.raises(ModelError):
+        index.add("x", ["missing"])
+
+
+def test_long_history_queries_stay_cheap():
+    index = AncestryIndex()
+    index.add("r", [])
+    main, side = "r", "r"
+    for i in range(20000):
+        main_id = f"m{i}"
+        index.add(main_id, [main])
+        main = main_id
+        if i % 1000 == 999:
+            side_id = f"s{i}"
+            index.add(side_id, [side])
+            side = side_id
+            merge_id = f"x{i}"
+            index.add(merge_id, [main, side])
+            main = merge_id
+    tip = "tip"
+    index.add(tip, [side])
+    assert index.is_ancestor("r", main)
+    assert index.is_ancestor(side, main)
+    assert not index.is_ancestor(tip, main)
+    assert index.merge_base(main, tip) == side
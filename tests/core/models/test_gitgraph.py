@@ -42,3 +42,71 @@ def test_git_commit_without_init_errors():
     model = GitGraphModel(structure_id="git3")
     with pytest.raises(ModelError):
         model.commit("fail")
+
+
+def _diverged_model() -> GitGraphModel:
+    model = GitGraphModel(structure_id="git4")
+    model.git_init()
+    model.commit("base")  # c0
+    model.branch("dev")
+    model.commit("main work")  # c1 on main
+    model.checkout("dev")
+    model.commit("dev work")  # c2 on dev
+    model.checkout("main")
+    return model
+
+
+def test_git_branch_creates_label_at_head():
+    model = GitGraphModel(structure_id="git5")
+    model.git_init()
+    model.commit("c")
+    tl = model.branch("dev")
+    assert model.branches["dev"] == "c0"
+    assert any(op.target == "branch_dev" for op in _ops_by_code(tl, OpCode.CREATE_NODE))
+    with pytest.raises(ModelError):
+        model.branch("dev")
+
+
+def test_git_merge_fast_forward_moves_labels_only():
+    model = GitGraphModel(structure_id="git6")
+    model.git_init()
+    model.commit("base")
+    model.branch("dev")
+    model.checkout("dev")
+    model.commit("dev work")
+    model.checkout("main")
+
+    tl = model.merge("dev")
+
+    assert model.branches["main"] == "c1"
+    assert not _ops_by_code(tl, OpCode.CREATE_NODE)
+    assert model.merge("dev").steps[0].label == "Up to date"
+
+
+def test_git_merge_creates_two_parent_commit():
+    model = _diverged_model()
+
+    tl = model.merge("dev")
+
+    merge_id = model.branches["main"]
+    assert model.commits[merge_id].parents == ["c1", "c2"]
+    edges = _ops_by_code(tl, OpCode.CREATE_EDGE)
+    assert {(op.data["from"], op.data["to"]) for op in edges} == {
+        ("c1", merge_id),
+        ("c2", merge_id),
+    }
+    states = {
+        op.target: op.data["state"]
+        for op in tl.steps[0].ops
+        if op.op is OpCode.SET_STATE
+    }
+    assert states["c0"] == "secondary"
+    assert model.ancestry.is_ancestor("c2", merge_id)
+
+
+def test_git_merge_state_round_trip_rebuilds_ancestry():
+    model = _diverged_model()
+    model.merge("dev")
+    restored = GitGraphModel(structure_id="git7")
+    restored.restore(model.export_state())
+    assert restored.ancestry.merge_base("c1", "c2") == "c0"
@@ -1,3 +1,5 @@
+import heapq
+
 from ds_vis.core.models.huffman import HuffmanModel
 from ds_vis.core.ops import OpCode
 
@@ -16,13 +18,13 @@ def test_huffman_build_generates_parents_and_edges():
     # 3 leaves + 2 parents
     assert len(creates) == 5
     assert len(edges) == 4
-    # queue_index 应按初始排序
-    init_indexes = [
-        op.data.get("queue_index")
+    # queue_index 为稀疏排序键：叶子按权值递增
+    init_indexes = {
+        op.data.get("label"): op.data.get("queue_index")
         for op in creates
         if op.data.get("queue_index") is not None
-    ]
-    assert sorted(init_indexes) == [0, 1, 2]
+    }
+    assert init_indexes["1.0"] < init_indexes["2.0"] < init_indexes["3.0"]
     assert model.node_count == 5
 
 
@@ -32,3 +34,56 @@ def test_huffman_delete_all_clears_nodes():
     tl = model.delete_all()
     deletes = _ops_by_code(tl, OpCode.DELETE_NODE)
     assert len(deletes) == 3  # 2 leaves + 1 parent
+
+
+def test_huffman_requeue_updates_only_new_parent():
+    model = HuffmanModel(structure_id="huff_rq")
+    tl = model.create([5, 1, 4, 2, 3, 8])
+    requeues = [step for step in tl.steps if step.label == "Requeue"]
+    assert len(requeues) == 5
+    for step in requeues:
+        labels = [op for op in step.ops if op.op is OpCode.SET_LABEL]
+        assert len(labels) == 1
+        states = [op for op in step.ops if op.op is OpCode.SET_STATE]
+        assert len(states) == 2  # only the two picked nodes are restored
+
+
+def test_huffman_queue_keys_follow_weight_order():
+    model = HuffmanModel(structure_id="huff_keys")
+    tl = model.create([7, 1, 1, 2, 9, 3, 3, 30])
+    keys = {}
+    weights = {}
+    for step in tl.steps:
+        for op in step.ops:
+            if op.op in (OpCode.CREATE_NODE, OpCode.SET_LABEL):
+                weights[op.target] = float(op.data["label"])
+                if op.data.get("queue_index") is not None:
+                    keys[op.target] = op.data["queue_index"]
+    # Keys never change once assigned, and sort consistently with weights.
+    ordered = sorted(keys, key=keys.get)
+    ordered_weights = [weights[nid] for nid in ordered]
+    assert ordered_weights == sorted(ordered_weights)
+    root = model._nodes[model._root]
+    assert root.weight == 56.0
+
+
+def test_huffman_matches_heap_merge_order():
+    weights = [13, 2, 2, 5, 8, 1, 1, 21, 3, 3, 0]
+    model = HuffmanModel(structure_id="huff_heap")
+    model.create(weights)
+
+    heap = [(float(w), i) for i, w in enumerate(weights)]
+    heapq.heapify(heap)
+    expected = []
+    order = len(weights)
+    while len(heap) > 1:
+        a, b = heapq.heappop(heap), heapq.heappop(heap)
+        expected.append((a[0], b[0]))
+        heapq.heappush(heap, (a[0] + b[0], order))
+        order += 1
+    parents = [node for node in model._nodes.values() if node.left is not None]
+    parents.sort(key=lambda node: node.order)
+    merged = [
+        (model._nodes[p.left].weight, model._nodes[p.right].weight) for p in parents
+    ]
+    assert merged == expected
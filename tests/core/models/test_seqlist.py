@@ -20,8 +20,11 @@ def test_create_and_insert_generates_nodes():
 
     ins = model.insert(1, 3)
     creates_ins = _ops_by_code(ins, OpCode.CREATE_NODE)
-    # new node + resized bucket
-    assert len(creates_ins) == 2
+    # new node only; the bucket is resized in place
+    assert len(creates_ins) == 1
+    resizes = _ops_by_code(ins, OpCode.SET_SIZE)
+    assert [op.target for op in resizes] == [model._container_id]
+    assert resizes[0].data["width"] == 3 * 80.0 + 40.0
     assert model.values == [1, 3, 2]
 
 
@@ -36,8 +39,9 @@ def test_delete_index_updates_state():
     model.create([1, 2, 3])
     tl = model.delete_index(1)
     deletes = _ops_by_code(tl, OpCode.DELETE_NODE)
-    # delete node + resized bucket
-    assert len(deletes) == 2
+    # delete node; bucket keeps its id and is resized
+    assert len(deletes) == 1
+    assert len(_ops_by_code(tl, OpCode.SET_SIZE)) == 1
     assert model.values == [1, 3]
 
 
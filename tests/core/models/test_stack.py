@@ -27,15 +27,17 @@ def test_create_push_pop_updates_nodes_and_values():
 
     tl_push = model.push(3)
     creates_push = _ops_by_code(tl_push, OpCode.CREATE_NODE)
-    # 新节点 + 重建桶
-    assert len(creates_push) == 2
+    # 新节点；桶原地 SET_SIZE，不再重建
+    assert len(creates_push) == 1
+    assert len(_ops_by_code(tl_push, OpCode.SET_SIZE)) == 1
     assert any(op.data.get("index") == 0 for op in creates_push if op.target)
     assert model.values[0] == 3
 
     tl_pop = model.pop()
     deletes = _ops_by_code(tl_pop, OpCode.DELETE_NODE)
-    # 删除栈顶 + 重建桶
-    assert len(deletes) == 2
+    # 删除栈顶；桶原地缩小
+    assert len(deletes) == 1
+    assert len(_ops_by_code(tl_pop, OpCode.SET_SIZE)) == 1
     assert model.values[0] == 2
 
 
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+from ds_vis.core.models import BstModel, GitGraphModel, SeqlistModel, StackModel
+from ds_vis.core.models.base import StateTracker
+from ds_vis.core.ops import OpCode, Timeline
+
+
+def _replay_states(timelines: Iterable[Timeline]) -> Dict[str, str]:
+    """Fold SET_STATE ops the way a renderer would (last write wins)."""
+    states: Dict[str, str] = {}
+    for timeline in timelines:
+        for step in timeline.steps:
+            for op in step.ops:
+                if op.op is OpCode.SET_STATE and op.target:
+                    states[op.target] = op.data["state"]
+    return states
+
+
+def _set_state_count(timeline: Timeline) -> int:
+    return sum(
+        1 for step in timeline.steps for op in step.ops if op.op is OpCode.SET_STATE
+    )
+
+
+def test_state_tracker_marks_and_drains_in_order():
+    tracker = StateTracker()
+    tracker.mark("a", "highlight")
+    tracker.mark("b", "secondary")
+    tracker.mark("a", "active")
+    tracker.mark("c", "highlight")
+    tracker.mark("c", "normal")
+    assert "a" in tracker and "c" not in tracker
+    assert tracker.drain() == ["a", "b"]
+    assert len(tracker) == 0
+
+
+def test_git_commit_restore_is_constant_per_commit():
+    model = GitGraphModel(structure_id="g")
+    model.git_init()
+    timelines = [model.commit(f"c{i}") for i in range(200)]
+    # highlight previous commit + restore it: at most two SET_STATE per commit
+    assert all(_set_state_count(tl) <= 2 for tl in timelines)
+    assert set(_replay_states(timelines).values()) == {"normal"}
+    assert len(model.state_tracker) == 0
+
+
+def test_bst_delete_restores_only_touched_nodes():
+    model = BstModel(structure_id="t")
+    model.create([50, 30, 70, 20, 40, 60, 80])
+    timeline = model.delete_value(20)
+    restore = timeline.steps[-1]
+    assert restore.label == "Restore"
+    # Only the live part of the search path 50 -> 30 is reset (20 is gone);
+    # a full restore would touch all 6 remaining nodes.
+    assert [op.target for op in restore.ops] == ["t_node_0", "t_node_1"]
+    states = _replay_states([model.delete_value(50), model.delete_value(70)])
+    assert {states[nid] for nid in model._nodes if nid in states} == {"normal"}
+
+
+def test_stack_and_seqlist_restore_touched_only():
+    stack = StackModel(structure_id="s")
+    stack.create({"values": list(range(20))})
+    pop = stack.pop()
+    assert _set_state_count(pop) < 10
+    assert len(stack.state_tracker) == 0
+
+    seq = SeqlistModel(structure_id="q")
+    seq.create({"values": list(range(20))})
+    search = seq.search(index=3)
+    assert _set_state_count(search) < 20
+    assert len(seq.state_tracker) == 0
+
+
+def _ops_on_deleted_nodes(timeline: Timeline) -> list:
+    """Ops that target a node after its DELETE_NODE in the same timeline."""
+    deleted: set = set()
+    late = []
+    for step in timeline.steps:
+        for op in step.ops:
+            if op.target in deleted:
+                late.append(op)
+            if op.op is OpCode.DELETE_NODE:
+                deleted.add(op.target)
+    assert deleted
+    return late
+
+
+def test_restore_skips_deleted_nodes():
+    bst = BstModel(structure_id="t")
+    bst.create([5, 3, 7])
+    assert _ops_on_deleted_nodes(bst.delete_value(3)) == []
+
+    seq = SeqlistModel(structure_id="s")
+    seq.create([1, 2, 3])
+    assert _ops_on_deleted_nodes(seq.delete_index(1)) == []
+
+    stack = StackModel(structure_id="k")
+    stack.create({"values": [1, 2]})
+    assert _ops_on_deleted_nodes(stack.pop()) == []
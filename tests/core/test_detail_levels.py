@@ -0,0 +1,163 @@
+"""
+Animation detail levels (L0/L1/L2): condensation keeps the net end state.
+"""
+
+from typing import Dict, Set, Tuple
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import (
+    AnimationOp,
+    AnimationStep,
+    DetailLevel,
+    OpCode,
+    Timeline,
+    condense_timeline,
+    parse_detail_level,
+)
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+EndState = Tuple[Set[str], Set[str], Dict[str, object], Dict[str, object]]
+
+
+def _end_state(timeline: Timeline) -> EndState:
+    nodes: Set[str] = set()
+    edges: Set[str] = set()
+    labels: Dict[str, object] = {}
+    states: Dict[str, object] = {}
+    for step in timeline.steps:
+        for op in step.ops:
+            target = op.target or ""
+            if op.op is OpCode.CREATE_NODE:
+                nodes.add(target)
+            elif op.op is OpCode.DELETE_NODE:
+                nodes.discard(target)
+            elif op.op is OpCode.CREATE_EDGE:
+                edges.add(target)
+            elif op.op is OpCode.DELETE_EDGE:
+                edges.discard(target)
+            elif op.op is OpCode.SET_LABEL:
+                labels[target] = op.data.get("text")
+            elif op.op is OpCode.SET_STATE:
+                states[target] = op.data.get("state")
+    alive = nodes | edges
+    labels = {k: v for k, v in labels.items() if k in alive}
+    states = {
+        k: v for k, v in states.items() if k in alive and v not in (None, "normal")
+    }
+    return nodes, edges, labels, states
+
+
+def _bst_timeline() -> Timeline:
+    sg = SceneGraph()
+    sg.apply_command(
+        _cmd("bst", CommandType.CREATE_STRUCTURE, kind="bst", values=[5, 3, 8])
+    )
+    model = sg._structures["bst"]
+    return model.apply_operation("insert", {"value": 4})
+
+
+def _cmd(sid: str, cmd_type: CommandType, **payload: object) -> Command:
+    return Command(structure_id=sid, type=cmd_type, payload=payload)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("L0", DetailLevel.L0), ("l1", DetailLevel.L1), (2, DetailLevel.L2)],
+)
+def test_parse_detail_level(value, expected):
+    assert parse_detail_level(value) is expected
+
+
+def test_parse_detail_level_rejects_unknown():
+    with pytest.raises(CommandError):
+        parse_detail_level("L9")
+
+
+def test_l0_folds_to_single_step_with_same_end_state():
+    full = _bst_timeline()
+    assert len(full.steps) > 2
+
+    result = condense_timeline(full, DetailLevel.L0)
+
+    assert len(result.steps) == 1
+    assert _end_state(result) == _end_state(full)
+
+
+def test_l1_keeps_only_structural_phases_and_restore():
+    full = _bst_timeline()
+
+    phases = condense_timeline(full, DetailLevel.L1)
+
+    assert len(phases.steps) < len(full.steps)
+    assert _end_state(phases) == _end_state(full)
+    for step in phases.steps[:-1]:
+        assert any(
+            op.op in (OpCode.CREATE_NODE, OpCode.CREATE_EDGE, OpCode.DELETE_NODE)
+            for op in step.ops
+        )
+
+
+def test_fold_drops_transient_nodes_and_splits_recreated_targets():
+    timeline = Timeline(
+        steps=[
+            AnimationStep(
+                ops=[
+                    AnimationOp(OpCode.CREATE_NODE, "tmp", {"kind": "x"}),
+                    AnimationOp(OpCode.DELETE_NODE, "old", {}),
+                ]
+            ),
+            AnimationStep(
+                ops=[
+                    AnimationOp(OpCode.DELETE_NODE, "tmp", {}),
+                    AnimationOp(OpCode.CREATE_NODE, "old", {"kind": "x"}),
+                ]
+            ),
+        ]
+    )
+
+    result = condense_timeline(timeline, DetailLevel.L0)
+
+    assert [[(op.op, op.target) for op in step.ops] for step in result.steps] == [
+        [(OpCode.DELETE_NODE, "old")],
+        [(OpCode.CREATE_NODE, "old")],
+    ]
+
+
+def test_scene_graph_detail_per_structure_and_per_command():
+    full = SceneGraph().apply_command(
+        _cmd("h", CommandType.CREATE_STRUCTURE, kind="huffman", values=[5, 1, 3, 2])
+    )
+
+    sg = SceneGraph()
+    sg.set_detail_level("L0", "h")
+    result = sg.apply_command(
+        _cmd("h", CommandType.CREATE_STRUCTURE, kind="huffman", values=[5, 1, 3, 2])
+    )
+    assert len(result.steps) == 1
+    assert _end_state(result)[:2] == _end_state(full)[:2]
+    assert any(op.op is OpCode.SET_POS for op in result.steps[0].ops)
+
+    # Per-command override wins over the structure setting.
+    override = sg.apply_command(
+        _cmd("h", CommandType.CREATE_STRUCTURE, kind="huffman", values=[1, 2], detail=2)
+    )
+    assert len(override.steps) > 1
+    assert sg.detail_level("h") is DetailLevel.L0
+    assert sg.detail_level("other") is DetailLevel.L2
+
+
+def test_large_huffman_forest_at_l0_positions_each_node_once():
+    # L1/L2 re-place the whole queue every merge (quadratic SET_POS); L0
+    # lays the finished tree out once.
+    weights = [(value * 37) % 101 + 1 for value in range(2000)]
+    sg = SceneGraph()
+    sg.set_detail_level("L0", "h")
+    result = sg.apply_command(
+        _cmd("h", CommandType.CREATE_STRUCTURE, kind="huffman", values=weights)
+    )
+    positions = [op.target for op in result.steps[0].ops if op.op is OpCode.SET_POS]
+    assert len(result.steps) == 1
+    assert len(positions) == len(set(positions)) == 2 * len(weights) - 1
@@ -1,3 +1,8 @@
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.layout import LayoutEngine, LayoutStrategy
+from ds_vis.core.ops import OpCode
 from ds_vis.core.scene.command import Command, CommandType
 from ds_vis.core.scene.scene_graph import SceneGraph
 
@@ -32,3 +37,102 @@ def test_layout_routing_by_kind():
     }
     assert list_y and bst_y
     assert list_y != bst_y  # should be offset to avoid overlap
+
+
+def _positions(timeline):
+    return {
+        op.target: (op.data["x"], op.data["y"])
+        for step in timeline.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS
+    }
+
+
+def test_layout_binding_is_built_once_per_structure(monkeypatch):
+    sg = SceneGraph(history_limit=1000)
+    engine = sg._layout_engine
+    calls = []
+    monkeypatch.setattr(engine, "set_offsets", lambda offsets: calls.append(offsets))
+    sg.apply_command(Command("a", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    for value in range(5):
+        sg.apply_command(
+            Command(
+                "a", CommandType.INSERT, {"kind": "list", "index": 0, "value": value}
+            )
+        )
+    sg.apply_command(Command("b", CommandType.CREATE_STRUCTURE, {"kind": "stack"}))
+
+    assert calls == [sg._structure_offsets]
+    binding = sg._layout_bindings["a"]
+    assert binding.strategy is LayoutStrategy.LINEAR and binding.engine is engine
+    assert sg._strategy_sids[LayoutStrategy.LINEAR] == {"a", "b"}
+
+    sg.undo()
+    assert "b" not in sg._layout_bindings
+    assert sg._strategy_sids[LayoutStrategy.LINEAR] == {"a"}
+
+
+def test_structures_created_after_import_are_laid_out():
+    sg = SceneGraph()
+    sg.import_scene(
+        {
+            "version": "1.0",
+            "structures": [{"id": "a", "kind": "list", "state": {"values": [1]}}],
+        }
+    )
+    timeline = sg.apply_command(
+        Command("b", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1, 2]})
+    )
+    assert len(_positions(timeline)) == 2
+    tree = sg.apply_command(
+        Command("t", CommandType.CREATE_STRUCTURE, {"kind": "bst", "values": [2, 1]})
+    )
+    assert len(_positions(tree)) == 2
+
+
+def test_set_layout_config_applies_through_the_shared_map():
+    sg = SceneGraph()
+    sg.apply_command(
+        Command("a", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]})
+    )
+    revision = sg.revision
+    binding = sg._layout_bindings["a"]
+    sg.set_layout_config("a", {"orientation": "vertical", "spacing": 50.0})
+    assert sg._layout_bindings["a"] is binding
+    assert sg.revision != revision
+    assert sg.export_scene()["structures"][0]["config"]["orientation"] == "vertical"
+
+    timeline = sg.apply_command(
+        Command("a", CommandType.INSERT, {"kind": "list", "index": 1, "value": 2})
+    )
+    xs = {x for x, _ in _positions(timeline).values()}
+    ys = sorted(y for _, y in _positions(timeline).values())
+    assert len(xs) == 1  # stacked vertically
+    assert ys[1] - ys[0] == 50.0
+    with pytest.raises(CommandError):
+        sg.set_layout_config("missing", {})
+
+
+def test_engine_hooks_default_to_no_ops_and_attach_once():
+    class _Engine(LayoutEngine):
+        def __init__(self):
+            self.seen = 0
+            self.attached = []
+
+        def apply_layout(self, timeline):
+            self.seen += 1
+            return timeline
+
+        def set_offsets(self, offsets):
+            self.attached.append(offsets)
+
+    engine = _Engine()
+    sg = SceneGraph(_layout_engine=engine, history_limit=10)
+    sg.apply_command(Command("a", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    sg.apply_command(
+        Command("a", CommandType.INSERT, {"kind": "list", "index": 0, "value": 1})
+    )
+    sg.undo()  # save_rows/restore_rows fall back to the protocol no-ops
+    assert engine.attached == [sg._structure_offsets]
+    assert engine.attached[0] is sg._structure_offsets
+    assert engine.seen == 3
@@ -1,4 +1,6 @@
 from ds_vis.core.layout import LayoutStrategy
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import CommandType
 from ds_vis.core.scene.scene_graph import SceneGraph
 
 
@@ -7,3 +9,42 @@ def test_git_layout_strategy_and_config():
     assert sg._layout_map["git"] is LayoutStrategy.DAG
     cfg = sg._kind_layout_config["git"]
     assert cfg["orientation"] == "vertical"
+
+
+
+def test_git_merge_commands_assign_branch_lanes(scene_graph, create_cmd_factory):
+    sid = "git_lanes"
+    positions = {}
+    timelines = []
+    for cmd_type, payload in [
+        (CommandType.CREATE_STRUCTURE, {}),
+        (CommandType.INSERT, {"message": "base"}),
+        (CommandType.GIT_BRANCH, {"name": "dev"}),
+        (CommandType.SEARCH, {"target": "dev"}),
+        (CommandType.INSERT, {"message": "dev work"}),
+        (CommandType.SEARCH, {"target": "main"}),
+        (CommandType.INSERT, {"message": "main work"}),
+        (CommandType.GIT_MERGE, {"source": "dev"}),
+    ]:
+        timelines.append(
+            scene_graph.apply_command(
+                create_cmd_factory(sid, cmd_type, kind="git", **payload)
+            )
+        )
+    for timeline in timelines:
+        for step in timeline.steps:
+            for op in step.ops:
+                if op.op is OpCode.SET_POS and op.target:
+                    positions[op.target] = (op.data["x"], op.data["y"])
+
+    merge_edges = [
+        op
+        for step in timelines[-1].steps
+        for op in step.ops
+        if op.op is OpCode.CREATE_EDGE
+    ]
+    assert len(merge_edges) == 2
+    # c1 lives on dev, c0/c2/c3 on main: dev gets its own lane (x offset).
+    assert positions["c1"][0] != positions["c0"][0]
+    assert positions["c2"][0] == positions["c0"][0]
+    assert positions["c3"][0] == positions["c0"][0]
@@ -0,0 +1,216 @@
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.layout import LayoutStrategy
+from ds_vis.core.models import BaseModel
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+
+def _script():
+    cmds = [
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]}),
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": "avl", "values": [4]}),
+        Command("G", CommandType.CREATE_STRUCTURE, {"kind": "git"}),
+    ]
+    for value in range(12):
+        cmds.append(
+            Command(
+                "L",
+                CommandType.INSERT,
+                {"kind": "list", "index": value % 3, "value": value},
+            )
+        )
+        cmds.append(Command("T", CommandType.INSERT, {"kind": "avl", "value": value}))
+        if value % 4 == 0:
+            cmds.append(
+                Command("G", CommandType.INSERT, {"kind": "git", "message": str(value)})
+            )
+    cmds.append(Command("L", CommandType.DELETE_NODE, {"kind": "list", "index": 0}))
+    cmds.append(Command("T", CommandType.DELETE_NODE, {"kind": "avl", "value": 4}))
+    return cmds
+
+
+def _ops(timeline):
+    return [
+        (op.op, op.target, dict(op.data)) for step in timeline.steps for op in step.ops
+    ]
+
+
+def _count_layout_calls(sg, monkeypatch):
+    calls = []
+    for name in ("_layout_engine", "_tree_layout_engine", "_dag_layout_engine"):
+        engine = getattr(sg, name)
+        original = engine.apply_layout
+
+        def counted(timeline, name=name, original=original):
+            calls.append(name)
+            return original(timeline)
+
+        monkeypatch.setattr(engine, "apply_layout", counted)
+    return calls
+
+
+def test_batch_matches_command_loop(monkeypatch):
+    looped = SceneGraph()
+    loop_ops = []
+    for cmd in _script():
+        loop_ops.extend(_ops(looped.apply_command(cmd)))
+
+    batched = SceneGraph()
+    calls = _count_layout_calls(batched, monkeypatch)
+    timeline = batched.apply_commands(_script())
+
+    assert _ops(timeline) == loop_ops
+    assert batched.export_scene() == looped.export_scene()
+    assert sorted(calls) == [
+        "_dag_layout_engine",
+        "_layout_engine",
+        "_tree_layout_engine",
+    ]
+
+
+def test_failed_batch_is_rolled_back():
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_command(
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]})
+    )
+    before = sg.export_scene()
+    batch = [
+        Command("L", CommandType.INSERT, {"kind": "list", "index": 0, "value": 2}),
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": "bst", "values": [3]}),
+        Command("T", CommandType.INSERT, {"kind": "bst", "value": 5}),
+        Command("L", CommandType.DELETE_NODE, {"kind": "list", "index": 9}),
+    ]
+    with pytest.raises(CommandError, match="out of range"):
+        sg.apply_commands(batch)
+
+    assert sg.export_scene() == before
+    assert "T" not in sg._structures
+    assert sg._row_index.get(LayoutStrategy.TREE, 0) == 0
+    assert len(sg._undo_stack) == 1
+
+    # layout engines never saw the failed batch
+    timeline = sg.apply_command(
+        Command("L", CommandType.INSERT, {"kind": "list", "index": 1, "value": 7})
+    )
+    positions = {
+        op.target: op.data["x"]
+        for step in timeline.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS
+    }
+    assert sorted(positions.values()) == sorted(set(positions.values()))
+    assert len(positions) == 2
+
+
+def test_batch_is_one_undo_step():
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_command(
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]})
+    )
+    before = sg.export_scene()
+    sg.apply_commands(_script()[1:])
+    after = sg.export_scene()
+
+    undo = sg.undo()
+    assert sg.export_scene() == before
+    assert len(undo.steps) == 1
+    deleted = {
+        op.data.get("structure_id")
+        for op in undo.steps[0].ops
+        if op.op is OpCode.DELETE_NODE
+    }
+    assert deleted >= {"T", "G"}
+
+    sg.redo()
+    assert sg.export_scene() == after
+    assert len(sg._undo_stack) == 2
+
+
+def test_batch_detail_condenses_each_strategy():
+    sg = SceneGraph()
+    timeline = sg.apply_commands(_script(), detail="L0")
+    assert len(timeline.steps) == 3
+    reference = SceneGraph()
+    reference.apply_commands(_script())
+    assert sg.export_scene() == reference.export_scene()
+    assert sg.apply_commands([]).steps == []
+
+
+def test_replay_applies_stream_in_chunks():
+    reference = SceneGraph()
+    reference.apply_commands(_script())
+
+    sg = SceneGraph(history_limit=0)
+    timelines = []
+    count = sg.replay(iter(_script()), chunk_size=5, on_timeline=timelines.append)
+    assert count == len(_script())
+    assert len(timelines) == -(-count // 5)
+    assert sg.export_scene() == reference.export_scene()
+    assert not sg.can_undo
+
+    bad = [
+        Command("X", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]}),
+        Command("X", CommandType.DELETE_NODE, {"kind": "list", "index": 5}),
+    ]
+    fresh = SceneGraph()
+    with pytest.raises(CommandError):
+        fresh.replay(iter(_script()[:4] + bad), chunk_size=4)
+    assert set(fresh._structures) == {"L", "T", "G"}  # first chunk stays applied
+
+
+def test_batch_without_history_keeps_one_pre_image_per_structure(monkeypatch):
+    begun = []
+    original = BaseModel.begin_change
+
+    def counted(self):
+        begun.append(self.structure_id)
+        original(self)
+
+    monkeypatch.setattr(BaseModel, "begin_change", counted)
+    sg = SceneGraph(history_limit=0)
+    sg.apply_commands(_script()[:3])
+    before = sg.export_scene()
+    begun.clear()
+    with pytest.raises(CommandError, match="out of range"):
+        sg.apply_commands(
+            _script()[3:]
+            + [Command("L", CommandType.DELETE_NODE, {"kind": "list", "index": 99})]
+        )
+    assert sorted(begun) == ["G", "L", "T"]
+    assert sg.export_scene() == before
+
+    # without a timeline consumer replay keeps nothing but lays out the same
+    looped = SceneGraph(history_limit=0)
+    for cmd in _script():
+        looped.apply_command(cmd)
+    replayed = SceneGraph(history_limit=0)
+    assert replayed.replay(iter(_script()), chunk_size=7) == len(_script())
+    assert replayed.export_scene() == looped.export_scene()
+    tail = Command("L", CommandType.INSERT, {"kind": "list", "index": 1, "value": 99})
+    assert _ops(replayed.apply_command(tail)) == _ops(looped.apply_command(tail))
+
+
+def test_batch_with_history_keeps_one_pre_image_per_structure(monkeypatch):
+    begun = []
+    original = BaseModel.begin_change
+
+    def counted(self):
+        begun.append(self.structure_id)
+        original(self)
+
+    monkeypatch.setattr(BaseModel, "begin_change", counted)
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_commands(_script()[:3])
+    before = sg.export_scene()
+    begun.clear()
+    sg.apply_commands(_script()[3:])
+    after = sg.export_scene()
+    assert sorted(begun) == ["G", "L", "T"]
+
+    sg.undo()
+    assert sg.export_scene() == before
+    sg.redo()  # re-applies every command of the batch, not one per structure
+    assert sg.export_scene() == after
@@ -0,0 +1,338 @@
+import random
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+
+class _Screen:
+    """Minimal renderer stand-in: what is on screen after a sequence of timelines."""
+
+    def __init__(self):
+        self.items = {}
+
+    def apply(self, timeline):
+        for step in timeline.steps:
+            for op in step.ops:
+                target = op.target
+                if target is None:
+                    continue
+                if op.op in (OpCode.CREATE_NODE, OpCode.CREATE_EDGE):
+                    data = {k: v for k, v in op.data.items() if k != "index"}
+                    self.items[target] = {"create": data}
+                elif op.op is OpCode.DELETE_NODE:
+                    self.items.pop(target, None)
+                    for edge_id, item in list(self.items.items()):
+                        create = item["create"]
+                        if target in (create.get("from"), create.get("to")):
+                            del self.items[edge_id]
+                elif op.op is OpCode.DELETE_EDGE:
+                    self.items.pop(target, None)
+                elif target in self.items:
+                    self.items[target][op.op] = self._attribute(op)
+
+    @staticmethod
+    def _attribute(op):
+        if op.op is OpCode.SET_LABEL:
+            return op.data.get("text", op.data.get("label"))
+        if op.op is OpCode.SET_STATE:
+            return op.data["state"]
+        if op.op is OpCode.SET_POS:
+            return (op.data["x"], op.data["y"])
+        return (op.data.get("width"), op.data.get("height"))
+
+    def snapshot(self):
+        shown = {}
+        for target, item in self.items.items():
+            create = item["create"]
+            implied = {
+                OpCode.SET_STATE: "normal",
+                OpCode.SET_LABEL: create.get("label"),
+                OpCode.SET_SIZE: (create.get("width"), create.get("height")),
+            }
+            shown[target] = {
+                key: value
+                for key, value in item.items()
+                if key == "create" or implied.get(key) != value
+            }
+        return shown
+
+
+def _without_new_positions(actual, expected):
+    # Layout may place an item that had no position yet (an empty container);
+    # there is no op to "unplace" it, so such positions are not compared.
+    return {
+        target: {
+            key: value
+            for key, value in item.items()
+            if key is not OpCode.SET_POS or key in expected.get(target, {})
+        }
+        for target, item in actual.items()
+    }
+
+
+def _run_and_unwind(commands):
+    sg = SceneGraph(history_limit=1000)
+    screen = _Screen()
+    history = []
+    for cmd in commands:
+        before = (sg.export_scene(), screen.snapshot())
+        try:
+            screen.apply(sg.apply_command(cmd))
+        except CommandError:  # e.g. index out of range: nothing recorded
+            assert (sg.export_scene(), screen.snapshot()) == before
+            continue
+        history.append((before, (sg.export_scene(), screen.snapshot())))
+
+    for (scene, shown), _ in reversed(history):
+        screen.apply(sg.undo())
+        assert sg.export_scene() == scene
+        assert _without_new_positions(screen.snapshot(), shown) == shown
+    assert not sg.can_undo
+    for _, after in history:
+        screen.apply(sg.redo())
+        assert (sg.export_scene(), screen.snapshot()) == after
+    assert not sg.can_redo
+
+
+def _tree_script(kind):
+    rng = random.Random(kind)
+    cmds = [
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": kind, "values": [5, 3]})
+    ]
+    for _ in range(40):
+        cmd_type = rng.choice(
+            [CommandType.INSERT, CommandType.INSERT, CommandType.DELETE_NODE]
+        )
+        cmds.append(Command("T", cmd_type, {"kind": kind, "value": rng.randrange(20)}))
+    cmds.append(Command("T", CommandType.SEARCH, {"kind": kind, "value": 5}))
+    cmds.append(Command("T", CommandType.DELETE_STRUCTURE, {"kind": kind}))
+    return cmds
+
+
+def _linear_script(kind):
+    rng = random.Random(kind)
+    cmds = [
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": kind, "values": [1, 2, 3]})
+    ]
+    for _ in range(20):
+        cmd_type = rng.choice(
+            [CommandType.INSERT, CommandType.DELETE_NODE, CommandType.UPDATE]
+        )
+        payload = {"kind": kind, "index": rng.randrange(3)}
+        if cmd_type is not CommandType.DELETE_NODE:
+            payload["value"] = rng.randrange(9)
+        if cmd_type is CommandType.UPDATE:
+            payload["new_value"] = rng.randrange(9)
+        cmds.append(Command("L", cmd_type, payload))
+    return cmds
+
+
+@pytest.mark.parametrize("kind", ["bst", "avl", "rbtree"])
+def test_undo_redo_restores_tree_models_and_screen(kind):
+    _run_and_unwind(_tree_script(kind))
+
+
+@pytest.mark.parametrize("kind", ["list", "seqlist"])
+def test_undo_redo_restores_linear_models_and_screen(kind):
+    _run_and_unwind(_linear_script(kind))
+
+
+def _multi_linear_script():
+    rng = random.Random("rows")
+    kinds = {"A": "seqlist", "B": "list", "S": "stack"}
+    cmds = [
+        Command(sid, CommandType.CREATE_STRUCTURE, {"kind": kind, "values": [1]})
+        for sid, kind in kinds.items()
+    ]
+    for _ in range(30):
+        sid = rng.choice(list(kinds))
+        kind = kinds[sid]
+        if rng.random() < 0.5:
+            payload = {"kind": kind, "value": rng.randrange(9)}
+            cmd_type = CommandType.INSERT
+        else:
+            payload = {"kind": kind}
+            cmd_type = CommandType.DELETE_NODE
+        if kind != "stack":
+            payload["index"] = 0
+        cmds.append(Command(sid, cmd_type, payload))
+    return cmds
+
+
+def test_undo_restores_rows_of_emptied_linear_structures():
+    sg = SceneGraph(history_limit=1000)
+    for sid, kind in (("a", "seqlist"), ("b", "list")):
+        sg.apply_command(
+            Command(sid, CommandType.CREATE_STRUCTURE, {"kind": kind, "values": [1]})
+        )
+    before = sg.export_scene()
+    sg.apply_command(
+        Command("a", CommandType.DELETE_NODE, {"kind": "seqlist", "index": 0})
+    )
+    undo = sg.undo()
+    assert sg.export_scene() == before
+    positions = {
+        op.target: op.data["y"]
+        for step in undo.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS
+    }
+    assert positions["a_node_1"] == 50.0  # back on its own row
+    assert positions["b_node_0"] == 390.0
+
+    _run_and_unwind(_multi_linear_script())
+
+
+def test_undo_of_recreate_keeps_the_structure_row():
+    # the inverse deletes b's new nodes and re-creates its old ones in one
+    # step; b must not be re-packed onto a new row in between
+    sg = SceneGraph(history_limit=1000)
+    scripts = (("b", [7, 27]), ("c", [19]), ("b", [6, 12]))
+    for sid, values in scripts:
+        sg.apply_command(
+            Command(
+                sid,
+                CommandType.CREATE_STRUCTURE,
+                {"kind": "seqlist", "values": values},
+            )
+        )
+    undo = sg.undo()
+    positions = {
+        op.target: op.data["y"]
+        for step in undo.steps
+        for op in step.ops
+        if op.op is OpCode.SET_POS
+    }
+    assert positions["b_node_1"] == positions["b_node_2"] == 50.0
+    assert positions["c_node_1"] == 390.0
+    assert sg._layout_engine._row_order == ["b", "c"]
+
+    # an empty list shows a sentinel, which re-create must remove too
+    _run_and_unwind(
+        [
+            Command("l", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": v})
+            for v in ([], [24], [29])
+        ]
+    )
+
+
+def test_undo_redo_stack_huffman_and_git():
+    _run_and_unwind(
+        [
+            Command("S", CommandType.CREATE_STRUCTURE, {"kind": "stack"}),
+            Command("S", CommandType.INSERT, {"kind": "stack", "value": 1}),
+            Command("S", CommandType.INSERT, {"kind": "stack", "value": 2}),
+            Command("S", CommandType.DELETE_NODE, {"kind": "stack"}),
+            Command(
+                "H",
+                CommandType.CREATE_STRUCTURE,
+                {"kind": "huffman", "values": [5, 1, 3, 2]},
+            ),
+            Command("H", CommandType.DELETE_STRUCTURE, {"kind": "huffman"}),
+            Command("G", CommandType.CREATE_STRUCTURE, {"kind": "git"}),
+            Command("G", CommandType.INSERT, {"kind": "git", "message": "a"}),
+            Command("G", CommandType.GIT_BRANCH, {"kind": "git", "name": "dev"}),
+            Command("G", CommandType.INSERT, {"kind": "git", "message": "b"}),
+            Command("G", CommandType.SEARCH, {"kind": "git", "target": "dev"}),
+            Command("G", CommandType.INSERT, {"kind": "git", "message": "c"}),
+            Command("G", CommandType.GIT_MERGE, {"kind": "git", "source": "main"}),
+            Command(
+                "G",
+                CommandType.GIT_IMPORT,
+                {
+                    "kind": "git",
+                    "commits": [{"id": "x"}, {"id": "y", "parents": ["x"]}],
+                    "reset": True,
+                    "branches": {"main": "y"},
+                    "head": "main",
+                },
+            ),
+        ]
+    )
+
+
+def test_undo_cost_tracks_the_command_not_the_history():
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_command(Command("T", CommandType.CREATE_STRUCTURE, {"kind": "avl"}))
+    for value in range(500):
+        sg.apply_command(
+            Command("T", CommandType.INSERT, {"kind": "avl", "value": value})
+        )
+
+    entry = sg._undo_stack[-1]
+    _, journal = entry.changes[0].model_delta["_nodes"]
+    # insert into a 500-key AVL tree touches one root-to-leaf path
+    assert 0 < len(journal) <= 25
+    assert len(entry.visual_delta) < 2 * len(sg._structures["T"]._nodes)
+
+    sg.undo()
+    assert sg._structures["T"].node_count == 499
+    assert 499 not in sg._structures["T"].export_state()["values"]
+
+
+def test_new_command_clears_redo_and_errors_when_empty():
+    sg = SceneGraph(history_limit=1000)
+    with pytest.raises(CommandError):
+        sg.undo()
+    sg.apply_command(Command("A", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    sg.undo()
+    assert "A" not in sg._structures
+    assert sg.export_scene()["structures"] == []
+    assert sg.can_redo
+
+    sg.apply_command(Command("B", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    assert not sg.can_redo
+    with pytest.raises(CommandError):
+        sg.redo()
+
+
+def test_history_limit_and_import_reset_history():
+    sg = SceneGraph(history_limit=2)
+    sg.apply_command(Command("A", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    for value in range(3):
+        payload = {"kind": "list", "index": 0, "value": value}
+        sg.apply_command(Command("A", CommandType.INSERT, payload))
+    sg.undo()
+    sg.undo()
+    assert not sg.can_undo
+    assert sg._structures["A"].values == [0]
+
+    sg.import_scene(sg.export_scene())
+    assert not sg.can_undo and not sg.can_redo
+
+    disabled = SceneGraph()  # history is off by default
+    disabled.apply_command(Command("A", CommandType.CREATE_STRUCTURE, {"kind": "list"}))
+    assert not disabled.can_undo
+
+
+def test_undo_redo_mixed_kind_batch_restores_screen():
+    sg = SceneGraph(history_limit=1000)
+    screen = _Screen()
+    screen.apply(
+        sg.apply_command(
+            Command(
+                "L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1, 2]}
+            )
+        )
+    )
+    scene, shown = sg.export_scene(), screen.snapshot()
+    batch = _linear_script("list")[1:] + _tree_script("avl")[:-1]
+    batch.append(Command("G", CommandType.CREATE_STRUCTURE, {"kind": "git"}))
+    # list inserts only: index 0..2 stays in range whatever the order
+    batch = [
+        cmd
+        for cmd in batch
+        if cmd.type is CommandType.INSERT or cmd.payload["kind"] != "list"
+    ]
+    screen.apply(sg.apply_commands(batch))
+    after = (sg.export_scene(), screen.snapshot())
+
+    screen.apply(sg.undo())
+    assert sg.export_scene() == scene
+    assert _without_new_positions(screen.snapshot(), shown) == shown
+    screen.apply(sg.redo())
+    assert (sg.export_scene(), screen.snapshot()) == after
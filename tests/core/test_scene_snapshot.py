@@ -0,0 +1,136 @@
+import copy
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+
+
+def _count_exports(monkeypatch, sg):
+    calls = {}
+    for sid, model in sg._structures.items():
+        original = model.export_state
+
+        def counted(sid=sid, original=original):
+            calls[sid] = calls.get(sid, 0) + 1
+            return original()
+
+        monkeypatch.setattr(model, "export_state", counted)
+    return calls
+
+
+def _scene():
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_command(
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1, 2]})
+    )
+    sg.apply_command(
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": "avl", "values": [5, 3]})
+    )
+    sg.apply_command(Command("G", CommandType.CREATE_STRUCTURE, {"kind": "git"}))
+    return sg
+
+
+def _insert_list(sg, value):
+    sg.apply_command(
+        Command("L", CommandType.INSERT, {"kind": "list", "index": 0, "value": value})
+    )
+
+
+def test_snapshot_keeps_state_at_its_revision(monkeypatch):
+    sg = _scene()
+    expected = copy.deepcopy(sg.export_scene())
+    calls = _count_exports(monkeypatch, sg)
+
+    snap = sg.snapshot()
+    assert calls == {}  # taking a snapshot exports nothing
+
+    _insert_list(sg, 9)  # copy-on-write: L captured before the write
+    _insert_list(sg, 8)
+    assert calls == {}  # L's state at the snapshot revision was cached
+    sg.apply_command(Command("T", CommandType.INSERT, {"kind": "avl", "value": 7}))
+    assert snap.to_dict() == expected
+    assert sg.export_scene() != expected
+    assert snap.revision != sg.revision
+
+
+def test_export_cache_reexports_only_changed_structures(monkeypatch):
+    sg = _scene()
+    calls = _count_exports(monkeypatch, sg)
+    first = sg.export_scene()
+    assert calls == {"L": 1, "T": 1, "G": 1}
+
+    assert sg.export_scene() == first
+    assert calls == {"L": 1, "T": 1, "G": 1}
+
+    _insert_list(sg, 4)
+    sg.export_scene()
+    assert calls == {"L": 2, "T": 1, "G": 1}
+
+    revision = sg.structure_revision("T")
+    with pytest.raises(CommandError):
+        sg.apply_command(Command("T", CommandType.INSERT, {"kind": "list", "value": 5}))
+    # a failed command may have written partially: never trust the old state
+    assert sg.structure_revision("T") != revision
+
+
+def test_snapshot_survives_undo_and_import():
+    sg = _scene()
+    _insert_list(sg, 4)
+    expected = copy.deepcopy(sg.export_scene())
+
+    snap = sg.snapshot()
+    sg.undo()
+    sg.import_scene({"version": "1.0", "structures": []})
+    assert sg.export_scene()["structures"] == []
+    assert snap.to_dict() == expected
+    assert sg.structure_revision("L") is None
+
+
+def test_snapshot_materializes_on_demand_after_release():
+    sg = _scene()
+    snap = sg.snapshot()
+    assert snap.structure_ids == ["L", "T", "G"]
+    assert snap.state("T")["values"] == [5, 3]
+    snap.release()
+    _insert_list(sg, 4)
+    assert not sg._open_snapshots
+    with pytest.raises(RuntimeError):
+        snap.state("L")
+
+
+def test_git_export_is_incremental_and_follows_undo():
+    sg = SceneGraph(history_limit=1000)
+    sg.apply_command(Command("G", CommandType.CREATE_STRUCTURE, {"kind": "git"}))
+    model = sg._structures["G"]
+
+    def commit(message):
+        sg.apply_command(
+            Command("G", CommandType.INSERT, {"kind": "git", "message": message})
+        )
+
+    def full_export():
+        return [
+            {
+                "id": cid,
+                "message": c.message,
+                "parents": list(c.parents),
+                "branch": c.branch,
+            }
+            for cid, c in model.commits.items()
+        ]
+
+    for message in "abc":
+        commit(message)
+        sg.export_scene()
+    cached = list(model._exported_commits)
+    commit("d")
+    assert model.export_state()["commits"][:3] == cached
+    assert model._exported_commits[0] is cached[0]
+
+    sg.undo()
+    sg.undo()
+    commit("x")  # reuses the id of the undone commit "c"
+    assert model.export_state()["commits"] == full_export()
+    assert model.export_state()["commits"][-1]["message"] == "x"
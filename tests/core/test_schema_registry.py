@@ -2,8 +2,13 @@ import pytest
 
 from ds_vis.core.exceptions import CommandError
 from ds_vis.core.scene.command import Command, CommandType
-from ds_vis.core.scene.command_schema import MODEL_OP_REGISTRY
+from ds_vis.core.scene.command_schema import (
+    MODEL_OP_REGISTRY,
+    SCHEMA_REGISTRY,
+    CommandSchema,
+)
 from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.persistence.json_io import commands_from_json, commands_to_json
 
 
 def test_schema_registry_validates_unknown_kind():
@@ -46,3 +51,57 @@ def test_schema_registry_rejects_extra_fields():
     )
     with pytest.raises(CommandError, match="Unexpected payload fields"):
         scene_graph.apply_command(cmd)
+
+
+def test_registered_schemas_are_compiled_at_register_time():
+    for schema in SCHEMA_REGISTRY.values():
+        assert "compiled" in schema.__dict__
+    schema = CommandSchema(required={"kind": str}, optional={"n": (int,)})
+    schema.validate({"kind": "x", "n": None, "detail": "L0"})
+    with pytest.raises(CommandError, match="Field 'n' must be a int when present"):
+        schema.validate({"kind": "x", "n": "1"})
+    with pytest.raises(CommandError, match="Field 'kind' must be str"):
+        schema.validate({"kind": 1})
+    with pytest.raises(CommandError, match="Unexpected payload fields: a, b"):
+        schema.validate({"kind": "x", "b": 1, "a": 2})
+    CommandSchema(allow_extra=True).validate({"anything": 1})
+
+
+def test_commands_validated_on_load_skip_second_validation(monkeypatch):
+    text = commands_to_json(
+        [
+            Command("s1", CommandType.CREATE_STRUCTURE, {"kind": "list"}),
+            Command("s1", CommandType.INSERT, {"kind": "list", "index": 0, "value": 1}),
+        ]
+    )
+    commands = commands_from_json(text)
+    assert all(cmd.validated for cmd in commands)
+    assert commands[0] == Command("s1", CommandType.CREATE_STRUCTURE, {"kind": "list"})
+
+    calls = []
+    for schema in SCHEMA_REGISTRY.values():
+        monkeypatch.setitem(schema.__dict__, "compiled", calls.append)
+    scene_graph = SceneGraph()
+    for cmd in commands:
+        scene_graph.apply_command(cmd)
+    assert calls == []
+    assert scene_graph._structures["s1"].values == [1]
+
+    untrusted = Command(
+        "s1", CommandType.INSERT, {"kind": "list", "index": 0, "value": 2}
+    )
+    scene_graph.apply_command(untrusted)
+    assert calls == [untrusted.payload]
+
+
+def test_payload_is_copied_only_to_fill_in_kind():
+    scene_graph = SceneGraph()
+    scene_graph.apply_command(
+        Command("s1", CommandType.CREATE_STRUCTURE, {"kind": "list"})
+    )
+    explicit = Command("s1", CommandType.SEARCH, {"kind": "list", "value": 1})
+    assert scene_graph._resolve_schema_and_op(explicit)[2] is explicit.payload
+    implicit = Command("s1", CommandType.SEARCH, {"value": 1})
+    _, _, payload = scene_graph._resolve_schema_and_op(implicit)
+    assert payload == {"kind": "list", "value": 1}
+    assert implicit.payload == {"value": 1}
@@ -1,4 +1,11 @@
-from ds_vis.dsl.cli import run_cli
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from ds_vis.dsl.cli import compile_scripts, run_cli
 
 
 def test_cli_runs_commands_from_file(tmp_path, capsys):
@@ -22,3 +29,128 @@ def test_cli_returns_error_on_invalid_text(capsys):
     err = capsys.readouterr().err
     assert "Error:" in err
     assert code == 1
+
+
+def _write_scripts(tmp_path):
+    scripts = {
+        "a.dsl": "bst T = [5, 3, 8]; insert T 4",
+        "b.dsl": "list L = [1, 2]; insert L 0 9",
+        "bad.dsl": "insert missing 1",
+        "c.json": (
+            '[{"structure_id": "s", "type": "CREATE_STRUCTURE", '
+            '"payload": {"kind": "stack", "values": [1]}}]'
+        ),
+    }
+    paths = []
+    for name, text in scripts.items():
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_compiles_in_order_and_isolates_errors(tmp_path, capsys):
+    paths = _write_scripts(tmp_path)
+    out_dir = tmp_path / "out"
+
+    code = run_cli(["--batch", *paths, "--out-dir", str(out_dir), "--jobs", "2"])
+
+    captured = capsys.readouterr()
+    assert code == 1
+    assert "Compiled 3/4 script(s)" in captured.out
+    assert "scripts/s" in captured.out
+    assert "bad.dsl" in captured.err
+    lines = [line for line in captured.out.splitlines() if "->" in line]
+    assert [line.split(" ->")[0] for line in lines] == [
+        paths[0],
+        paths[1],
+        paths[3],
+    ]
+    timeline = json.loads((out_dir / "a.timeline.json").read_text(encoding="utf-8"))
+    ops = [op for step in timeline["steps"] for op in step["ops"]]
+    assert any(op["op"] == "SET_POS" for op in ops)
+    assert not (out_dir / "bad.timeline.json").exists()
+
+
+def test_batch_results_match_inline_compilation(tmp_path):
+    paths = _write_scripts(tmp_path) + [str(tmp_path / "missing.dsl")]
+    parallel = compile_scripts(paths, tmp_path / "p", jobs=2)
+    inline = compile_scripts(paths, tmp_path / "i", jobs=1)
+
+    assert [r.path for r in parallel] == paths
+    assert [(r.ok, r.commands, r.steps) for r in parallel] == [
+        (r.ok, r.commands, r.steps) for r in inline
+    ]
+    assert "Failed to read script" in (parallel[-1].error or "")
+    for name in ("a", "b", "c"):
+        assert (tmp_path / "p" / f"{name}.timeline.json").read_text() == (
+            tmp_path / "i" / f"{name}.timeline.json"
+        ).read_text()
+
+
+def test_batch_requires_out_dir_and_dedupes_names(tmp_path, capsys):
+    assert run_cli(["--batch", "x.dsl"]) == 1
+    assert "--out-dir" in capsys.readouterr().err
+
+    (tmp_path / "one").mkdir()
+    (tmp_path / "two").mkdir()
+    for sub in ("one", "two"):
+        (tmp_path / sub / "s.dsl").write_text("list L = [1]", encoding="utf-8")
+    results = compile_scripts(
+        [str(tmp_path / "one" / "s.dsl"), str(tmp_path / "two" / "s.dsl")],
+        tmp_path / "out",
+        jobs=1,
+    )
+    assert [Path(r.output or "").name for r in results] == [
+        "s.timeline.json",
+        "s-2.timeline.json",
+    ]
+
+
+def test_stream_mode_reads_json_lines(tmp_path, capsys):
+    lines = [
+        '{"structure_id": "s", "type": "CREATE_STRUCTURE", '
+        '"payload": {"kind": "list", "values": []}}'
+    ]
+    lines += [
+        '{"structure_id": "s", "type": "INSERT", '
+        f'"payload": {{"kind": "list", "index": 0, "value": {v}}}}}'
+        for v in range(3)
+    ]
+    path = tmp_path / "log.jsonl"
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    assert run_cli(["--stream", "--file", str(path)]) == 0
+    assert "Executed 4 command(s)" in capsys.readouterr().out
+
+    assert run_cli(["--stream", "--text", "[1]"]) == 1
+    assert "Command 0" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched parser",
+)
+def test_crashing_worker_only_fails_its_own_script(tmp_path, monkeypatch):
+    import ds_vis.dsl.cli as cli
+
+    real_parse = cli.parse_dsl
+
+    def crashing_parse(text):
+        if "crash" in text:
+            os._exit(1)
+        return real_parse(text)
+
+    monkeypatch.setattr(cli, "parse_dsl", crashing_parse)
+    paths = []
+    for i in range(8):
+        path = tmp_path / f"s{i}.dsl"
+        body = "list crash = [1]" if i == 3 else f"list L = [{i}]"
+        path.write_text(body, encoding="utf-8")
+        paths.append(str(path))
+
+    results = compile_scripts(paths, tmp_path / "out", jobs=2)
+
+    assert [r.path for r in results] == paths
+    assert [r.ok for r in results] == [i != 3 for i in range(8)]
+    assert "crashed" in (results[3].error or "")
@@ -1,7 +1,7 @@
 import pytest
 
 from ds_vis.core.scene.command import CommandType
-from ds_vis.dsl.parser import parse_dsl
+from ds_vis.dsl.parser import iter_dsl, parse_dsl
 
 
 def test_parse_create_and_insert_text():
@@ -68,3 +68,25 @@ def test_dsl_multiline_brackets():
     assert commands[0].structure_id == "L1"
     assert len(commands[0].payload["values"]) == 2
     assert commands[1].type == CommandType.INSERT
+
+
+def test_iter_dsl_is_lazy():
+    # The broken statement is only reached after the first commands are yielded.
+    commands = iter_dsl("list L1 = [1]; insert L1 0 2; bogus L1")
+    first = next(commands)
+    assert first.type is CommandType.CREATE_STRUCTURE
+    second = next(commands)
+    assert second.payload == {"kind": "list", "value": 2, "index": 0}
+    with pytest.raises(Exception, match="Unsupported statement"):
+        next(commands)
+
+
+def test_parse_git_branch_and_merge():
+    cmds = parse_dsl("git G1 init; git G1 branch dev c0; git G1 merge dev")
+    assert [c.type for c in cmds] == [
+        CommandType.CREATE_STRUCTURE,
+        CommandType.GIT_BRANCH,
+        CommandType.GIT_MERGE,
+    ]
+    assert cmds[1].payload == {"kind": "git", "name": "dev", "start": "c0"}
+    assert cmds[2].payload == {"kind": "git", "source": "dev"}
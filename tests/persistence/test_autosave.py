@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.persistence.autosave import AutosaveScheduler
+from ds_vis.persistence.json_io import load_scene_from_file
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scene():
+    sg = SceneGraph()
+    sg.apply_command(
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]})
+    )
+    sg.apply_command(
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": "bst", "values": [2, 1]})
+    )
+    return sg
+
+
+def _insert(sg, value):
+    sg.apply_command(
+        Command("L", CommandType.INSERT, {"kind": "list", "index": 0, "value": value})
+    )
+
+
+def test_autosave_respects_interval_and_dirty_state(tmp_path):
+    sg = _scene()
+    clock = _Clock()
+    saver = AutosaveScheduler(sg, tmp_path / "scene.json", 10.0, clock=clock)
+
+    assert saver.poll()
+    assert not saver.poll()  # clean
+    _insert(sg, 5)
+    clock.now = 5.0
+    assert not saver.poll()  # interval not elapsed
+    assert saver.poll(force=True)
+    clock.now = 20.0
+    assert not saver.poll()  # elapsed but clean
+    assert saver.saves == 2
+
+    data = load_scene_from_file(tmp_path / "scene.json")
+    assert data == json.loads(json.dumps(sg.export_scene()))
+    restored = SceneGraph()
+    restored.import_scene(data)
+    assert restored._structures["L"].values == [5, 1]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_autosave_reserializes_only_changed_structures(tmp_path, monkeypatch):
+    sg = _scene()
+    saver = AutosaveScheduler(sg, tmp_path / "scene.json", 0.0)
+    encoded = []
+    real_dumps = json.dumps
+
+    def counting_dumps(obj, *args, **kwargs):
+        if isinstance(obj, dict) and "values" in obj:
+            encoded.append(obj["values"])
+        return real_dumps(obj, *args, **kwargs)
+
+    monkeypatch.setattr("ds_vis.persistence.autosave.json.dumps", counting_dumps)
+    saver.poll()
+    assert sorted(encoded) == [[1], [2, 1]]
+
+    encoded.clear()
+    _insert(sg, 7)
+    saver.poll()
+    assert encoded == [[7, 1]]
+
+
+def test_background_save_writes_the_polled_revision(tmp_path):
+    sg = _scene()
+    saver = AutosaveScheduler(sg, tmp_path / "scene.json", 0.0, background=True)
+    expected = json.loads(json.dumps(sg.export_scene()))
+
+    assert saver.poll()
+    for value in range(50):  # keep writing while the worker encodes
+        _insert(sg, value)
+    saver.flush()
+    assert load_scene_from_file(tmp_path / "scene.json") == expected
+
+    assert saver.poll()
+    saver.flush()
+    assert load_scene_from_file(tmp_path / "scene.json") == json.loads(
+        json.dumps(sg.export_scene())
+    )
+
+
+def test_autosave_io_error_is_command_error_and_retried(tmp_path):
+    sg = _scene()
+    saver = AutosaveScheduler(sg, tmp_path / "missing" / "scene.json", 0.0)
+    with pytest.raises(CommandError, match="autosave"):
+        saver.poll()
+    assert saver.dirty
+
+    background = AutosaveScheduler(
+        sg, tmp_path / "missing" / "scene.json", 0.0, background=True
+    )
+    background.poll()
+    with pytest.raises(CommandError):
+        background.flush()
+
+
+def test_background_encoding_error_is_kept_and_retried(tmp_path, monkeypatch):
+    sg = _scene()
+    saver = AutosaveScheduler(sg, tmp_path / "scene.json", 0.0, background=True)
+
+    def broken(snap):
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr(saver, "_encode", broken)
+    assert saver.poll()
+    with pytest.raises(ValueError, match="cannot encode"):
+        saver.flush()
+    assert saver.dirty and saver.last_error is None
+
+    monkeypatch.undo()
+    assert saver.poll()
+    saver.flush()
+    assert load_scene_from_file(tmp_path / "scene.json") == json.loads(
+        json.dumps(sg.export_scene())
+    )
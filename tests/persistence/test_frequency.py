@@ -0,0 +1,64 @@
+import heapq
+import math
+
+from ds_vis.core.models.huffman import HuffmanModel
+from ds_vis.persistence.frequency import count_file_frequencies, iter_file_chunks
+
+
+def test_streaming_counts_match_whole_file(tmp_path):
+    data = b"abracadabra" * 1000 + bytes(range(256))
+    path = tmp_path / "corpus.bin"
+    path.write_bytes(data)
+
+    chunks = list(iter_file_chunks(path, chunk_size=7))
+    assert max(len(chunk) for chunk in chunks) == 7
+
+    counts = count_file_frequencies(path, chunk_size=7)
+    assert counts[ord("a")] == 5001
+    assert sum(counts.values()) == len(data)
+
+
+def test_text_mode_counts_characters(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text("你好, hello 你", encoding="utf-8")
+
+    counts = count_file_frequencies(path, text=True, chunk_size=3)
+
+    assert counts["你"] == 2
+    assert counts["l"] == 2
+
+
+def test_code_table_and_sizes_from_frequencies(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text("aaaaabbbbcccdde", encoding="utf-8")
+    counts = count_file_frequencies(path, text=True)
+
+    model = HuffmanModel(structure_id="huff_file")
+    model.create_from_frequencies(counts)
+    table = model.code_table()
+
+    assert set(table) == set("abcde")
+    codes = list(table.values())
+    # prefix-free
+    for code in codes:
+        assert not any(other != code and other.startswith(code) for other in codes)
+    bits = sum(counts[sym] * len(code) for sym, code in table.items())
+    assert model.encoded_bits() == bits
+    assert math.isclose(model.average_code_length(), bits / 15)
+    # Optimal Huffman cost: sum of all merged weights.
+    heap = list(counts.values())
+    heapq.heapify(heap)
+    optimal = 0
+    while len(heap) > 1:
+        merged = heapq.heappop(heap) + heapq.heappop(heap)
+        optimal += merged
+        heapq.heappush(heap, merged)
+    assert bits == optimal
+    assert model.export_state()["symbols"] == list(counts)
+
+
+def test_single_symbol_gets_one_bit_code():
+    model = HuffmanModel(structure_id="huff_one")
+    model.create_from_frequencies({"x": 10})
+    assert model.code_table() == {"x": "0"}
+    assert model.encoded_bits() == 10
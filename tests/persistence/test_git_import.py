@@ -0,0 +1,87 @@
+import shutil
+import subprocess
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import OpCode
+from ds_vis.core.scene.command import CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.persistence.git_import import iter_git_import_commands, iter_git_log
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git missing")
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        env={
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "HOME": str(repo),
+            "PATH": "/usr/bin:/bin",
+        },
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    for i in range(3):
+        _git(tmp_path, "commit", "-q", "--allow-empty", "-m", f"main {i}")
+    _git(tmp_path, "checkout", "-q", "-b", "dev", "HEAD~1")
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "dev work")
+    _git(tmp_path, "checkout", "-q", "main")
+    _git(tmp_path, "merge", "-q", "--no-ff", "-m", "merge dev", "dev")
+    return tmp_path
+
+
+def test_git_log_streams_parents_first(repo):
+    entries = list(iter_git_log(repo))
+    assert len(entries) == 5
+    seen = set()
+    for entry in entries:
+        assert all(parent in seen for parent in entry.parents)
+        seen.add(entry.commit_id)
+    assert entries[-1].message == "merge dev"
+    assert len(entries[-1].parents) == 2
+
+
+def test_import_commands_build_model_in_batches(repo):
+    commands = list(iter_git_import_commands(repo, "G", batch_size=2))
+    assert [cmd.type for cmd in commands] == [CommandType.GIT_IMPORT] * 3
+    assert commands[0].payload["reset"] is True
+
+    sg = SceneGraph()
+    timelines = [sg.apply_command(cmd) for cmd in commands]
+    model = sg._structures["G"]
+    assert model.node_count == 5
+    assert model.head == "main"
+    assert set(model.branches) == {"main", "dev"}
+    merge = model.commits[model.branches["main"]]
+    assert model.ancestry.is_ancestor(model.branches["dev"], merge.commit_id)
+    assert any(
+        op.op is OpCode.SET_POS and op.target == "HEAD"
+        for step in timelines[-1].steps
+        for op in step.ops
+    )
+
+
+def test_import_window_keeps_recent_commits(repo):
+    sg = SceneGraph()
+    for cmd in iter_git_import_commands(repo, "G", max_count=2):
+        sg.apply_command(cmd)
+    model = sg._structures["G"]
+    assert model.node_count == 2
+    roots = [c for c in model.commits.values() if not c.parents]
+    assert len(roots) == 1
+    assert model.commits[model.branches["main"]].message == "merge dev"
+
+
+def test_import_errors_on_missing_repo(tmp_path):
+    with pytest.raises(CommandError):
+        list(iter_git_log(tmp_path / "missing"))
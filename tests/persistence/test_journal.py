@@ -0,0 +1,205 @@
+import json
+
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.persistence.journal import CHECKPOINT_FILE, JOURNAL_FILE, CommandJournal
+
+
+def _create():
+    return Command("T", CommandType.CREATE_STRUCTURE, {"kind": "avl", "values": [5]})
+
+
+def _insert(value):
+    return Command("T", CommandType.INSERT, {"kind": "avl", "value": value})
+
+
+def _lines(tmp_path):
+    text = (tmp_path / JOURNAL_FILE).read_text(encoding="utf-8")
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def _count_fsyncs(monkeypatch):
+    calls = []
+    real_fsync = __import__("os").fsync
+
+    def counted(fd):
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr("ds_vis.persistence.journal.os.fsync", counted)
+    return calls
+
+
+def test_recovery_loads_checkpoint_and_replays_tail(tmp_path):
+    journal = CommandJournal(SceneGraph(), tmp_path, checkpoint_every=4)
+    journal.apply_command(_create())
+    for value in (1, 9, 3, 7, 2):
+        journal.apply_command(_insert(value))
+    assert journal.seq == 6
+    journal.sync()
+    assert [line["seq"] for line in _lines(tmp_path)] == [5, 6]
+    checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert checkpoint["seq"] == 4
+    expected = journal.scene.export_scene()
+    journal.close()
+
+    recovered = CommandJournal.open(tmp_path, checkpoint_every=4)
+    assert recovered.replayed == 2
+    assert recovered.scene.export_scene() == expected
+    assert not recovered.scene.can_undo
+
+    # the recovered scene keeps journaling where the old one stopped
+    recovered.apply_command(_insert(8))
+    assert recovered.seq == 7
+    recovered.close()
+    again = CommandJournal.open(tmp_path)
+    assert again.scene._structures["T"].export_state() == (
+        recovered.scene._structures["T"].export_state()
+    )
+
+
+def test_fsync_is_batched(tmp_path, monkeypatch):
+    journal = CommandJournal(
+        SceneGraph(), tmp_path, sync_every=10, sync_interval_s=3600
+    )
+    calls = _count_fsyncs(monkeypatch)
+    journal.apply_command(_create())
+    for value in range(18):
+        journal.apply_command(_insert(value))
+    assert len(calls) == 1  # one sync for 19 commands, 9 still pending
+    assert journal.pending_sync == 9
+    journal.sync()
+    assert journal.pending_sync == 0
+
+
+def test_fsync_interval_bounds_the_loss_window(tmp_path, monkeypatch):
+    now = [0.0]
+    journal = CommandJournal(
+        SceneGraph(),
+        tmp_path,
+        sync_every=1000,
+        sync_interval_s=1.0,
+        clock=lambda: now[0],
+    )
+    calls = _count_fsyncs(monkeypatch)
+    journal.apply_command(_create())
+    assert calls == []
+    now[0] = 1.5
+    journal.apply_command(_insert(1))
+    assert len(calls) == 1
+
+
+def test_torn_last_line_is_discarded(tmp_path):
+    with CommandJournal(SceneGraph(), tmp_path) as journal:
+        journal.apply_command(_create())
+        journal.apply_command(_insert(1))
+    with (tmp_path / JOURNAL_FILE).open("a", encoding="utf-8") as fh:
+        fh.write('{"seq": 3, "structure_id": "T", "ty')
+
+    recovered = CommandJournal.open(tmp_path)
+    assert recovered.replayed == 2
+    assert recovered.seq == 2
+    recovered.apply_command(_insert(4))
+    recovered.close()
+    assert [line["seq"] for line in _lines(tmp_path)] == [1, 2, 3]
+
+
+def test_corruption_and_gaps_raise(tmp_path):
+    with CommandJournal(SceneGraph(), tmp_path) as journal:
+        journal.apply_command(_create())
+        journal.apply_command(_insert(1))
+    path = tmp_path / JOURNAL_FILE
+    good = path.read_text(encoding="utf-8").splitlines()
+
+    path.write_text("garbage\n" + good[1] + "\n", encoding="utf-8")
+    with pytest.raises(CommandError, match="Corrupt"):
+        CommandJournal.open(tmp_path)
+    path.write_text(good[1] + "\n", encoding="utf-8")
+    with pytest.raises(CommandError, match="gap"):
+        CommandJournal.open(tmp_path)
+
+
+def test_failed_commands_are_not_journaled_and_undo_checkpoints(tmp_path):
+    journal = CommandJournal(SceneGraph(history_limit=1000), tmp_path)
+    journal.apply_command(_create())
+    with pytest.raises(CommandError):
+        journal.apply_commands(
+            [_insert(2), Command("T", CommandType.INSERT, {"kind": "list", "value": 1})]
+        )
+    assert journal.seq == 1
+
+    journal.apply_commands([_insert(2), _insert(3)])
+    journal.undo()
+    assert _lines(tmp_path) == []  # checkpoint compacted the journal
+    expected = journal.scene.export_scene()
+    journal.close()
+    assert CommandJournal.open(tmp_path).scene.export_scene() == expected
+
+
+def test_new_journal_starts_from_current_scene(tmp_path):
+    scene = SceneGraph()
+    scene.apply_command(_create())
+    scene.set_detail_level("L1", "T")
+    CommandJournal(scene, tmp_path).close()
+    recovered = CommandJournal.open(tmp_path)
+    assert recovered.scene.export_scene() == scene.export_scene()
+    assert recovered.scene.detail_level("T").name == "L1"
+    assert (
+        CommandJournal.open(tmp_path / "fresh").scene.export_scene()["structures"] == []
+    )
+
+
+def test_poll_syncs_once_the_interval_elapses(tmp_path, monkeypatch):
+    now = [0.0]
+    journal = CommandJournal(
+        SceneGraph(), tmp_path, sync_every=1000, clock=lambda: now[0]
+    )
+    calls = _count_fsyncs(monkeypatch)
+    journal.apply_command(_create())
+    assert not journal.poll() and calls == []
+    now[0] = 1.5  # no further appends: only the timer bounds the window
+    assert journal.poll()
+    assert len(calls) == 1 and journal.pending_sync == 0
+    assert not journal.poll()
+
+
+def test_failed_append_leaves_scene_and_journal_unchanged(tmp_path):
+    journal = CommandJournal(SceneGraph(), tmp_path, checkpoint_every=2)
+    journal.apply_commands([_create(), _insert(1)])  # checkpoint truncates
+    journal.apply_command(_insert(2))
+    before = journal.scene.export_scene()
+
+    class _FullDisk:
+        def __init__(self, file):
+            self._file = file
+
+        def write(self, text):
+            self._file.write(text[:10])  # torn line, then the error
+            raise OSError("No space left on device")
+
+        def __getattr__(self, name):
+            return getattr(self._file, name)
+
+    real = journal._file
+    journal._file = _FullDisk(real)
+    with pytest.raises(CommandError, match="Failed to append"):
+        journal.apply_command(_insert(3))
+    journal._file = real
+    assert journal.scene.export_scene() == before
+    assert journal.seq == 3
+    assert [line["seq"] for line in _lines(tmp_path)] == [3]
+
+    # a command that fails after its lines were written is cut off again
+    with pytest.raises(CommandError):
+        journal.apply_command(
+            Command("T", CommandType.INSERT, {"kind": "list", "value": 1})
+        )
+    assert [line["seq"] for line in _lines(tmp_path)] == [3]
+    journal.apply_command(_insert(4))
+    assert journal.seq == 4
+    expected = journal.scene.export_scene()
+    journal.close()
+    assert CommandJournal.open(tmp_path).scene.export_scene() == expected
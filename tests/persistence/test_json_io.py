@@ -46,3 +46,94 @@ def test_scene_persistence_roundtrip(tmp_path):
 
     loaded_data = load_scene_from_file(file_path)
     assert loaded_data == scene_data
+
+
+def _streamed_cmds(create_cmd_factory):
+    cmds = [
+        create_cmd_factory("s1", CommandType.CREATE_STRUCTURE, kind="list", values=[])
+    ]
+    for value in range(20):
+        cmds.append(
+            create_cmd_factory(
+                "s1", CommandType.INSERT, kind="list", index=0, value=value
+            )
+        )
+    return cmds
+
+
+def test_iter_commands_streams_json_array_in_small_chunks(create_cmd_factory):
+    import io
+
+    from ds_vis.persistence.json_io import iter_commands
+
+    cmds = _streamed_cmds(create_cmd_factory)
+    text = commands_to_json(cmds).replace(", {", ",\n  {")
+    streamed = list(iter_commands(io.StringIO(text), chunk_size=7))
+
+    assert streamed == commands_from_json(text)
+    assert all(cmd.validated for cmd in streamed)
+    assert list(iter_commands(io.StringIO(" [ ] "))) == []
+    assert list(iter_commands(io.StringIO(""))) == []
+
+
+def test_iter_commands_reads_json_lines_file(tmp_path, create_cmd_factory):
+    import json
+
+    from ds_vis.persistence.json_io import command_to_dict, iter_commands_from_file
+
+    cmds = _streamed_cmds(create_cmd_factory)
+    path = tmp_path / "log.jsonl"
+    lines = [json.dumps(command_to_dict(cmd)) for cmd in cmds]
+    path.write_text("\n".join(lines[:3]) + "\n\n" + "\n".join(lines[3:]), "utf-8")
+
+    assert list(iter_commands_from_file(path)) == cmds
+    with pytest.raises(CommandError, match="Failed to read"):
+        list(iter_commands_from_file(tmp_path / "missing.jsonl"))
+
+
+def test_iter_commands_is_lazy_and_reports_position(create_cmd_factory):
+    import io
+
+    from ds_vis.persistence.json_io import iter_commands
+
+    first = commands_to_json(_streamed_cmds(create_cmd_factory)[:1])[:-1]
+    stream = iter_commands(io.StringIO(first + ", 42]"), chunk_size=4)
+    assert next(stream).type is CommandType.CREATE_STRUCTURE
+    with pytest.raises(CommandError, match="Command 1: .*mapping"):
+        next(stream)
+
+    cases = {
+        "[": "Unterminated",
+        first + ",": "Unterminated",
+        first + "] []": "Unexpected data",
+        first + " {}": "Expected ','",
+        first + ", {oops}]": "Invalid JSON in command 1",
+        first[1:] + "\nnot json\n": "Invalid JSON on line 2",
+        "42": "JSON array or JSON Lines",
+    }
+    for text, message in cases.items():
+        with pytest.raises(CommandError, match=message):
+            list(iter_commands(io.StringIO(text), chunk_size=3))
+
+
+def test_iter_commands_fails_fast_on_invalid_json(create_cmd_factory):
+    import io
+    import json
+
+    from ds_vis.persistence.json_io import iter_commands
+
+    # every chunk boundary (inside strings, escapes, literals, numbers) decodes
+    payload = {"kind": "bst", "values": [-1.5e3, 2], "bulk": True, "balanced": False}
+    sid = 'éé\n"x"'
+    text = json.dumps(
+        [{"structure_id": sid, "type": "CREATE_STRUCTURE", "payload": payload}]
+    )
+    for chunk_size in range(1, 12):
+        (cmd,) = iter_commands(io.StringIO(text), chunk_size=chunk_size)
+        assert (cmd.structure_id, cmd.payload) == (sid, payload)
+
+    first = commands_to_json(_streamed_cmds(create_cmd_factory)[:1])[:-1]
+    stream = io.StringIO(first + ", {oops}, " + "[" * 100_000 + "]")
+    with pytest.raises(CommandError, match="Invalid JSON in command 1"):
+        list(iter_commands(stream, chunk_size=64))
+    assert stream.tell() < 4096  # raised without buffering the rest
@@ -0,0 +1,95 @@
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.persistence.sessions import (
+    SessionManager,
+    estimate_memory,
+    estimate_scene_memory,
+)
+
+
+def _create(kind, values):
+    return Command("s", CommandType.CREATE_STRUCTURE, {"kind": kind, "values": values})
+
+
+def _insert(value):
+    return Command("s", CommandType.INSERT, {"kind": "bst", "value": value})
+
+
+def test_estimate_memory_counts_shared_objects_once():
+    shared = [[i] for i in range(100)]
+    alone = estimate_memory(shared)
+    assert estimate_memory({"a": shared, "b": shared}) < 1.1 * alone
+    copy = [[i] for i in range(100)]
+    assert estimate_memory([shared, copy]) > 1.5 * alone
+
+
+def test_scene_memory_grows_with_models_and_layout_caches():
+    manager = SessionManager()
+    scene = manager.scene("a")
+    scene.apply_command(_create("bst", [5]))
+    small = estimate_scene_memory(scene)
+    scene.apply_commands([_insert(v) for v in range(200)])
+    assert estimate_scene_memory(scene) > small + 200 * 100
+    assert manager.memory_usage("a") == estimate_scene_memory(scene)
+
+
+def test_lru_eviction_and_lazy_rehydration():
+    manager = SessionManager(max_resident=2)
+    for sid in ("a", "b", "c"):
+        manager.apply_command(sid, _create("list", [ord(sid)]))
+    assert manager.resident_ids == ["b", "c"]
+    assert not manager.is_resident("a") and "a" in manager
+    assert manager.evictions == 1
+
+    manager.scene("b")  # b becomes most recently used
+    scene = manager.scene("a")
+    assert manager.resident_ids == ["b", "a"]
+    assert manager.rehydrations == 1
+    assert scene._structures["s"].values == [ord("a")]
+    assert not scene.can_undo  # history is not kept across eviction
+
+    manager.apply_command(
+        "a", Command("s", CommandType.INSERT, {"kind": "list", "index": 0, "value": 1})
+    )
+    assert scene._structures["s"].values == [1, ord("a")]
+
+
+def test_memory_limit_evicts_idle_sessions_but_never_the_current_one():
+    manager = SessionManager(memory_limit=1)
+    manager.apply_command("a", _create("bst", [1, 2, 3]))
+    assert manager.resident_ids == ["a"]  # alone over budget, still resident
+    manager.apply_command("b", _create("bst", [4]))
+    assert manager.resident_ids == ["b"]
+    assert 0 < manager.memory_usage("a") < 1000  # compressed blob
+
+    roomy = SessionManager(memory_limit=10**9)
+    for sid in "abc":
+        roomy.apply_command(sid, _create("bst", [1]))
+    assert roomy.resident_ids == ["a", "b", "c"]
+    assert roomy.memory_usage() == sum(roomy.memory_usage(s) for s in "abc")
+
+
+def test_evicted_scene_round_trips_settings():
+    manager = SessionManager(compress=False)
+    scene = manager.scene("a")
+    scene.apply_command(_create("avl", [3, 1, 2]))
+    scene.set_detail_level("L0")
+    scene.set_detail_level("L1", "s")
+    exported = scene.export_scene()
+
+    manager.evict("a")
+    manager.evict("a")  # already evicted: no-op
+    restored = manager.scene("a")
+    assert restored is not scene
+    assert restored.export_scene() == exported
+    assert restored.default_detail.name == "L0"
+    assert restored.detail_level("s").name == "L1"
+
+    manager.close("a")
+    assert "a" not in manager and len(manager) == 0
+    with pytest.raises(CommandError):
+        manager.memory_usage("a")
+    with pytest.raises(CommandError):
+        SessionManager(max_resident=0)
@@ -0,0 +1,167 @@
+import pytest
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import DetailLevel
+from ds_vis.core.scene.command import Command, CommandType
+from ds_vis.core.scene.scene_graph import SceneGraph
+from ds_vis.persistence.timeline_cache import (
+    CachedSceneRunner,
+    TimelineCache,
+    command_key,
+    start_key,
+)
+
+
+def _script():
+    cmds = [
+        Command("T", CommandType.CREATE_STRUCTURE, {"kind": "bst", "values": [5]}),
+        Command("L", CommandType.CREATE_STRUCTURE, {"kind": "list", "values": [1]}),
+    ]
+    for value in (3, 8, 1, 4, 9):
+        cmds.append(Command("T", CommandType.INSERT, {"kind": "bst", "value": value}))
+    cmds.append(Command("T", CommandType.DELETE_NODE, {"kind": "bst", "value": 3}))
+    cmds.append(
+        Command("L", CommandType.INSERT, {"kind": "list", "index": 0, "value": 2})
+    )
+    return cmds
+
+
+def _ops(timeline):
+    return [
+        (op.op, op.target, dict(op.data)) for step in timeline.steps for op in step.ops
+    ]
+
+
+def _reference():
+    sg = SceneGraph()
+    return [_ops(sg.apply_command(cmd)) for cmd in _script()], sg.export_scene()
+
+
+def _with_history():
+    return SceneGraph(history_limit=1000)
+
+
+def _count_model_work(monkeypatch):
+    calls = []
+    original = SceneGraph.apply_command
+
+    def counted(self, command):
+        calls.append(command)
+        return original(self, command)
+
+    monkeypatch.setattr(SceneGraph, "apply_command", counted)
+    return calls
+
+
+def test_keys_follow_start_scene_and_command_chain():
+    cmd = _script()[0]
+    assert start_key() == start_key({})
+    assert start_key() != start_key(default_detail=DetailLevel.L0)
+    assert start_key({"v": (1, 2)}) == start_key({"v": [1, 2]})
+    first = command_key(start_key(), cmd)
+    assert first == command_key(start_key(), _script()[0])
+    assert command_key(first, cmd) != first
+    assert command_key(start_key(), _script()[1]) != first
+
+
+def test_replay_hits_cache_and_skips_model_work(monkeypatch):
+    expected, exported = _reference()
+    cache = TimelineCache()
+    first = CachedSceneRunner(cache, checkpoint_every=3)
+    assert [_ops(first.apply_command(cmd)) for cmd in _script()] == expected
+    first.checkpoint()
+
+    calls = _count_model_work(monkeypatch)
+    second = CachedSceneRunner(cache, checkpoint_every=3)
+    assert [_ops(second.apply_command(cmd)) for cmd in _script()] == expected
+    assert calls == [] and second.pending == len(_script())
+    assert cache.hits == len(_script())
+
+    # resumes from the final post-state: still no command is re-run
+    assert second.scene.export_scene() == exported
+    assert calls == [] and second.pending == 0
+
+
+def test_miss_resumes_from_checkpoint_and_replays_the_tail(monkeypatch):
+    cache = TimelineCache()
+    CachedSceneRunner(
+        cache, scene_factory=_with_history, checkpoint_every=4
+    ).apply_commands(_script()[:6])
+
+    calls = _count_model_work(monkeypatch)
+    runner = CachedSceneRunner(cache, scene_factory=_with_history, checkpoint_every=4)
+    for cmd in _script()[:6]:
+        runner.apply_command(cmd)
+    assert calls == []
+    extra = _script()[6:]
+    for cmd in extra:  # misses: catch up, then run for real
+        runner.apply_command(cmd)
+    assert calls == extra
+
+    expected, exported = _reference()
+    assert runner.scene.export_scene() == exported
+    # the resumed scene keeps the layout engine state and history
+    tail = Command("T", CommandType.INSERT, {"kind": "bst", "value": 7})
+    reference = _with_history()
+    for cmd in _script():
+        reference.apply_command(cmd)
+    assert _ops(runner.apply_command(tail)) == _ops(reference.apply_command(tail))
+    runner.scene.undo()
+    reference.undo()
+    assert runner.scene.export_scene() == reference.export_scene()
+
+
+def test_failed_command_is_not_cached():
+    cache = TimelineCache()
+    runner = CachedSceneRunner(cache)
+    runner.apply_command(_script()[0])
+    key = runner.key
+    bad = Command("T", CommandType.DELETE_NODE, {"kind": "list", "index": 0})
+    with pytest.raises(CommandError):
+        runner.apply_command(bad)
+    assert runner.key == key
+    assert command_key(key, bad) not in cache
+
+
+def test_start_scene_and_detail_levels_are_part_of_the_key():
+    cache = TimelineCache()
+    data = {
+        "version": "1.0",
+        "structures": [{"id": "T", "kind": "bst", "state": {"values": [2, 1]}}],
+    }
+    imported = CachedSceneRunner(cache, data)
+    assert imported.start_timeline.steps
+    cmd = Command("T", CommandType.INSERT, {"kind": "bst", "value": 3})
+    imported.apply_command(cmd)
+
+    plain = CachedSceneRunner(cache)
+    plain.apply_command(_script()[0])
+    condensed = CachedSceneRunner(cache)
+    condensed.set_detail_level("L0")
+    timeline = condensed.apply_command(_script()[0])
+    assert cache.hits == 0
+    assert len(timeline.steps) == 1
+    assert condensed.scene.default_detail.name == "L0"
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path, monkeypatch):
+    expected, exported = _reference()
+    writer = TimelineCache(max_entries=2, directory=tmp_path)
+    CachedSceneRunner(writer).apply_commands(_script())
+    assert len(writer) == 2
+    assert len(list(tmp_path.glob("*.pkl"))) == len(_script())
+
+    calls = _count_model_work(monkeypatch)
+    reader = TimelineCache(directory=tmp_path)
+    runner = CachedSceneRunner(reader)
+    assert [_ops(runner.apply_command(cmd)) for cmd in _script()] == expected
+    assert runner.scene.export_scene() == exported
+    assert calls == []
+
+    (tmp_path / f"{runner.key}.pkl").write_bytes(b"garbage")
+    assert TimelineCache(directory=tmp_path).get(runner.key) is None
+    assert not (tmp_path / f"{runner.key}.pkl").exists()
+    writer.clear()
+    assert len(writer) == 0 and not list(tmp_path.glob("*.pkl"))
+    with pytest.raises(CommandError):
+        TimelineCache(max_entries=0)
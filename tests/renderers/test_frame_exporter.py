@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import pickle
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QGraphicsScene
+
+from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
+from ds_vis.core.scene.command import CommandType
+from ds_vis.renderers.pyside6.exporter import (
+    ExportConfig,
+    FrameExporter,
+    _chunk_bounds,
+)
+from ds_vis.renderers.pyside6.renderer import PySide6Renderer
+
+
+def _demo_timeline() -> Timeline:
+    return Timeline(
+        steps=[
+            AnimationStep(
+                duration_ms=100,
+                ops=[
+                    AnimationOp(
+                        op=OpCode.CREATE_NODE,
+                        target="n1",
+                        data={"structure_id": "s1", "label": "1"},
+                    ),
+                    AnimationOp(
+                        op=OpCode.SET_POS, target="n1", data={"x": 0.0, "y": 0.0}
+                    ),
+                ],
+            ),
+            AnimationStep(
+                duration_ms=0,
+                ops=[
+                    AnimationOp(
+                        op=OpCode.SET_STATE,
+                        target="n1",
+                        data={"state": "highlight"},
+                    )
+                ],
+            ),
+            AnimationStep(
+                duration_ms=200,
+                ops=[
+                    AnimationOp(
+                        op=OpCode.SET_POS, target="n1", data={"x": 200.0, "y": 0.0}
+                    )
+                ],
+            ),
+        ]
+    )
+
+
+def test_plan_frames_follows_fps():
+    exporter = FrameExporter(ExportConfig(fps=20))
+    assert exporter.plan_frames(_demo_timeline()) == [2, 1, 4]
+
+
+def test_export_frames_writes_sequence(qt_app, tmp_path):
+    exporter = FrameExporter(ExportConfig(fps=20, workers=1))
+    result = exporter.export_frames(_demo_timeline(), tmp_path)
+
+    assert result.frame_count == 7
+    assert all(path.exists() for path in result.frame_paths)
+    sizes = {QImage(str(path)).size().toTuple() for path in result.frame_paths}
+    assert len(sizes) == 1  # every frame shares the keyframe union rect
+    width, height = sizes.pop()
+    assert width % 2 == 0 and height % 2 == 0
+    # node moves right during the last step: first and last frames must differ
+    first = QImage(str(result.frame_paths[0]))
+    last = QImage(str(result.frame_paths[-1]))
+    assert first != last
+
+
+def test_export_frames_parallel_matches_serial(
+    qt_app, tmp_path, scene_graph, create_cmd_factory
+):
+    timeline = scene_graph.apply_command(
+        create_cmd_factory(
+            "exp_bst", CommandType.CREATE_STRUCTURE, kind="bst", values=[5, 3, 7]
+        )
+    )
+    serial = FrameExporter(ExportConfig(fps=10, workers=1)).export_frames(
+        timeline, tmp_path / "serial"
+    )
+    parallel = FrameExporter(ExportConfig(fps=10, workers=2)).export_frames(
+        timeline, tmp_path / "parallel"
+    )
+
+    assert serial.frame_count == parallel.frame_count > 0
+    for a, b in zip(serial.frame_paths, parallel.frame_paths):
+        assert QImage(str(a)) == QImage(str(b))
+
+
+def _lesson_timeline(scene_graph, create_cmd_factory) -> Timeline:
+    timeline = Timeline()
+    for cmd in (
+        create_cmd_factory(
+            "exp_bst", CommandType.CREATE_STRUCTURE, kind="bst", values=[5, 3, 7]
+        ),
+        create_cmd_factory("exp_bst", CommandType.INSERT, kind="bst", value=4),
+        create_cmd_factory("exp_bst", CommandType.DELETE_NODE, kind="bst", value=3),
+    ):
+        timeline.steps.extend(scene_graph.apply_command(cmd).steps)
+    return timeline
+
+
+def _render_scene(scene, rect) -> QImage:
+    image = QImage(int(rect.width()), int(rect.height()), QImage.Format.Format_ARGB32)
+    image.fill(0)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(0, 0, rect.width(), rect.height()), rect)
+    painter.end()
+    return image
+
+
+def test_keyframe_snapshot_restores_the_scene(qt_app, scene_graph, create_cmd_factory):
+    steps = _lesson_timeline(scene_graph, create_cmd_factory).steps
+    cut = len(steps) - 3
+    live_scene = QGraphicsScene()
+    live = PySide6Renderer(live_scene, animations_enabled=False)
+    for step in steps[:cut]:
+        live.render_step_frames(step, 1, lambda _: None)
+    snapshot = live.capture_keyframe()
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+    seeded_scene = QGraphicsScene()
+    seeded = PySide6Renderer(seeded_scene, animations_enabled=False)
+    seeded.restore_keyframe(snapshot)
+    assert seeded.capture_keyframe() == snapshot
+    for step in steps[cut:]:
+        live.render_step_frames(step, 1, lambda _: None)
+        seeded.render_step_frames(step, 1, lambda _: None)
+        rect = live_scene.itemsBoundingRect().adjusted(-10, -10, 10, 10)
+        assert _render_scene(live_scene, rect) == _render_scene(seeded_scene, rect)
+
+
+def test_export_jobs_carry_only_their_own_steps(
+    qt_app, tmp_path, scene_graph, create_cmd_factory
+):
+    timeline = _lesson_timeline(scene_graph, create_cmd_factory)
+    counts = FrameExporter(ExportConfig(fps=10)).plan_frames(timeline)
+    bounds = _chunk_bounds(counts, 4)
+    assert [start for start, _ in bounds][1:] == [end for _, end in bounds][:-1]
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(timeline.steps)
+
+    serial = FrameExporter(ExportConfig(fps=10, workers=1)).export_frames(
+        timeline, tmp_path / "serial"
+    )
+    parallel = FrameExporter(ExportConfig(fps=10, workers=3)).export_frames(
+        timeline, tmp_path / "parallel"
+    )
+    assert serial.frame_count == parallel.frame_count == sum(counts)
+    for a, b in zip(serial.frame_paths, parallel.frame_paths):
+        assert QImage(str(a)) == QImage(str(b))
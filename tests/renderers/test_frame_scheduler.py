@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+from PySide6.QtWidgets import QGraphicsScene
+
+from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode
+from ds_vis.renderers.pyside6.frame_scheduler import AdaptiveFrameScheduler
+from ds_vis.renderers.pyside6.renderer import PySide6Renderer, RendererConfig
+
+
+def test_plan_tracks_measured_cost():
+    scheduler = AdaptiveFrameScheduler(max_frames=60, min_frame_ms=10.0)
+    # Cheap frames: bounded by the minimum slot.
+    assert scheduler.plan(400) == 40
+    scheduler.record(50.0)
+    assert scheduler.plan(400) == 8
+    # Zero/negative durations still produce the final frame.
+    assert scheduler.plan(0) == 1
+
+
+def test_record_smooths_cost():
+    scheduler = AdaptiveFrameScheduler(smoothing=0.5)
+    scheduler.record(10.0)
+    scheduler.record(30.0)
+    assert scheduler.cost_ms == 20.0
+
+
+def test_next_frame_drops_late_frames_but_keeps_last():
+    scheduler = AdaptiveFrameScheduler()
+    # On schedule: advance by one.
+    assert scheduler.next_frame(0, 10, elapsed_ms=5.0, duration_ms=100.0) == 1
+    # 55ms in: slots 1..5 have passed, jump to frame 5.
+    assert scheduler.next_frame(1, 10, elapsed_ms=55.0, duration_ms=100.0) == 5
+    # Way past the end: clamp to the final frame.
+    assert scheduler.next_frame(2, 10, elapsed_ms=500.0, duration_ms=100.0) == 10
+    assert scheduler.wait_ms(5, 10, elapsed_ms=42.0, duration_ms=100.0) == 8
+    assert scheduler.wait_ms(5, 10, elapsed_ms=70.0, duration_ms=100.0) == 0
+
+
+def test_adaptive_step_keeps_wall_clock_duration(qt_app):
+    renderer = PySide6Renderer(
+        QGraphicsScene(),
+        config=RendererConfig(adaptive_frames=True, adaptive_max_frames=30),
+    )
+    stats = renderer.enable_instrumentation()
+    assert stats is not None and renderer.frame_scheduler is not None
+    # Pretend previous frames were expensive: fewer frames get planned.
+    renderer.frame_scheduler.record(40.0)
+    renderer.apply_step(
+        AnimationStep(
+            duration_ms=0,
+            ops=[AnimationOp(op=OpCode.CREATE_NODE, target="n", data={})],
+        )
+    )
+    started = time.perf_counter()
+    renderer.apply_step(
+        AnimationStep(
+            duration_ms=200,
+            ops=[AnimationOp(op=OpCode.SET_POS, target="n", data={"x": 90.0})],
+        )
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+    step = stats.steps[-1]
+    assert 1 <= len(step.frames) + step.skipped_frames <= 5
+    assert step.frames[-1].index == len(step.frames) + step.skipped_frames
+    assert elapsed_ms < 200 * 2
+    assert renderer._nodes["n"].item.pos().x() == 90.0
@@ -404,3 +404,32 @@ def test_renderer_clear_removes_visuals(qt_app):
     assert not renderer._edges
     assert not any(isinstance(item, QGraphicsEllipseItem) for item in scene.items())
     assert not any(isinstance(item, QGraphicsPathItem) for item in scene.items())
+
+
+def test_renderer_resizes_bucket_in_place(qt_app, scene_graph, create_cmd_factory):
+    scene = QGraphicsScene()
+    renderer = PySide6Renderer(scene, animations_enabled=False)
+    renderer.render_timeline(
+        scene_graph.apply_command(
+            create_cmd_factory(
+                "stk", CommandType.CREATE_STRUCTURE, kind="stack", values=[1, 2]
+            )
+        )
+    )
+    bucket_ids = [
+        nid for nid, node in renderer._nodes.items() if node.shape == "bucket"
+    ]
+    assert len(bucket_ids) == 1
+    bucket = renderer._nodes[bucket_ids[0]]
+    before_item, before_height = bucket.item, bucket.height
+
+    renderer.render_timeline(
+        scene_graph.apply_command(
+            create_cmd_factory("stk", CommandType.INSERT, kind="stack", value=3)
+        )
+    )
+
+    after = renderer._nodes[bucket_ids[0]]
+    assert after.item is before_item
+    assert after.height > before_height
+    assert after.item.rect().height() == after.height
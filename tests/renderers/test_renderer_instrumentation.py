@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from PySide6.QtWidgets import QGraphicsScene
+
+from ds_vis.core.ops import AnimationOp, AnimationStep, OpCode, Timeline
+from ds_vis.renderers.pyside6.renderer import PySide6Renderer, RendererConfig
+
+
+def _two_node_timeline() -> Timeline:
+    create = AnimationStep(
+        duration_ms=0,
+        label="create",
+        ops=[
+            AnimationOp(op=OpCode.CREATE_NODE, target="a", data={"label": "A"}),
+            AnimationOp(op=OpCode.CREATE_NODE, target="b", data={"label": "B"}),
+            AnimationOp(
+                op=OpCode.CREATE_EDGE, target="e", data={"from": "a", "to": "b"}
+            ),
+        ],
+    )
+    move = AnimationStep(
+        duration_ms=100,
+        label="move",
+        ops=[
+            AnimationOp(op=OpCode.SET_POS, target="b", data={"x": 120.0, "y": 0.0}),
+            AnimationOp(op=OpCode.SET_STATE, target="a", data={"state": "active"}),
+        ],
+    )
+    return Timeline(steps=[create, move])
+
+
+def test_instrumentation_disabled_by_default(qt_app):
+    renderer = PySide6Renderer(QGraphicsScene(), animations_enabled=False)
+    renderer.render_timeline(_two_node_timeline())
+    assert renderer.instrumentation is None
+
+
+def test_instrumentation_records_ops_edges_and_frames(qt_app):
+    renderer = PySide6Renderer(QGraphicsScene(), animations_enabled=False)
+    stats = renderer.enable_instrumentation()
+    assert stats is not None
+    timeline = _two_node_timeline()
+
+    renderer.apply_step(timeline.steps[0])
+    renderer.render_step_frames(timeline.steps[1], 4, lambda _: None)
+
+    create, move = stats.steps
+    assert create.label == "create" and not create.animated
+    assert create.op_counts == {OpCode.CREATE_NODE: 2, OpCode.CREATE_EDGE: 1}
+    assert set(create.op_time_ms) == set(create.op_counts)
+    assert create.edge_rebuilds == 1
+    assert create.frames == []
+
+    assert move.animated
+    assert [frame.index for frame in move.frames] == [1, 2, 3, 4]
+    assert all(frame.budget_ms == 25.0 for frame in move.frames)
+    # one rebuild per interpolation frame plus the final SET_POS
+    assert move.edge_rebuilds == 5
+    assert move.op_counts[OpCode.SET_POS] == 1
+    assert "step 1" in move.summary()
+
+
+def test_stats_overlay_follows_last_step(qt_app):
+    scene = QGraphicsScene()
+    renderer = PySide6Renderer(
+        scene, animations_enabled=False, config=RendererConfig(show_stats_overlay=True)
+    )
+    renderer.render_timeline(_two_node_timeline())
+
+    assert renderer.instrumentation is not None
+    overlay = renderer._stats_item
+    assert overlay is not None and overlay.scene() is scene
+    assert overlay.text().startswith("step 1 | move")
+
+    renderer.set_stats_overlay(False)
+    assert renderer._stats_item is None
+    assert overlay.scene() is None
+
+
+def test_stats_overlay_does_not_cover_the_message(qt_app):
+    scene = QGraphicsScene()
+    renderer = PySide6Renderer(
+        scene, animations_enabled=False, config=RendererConfig(show_stats_overlay=True)
+    )
+    overlay = renderer._stats_item
+    assert overlay is not None
+    message = AnimationStep(
+        ops=[AnimationOp(op=OpCode.SET_MESSAGE, target=None, data={"text": "hi"})]
+    )
+
+    def rect(item):
+        return item.mapToScene(item.boundingRect()).boundingRect()
+
+    renderer.render_timeline(Timeline(steps=[message]))  # empty scene
+    assert not rect(overlay).intersects(rect(renderer._message_item))
+
+    renderer.render_timeline(Timeline(steps=[*_two_node_timeline().steps, message]))
+    assert not rect(overlay).intersects(rect(renderer._message_item))
+    assert rect(overlay).top() > renderer._content_bounding_rect().bottom()
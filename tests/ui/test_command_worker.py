@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from ds_vis.core.exceptions import CommandError
+from ds_vis.core.ops import AnimationStep, Timeline
+from ds_vis.ui.command_worker import SceneGraphWorker, StepStream
+from ds_vis.ui.main_window import MainWindow
+
+
+def _step_timeline(label: str) -> Timeline:
+    return Timeline(steps=[AnimationStep(label=label)])
+
+
+def _collect(worker: SceneGraphWorker) -> dict:
+    seen: dict = {"progress": [], "available": 0, "failed": [], "finished": []}
+
+    def _available() -> None:
+        seen["available"] += 1
+
+    worker.signals.progress.connect(lambda d, t: seen["progress"].append((d, t)))
+    worker.signals.steps_available.connect(_available)
+    worker.signals.failed.connect(seen["failed"].append)
+    worker.signals.finished.connect(seen["finished"].append)
+    return seen
+
+
+def _labels(stream: StepStream) -> List[str | None]:
+    return [step.label for step in stream.drain()]
+
+
+def test_worker_streams_steps_and_reports_progress(qt_app):
+    stream = StepStream()
+    worker = SceneGraphWorker(
+        [lambda: _step_timeline("a"), lambda: _step_timeline("b")], stream, total=2
+    )
+    seen = _collect(worker)
+    worker.run()
+
+    assert seen["progress"] == [(1, 2), (2, 2)]
+    # Only the empty -> non-empty transition wakes the player.
+    assert seen["available"] == 1
+    assert _labels(stream) == ["a", "b"]
+    assert stream.exhausted
+    assert seen["finished"] == [False]
+
+
+def test_worker_cancel_keeps_completed_work(qt_app):
+    worker: SceneGraphWorker
+    calls: List[str] = []
+
+    def first() -> Timeline:
+        calls.append("first")
+        worker.cancel()
+        return _step_timeline("first")
+
+    def second() -> Timeline:  # pragma: no cover - must not run
+        calls.append("second")
+        return _step_timeline("second")
+
+    stream = StepStream()
+    worker = SceneGraphWorker([first, second], stream, total=2)
+    seen = _collect(worker)
+    worker.run()
+
+    assert calls == ["first"]
+    assert _labels(stream) == ["first"]
+    assert seen["finished"] == [True]
+
+
+def test_worker_reports_failure_after_partial_success(qt_app):
+    def broken() -> Timeline:
+        raise CommandError("boom")
+
+    stream = StepStream()
+    worker = SceneGraphWorker([lambda: _step_timeline("ok"), broken], stream)
+    seen = _collect(worker)
+    worker.run()
+
+    assert seen["failed"] == ["boom"]
+    assert _labels(stream) == ["ok"]
+    assert seen["finished"] == [False]
+
+
+def test_step_stream_applies_backpressure():
+    stream = StepStream(capacity=2)
+    produced: List[int] = []
+
+    def produce() -> None:
+        for i in range(5):
+            stream.put(AnimationStep(label=str(i)))
+            produced.append(i)
+        stream.close()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    consumed: List[str | None] = []
+    while not stream.exhausted:
+        batch = stream.drain(1)
+        # The producer can never run more than `capacity` steps ahead.
+        assert len(produced) - len(consumed) <= 3
+        consumed.extend(step.label for step in batch)
+    thread.join(timeout=5)
+    assert consumed == ["0", "1", "2", "3", "4"]
+
+
+def test_step_stream_close_unblocks_producer():
+    stream = StepStream(capacity=1)
+    stream.put(AnimationStep())
+    result: List[bool] = []
+    thread = threading.Thread(target=lambda: result.append(stream.put(AnimationStep())))
+    thread.start()
+    stream.close(discard=True)
+    thread.join(timeout=5)
+    assert result == [False]
+    assert stream.exhausted
+
+
+def test_main_window_streams_long_scripts(qt_app):
+    window = MainWindow()
+    window._toggle_animations(False)
+    window._set_speed(100.0)
+    window._background_min_commands = 1
+    try:
+        window._run_dsl_text("list L1 = [1,2]; insert L1 1 9")
+        assert window._is_busy()
+        assert not window._control_panel.isEnabled()
+
+        window._thread_pool.waitForDone()
+        qt_app.processEvents()
+
+        assert not window._is_busy()
+        assert window._control_panel.isEnabled()
+        window._pause()
+        for _ in range(100):
+            window._advance_step(schedule_next=False)
+            if window._stream is None:
+                break
+        assert window._stream is None
+        assert len(window._renderer._nodes) == 3
+    finally:
+        window.close()
@@ -0,0 +1,107 @@
+"""
+Benchmark: SceneGraph.apply_commands vs one apply_command per command.
+
+A batch dispatches every command, records one pre-image per structure and
+lays out each strategy's steps in one engine pass (see docs/design/
+scene_graph.md §3.3). This script times the same command list applied in a
+loop, as one batch and through `replay`, with undo history off and on.
+
+Cases:
+- single: N inserts into one structure (per-step layout work dominates).
+- multi:  N inserts spread round-robin over S structures; the loop re-lays
+          every structure per command, the batch only the dirty ones.
+
+Usage (from repo root):
+    uv run python tools/bench_batch.py [N] [S]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ds_vis.core.scene.command import Command, CommandType  # noqa: E402
+from ds_vis.core.scene.scene_graph import SceneGraph  # noqa: E402
+
+KINDS = ("list", "seqlist", "stack")
+
+
+def _insert(structure_id: str, kind: str, value: int) -> Command:
+    payload: dict[str, object] = {"kind": kind, "value": value}
+    if kind != "stack":
+        payload["index"] = 0
+    return Command(structure_id, CommandType.INSERT, payload)
+
+
+def _scene(structures: List[tuple[str, str]], history_limit: int) -> SceneGraph:
+    scene = SceneGraph(history_limit=history_limit)
+    for structure_id, kind in structures:
+        scene.apply_command(
+            Command(
+                structure_id,
+                CommandType.CREATE_STRUCTURE,
+                {"kind": kind, "values": []},
+            )
+        )
+    return scene
+
+
+def _time(
+    structures: List[tuple[str, str]],
+    commands: List[Command],
+    history_limit: int,
+    run: Callable[[SceneGraph, List[Command]], object],
+) -> float:
+    scene = _scene(structures, history_limit)
+    started = time.perf_counter()
+    run(scene, commands)
+    return time.perf_counter() - started
+
+
+def _loop(scene: SceneGraph, commands: List[Command]) -> object:
+    return [scene.apply_command(command) for command in commands]
+
+
+def _batch(scene: SceneGraph, commands: List[Command]) -> object:
+    return scene.apply_commands(commands)
+
+
+def _replay(scene: SceneGraph, commands: List[Command]) -> object:
+    return scene.replay(commands, on_timeline=lambda timeline: None)
+
+
+def _report(
+    label: str, structures: List[tuple[str, str]], commands: List[Command]
+) -> None:
+    for history_limit in (0, 1000):
+        loop = _time(structures, commands, history_limit, _loop)
+        batch = _time(structures, commands, history_limit, _batch)
+        replay = _time(structures, commands, history_limit, _replay)
+        print(
+            f"{label:<16} history={history_limit:>4}  loop={loop:6.2f}s  "
+            f"batch={batch:6.2f}s  replay={replay:6.2f}s  "
+            f"loop/batch={loop / batch:5.2f}x"
+        )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    s = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    for kind in KINDS:
+        commands = [_insert("s", kind, i) for i in range(n)]
+        _report(f"single {kind}", [("s", kind)], commands)
+    structures = [(f"s{i}", KINDS[i % len(KINDS)]) for i in range(s)]
+    commands = [
+        _insert(*structures[i % s], value=i)  # round-robin over structures
+        for i in range(n)
+    ]
+    _report(f"multi x{s}", structures, commands)
+
+
+if __name__ == "__main__":
+    main()
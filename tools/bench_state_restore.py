@@ -0,0 +1,77 @@
+"""
+Benchmark: SET_STATE op counts for long operation sequences.
+
+Restore steps only reset ids touched since the last restore (see
+BaseModel.state_op / restore_touched_ops). This script replays N consecutive
+git commits and N BST deletes and prints the SET_STATE ops actually emitted
+next to what a "reset every node" restore would have produced.
+
+Usage (from repo root):
+    uv run python tools/bench_state_restore.py [N]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from ds_vis.core.models import BstModel, GitGraphModel  # noqa: E402
+from ds_vis.core.ops import OpCode, Timeline  # noqa: E402
+
+
+def _count(timelines: Iterable[Timeline]) -> tuple[int, int]:
+    total = 0
+    set_state = 0
+    for timeline in timelines:
+        for step in timeline.steps:
+            total += len(step.ops)
+            set_state += sum(1 for op in step.ops if op.op is OpCode.SET_STATE)
+    return total, set_state
+
+
+def bench_git_commits(n: int) -> None:
+    model = GitGraphModel(structure_id="bench_git")
+    model.git_init()
+    started = time.perf_counter()
+    total, set_state = _count(model.commit(f"c{i}") for i in range(n))
+    elapsed = time.perf_counter() - started
+    # Full restore resets every commit after each commit: 1 + 2 + ... + n.
+    full_restore = n * (n + 1) // 2
+    print(
+        f"git commits   n={n:>6}  ops={total:>9}  set_state={set_state:>9}  "
+        f"full-restore set_state>={full_restore:>12}  {elapsed:.2f}s"
+    )
+
+
+def bench_bst_deletes(n: int) -> None:
+    keys = list(range(n))
+    rng = random.Random(42)
+    rng.shuffle(keys)
+    model = BstModel(structure_id="bench_bst")
+    model.create(keys)
+    rng.shuffle(keys)
+    started = time.perf_counter()
+    total, set_state = _count(model.delete_value(key) for key in keys)
+    elapsed = time.perf_counter() - started
+    # Full restore resets every remaining node after each delete.
+    full_restore = n * (n - 1) // 2
+    print(
+        f"bst deletes   n={n:>6}  ops={total:>9}  set_state={set_state:>9}  "
+        f"full-restore set_state>={full_restore:>12}  {elapsed:.2f}s"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    bench_git_commits(n)
+    bench_bst_deletes(n)
+
+
+if __name__ == "__main__":
+    main()